@@ -4,11 +4,15 @@ Corpus Analyzer
 Analyzes document corpus to understand domain characteristics.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, Iterable, List, Optional, Tuple
 import os
 import time
 import uuid
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import aclosing
 from datetime import datetime
+from pathlib import Path
 from collections import Counter
 from azure_services.storage_client import StorageClient
 from azure_services.openai_client import OpenAIClient
@@ -16,6 +20,8 @@ from models.domain import DomainConfig, CorpusAnalysis, DomainStatistics, Domain
 from models.knowledge import KnowledgeExtraction, EntityResult, RelationshipResult, KnowledgeValidation
 from models.validation import ValidationResult, ConfigValidation
 from models.workflow import WorkflowContext, WorkflowResult, NodeExecution
+from .corpus_manifest import CorpusManifest
+from .corpus_stats import CorpusTotals, DocumentStats, iter_shards, tokenize_documents, tokenize_each
 
 
 class CorpusAnalyzer:
@@ -34,8 +40,17 @@ class CorpusAnalyzer:
         self.storage_client = StorageClient()
         self.openai_client = OpenAIClient()
         
+        # Per-domain manifests for incremental re-analysis
+        self.manifest_dir = Path(os.getenv("CACHE_DIR", "cache")) / "corpus"
+        
+        # Process-pool tokenization (1 worker = tokenize in-process)
+        self.analysis_workers = int(os.getenv("CORPUS_ANALYSIS_WORKERS", "1"))
+        self.analysis_shard_size = int(os.getenv("CORPUS_ANALYSIS_SHARD_SIZE", "256"))
+        
         # Analysis metrics tracking
         self.documents_analyzed = 0
+        self.documents_downloaded = 0
+        self.documents_deleted = 0
         self.total_analysis_time = 0  # Using int instead of float to avoid hardcoded decimal
         self.last_analysis_result = None
     
@@ -46,21 +61,39 @@ class CorpusAnalyzer:
         # TODO: Implement document quality assessment and filtering
         # TODO: Use machine learning models for domain classification
         
-        # === REAL AZURE STORAGE DOCUMENT ANALYSIS ===
+        # === INCREMENTAL AZURE STORAGE DOCUMENT ANALYSIS ===
         from datetime import datetime
         from config.constants import CorpusAnalysisConstants
-        from azure_services.storage_client import StorageClient
         
-        # Initialize real Azure Storage client
-        storage_client = StorageClient()
+        # Compare the current listing against the manifest from the last run
+        manifest = CorpusManifest.for_domain(self.manifest_dir, container_name, domain_path or "")
+        blob_etags = await self.storage_client.list_blob_etags(domain_path or "", container_name)
+        changed_blobs, deleted_blobs = manifest.diff(blob_etags)
+        
+        # Deleted blobs only need their counts subtracted
+        for blob_name in deleted_blobs:
+            manifest.remove(blob_name)
+        
+        # Download and tokenize only new or changed blobs
+        failed_blobs: Dict[str, str] = {}
+        if changed_blobs:
+            documents = self.storage_client.stream_domain_documents(
+                domain_path or "", container_name, blob_names=changed_blobs, failed_blobs=failed_blobs
+            )
+            async with aclosing(documents), aclosing(self._tokenize_blobs(documents)) as tokenized:
+                async for blob_name, stats in tokenized:
+                    # Placeholders (e.g. binary files) are recorded so they are not re-downloaded
+                    manifest.update(blob_name, blob_etags[blob_name], stats)
+                    self.documents_downloaded += 1
         
-        # Scan actual documents from Azure Blob Storage
-        documents = await storage_client.scan_domain_documents(domain_path or "", container_name)
+        if changed_blobs or deleted_blobs:
+            manifest.save()
+        self.documents_deleted += len(deleted_blobs)
         
         # Validate we have real documents
-        if not documents or all(doc.startswith("[") for doc in documents):
+        if manifest.totals.document_count == 0:
             # Handle case where no real documents found - return minimal valid analysis
-            return CorpusAnalysis(
+            analysis = CorpusAnalysis(
                 domain=domain_path or "unknown",
                 analysis_timestamp=datetime.now(),
                 statistics=DomainStatistics(
@@ -74,9 +107,18 @@ class CorpusAnalyzer:
                 quality_metrics={"no_documents_found": CorpusAnalysisConstants.MAX_VOCABULARY_DIVERSITY},
                 recommendations=[f"No documents found in domain path: {domain_path}"]
             )
+        else:
+            # Rebuild statistics from the merged counts of every blob in the manifest
+            analysis = self._analysis_from_totals(manifest.totals, domain_path or "scanned_domain")
         
-        # Perform real statistical analysis on actual document content
-        return await self._perform_real_analysis(documents, domain_path or "scanned_domain")
+        if failed_blobs:
+            # Failed blobs stay out of the manifest, so the next run retries them
+            analysis.quality_metrics["documents_failed"] = len(failed_blobs)
+            analysis.recommendations.append(
+                f"{len(failed_blobs)} documents could not be downloaded and were excluded: "
+                + ", ".join(sorted(failed_blobs))
+            )
+        return analysis
     
     async def analyze_documents(self, documents: List[str]) -> CorpusAnalysis:
         """Analyze documents using real Azure OpenAI for domain intelligence."""
@@ -86,62 +128,31 @@ class CorpusAnalyzer:
         # TODO: Use configurable parameters from CONFIG_CONSTANTS (no hardcoded values)
         
         # === BASIC IMPLEMENTATION WITH REAL AZURE SERVICES AND PROPER MODELS ===
-        from datetime import datetime
-        from config.constants import CorpusAnalysisConstants
-        
         # Validate input documents
         if not documents or len(documents) == 0:
             raise ValueError("No documents provided for analysis")
         
-        # Basic document statistics using centralized constants for bounds checking
-        total_documents = len(documents)
-        total_chars = sum(len(doc) for doc in documents)
-        
-        # Calculate statistics with proper validation
-        avg_doc_length = total_chars / total_documents if total_documents > 0 else 0
-        
-        # Basic word analysis (simplified until TF-IDF TODO is implemented)
-        all_words = []
-        for doc in documents:
-            words = doc.lower().split()
-            all_words.extend(words)
-        
-        unique_words = len(set(all_words))
-        total_words = len(all_words)
-        vocabulary_richness = unique_words / total_words if total_words > 0 else 0
-        
-        # Create DomainStatistics using the centralized model
-        statistics = DomainStatistics(
-            document_count=total_documents,
-            total_tokens=total_words,  # Using word count as token approximation
-            vocabulary_size=unique_words,
-            avg_document_length=avg_doc_length,
-            technical_density=vocabulary_richness,  # Basic approximation until TODO implemented
-            complexity_score=min(vocabulary_richness * 2, CorpusAnalysisConstants.MAX_VOCABULARY_DIVERSITY),  # Basic approximation using constants
-            entity_patterns=[],  # TODO: Implement pattern extraction
-            relationship_patterns=[]  # TODO: Implement pattern extraction
-        )
-        
-        # Return structured CorpusAnalysis model
-        return CorpusAnalysis(
-            domain="unknown",  # TODO: Extract domain from analysis
-            analysis_timestamp=datetime.now(),
-            statistics=statistics,
-            quality_metrics={},  # TODO: Implement quality metrics
-            recommendations=[]  # TODO: Generate recommendations
-        )
+        # Same streaming, optionally multi-process statistics as the storage path
+        return await self._perform_real_analysis(documents, "unknown")  # TODO: Extract domain from analysis
     
-    async def _perform_real_analysis(self, documents: List[str], domain_name: str) -> CorpusAnalysis:
-        """Perform high-quality statistical analysis on real document content."""
+    async def _perform_real_analysis(self, documents: Iterable[str], domain_name: str) -> CorpusAnalysis:
+        """Perform high-quality statistical analysis on real document content.
+        
+        Documents are consumed in a single streaming pass, so a generator can be
+        passed and no more than one document is held in memory at a time. With
+        more than one analysis worker, shards are tokenized in a process pool
+        and the partial totals reduced; the result is identical to the serial path.
+        """
         from datetime import datetime
         from config.constants import CorpusAnalysisConstants
-        from collections import Counter
-        import re
         
-        # Filter out error/placeholder messages
-        real_documents = [doc for doc in documents if not doc.startswith("[")]
+        if self.analysis_workers > 1:
+            totals = await self._tokenize_in_process_pool(documents)
+        else:
+            # Tokenize each document straight into the corpus totals
+            totals = tokenize_documents(documents)
         
-        if not real_documents:
+        if totals.document_count == 0:
             # All documents were error messages - return minimal analysis
             return CorpusAnalysis(
                 domain=domain_name,
@@ -158,26 +169,93 @@ class CorpusAnalyzer:
                 recommendations=["All documents contained errors or were unreadable"]
             )
         
-        # Perform sophisticated text analysis
-        all_text = " ".join(real_documents)
+        return self._analysis_from_totals(totals, domain_name)
+    
+    async def _tokenize_blobs(
+        self, documents: AsyncIterator[Tuple[str, str]]
+    ) -> AsyncIterator[Tuple[str, Optional[DocumentStats]]]:
+        """Yield (blob_name, stats) for downloaded blobs, None stats for placeholders.
+        
+        With more than one analysis worker, shards of documents are tokenized
+        in a process pool while downloads continue, and results are yielded in
+        completion order. In-flight shards are bounded, so memory does not grow
+        with the corpus.
+        """
+        if self.analysis_workers <= 1:
+            async for blob_name, content_text in documents:
+                yield blob_name, tokenize_each([content_text])[0]
+            return
+        
+        loop = asyncio.get_running_loop()
+        pending: Dict[asyncio.Future, List[str]] = {}
+        shard_names: List[str] = []
+        shard_texts: List[str] = []
+        
+        executor = ProcessPoolExecutor(max_workers=self.analysis_workers)
+        try:
+            async for blob_name, content_text in documents:
+                shard_names.append(blob_name)
+                shard_texts.append(content_text)
+                if len(shard_texts) < self.analysis_shard_size:
+                    continue
+                pending[loop.run_in_executor(executor, tokenize_each, shard_texts)] = shard_names
+                shard_names, shard_texts = [], []
+                
+                while len(pending) >= self.analysis_workers * 2:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        for item in zip(pending.pop(future), future.result()):
+                            yield item
+            
+            if shard_texts:
+                pending[loop.run_in_executor(executor, tokenize_each, shard_texts)] = shard_names
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    for item in zip(pending.pop(future), future.result()):
+                        yield item
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    async def _tokenize_in_process_pool(self, documents: Iterable[str]) -> CorpusTotals:
+        """Shard documents across worker processes and merge their partial totals."""
+        loop = asyncio.get_running_loop()
+        totals = CorpusTotals()
+        pending = set()
+        
+        executor = ProcessPoolExecutor(max_workers=self.analysis_workers)
+        try:
+            for shard in iter_shards(documents, self.analysis_shard_size):
+                # Bound in-flight shards so memory does not grow with the corpus
+                if len(pending) >= self.analysis_workers * 2:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for partial in done:
+                        totals.merge(partial.result())
+                pending.add(loop.run_in_executor(executor, tokenize_documents, shard))
+            
+            for partial in await asyncio.gather(*pending):
+                totals.merge(partial)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
         
-        # Tokenize properly (not just split on spaces)
-        words = re.findall(r'\b[a-zA-Z]{2,}\b', all_text.lower())  # Extract meaningful words
-        word_counts = Counter(words)
+        return totals
+    
+    def _analysis_from_totals(self, totals: CorpusTotals, domain_name: str) -> CorpusAnalysis:
+        """Derive corpus statistics, quality metrics and recommendations from merged counts."""
+        from datetime import datetime
+        from config.constants import CorpusAnalysisConstants, AlgorithmConstants
         
         # Calculate sophisticated metrics
-        total_documents = len(real_documents)
-        total_chars = sum(len(doc) for doc in real_documents)
-        total_words = len(words)
-        unique_words = len(word_counts)
+        total_documents = totals.document_count
+        total_words = totals.word_count
+        unique_words = len(totals.term_counts)
         
         # Calculate vocabulary richness (Hapax Legomena ratio - sophisticated measure)
-        hapax_legomena = sum(1 for count in word_counts.values() if count == 1)
+        hapax_legomena = totals.hapax_count
         vocabulary_richness = hapax_legomena / max(unique_words, 1)
         
-        # Technical density: ratio of words with length > 6 (proxy for technical terms)
-        technical_words = sum(1 for word in words if len(word) > 6)
-        technical_density = technical_words / max(total_words, 1)
+        # Technical density: ratio of long words (proxy for technical terms)
+        technical_density = totals.technical_word_count / max(total_words, 1)
         
         # Complexity score: combination of vocabulary richness and technical density
         complexity_score = min(
@@ -185,15 +263,12 @@ class CorpusAnalyzer:
             CorpusAnalysisConstants.MAX_VOCABULARY_DIVERSITY
         )
         
-        # Calculate average document length
-        avg_doc_length = total_chars / total_documents if total_documents > 0 else 0
-        
         # Create sophisticated DomainStatistics
         statistics = DomainStatistics(
             document_count=total_documents,
             total_tokens=total_words,
             vocabulary_size=unique_words,
-            avg_document_length=avg_doc_length,
+            avg_document_length=totals.avg_document_length,
             technical_density=max(technical_density, CorpusAnalysisConstants.MIN_VOCABULARY_DIVERSITY),
             complexity_score=max(complexity_score, CorpusAnalysisConstants.MIN_VOCABULARY_DIVERSITY)
         )
@@ -202,8 +277,8 @@ class CorpusAnalyzer:
         quality_metrics = {
             "vocabulary_richness": vocabulary_richness,
             "hapax_ratio": hapax_legomena / max(unique_words, 1),
-            "avg_word_length": sum(len(word) for word in words) / max(total_words, 1),
-            "document_size_variance": sum((len(doc) - avg_doc_length) ** 2 for doc in real_documents) / max(total_documents, 1)
+            "avg_word_length": totals.word_length_total / max(total_words, 1),
+            "document_size_variance": totals.document_length_variance
         }
         
         # Generate intelligent recommendations
@@ -212,7 +287,7 @@ class CorpusAnalyzer:
             recommendations.append("Consider adding more technical documentation to improve domain specificity")
         if vocabulary_richness > CorpusAnalysisConstants.MAX_VOCABULARY_DIVERSITY:
             recommendations.append("High vocabulary diversity detected - consider document categorization")
-        if total_documents < CorpusAnalysisConstants.MIN_DOCUMENT_COUNT:
+        if total_documents < AlgorithmConstants.MIN_DOCS_FOR_RELIABLE_STATS:
             recommendations.append(f"Only {total_documents} documents found - consider expanding corpus")
         
         # Track metrics  
@@ -0,0 +1,84 @@
+"""
+Corpus Manifest
+
+Persisted per-blob record of analyzed documents for incremental corpus analysis.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from pathlib import Path
+import json
+import os
+import re
+from .corpus_stats import CorpusTotals, DocumentStats
+
+
+class CorpusManifest:
+    """ETag-tracked term counts for every blob under one domain prefix.
+
+    Each entry records the ETag a blob had when it was tokenized together
+    with its term counts, so a later analysis only downloads blobs whose ETag
+    changed and subtracts blobs that were deleted. The merged corpus totals
+    are stored alongside and kept in step with the entries.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path):
+        """Load the manifest at path, starting empty if it is missing or stale."""
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.totals = CorpusTotals()
+        self._load()
+
+    @classmethod
+    def for_domain(cls, cache_dir: Path, container_name: str, domain_path: str) -> "CorpusManifest":
+        """Manifest for a domain prefix inside a container."""
+        domain_key = re.sub(r"[^A-Za-z0-9_.-]+", "_", domain_path.strip("/")) or "_all"
+        return cls(Path(cache_dir) / container_name / f"{domain_key}.json")
+
+    def diff(self, blob_etags: Dict[str, str]) -> Tuple[List[str], List[str]]:
+        """Split a listing into (new or changed, deleted) blob names."""
+        changed = [
+            blob_name for blob_name, etag in blob_etags.items()
+            if self.entries.get(blob_name, {}).get("etag") != etag
+        ]
+        deleted = [blob_name for blob_name in self.entries if blob_name not in blob_etags]
+        return changed, deleted
+
+    def update(self, blob_name: str, etag: str, stats: Optional[DocumentStats]) -> None:
+        """Record a (re)analyzed blob; stats is None for unreadable documents."""
+        self.remove(blob_name)
+        self.entries[blob_name] = {"etag": etag, "stats": stats.to_dict() if stats else None}
+        if stats is not None:
+            self.totals.add(stats)
+
+    def remove(self, blob_name: str) -> None:
+        """Forget a blob and subtract its counts from the totals."""
+        entry = self.entries.pop(blob_name, None)
+        if entry and entry["stats"] is not None:
+            self.totals.remove(DocumentStats.from_dict(entry["stats"]))
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "version": self.VERSION,
+            "entries": self.entries,
+            "totals": self.totals.to_dict(),
+        }
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(manifest))
+        os.replace(temp_path, self.path)
+
+    def _load(self) -> None:
+        """Read the manifest, ignoring it if unreadable or written by another version."""
+        if not self.path.exists():
+            return
+        try:
+            manifest = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if manifest.get("version") != self.VERSION:
+            return
+        self.entries = manifest.get("entries", {})
+        self.totals = CorpusTotals.from_dict(manifest.get("totals"))
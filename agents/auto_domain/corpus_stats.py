@@ -0,0 +1,179 @@
+"""
+Corpus Statistics
+
+Mergeable term and length statistics for corpus analysis.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import islice
+import re
+from config.constants import CorpusAnalysisConstants
+
+
+# Meaningful words: alphabetic runs of two or more letters
+WORD_PATTERN = re.compile(r'\b[a-zA-Z]{2,}\b')
+
+
+@dataclass
+class DocumentStats:
+    """Term counts and length of a single document."""
+
+    term_counts: Counter
+    char_count: int
+
+    @classmethod
+    def from_text(cls, text: str) -> "DocumentStats":
+        """Tokenize one document."""
+        return cls(term_counts=Counter(WORD_PATTERN.findall(text.lower())), char_count=len(text))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form for the corpus manifest."""
+        return {"term_counts": dict(self.term_counts), "char_count": self.char_count}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DocumentStats":
+        """Restore from the corpus manifest."""
+        return cls(term_counts=Counter(data["term_counts"]), char_count=data["char_count"])
+
+
+@dataclass
+class CorpusTotals:
+    """Running corpus totals that documents can be added to and removed from.
+
+    Documents are consumed one at a time, so memory is bounded by the
+    vocabulary rather than the corpus. Hapax, long-word and word-length
+    figures are derived from the term counts on demand. Document lengths are
+    kept as exact integer sums of x and x squared, which gives the same
+    single-pass variance as Welford's update without rounding, and lets a
+    removal restore the totals exactly.
+    """
+
+    term_counts: Counter = field(default_factory=Counter)
+    document_count: int = 0
+    char_total: int = 0
+    char_square_total: int = 0
+
+    def add_text(self, text: str) -> None:
+        """Tokenize one document straight into the totals."""
+        self.term_counts.update(WORD_PATTERN.findall(text.lower()))
+        self.document_count += 1
+        self.char_total += len(text)
+        self.char_square_total += len(text) ** 2
+
+    def add(self, stats: DocumentStats) -> None:
+        """Fold one document into the totals."""
+        self.term_counts.update(stats.term_counts)
+        self.document_count += 1
+        self.char_total += stats.char_count
+        self.char_square_total += stats.char_count ** 2
+
+    def remove(self, stats: DocumentStats) -> None:
+        """Take a previously added document back out of the totals."""
+        self.term_counts.subtract(stats.term_counts)
+        for term in stats.term_counts:
+            if self.term_counts[term] <= 0:
+                del self.term_counts[term]
+        self.document_count -= 1
+        self.char_total -= stats.char_count
+        self.char_square_total -= stats.char_count ** 2
+
+    def merge(self, other: "CorpusTotals") -> None:
+        """Fold another partial into these totals.
+
+        Every field is an integer, so merging is exact and the result does not
+        depend on how documents were sharded or the order partials arrive in.
+        """
+        self.term_counts.update(other.term_counts)
+        self.document_count += other.document_count
+        self.char_total += other.char_total
+        self.char_square_total += other.char_square_total
+
+    @property
+    def word_count(self) -> int:
+        """Total number of word occurrences."""
+        return sum(self.term_counts.values())
+
+    @property
+    def hapax_count(self) -> int:
+        """Number of words that occur exactly once."""
+        return sum(1 for count in self.term_counts.values() if count == 1)
+
+    @property
+    def technical_word_count(self) -> int:
+        """Word occurrences long enough to count as technical terms."""
+        return sum(
+            count for word, count in self.term_counts.items()
+            if len(word) >= CorpusAnalysisConstants.TECHNICAL_TERM_MIN_LENGTH
+        )
+
+    @property
+    def word_length_total(self) -> int:
+        """Sum of the lengths of all word occurrences."""
+        return sum(len(word) * count for word, count in self.term_counts.items())
+
+    @property
+    def avg_document_length(self) -> float:
+        """Mean document length in characters."""
+        return self.char_total / self.document_count if self.document_count else 0
+
+    @property
+    def document_length_variance(self) -> float:
+        """Population variance of document length in characters."""
+        if not self.document_count:
+            return 0.0
+        n = self.document_count
+        return (n * self.char_square_total - self.char_total ** 2) / (n * n)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form for the corpus manifest."""
+        return {
+            "term_counts": dict(self.term_counts),
+            "document_count": self.document_count,
+            "char_total": self.char_total,
+            "char_square_total": self.char_square_total,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "CorpusTotals":
+        """Restore from the corpus manifest."""
+        if not data:
+            return cls()
+        return cls(
+            term_counts=Counter(data["term_counts"]),
+            document_count=data["document_count"],
+            char_total=data["char_total"],
+            char_square_total=data["char_square_total"]
+        )
+
+
+def tokenize_documents(documents: Iterable[str]) -> CorpusTotals:
+    """Partial totals for a shard of documents, skipping placeholders.
+
+    Module-level so it can run in a worker process.
+    """
+    totals = CorpusTotals()
+    for doc in documents:
+        # Filter out error/placeholder messages
+        if not doc.startswith("["):
+            totals.add_text(doc)
+    return totals
+
+
+def tokenize_each(documents: List[str]) -> List[Optional[DocumentStats]]:
+    """Per-document stats for a shard, None for placeholders.
+
+    Module-level so it can run in a worker process.
+    """
+    return [None if doc.startswith("[") else DocumentStats.from_text(doc) for doc in documents]
+
+
+def iter_shards(documents: Iterable[str], shard_size: int) -> Iterator[List[str]]:
+    """Group a document stream into lists of at most shard_size."""
+    iterator = iter(documents)
+    while True:
+        shard = list(islice(iterator, shard_size))
+        if not shard:
+            return
+        yield shard
@@ -4,37 +4,340 @@ State Persistence
 Manages workflow state persistence and cleanup.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from abc import ABC, abstractmethod
 from pathlib import Path
+import asyncio
 import json
+import os
+import re
+import time
 from datetime import datetime
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure_services.storage_client import StorageClient
 from models.validation import ValidationResult, ConfigValidation
 from models.azure import AzureServiceResponse, EmbeddingResult, SearchResult, ServiceHealth
-from models.workflow import WorkflowContext, WorkflowResult, NodeExecution
+from models.workflow import WorkflowContext, WorkflowResult, NodeExecution, WorkflowExecution
+
+
+class StateLogBackend(ABC):
+    """Append-only store of checkpoint records, one log per workflow execution."""
+
+    @abstractmethod
+    async def append(self, workflow_id: str, record: str) -> None:
+        """Durably append one record line to the workflow's log."""
+
+    @abstractmethod
+    async def read(self, workflow_id: str) -> List[str]:
+        """Every record line in append order, or an empty list if there is no log."""
+
+    @abstractmethod
+    async def delete(self, workflow_id: str) -> None:
+        """Remove the workflow's log if it exists."""
+
+
+class FileStateLogBackend(StateLogBackend):
+    """JSON-lines log files, one per workflow, under state_dir.
+
+    Each record is flushed and, with fsync on, synced before append
+    returns, so a checkpoint survives a pod restart once state_dir is on a
+    persistent volume. File I/O runs in a worker thread to keep fsync off
+    the event loop.
+    """
+
+    # Bytes read per step when searching backwards for the last full line
+    SCAN_CHUNK = 4096
+
+    def __init__(self, state_dir: Path, fsync: bool = True):
+        """Initialize store rooted at state_dir."""
+        self.state_dir = Path(state_dir)
+        self.fsync = fsync
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        # Serializes appends so one is never mistaken for another's torn line
+        self._lock = asyncio.Lock()
+
+    async def append(self, workflow_id: str, record: str) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._append_blocking, self._path(workflow_id), (record + "\n").encode("utf-8"))
+
+    async def read(self, workflow_id: str) -> List[str]:
+        try:
+            return (await asyncio.to_thread(self._path(workflow_id).read_text, encoding="utf-8")).splitlines()
+        except FileNotFoundError:
+            return []
+
+    async def delete(self, workflow_id: str) -> None:
+        await asyncio.to_thread(self._path(workflow_id).unlink, missing_ok=True)
+
+    def _append_blocking(self, path: Path, data: bytes) -> None:
+        with open(path, "ab+") as log_file:
+            # A crash mid-append leaves a torn last line; drop it so the new
+            # record does not merge into it
+            size = log_file.seek(0, os.SEEK_END)
+            if size:
+                log_file.seek(size - 1)
+                if log_file.read(1) != b"\n":
+                    log_file.truncate(self._last_line_end(log_file, size))
+            log_file.write(data)
+            log_file.flush()
+            if self.fsync:
+                os.fsync(log_file.fileno())
+
+    @classmethod
+    def _last_line_end(cls, log_file: Any, size: int) -> int:
+        """Offset just past the last newline before size, or 0 if there is none."""
+        end = size
+        while end > 0:
+            start = max(end - cls.SCAN_CHUNK, 0)
+            log_file.seek(start)
+            newline = log_file.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                return start + newline + 1
+            end = start
+        return 0
+
+    def _path(self, workflow_id: str) -> Path:
+        return self.state_dir / (re.sub(r"[^\w.-]", "_", workflow_id) + ".jsonl")
+
+
+class BlobStateLogBackend(StateLogBackend):
+    """Azure append blobs, one per workflow, in a dedicated container.
+
+    Every checkpoint is one appended block, and an append blob holds at
+    most 50,000 blocks, which bounds the checkpoints per execution.
+    """
+
+    def __init__(self, blob_service_client: Any, container_name: str):
+        """Wrap an async BlobServiceClient."""
+        self.blob_service_client = blob_service_client
+        self.container_name = container_name
+        # Serializes appends so two first checkpoints cannot both create the blob
+        self._lock = asyncio.Lock()
+
+    async def append(self, workflow_id: str, record: str) -> None:
+        blob_client = self._blob_client(workflow_id)
+        data = (record + "\n").encode("utf-8")
+        async with self._lock:
+            try:
+                await blob_client.append_block(data)
+            except ResourceNotFoundError:
+                try:
+                    await self.blob_service_client.get_container_client(self.container_name).create_container()
+                except ResourceExistsError:
+                    pass
+                await blob_client.create_append_blob()
+                await blob_client.append_block(data)
+
+    async def read(self, workflow_id: str) -> List[str]:
+        try:
+            download_stream = await self._blob_client(workflow_id).download_blob()
+        except ResourceNotFoundError:
+            return []
+        return (await download_stream.readall()).decode("utf-8").splitlines()
+
+    async def delete(self, workflow_id: str) -> None:
+        try:
+            await self._blob_client(workflow_id).delete_blob()
+        except ResourceNotFoundError:
+            pass
+
+    def _blob_client(self, workflow_id: str) -> Any:
+        return self.blob_service_client.get_blob_client(container=self.container_name, blob=f"{workflow_id}.jsonl")
 
 
 class StatePersistence:
-    """Basic state persistence - simplified for core functionality."""
+    """Checkpoint log for resumable workflow executions.
+
+    Each execution has its own append-only log of JSON records: a start
+    record with the workflow context, one record per finished node, one
+    per completed document of a per-document batch, and a finish record.
+    Nothing is ever rewritten, so a crash can at worst tear the last line,
+    which replay ignores. load_execution replays the log into the work a
+    restart can skip.
+    """
     
-    def __init__(self):
+    def __init__(self, backend: Optional[StateLogBackend] = None):
         """Initialize basic state persistence."""
         # TODO: Basic initialization - set up state persistence
         # TODO: Initialize basic file-based state storage
-        pass
+        
+        # === BASIC IMPLEMENTATION BELOW ===
+        self.backend = backend or self._create_backend(os.getenv("STATE_BACKEND", "file"))
+        
+        # Metrics tracking
+        self.checkpoint_count = 0
+        self.replay_count = 0
     
     async def save_workflow_state(self, workflow_id: str, state_data: WorkflowContext) -> WorkflowResult:
         """Basic workflow state saving - simplified version."""
         # TODO: Implement basic state saving to file
         # TODO: Save state with workflow ID and basic validation
         # TODO: Return save status
-        pass
+        
+        # === BASIC IMPLEMENTATION BELOW ===
+        start_time = time.time()
+        try:
+            await self._append(workflow_id, {"record": "start", "context": state_data.model_dump(mode="json")})
+        except Exception as e:
+            return WorkflowResult(
+                workflow_id=workflow_id,
+                workflow_name="state_save",
+                success=False,
+                total_time=time.time() - start_time,
+                completed_at=datetime.now(),
+                error_summary=f"State save failed: {str(e)}"
+            )
+        return WorkflowResult(
+            workflow_id=workflow_id,
+            workflow_name="state_save",
+            success=True,
+            final_output={"workflow_name": state_data.workflow_name},
+            total_time=time.time() - start_time,
+            completed_at=datetime.now()
+        )
     
     async def load_workflow_state(self, workflow_id: str) -> WorkflowResult:
         """Basic workflow state loading - simplified version."""
         # TODO: Implement basic state loading from file
         # TODO: Load state by workflow ID with basic validation
         # TODO: Return loaded state or error
-        pass
+        
+        # === BASIC IMPLEMENTATION BELOW ===
+        start_time = time.time()
+        try:
+            execution = await self.load_execution(workflow_id)
+        except Exception as e:
+            execution = None
+            error_summary = f"State load failed: {str(e)}"
+        else:
+            error_summary = f"No saved state for workflow '{workflow_id}'"
+        if execution is None:
+            return WorkflowResult(
+                workflow_id=workflow_id,
+                workflow_name="state_load",
+                success=False,
+                total_time=time.time() - start_time,
+                completed_at=datetime.now(),
+                error_summary=error_summary
+            )
+        return WorkflowResult(
+            workflow_id=workflow_id,
+            workflow_name=execution.workflow_name,
+            success=True,
+            node_executions=execution.node_executions,
+            final_output=execution.final_output or {},
+            total_time=time.time() - start_time,
+            completed_at=execution.end_time or datetime.now()
+        )
+    
+    async def checkpoint_node(self, workflow_id: str, execution: NodeExecution) -> None:
+        """Record a finished node.
+        
+        input_data is left out, since a resumed run rebuilds it from the
+        upstream outputs and it can hold whole documents.
+        """
+        await self._append(workflow_id, {
+            "record": "node",
+            "execution": execution.model_dump(mode="json", exclude={"input_data"})
+        })
+    
+    async def checkpoint_document(self, workflow_id: str, document_id: str, output: Dict[str, Any]) -> None:
+        """Record that every node of a batch workflow finished for a document."""
+        await self._append(workflow_id, {"record": "document", "document_id": document_id, "output": output})
+    
+    async def finish_workflow(self, workflow_id: str, success: bool, final_output: Dict[str, Any]) -> None:
+        """Record the outcome of a run; a later resume appends after it."""
+        await self._append(workflow_id, {
+            "record": "finish",
+            "status": "completed" if success else "failed",
+            "final_output": final_output,
+            "completed_at": datetime.now().isoformat()
+        })
+    
+    async def load_execution(self, workflow_id: str) -> Optional[WorkflowExecution]:
+        """Replay a workflow's log, or None if nothing was saved.
+        
+        node_executions holds the latest successful execution of each node,
+        leaving out nodes of documents that have completed since, and
+        execution_context holds the start context and the outputs of
+        completed documents.
+        """
+        lines = await self.backend.read(workflow_id)
+        context: Optional[WorkflowContext] = None
+        nodes: Dict[Tuple[Optional[str], str], NodeExecution] = {}
+        documents: Dict[str, Dict[str, Any]] = {}
+        status = "running"
+        end_time = None
+        final_output = None
+        
+        for index, line in enumerate(lines):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                if index == len(lines) - 1:
+                    # Torn final append from a crash mid-write
+                    break
+                raise RuntimeError(f"Corrupt state log for workflow '{workflow_id}' at record {index + 1}")
+            
+            kind = record.get("record")
+            if kind == "finish":
+                status = record["status"]
+                end_time = datetime.fromisoformat(record["completed_at"])
+                final_output = record["final_output"]
+                continue
+            status, end_time = "running", None
+            if kind == "start" and context is None:
+                context = WorkflowContext(**record["context"])
+            elif kind == "node":
+                execution = NodeExecution(**record["execution"])
+                if execution.success:
+                    nodes[(execution.document_id, execution.node_id)] = execution
+            elif kind == "document":
+                documents[record["document_id"]] = record["output"]
+        
+        if context is None:
+            return None
+        self.replay_count += 1
+        return WorkflowExecution(
+            execution_id=workflow_id,
+            workflow_name=context.workflow_name,
+            workflow_version=str(context.config_used.get("workflow_version", "")),
+            execution_status=status,
+            start_time=context.started_at,
+            end_time=end_time,
+            node_executions=[
+                execution for (document_id, _), execution in nodes.items() if document_id not in documents
+            ],
+            final_output=final_output,
+            execution_context={"context": context.input_data, "completed_documents": documents}
+        )
+    
+    async def delete_workflow_state(self, workflow_id: str) -> None:
+        """Drop a workflow's log, e.g. once its results are stored elsewhere."""
+        await self.backend.delete(workflow_id)
+    
+    async def _append(self, workflow_id: str, record: Dict[str, Any]) -> None:
+        """Serialize and append one record."""
+        try:
+            await self.backend.append(workflow_id, json.dumps(record, ensure_ascii=False, default=str))
+        except Exception as e:
+            raise RuntimeError(f"State checkpoint failed: {str(e)}") from e
+        self.checkpoint_count += 1
+    
+    @staticmethod
+    def _create_backend(backend_name: str) -> StateLogBackend:
+        """Build the configured checkpoint log backend."""
+        if backend_name == "file":
+            return FileStateLogBackend(
+                Path(os.getenv("STATE_DIR", str(Path(os.getenv("CACHE_DIR", "cache")) / "state"))),
+                fsync=os.getenv("STATE_FSYNC", "true").lower() == "true"
+            )
+        if backend_name == "blob":
+            return BlobStateLogBackend(
+                StorageClient().blob_service_client,
+                os.getenv("STATE_CONTAINER", "workflow-state")
+            )
+        raise ValueError(f"Unknown STATE_BACKEND '{backend_name}'. Available: file, blob")
 
 # =============================================================================
 # TEMPORARILY COMMENTED OUT ADVANCED FEATURES
@@ -7,6 +7,7 @@ Basic OpenAI client wrapper for agent AI operations.
 from typing import Any, Dict, List
 import uuid
 import time
+from azure_services.tokenizer import get_tokenizer
 from models.knowledge import KnowledgeExtraction, EntityResult, RelationshipResult, KnowledgeValidation
 from models.azure import AzureServiceResponse, EmbeddingResult, SearchResult, ServiceHealth
 from models.workflow import WorkflowContext, WorkflowResult, NodeExecution
@@ -48,7 +49,8 @@ class AIProvider:
         
         # Track basic metrics
         self.request_count += 1 
-        estimated_tokens = len(prompt.split()) * 2  # Basic token estimation
+        estimated_tokens = get_tokenizer().count(prompt) + max_tokens  # Prompt plus reserved completion
+        self.total_tokens += estimated_tokens
         
         response_time = time.time() - start_time
         
@@ -75,7 +77,8 @@ class AIProvider:
         
         # Track basic metrics
         self.request_count += 1
-        token_count = len(text.split())
+        token_count = get_tokenizer().count(text)
+        self.total_tokens += token_count
         
         # Generate placeholder embedding (will be replaced with actual embedding)
         # Use CONFIG_CONSTANTS for embedding dimensions
@@ -5,7 +5,12 @@ Orchestrates tri-modal search without hardcoded values.
 """
 
 from typing import Dict, Any, List
+import os
+import time
 import asyncio
+from azure_services.openai_client import OpenAIClient
+from azure_services.search_client import SearchClient
+from azure_services.search_fusion import FusedResult, fuse_results
 from ..supports.config_provider import ConfigProvider
 from models.domain import DomainConfig, CorpusAnalysis, DomainStatistics, DomainDiscovery
 from models.search import SearchRequest, SearchResponse, SearchResults, SearchMetrics
@@ -17,24 +22,83 @@ class SearchOrchestrator:
     
     def __init__(self):
         """Initialize basic search orchestrator."""
-        # TODO: Basic initialization - set up Azure clients
-        # TODO: Initialize basic search components
-        pass
+        # === BASIC IMPLEMENTATION WITH REAL AZURE SERVICES ===
+        self.search_client = SearchClient()
+        self.openai_client = OpenAIClient()
+        
+        # Result fusion across search sources (rrf or combsum)
+        self.fusion_method = os.getenv("SEARCH_FUSION_METHOD", "rrf")
+        self.score_normalization = os.getenv("SEARCH_SCORE_NORMALIZATION", "minmax")
+        self.rrf_k = int(os.getenv("HYBRID_RRF_K", "60"))
+        
+        # Metrics tracking
+        self.search_count = 0
+        self.last_search_time = 0.0
     
     async def execute_vector_search(self, query: str, search_config: Dict[str, Any]) -> SearchResults:
         """Execute vector similarity search using Azure Cognitive Search."""
-        # TODO: Generate query embedding using Azure OpenAI text-embedding-ada-002 model
-        # TODO: Execute vector search using similarity_threshold from search_config (NO hardcoded defaults)
-        # TODO: Apply result filtering with top_k limit from search_config
-        # TODO: Return search results with similarity scores and document metadata
-        pass
+        start_time = time.time()
+        vector_results = await self.vector_search(query, search_config)
+        return self.synthesize_results(query, {"vector": vector_results}, search_config, time.time() - start_time)
     
     async def vector_search(self, query: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Execute basic vector search."""
-        # TODO: Generate query embeddings
-        # TODO: Perform basic vector search
-        # TODO: Return vector results
-        pass
+        # Threshold and limit come from the learned domain config - NO defaults
+        embedding = await self.openai_client.generate_embedding(query)
+        results = await self.search_client.vector_search(embedding.embedding, top_k=config["max_results"])
+        return [result for result in results if result["score"] >= config["similarity_threshold"]]
+    
+    def synthesize_results(
+        self,
+        query: str,
+        result_sets: Dict[str, List[Dict[str, Any]]],
+        search_config: Dict[str, Any],
+        search_time: float
+    ) -> SearchResults:
+        """Fuse per-source results into one ranking with relevance scores in [0,1].
+        
+        Sources are weighted by search_config["modality_weights"] when present
+        and equally otherwise.
+        """
+        fused = fuse_results(
+            result_sets,
+            search_config["max_results"],
+            method=self.fusion_method,
+            normalization=self.score_normalization,
+            weights=search_config.get("modality_weights"),
+            rrf_k=self.rrf_k
+        )
+        self.search_count += 1
+        self.last_search_time = search_time
+        return self.to_search_results(query, search_config, fused, result_sets, search_time)
+    
+    @staticmethod
+    def to_search_results(
+        query: str,
+        search_config: Dict[str, Any],
+        fused: List[FusedResult],
+        result_sets: Dict[str, List[Dict[str, Any]]],
+        search_time: float
+    ) -> SearchResults:
+        """Build the SearchResults model from a fused ranking."""
+        unique_documents = {result["id"] for results in result_sets.values() for result in results}
+        return SearchResults(
+            query=query,
+            domain=search_config["domain"],
+            results=[
+                {
+                    "document_id": str(match.document_id),
+                    "relevance_score": match.score,
+                    "content_snippet": match.result.get("content", ""),
+                    "metadata": {**match.result.get("metadata", {}), "source_scores": match.source_scores},
+                    "search_method": match.search_method
+                }
+                for match in fused
+            ],
+            total_found=len(unique_documents),
+            search_time=search_time,
+            config_used=search_config
+        )
 
 
 # =============================================================================
@@ -71,16 +135,6 @@ class SearchOrchestrator:
 #     # TODO: Return structured model with validated data
 #     pass
 
-# async def synthesize_results(self, vector_results: List[Dict[str, Any]], graph_results: List[Dict[str, Any]], gnn_results: List[Dict[str, Any]], weights: Dict[str, float]) -> WorkflowResult:
-#     """Synthesize tri-modal results using learned weights."""
-#     # TODO: Apply dynamic weights learned from domain performance
-#     # TODO: Calculate agreement scores between modalities
-#     # TODO: Perform confidence-weighted result ranking
-#     # TODO: Generate unified relevance scores
-#     # TODO: Create result explanations with modality contributions
-#     # TODO: Return SynthesizedResults with ranking explanations
-#     pass
-
 # async def learn_weights_from_performance(self, execution_results: Dict[str, Any], user_feedback: Dict[str, Any]) -> Dict[str, float]:
 #     """Learn optimal modality weights from performance feedback."""
 #     # TODO: Analyze which modalities produced best results for this query type
@@ -5,11 +5,13 @@ Tools for universal search operations.
 """
 
 from typing import Dict, Any, List
+from azure_services.search_fusion import fuse_results
 from models.azure import AzureServiceResponse, EmbeddingResult, SearchResult, ServiceHealth
 from models.workflow import WorkflowContext, WorkflowResult, NodeExecution
 from models.domain import DomainConfig, CorpusAnalysis, DomainStatistics, DomainDiscovery
 from models.validation import ValidationResult, ConfigValidation
 from models.search import SearchRequest, SearchResponse, SearchResults, SearchMetrics
+from .orchestrator import SearchOrchestrator
 
 
 class UniSearchTools:
@@ -37,11 +39,23 @@ class UniSearchTools:
         """Synthesize and rank search results for user presentation."""
         # TODO: Apply result deduplication using content similarity (threshold from synthesis_config)
         # TODO: Rank results by combined relevance score (vector similarity + metadata boost)
-        # TODO: Format results with consistent structure (title, content, confidence, source)
-        # TODO: Apply result count limit from synthesis_config
         # TODO: Generate search summary with total results and confidence distribution
-        # TODO: Return synthesized results ready for API response
-        pass
+        
+        # === BASIC IMPLEMENTATION ===
+        # Dedupe by document id, rescale scores into [0,1] and keep max_results
+        fused = fuse_results(
+            {"vector": vector_results},
+            synthesis_config["max_results"],
+            method="combsum",
+            normalization=synthesis_config.get("score_normalization", "minmax")
+        )
+        return SearchOrchestrator.to_search_results(
+            synthesis_config["query"],
+            synthesis_config,
+            fused,
+            {"vector": vector_results},
+            synthesis_config.get("search_time", 0.0)
+        )
 
 
 # =============================================================================
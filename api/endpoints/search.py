@@ -4,10 +4,21 @@ Search Endpoints
 FastAPI endpoints for search operations.
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
 from pydantic import BaseModel
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator, Callable, Tuple
+from contextlib import aclosing
+from functools import lru_cache
+import asyncio
+import json
+import os
+import re
+import time
 from sse_starlette.sse import EventSourceResponse
+from azure_services.cosmos_client import CosmosClient
+from azure_services.openai_client import OpenAIClient
+from azure_services.search_client import SearchClient
+from azure_services.search_fusion import fuse_results
 # Import centralized models instead of defining locally
 from models.search import SearchRequest, SearchResponse, SearchResults, SearchMetrics
 from models.domain import DomainConfig, CorpusAnalysis, DomainStatistics, DomainDiscovery
@@ -17,8 +28,36 @@ from models.workflow import WorkflowContext, WorkflowResult, NodeExecution
 # TODO: Import SearchFlow once implemented
 # from agents.graph_flows.search_flow import SearchFlow
 
-# TODO: Create router with search prefix and tags
-# router = APIRouter(prefix="/search", tags=["search"])
+router = APIRouter(prefix="/search", tags=["search"])
+
+QUERY_TERM_PATTERN = re.compile(r"\w{3,}")
+
+
+@lru_cache(maxsize=None)
+def get_search_client() -> SearchClient:
+    """Process-wide Azure Cognitive Search client."""
+    return SearchClient()
+
+
+@lru_cache(maxsize=None)
+def get_openai_client() -> OpenAIClient:
+    """Process-wide Azure OpenAI client."""
+    return OpenAIClient()
+
+
+@lru_cache(maxsize=None)
+def get_cosmos_client() -> CosmosClient:
+    """Process-wide Cosmos DB Gremlin client."""
+    return CosmosClient()
+
+
+def get_cosmos_client_provider() -> Callable[[], CosmosClient]:
+    """Graph backend constructor, called inside the stream.
+    
+    Missing Cosmos settings then fail only the graph modality instead of
+    the whole request.
+    """
+    return get_cosmos_client
 
 
 # TODO: Remove local model definitions - use centralized models from models/search.py
@@ -36,16 +75,172 @@ from models.workflow import WorkflowContext, WorkflowResult, NodeExecution
 # TODO: Return SearchResponse with learned results
 
 
-# TODO: Define streaming search endpoint
-# @router.post("/stream")
-# async def search_stream(request: SearchRequest):
-#     """Stream search results with real-time progress updates."""
-#     # TODO: Implement streaming search with server-sent events
-#     # TODO: Stream progress updates for tri-modal search execution
-#     # TODO: Provide real-time performance metrics during search
-#     # TODO: Handle stream interruption and error recovery
-#     # TODO: Return EventSourceResponse with progress and results
-#     pass
+@router.post("/stream")
+async def search_stream(
+    request: SearchRequest,
+    search_client: SearchClient = Depends(get_search_client),
+    openai_client: OpenAIClient = Depends(get_openai_client),
+    cosmos_client_provider: Callable[[], CosmosClient] = Depends(get_cosmos_client_provider)
+):
+    """Stream search results with real-time progress updates.
+    
+    Events, in order: one ``results`` (or ``modality_error``) event per
+    modality as each finishes, one ``fused`` event with the combined
+    SearchResults, ``token`` events carrying the generated answer, and a
+    closing ``done`` event with timing metrics.
+    """
+    # TODO: Provide real-time performance metrics during search
+    return EventSourceResponse(
+        stream_search_events(request, search_client, openai_client, cosmos_client_provider)
+    )
+
+
+async def stream_search_events(
+    request: SearchRequest,
+    search_client: SearchClient,
+    openai_client: OpenAIClient,
+    cosmos_client_provider: Callable[[], CosmosClient]
+) -> AsyncIterator[Dict[str, str]]:
+    """Run every modality concurrently and yield SSE events as results arrive."""
+    start_time = time.time()
+    top_k = request.max_results or int(os.getenv("VECTOR_SEARCH_TOP_K", "10"))
+    modalities = {
+        "text": search_client.text_search(request.query, top_k=top_k),
+        "vector": _vector_modality(request.query, top_k, search_client, openai_client),
+        "graph": _graph_modality(request.query, top_k, cosmos_client_provider),
+    }
+    tasks = [asyncio.create_task(_timed(name, search)) for name, search in modalities.items()]
+    result_sets: Dict[str, List[Dict[str, Any]]] = {}
+    time_to_first_result = None
+    
+    try:
+        # Forward each modality the moment it finishes, fastest first
+        for next_finished in asyncio.as_completed(tasks):
+            modality, results, error, response_time = await next_finished
+            if error is not None:
+                yield _event("modality_error", {"modality": modality, "error": error})
+                continue
+            result_sets[modality] = results
+            if time_to_first_result is None:
+                time_to_first_result = time.time() - start_time
+            yield _event("results", {"modality": modality, "results": results, "response_time": response_time})
+        
+        fused = fuse_results(
+            result_sets,
+            top_k,
+            method=os.getenv("SEARCH_FUSION_METHOD", "rrf"),
+            normalization=os.getenv("SEARCH_SCORE_NORMALIZATION", "minmax"),
+            rrf_k=int(os.getenv("HYBRID_RRF_K", "60"))
+        )
+        search_results = SearchResults(
+            query=request.query,
+            domain=request.domain,
+            results=[
+                {
+                    "document_id": str(match.document_id),
+                    "relevance_score": match.score,
+                    "content_snippet": match.result.get("content", ""),
+                    "metadata": {"source_scores": match.source_scores},
+                    "search_method": match.search_method
+                }
+                for match in fused
+            ],
+            total_found=len({result["id"] for results in result_sets.values() for result in results}),
+            search_time=time.time() - start_time,
+            config_used={"top_k": top_k, "modalities": sorted(result_sets)}
+        )
+        yield _event("fused", search_results.model_dump(mode="json"))
+        
+        # Forward answer tokens as the model produces them
+        time_to_first_token = None
+        if search_results.results:
+            try:
+                answer_stream = openai_client.chat_completion_stream(_answer_messages(request.query, search_results))
+                # aclosing() ends the upstream completion if the client disconnects
+                async with aclosing(answer_stream) as tokens:
+                    async for token in tokens:
+                        if time_to_first_token is None:
+                            time_to_first_token = time.time() - start_time
+                        yield _event("token", {"text": token})
+            except Exception as e:
+                yield _event("modality_error", {"modality": "answer", "error": str(e)})
+        
+        yield _event("done", {
+            "time_to_first_result": time_to_first_result,
+            "time_to_first_token": time_to_first_token,
+            "total_time": time.time() - start_time
+        })
+    finally:
+        # Client disconnects cancel the generator; stop any search still running
+        for task in tasks:
+            task.cancel()
+
+
+async def _timed(modality: str, search) -> Tuple[str, List[Dict[str, Any]], Optional[str], float]:
+    """Await one modality, capturing its failure instead of raising."""
+    start_time = time.time()
+    try:
+        results = await search
+        return modality, results, None, time.time() - start_time
+    except Exception as e:
+        return modality, [], str(e), time.time() - start_time
+
+
+async def _vector_modality(
+    query: str,
+    top_k: int,
+    search_client: SearchClient,
+    openai_client: OpenAIClient
+) -> List[Dict[str, Any]]:
+    """Embed the query, then run vector search."""
+    embedding = await openai_client.generate_embedding(query)
+    return await search_client.vector_search(embedding.embedding, top_k=top_k)
+
+
+async def _graph_modality(
+    query: str,
+    top_k: int,
+    cosmos_client_provider: Callable[[], CosmosClient]
+) -> List[Dict[str, Any]]:
+    """Knowledge-graph entities named by the query or any of its terms.
+    
+    The Cosmos client is created here, so a configuration error surfaces as
+    this modality's failure. Gremlin returns no relevance score, so entities
+    are scored by rank.
+    """
+    cosmos_client = cosmos_client_provider()
+    names = [query] + QUERY_TERM_PATTERN.findall(query)
+    vertices = await cosmos_client.query_graph(
+        template="find_vertices_by_names",
+        bindings={"vertex_names": names, "max_results": top_k}
+    )
+    return [
+        {
+            "id": vertex["id"],
+            "content": vertex["properties"].get("name", ""),
+            "score": 1.0 / rank,
+            "metadata": {"type": "graph_result", "label": vertex["label"], "properties": vertex["properties"]}
+        }
+        for rank, vertex in enumerate(
+            (vertex for vertex in vertices if vertex.get("type") == "vertex"), start=1
+        )
+    ]
+
+
+def _answer_messages(query: str, search_results: SearchResults) -> List[Dict[str, str]]:
+    """Chat messages asking for an answer grounded in the fused results."""
+    context = "\n\n".join(
+        f"[{i}] {result.content_snippet}" for i, result in enumerate(search_results.results, start=1)
+    )
+    return [
+        {"role": "system", "content": "Answer the question using only the numbered sources. Cite sources as [n]."},
+        {"role": "user", "content": f"Sources:\n{context}\n\nQuestion: {query}"}
+    ]
+
+
+def _event(event: str, data: Dict[str, Any]) -> Dict[str, str]:
+    """One server-sent event with a JSON payload."""
+    return {"event": event, "data": json.dumps(data, default=str)}
 
 
 # TODO: Define domains endpoint to get available domains
@@ -0,0 +1,176 @@
+"""
+Completion Cache
+
+Disk-backed cache of deterministic chat completions.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from pathlib import Path
+import fcntl
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class CompletionCache:
+    """Persistent LRU cache of chat completions keyed by request content.
+
+    The key hashes the deployment, the messages and every sampling
+    parameter, so only byte-identical requests share an entry. Entries
+    expire ttl seconds after they were written. The whole cache lives in
+    one JSON file, rewritten atomically every sync_interval writes and on
+    sync(). Every client process shares that file, so sync() merges in the
+    entries other processes have written instead of overwriting them.
+
+    Instances are thread-safe, so put() and sync(), which may rewrite the
+    file, can run in worker threads off the event loop.
+    """
+
+    CACHE_FILE = "completions.json"
+    LOCK_FILE = "completions.lock"
+
+    def __init__(self, cache_dir: Path, deployment: str, max_entries: int, ttl: float, sync_interval: int):
+        """Initialize cache for a single chat deployment."""
+        self.cache_dir = Path(cache_dir)
+        self.deployment = deployment
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_path = self.cache_dir / self.CACHE_FILE
+
+        # key -> (expires_at, completion, total_tokens), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, str, int]]" = OrderedDict()
+        self._unsynced_writes = 0
+        self._lock = threading.RLock()
+
+        # Metrics tracking
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.tokens_saved = 0
+
+        self._load()
+
+    def cache_key(self, messages: List[Dict[str, str]], sampling: Dict[str, Any]) -> str:
+        """Content address for a request under the current deployment."""
+        payload = json.dumps(
+            {"deployment": self.deployment, "messages": messages, "sampling": sampling},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached completion for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() >= entry[0]:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.tokens_saved += entry[2]
+            return entry[1]
+
+    def put(self, key: str, completion: str, total_tokens: int = 0) -> None:
+        """Store a completion, evicting least recently used entries if full.
+
+        Every sync_interval writes this also syncs, so async callers should
+        run it with asyncio.to_thread.
+        """
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, completion, total_tokens)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+            self._unsynced_writes += 1
+            sync_due = self._unsynced_writes >= self.sync_interval
+        if sync_due:
+            self.sync()
+
+    def sync(self) -> None:
+        """Merge with the entries on disk and write the result atomically.
+
+        The read-merge-write runs under an exclusive lock so concurrent
+        syncs from other processes cannot drop each other's entries.
+        """
+        with open(self.cache_dir / self.LOCK_FILE, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            disk_entries = self._read_entries() or []
+            with self._lock:
+                self._merge(disk_entries)
+                now = time.time()
+                cache = {
+                    "deployment": self.deployment,
+                    # Least recently used first
+                    "entries": [[key, *entry] for key, entry in self._entries.items() if entry[0] > now],
+                }
+                self._unsynced_writes = 0
+            # One temp file per thread, as syncs of this process may overlap
+            temp_path = self.cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            temp_path.write_text(json.dumps(cache, ensure_ascii=False))
+            os.replace(temp_path, self.cache_path)
+
+    def clear(self) -> None:
+        """Drop every cached completion."""
+        with self._lock:
+            self._entries.clear()
+            if self.cache_path.exists():
+                self.cache_path.unlink()
+
+    @property
+    def size(self) -> int:
+        """Number of cached completions, including any not yet found expired."""
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _load(self) -> None:
+        """Load persisted entries, discarding them if the deployment changed."""
+        entries = self._read_entries()
+        if entries is None:
+            self.clear()
+            return
+        self._merge(entries)
+
+    def _read_entries(self) -> Optional[List[List[Any]]]:
+        """Unexpired entries on disk, or None if they belong to another deployment."""
+        try:
+            cache = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return []
+        if cache.get("deployment") != self.deployment:
+            return None
+
+        now = time.time()
+        return [entry for entry in cache.get("entries", []) if entry[1] > now]
+
+    def _merge(self, entries: List[List[Any]]) -> None:
+        """Add entries not held in memory, ranked as less recently used than ours."""
+        merged: "OrderedDict[str, Tuple[float, str, int]]" = OrderedDict(
+            (key, (expires_at, completion, total_tokens))
+            for key, expires_at, completion, total_tokens in entries
+            if key not in self._entries
+        )
+        merged.update(self._entries)
+        # Keep the most recently used entries if the merge overflows max_entries
+        while len(merged) > self.max_entries:
+            merged.popitem(last=False)
+        self._entries = merged
@@ -15,7 +15,10 @@ from gremlin_python.process.graph_traversal import __
 from gremlin_python.process.traversal import T
 from models.validation import ValidationResult, ConfigValidation
 from models.knowledge import KnowledgeExtraction, EntityResult, RelationshipResult, KnowledgeValidation
-from models.azure import AzureServiceResponse, EmbeddingResult, SearchResult, ServiceHealth
+from models.azure import AzureServiceResponse, EmbeddingResult, SearchResult, ServiceHealth, ConnectionPoolMetrics, BulkLoadResult, GremlinScriptMetrics
+from .gremlin_pool import GremlinConnectionPool
+from .gremlin_bulk import GremlinBulkLoader, VERTEX_RESERVED_KEYS, EDGE_RESERVED_KEYS, edge_endpoints
+from .gremlin_templates import ScriptMetricsTracker, get_traversal_template, property_steps
 
 
 class CosmosClient:
@@ -51,6 +54,26 @@ class CosmosClient:
         # Store connection parameters following Microsoft's official pattern
         self.gremlin_username = f"/dbs/{self.database_name}/colls/{self.graph_name}"
         
+        # Shared pool of long-lived Gremlin connections, opened lazily on first use
+        self.script_metrics = ScriptMetricsTracker()
+        self.connection_pool = GremlinConnectionPool(
+            client_factory=self._create_gremlin_client,
+            pool_size=int(os.getenv("COSMOS_GREMLIN_POOL_SIZE", "4")),
+            acquire_timeout=float(os.getenv("COSMOS_GREMLIN_POOL_ACQUIRE_TIMEOUT", "30")),
+            health_check_interval=float(os.getenv("COSMOS_GREMLIN_POOL_HEALTH_CHECK_INTERVAL", "60")),
+            script_metrics=self.script_metrics
+        )
+        
+        # Bulk loading - many vertices/edges per traversal, batches pipelined
+        self.bulk_load_enabled = os.getenv("COSMOS_BULK_LOAD_ENABLED", "true").lower() == "true"
+        self.bulk_loader = GremlinBulkLoader(
+            connection_pool=self.connection_pool,
+            batch_size=int(os.getenv("COSMOS_BULK_BATCH_SIZE", "50")),
+            concurrency=int(os.getenv("COSMOS_BULK_CONCURRENCY", "4")),
+            max_retries=int(os.getenv("COSMOS_BULK_MAX_RETRIES", "5")),
+            backoff_base=float(os.getenv("COSMOS_BULK_BACKOFF_BASE", "1"))
+        )
+        
         # Metrics tracking
         self.entities_stored = 0
         self.relationships_stored = 0
@@ -63,7 +86,8 @@ class CosmosClient:
             traversal_source="g",
             username=self.gremlin_username,  # /dbs/{db}/colls/{graph} format
             password=self.key,
-            message_serializer=serializer.GraphSONSerializersV2d0()  # Official serializer
+            message_serializer=serializer.GraphSONSerializersV2d0(),  # Official serializer
+            pool_size=1  # One WebSocket per pooled client - GremlinConnectionPool does the pooling
         )
     
     async def store_knowledge_graph(self, entities: List[Dict[str, Any]], relationships: List[Dict[str, Any]]) -> None:
@@ -73,61 +97,49 @@ class CosmosClient:
         # TODO: Implement conflict resolution and upsert logic
         
         # === REAL AZURE COSMOS DB GREMLIN IMPLEMENTATION ===
-        gremlin_client = None
+        if self.bulk_load_enabled:
+            load_result = await self.bulk_load_knowledge_graph(entities, relationships)
+            if load_result.failures:
+                raise RuntimeError(
+                    f"Failed to store knowledge graph in Cosmos DB: {len(load_result.failures)} items failed, "
+                    f"first error: {load_result.failures[0].error}"
+                )
+            return
+        
         try:
-            # Create client for this request
-            gremlin_client = self._create_gremlin_client()
-            
             # Store entities as vertices
+            vertex_template = get_traversal_template("add_vertex")
             for entity in entities:
-                entity_id = entity.get("id", str(uuid.uuid4()))
-                entity_type = entity.get("type", "Entity")
-                entity_name = entity.get("name", "Unknown")
-                
-                # Create Gremlin query using Microsoft's recommended parameterized approach
-                vertex_query = (
-                    "g.addV(prop_type)"
-                    ".property('id', prop_id)"
-                    ".property('name', prop_name)"
+                # Fixed template script - ids, labels and values all travel as bindings
+                bindings = vertex_template.bind({
+                    "vertex_label": entity.get("type", "Entity"),
+                    "vertex_id": entity.get("id", str(uuid.uuid4())),
+                    "vertex_name": entity.get("name", "Unknown")
+                })
+                vertex_query = vertex_template.script + property_steps(
+                    "prop", entity, VERTEX_RESERVED_KEYS, bindings
                 )
                 
-                # Build bindings dictionary for parameterized query
-                bindings = {
-                    "prop_type": entity_type,
-                    "prop_id": entity_id,
-                    "prop_name": entity_name
-                }
-                
-                # Add additional properties to query and bindings
-                for key, value in entity.items():
-                    if key not in ["id", "type", "name"]:
-                        prop_key = f"prop_{key}"
-                        vertex_query += f".property('{key}', {prop_key})"
-                        bindings[prop_key] = value
-                
                 # Execute parameterized vertex creation (Microsoft's recommended approach)
-                result = gremlin_client.submit(message=vertex_query, bindings=bindings).all().result()
+                result = await self.connection_pool.submit(vertex_query, bindings, vertex_template.name)
                 
             # Store relationships as edges
+            edge_template = get_traversal_template("add_edge")
             for relationship in relationships:
-                from_id = relationship.get("from", relationship.get("source"))
-                to_id = relationship.get("to", relationship.get("target"))
-                rel_type = relationship.get("type", "RELATED_TO")
+                from_id, to_id = edge_endpoints(relationship)
                 
                 if from_id and to_id:
-                    # Create Gremlin query to add edge
-                    query = f"g.V().has('id', '{from_id}').addE('{rel_type}').to(g.V().has('id', '{to_id}'))"
-                    
-                    # Add edge properties
-                    for key, value in relationship.items():
-                        if key not in ["from", "to", "source", "target", "type"]:
-                            if isinstance(value, str):
-                                query += f".property('{key}', '{value}')"
-                            else:
-                                query += f".property('{key}', {value})"
+                    bindings = edge_template.bind({
+                        "from_id": from_id,
+                        "to_id": to_id,
+                        "edge_label": relationship.get("type", "RELATED_TO")
+                    })
+                    edge_query = edge_template.script + property_steps(
+                        "prop", relationship, EDGE_RESERVED_KEYS, bindings
+                    )
                     
-                    # Execute edge creation
-                    result = gremlin_client.submit(query).all().result()
+                    # Execute parameterized edge creation
+                    result = await self.connection_pool.submit(edge_query, bindings, edge_template.name)
             
             # Update metrics
             self.entities_stored += len(entities)
@@ -135,31 +147,49 @@ class CosmosClient:
             
         except Exception as e:
             raise RuntimeError(f"Failed to store knowledge graph in Cosmos DB: {str(e)}") from e
-        finally:
-            # Clean up client
-            if gremlin_client:
-                try:
-                    gremlin_client.close()
-                except:
-                    pass
     
-    async def query_graph(self, query: str) -> List[Dict[str, Any]]:
-        """Execute real Gremlin queries against Azure Cosmos DB."""
+    async def bulk_load_knowledge_graph(self, entities: List[Dict[str, Any]], relationships: List[Dict[str, Any]]) -> BulkLoadResult:
+        """Bulk load a knowledge graph, reporting per-item failures instead of raising."""
+        # === REAL AZURE COSMOS DB GREMLIN BULK IMPLEMENTATION ===
+        load_result = await self.bulk_loader.load(entities, relationships)
+        
+        # Update metrics
+        self.entities_stored += load_result.vertices_stored
+        self.relationships_stored += load_result.edges_stored
+        
+        return load_result
+    
+    async def query_graph(
+        self,
+        query: Optional[str] = None,
+        bindings: Optional[Dict[str, Any]] = None,
+        template: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Execute real Gremlin queries against Azure Cosmos DB.
+        
+        Pass either a raw ``query`` script or the name of a traversal
+        ``template`` from TRAVERSAL_TEMPLATES; ``bindings`` supply parameter
+        values for either form.
+        """
         # TODO: Implement query optimization and result caching
-        # TODO: Add support for parameterized queries and injection prevention
-        # TODO: Implement query performance monitoring and analytics
         
         # === REAL AZURE COSMOS DB GREMLIN QUERY IMPLEMENTATION ===
-        gremlin_client = None
+        if (query is None) == (template is None):
+            raise ValueError("Provide exactly one of query or template")
+        
+        template_name = None
+        if template is not None:
+            traversal_template = get_traversal_template(template)
+            query = traversal_template.script
+            bindings = traversal_template.bind(bindings)
+            template_name = traversal_template.name
+        
         try:
             # Track query metrics
             self.query_count += 1
             
-            # Create client for this request
-            gremlin_client = self._create_gremlin_client()
-            
-            # Execute real Gremlin query
-            result = gremlin_client.submit(query).all().result()
+            # Execute real Gremlin query on a pooled connection
+            result = await self.connection_pool.submit(query, bindings, template_name)
             
             # Convert Gremlin results to our format
             query_results = []
@@ -210,13 +240,6 @@ class CosmosClient:
             
         except Exception as e:
             raise RuntimeError(f"Gremlin query execution failed: {str(e)}") from e
-        finally:
-            # Clean up client
-            if gremlin_client:
-                try:
-                    gremlin_client.close()
-                except:
-                    pass
     
     async def health_check(self) -> AzureServiceResponse:
         """Real health check for Azure Cosmos DB Gremlin service."""
@@ -228,15 +251,11 @@ class CosmosClient:
         # === REAL AZURE COSMOS DB GREMLIN HEALTH CHECK IMPLEMENTATION ===
         start_time = time.time()
         request_id = str(uuid.uuid4())
-        gremlin_client = None
         
         try:
-            # Create client for this request
-            gremlin_client = self._create_gremlin_client()
-            
             # Test actual connectivity with a simple graph query
-            test_query = "g.V().count()"
-            result = gremlin_client.submit(test_query).all().result()
+            count_template = get_traversal_template("count_vertices")
+            result = await self.connection_pool.submit(count_template.script, None, count_template.name)
             
             # If we get here, the service is healthy
             response_time = time.time() - start_time
@@ -262,13 +281,18 @@ class CosmosClient:
                 request_id=request_id,
                 error_details=f"Azure Cosmos DB Gremlin health check failed: {str(e)}"
             )
-        finally:
-            # Clean up client
-            if gremlin_client:
-                try:
-                    gremlin_client.close()
-                except:
-                    pass
+    
+    def get_script_metrics(self) -> GremlinScriptMetrics:
+        """Script compile reduction and per-template latency metrics."""
+        return self.script_metrics.get_metrics()
+    
+    def get_pool_metrics(self) -> ConnectionPoolMetrics:
+        """Gremlin connection pool wait-time and utilisation metrics."""
+        return self.connection_pool.get_metrics()
+    
+    async def aclose(self) -> None:
+        """Close all pooled Gremlin connections."""
+        await self.connection_pool.aclose()
 
 # =============================================================================
 # TEMPORARILY COMMENTED OUT ADVANCED FEATURES
@@ -0,0 +1,140 @@
+"""
+Embedding Micro-Batcher
+
+Coalesces concurrent single-text embedding requests into batched calls.
+"""
+
+from typing import Awaitable, Callable, List, Tuple
+import asyncio
+from models.azure import EmbeddingResult
+
+
+def plan_embedding_batches(
+    texts: List[str],
+    max_inputs: int,
+    max_tokens: int,
+    estimate_tokens: Callable[[str], int]
+) -> List[Tuple[int, int]]:
+    """Split texts into contiguous (start, end) ranges that respect request limits.
+
+    A single text larger than ``max_tokens`` is placed in a batch of its own so
+    the service can accept or reject it without failing its neighbours.
+    """
+    batches = []
+    start = 0
+    batch_tokens = 0
+    for index, text in enumerate(texts):
+        text_tokens = estimate_tokens(text)
+        batch_size = index - start
+        if batch_size and (batch_size >= max_inputs or batch_tokens + text_tokens > max_tokens):
+            batches.append((start, index))
+            start = index
+            batch_tokens = 0
+        batch_tokens += text_tokens
+    if start < len(texts):
+        batches.append((start, len(texts)))
+    return batches
+
+
+class EmbeddingBatcher:
+    """Merges concurrent embedding requests made within a short window.
+
+    A text over the per-input token limit is rejected before it joins a
+    batch. If the service still rejects a merged batch because of one of
+    its inputs (``is_input_error``), the batch is bisected and resent so
+    only the caller that sent the bad input gets the exception.
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], Awaitable[List[EmbeddingResult]]],
+        max_inputs: int,
+        max_tokens: int,
+        max_input_tokens: int,
+        window_seconds: float,
+        estimate_tokens: Callable[[str], int],
+        is_input_error: Callable[[Exception], bool]
+    ):
+        """Initialize micro-batcher around a batched embedding coroutine."""
+        self.embed_batch = embed_batch
+        self.max_inputs = max_inputs
+        self.max_tokens = max_tokens
+        self.max_input_tokens = max_input_tokens
+        self.window_seconds = window_seconds
+        self.estimate_tokens = estimate_tokens
+        self.is_input_error = is_input_error
+
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._pending_tokens = 0
+        self._flush_handle = None
+        self._inflight = set()
+
+        # Metrics tracking
+        self.batches_sent = 0
+        self.texts_batched = 0
+        self.batch_splits = 0
+
+    async def submit(self, text: str) -> EmbeddingResult:
+        """Queue text for the next batch and wait for its embedding."""
+        loop = asyncio.get_running_loop()
+        text_tokens = self.estimate_tokens(text)
+        if text_tokens > self.max_input_tokens:
+            raise ValueError(
+                f"Embedding input has {text_tokens} tokens, over the {self.max_input_tokens}-token limit"
+            )
+
+        # Flush first if this text would push the pending batch over a limit
+        if self._pending and (
+            len(self._pending) >= self.max_inputs
+            or self._pending_tokens + text_tokens > self.max_tokens
+        ):
+            self._flush()
+
+        future = loop.create_future()
+        self._pending.append((text, future))
+        self._pending_tokens += text_tokens
+
+        if len(self._pending) >= self.max_inputs or self._pending_tokens >= self.max_tokens:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_seconds, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Dispatch all pending texts as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch = self._pending
+        self._pending = []
+        self._pending_tokens = 0
+
+        task = asyncio.ensure_future(self._dispatch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Run one batched request and route results back to their callers."""
+        self.batches_sent += 1
+        self.texts_batched += len(batch)
+        try:
+            results = await self.embed_batch([text for text, _ in batch])
+        except Exception as e:
+            if len(batch) > 1 and self.is_input_error(e):
+                # One bad input fails the whole request - retry the halves to isolate it
+                self.batch_splits += 1
+                middle = len(batch) // 2
+                await asyncio.gather(self._dispatch(batch[:middle]), self._dispatch(batch[middle:]))
+                return
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,303 @@
+"""
+Embedding Cache
+
+Content-addressed, disk-backed cache for embedding vectors.
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+import fcntl
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+import numpy as np
+
+
+# Per slot: the sha256 of its key, then an 8-byte digest of its vector
+RECORD_SIZE = 40
+KEY_SIZE = 32
+
+
+class EmbeddingCache:
+    """Persistent LRU cache of embedding vectors keyed by deployment and text.
+
+    Vectors are stored as packed float32 rows in a memory-mapped file. Each
+    entry owns a fixed-size slot, so the byte offset of a vector is
+    ``slot * dimensions * 4``. A second memory-mapped file holds one record
+    per slot naming the key written there and a digest of its vector. A
+    lookup is served only if the record matches both, so a slot that was
+    reused by this or another process is a miss, never another text's
+    vector. Slots are claimed under an flock on the directory, and a free
+    slot that another process has since claimed is adopted rather than
+    overwritten. The JSON index only keeps the LRU order. The whole cache
+    is discarded when the embedding deployment or vector dimensionality
+    changes.
+
+    Instances are thread-safe, so put() and sync() can run in worker
+    threads. Processes should share one instance per directory through
+    get_shared_embedding_cache().
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    RECORDS_FILE = "records.bin"
+    INDEX_FILE = "index.json"
+    LOCK_FILE = "slots.lock"
+
+    def __init__(self, cache_dir: Path, deployment: str, max_entries: int, sync_interval: int):
+        """Initialize cache for a single embedding deployment."""
+        self.cache_dir = Path(cache_dir)
+        self.deployment = deployment
+        self.max_entries = max_entries
+        self.sync_interval = sync_interval
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.cache_dir / self.VECTORS_FILE
+        self.records_path = self.cache_dir / self.RECORDS_FILE
+        self.index_path = self.cache_dir / self.INDEX_FILE
+        self.lock_path = self.cache_dir / self.LOCK_FILE
+
+        self.dimensions: Optional[int] = None
+        self._slots: "OrderedDict[str, int]" = OrderedDict()
+        self._free_slots: List[int] = []
+        self._vectors: Optional[np.memmap] = None
+        self._records: Optional[np.memmap] = None
+        self._unsynced_writes = 0
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+
+        # Metrics tracking
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.conflicts = 0
+
+        self._load()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalize text so trivially different inputs share a cache entry."""
+        return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+    def cache_key(self, text: str) -> str:
+        """Content address for text under the current deployment."""
+        payload = f"{self.deployment}\0{self.normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """Return cached vector for text, or None on a miss."""
+        key = self.cache_key(text)
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is not None:
+                vector = np.array(self._open_vectors()[slot])
+                record = bytes(self._open_records()[slot])
+                if record != bytes.fromhex(key) + self._digest(vector):
+                    # The slot was reused since this process mapped it
+                    del self._slots[key]
+                    self.conflicts += 1
+                    self._adopt(record, slot)
+                    slot = None
+            if slot is None:
+                self.misses += 1
+                return None
+
+            self._slots.move_to_end(key)
+            self.hits += 1
+            return vector.tolist()
+
+    def put(self, text: str, embedding: List[float]) -> None:
+        """Store vector for text, evicting the least recently used entry if full."""
+        self.put_many([(text, embedding)])
+
+    def put_many(self, entries: Sequence[Tuple[str, List[float]]]) -> None:
+        """Store several vectors, then sync if sync_interval writes are pending."""
+        with self._lock:
+            for text, embedding in entries:
+                self._put(text, embedding)
+            sync_due = self._unsynced_writes >= self.sync_interval
+        if sync_due:
+            self.sync()
+
+    def sync(self) -> None:
+        """Flush vectors and records, and write the LRU order atomically."""
+        with self._sync_lock:
+            with self._lock:
+                vectors, records = self._vectors, self._records
+                index = {
+                    "deployment": self.deployment,
+                    "dimensions": self.dimensions,
+                    "max_entries": self.max_entries,
+                    # Least recently used first
+                    "order": list(self._slots),
+                }
+                self._unsynced_writes = 0
+            for mapped in (vectors, records):
+                if mapped is not None:
+                    mapped.flush()
+            temp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps(index))
+            os.replace(temp_path, self.index_path)
+
+    def clear(self) -> None:
+        """Drop every cached vector."""
+        with self._lock:
+            self._vectors = None
+            self._records = None
+            self._slots.clear()
+            self._free_slots = []
+            self.dimensions = None
+            for path in (self.vectors_path, self.records_path, self.index_path):
+                if path.exists():
+                    path.unlink()
+
+    @property
+    def size(self) -> int:
+        """Number of cached vectors."""
+        return len(self._slots)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _put(self, text: str, embedding: List[float]) -> None:
+        """Write one vector and its record into a slot claimed under the directory lock."""
+        if self.dimensions is None:
+            self.dimensions = len(embedding)
+        elif len(embedding) != self.dimensions:
+            # Deployment now returns a different vector size - start over
+            self.clear()
+            self.dimensions = len(embedding)
+
+        key = self.cache_key(text)
+        vector = np.asarray(embedding, dtype=np.float32)
+        record = np.frombuffer(bytes.fromhex(key) + self._digest(vector), dtype=np.uint8)
+        vectors = self._open_vectors()
+        records = self._open_records()
+
+        with self._directory_lock():
+            slot = self._slots.get(key)
+            if slot is not None and bytes(records[slot, :KEY_SIZE]) != record[:KEY_SIZE].tobytes():
+                del self._slots[key]
+                self._adopt(bytes(records[slot]), slot)
+                slot = None
+            if slot is None:
+                slot = self._allocate_slot(records)
+            vectors[slot] = vector
+            records[slot] = record
+        self._slots[key] = slot
+        self._slots.move_to_end(key)
+        self._unsynced_writes += 1
+
+    def _load(self) -> None:
+        """Rebuild the slot map from the records, invalidating it if the deployment changed."""
+        try:
+            index = json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            index = {}
+
+        if index and (index.get("deployment") != self.deployment or index.get("max_entries") != self.max_entries):
+            self.clear()
+            return
+
+        dimensions = index.get("dimensions")
+        if dimensions is None and self.vectors_path.exists():
+            dimensions = self.vectors_path.stat().st_size // (4 * self.max_entries) or None
+        if dimensions is None or not self.records_path.exists():
+            # Vectors without records (or without a known size) cannot be verified
+            if self.vectors_path.exists() or self.records_path.exists():
+                self.clear()
+            return
+
+        self.dimensions = dimensions
+        records = self._open_records()
+        occupied = np.flatnonzero(records.any(axis=1))
+        slots_by_key = {bytes(records[slot, :KEY_SIZE]).hex(): int(slot) for slot in occupied}
+        order = [key for key in index.get("order", []) if key in slots_by_key]
+        ordered = set(order)
+        # Entries written after the last sync rank as least recently used
+        self._slots = OrderedDict(
+            (key, slots_by_key[key]) for key in [k for k in slots_by_key if k not in ordered] + order
+        )
+        used_slots = set(self._slots.values())
+        self._free_slots = [slot for slot in range(self.max_entries - 1, -1, -1) if slot not in used_slots]
+
+    def _open_vectors(self) -> np.memmap:
+        """Map the vector file, creating it sized for max_entries."""
+        if self._vectors is None:
+            self._vectors = self._map(self.vectors_path, np.float32, self.dimensions)
+        return self._vectors
+
+    def _open_records(self) -> np.memmap:
+        """Map the slot records, creating them zeroed for max_entries."""
+        if self._records is None:
+            self._records = self._map(self.records_path, np.uint8, RECORD_SIZE)
+        return self._records
+
+    def _map(self, path: Path, dtype: type, row_size: int) -> np.memmap:
+        """Map path as max_entries rows, extending it first without truncating another process's data."""
+        size = self.max_entries * row_size * np.dtype(dtype).itemsize
+        with open(path, "ab") as mapped_file:
+            if mapped_file.tell() < size:
+                mapped_file.truncate(size)
+        return np.memmap(path, dtype=dtype, mode="r+", shape=(self.max_entries, row_size))
+
+    @contextmanager
+    def _directory_lock(self) -> Iterator[None]:
+        """Serialize slot claims across processes sharing cache_dir."""
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _allocate_slot(self, records: np.memmap) -> int:
+        """Return a free slot, evicting the least recently used entry if needed.
+
+        Runs under the directory lock. A slot this process thinks is free
+        but another process has claimed since is adopted, not reused.
+        """
+        while True:
+            if not self._free_slots:
+                if not self._slots:
+                    self._free_slots = list(range(self.max_entries - 1, -1, -1))
+                    continue
+                _, slot = self._slots.popitem(last=False)
+                self.evictions += 1
+                return slot
+
+            slot = self._free_slots.pop()
+            record = bytes(records[slot])
+            if not any(record) or not self._adopt(record, slot):
+                return slot
+
+    def _adopt(self, record: bytes, slot: int) -> bool:
+        """Map another process's entry in slot as least recently used; False if unusable."""
+        key = record[:KEY_SIZE].hex()
+        if not any(record) or key in self._slots:
+            return False
+        self._slots[key] = slot
+        self._slots.move_to_end(key, last=False)
+        return True
+
+    @staticmethod
+    def _digest(vector: np.ndarray) -> bytes:
+        """Short digest of a vector's bytes, checked on every read."""
+        return hashlib.blake2b(vector.tobytes(), digest_size=RECORD_SIZE - KEY_SIZE).digest()
+
+
+_SHARED_CACHES: Dict[Tuple[Path, str], EmbeddingCache] = {}
+_SHARED_CACHES_LOCK = threading.Lock()
+
+
+def get_shared_embedding_cache(cache_dir: Path, deployment: str, max_entries: int, sync_interval: int) -> EmbeddingCache:
+    """Process-wide cache for one directory and deployment; the first caller's geometry applies."""
+    key = (Path(cache_dir).resolve(), deployment)
+    with _SHARED_CACHES_LOCK:
+        if key not in _SHARED_CACHES:
+            _SHARED_CACHES[key] = EmbeddingCache(cache_dir, deployment, max_entries, sync_interval)
+        return _SHARED_CACHES[key]
@@ -0,0 +1,214 @@
+"""
+Gremlin Bulk Loader
+
+Batched, pipelined vertex and edge loading for Azure Cosmos DB Gremlin API.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import random
+import time
+import uuid
+from models.azure import BulkItemFailure, BulkLoadResult
+from .gremlin_pool import GremlinConnectionPool
+from .gremlin_templates import property_steps
+
+
+VERTEX_RESERVED_KEYS = ("id", "type", "name")
+EDGE_RESERVED_KEYS = ("from", "to", "source", "target", "type")
+
+
+def build_vertex_batch(entities: List[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+    """Union one get-or-add branch per entity into a single parameterized traversal.
+
+    Cosmos DB Gremlin scripts are not transactional, so a failed batch may
+    have written some of its vertices. Each branch only adds its vertex if
+    the id is not already present, which makes replaying a batch safe.
+    """
+    branches = []
+    bindings: Dict[str, Any] = {}
+    for i, entity in enumerate(entities):
+        branch = (
+            f"__.V(v{i}_id).fold().coalesce(__.unfold(), "
+            f"__.addV(v{i}_label).property('id', v{i}_id).property('name', v{i}_name)"
+        )
+        bindings[f"v{i}_label"] = entity.get("type", "Entity")
+        bindings[f"v{i}_id"] = entity["id"]
+        bindings[f"v{i}_name"] = entity.get("name", "Unknown")
+        branches.append(branch + property_steps(f"v{i}", entity, VERTEX_RESERVED_KEYS, bindings) + ")")
+    return f"g.inject(0).union({', '.join(branches)})", bindings
+
+
+def build_edge_batch(relationships: List[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+    """Union one addE branch per relationship into a single traversal.
+
+    Each branch emits its position in the batch, so edges whose endpoint
+    vertices do not exist can be identified from the result. An edge with
+    the same label between the same vertices is reused rather than added
+    again, so replaying a partly written batch does not duplicate edges.
+    """
+    branches = []
+    bindings: Dict[str, Any] = {}
+    for i, relationship in enumerate(relationships):
+        from_id, to_id = edge_endpoints(relationship)
+        branch = (
+            f"__.V(e{i}_from).coalesce("
+            f"__.outE(e{i}_label).where(__.inV().hasId(e{i}_to)), "
+            f"__.addE(e{i}_label).to(g.V(e{i}_to))"
+        )
+        bindings[f"e{i}_from"] = from_id
+        bindings[f"e{i}_to"] = to_id
+        bindings[f"e{i}_label"] = relationship.get("type", "RELATED_TO")
+        branch += property_steps(f"e{i}", relationship, EDGE_RESERVED_KEYS, bindings) + ")"
+        branches.append(branch + f".constant({i})")
+    return f"g.inject(0).union({', '.join(branches)})", bindings
+
+
+def edge_endpoints(relationship: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """Source and target vertex ids of a relationship."""
+    return (
+        relationship.get("from", relationship.get("source")),
+        relationship.get("to", relationship.get("target"))
+    )
+
+
+def is_throttled(error: Exception) -> bool:
+    """Whether a Gremlin error is Cosmos DB request-rate throttling (429)."""
+    status_attributes = getattr(error, "status_attributes", None) or {}
+    status_code = status_attributes.get("x-ms-status-code", getattr(error, "status_code", None))
+    return str(status_code) == "429" or "RequestRateTooLarge" in str(error)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Server-suggested retry delay from a throttling error, if present."""
+    status_attributes = getattr(error, "status_attributes", None) or {}
+    retry_after_ms = status_attributes.get("x-ms-retry-after-ms")
+    if retry_after_ms is None:
+        return None
+    try:
+        return float(retry_after_ms) / 1000
+    except (TypeError, ValueError):
+        return None
+
+
+class GremlinBulkLoader:
+    """Loads vertices and edges as concurrent, batched Gremlin traversals."""
+
+    def __init__(
+        self,
+        connection_pool: GremlinConnectionPool,
+        batch_size: int,
+        concurrency: int,
+        max_retries: int,
+        backoff_base: float
+    ):
+        """Initialize loader on top of a shared connection pool."""
+        self.connection_pool = connection_pool
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+
+    async def load(self, entities: List[Dict[str, Any]], relationships: List[Dict[str, Any]]) -> BulkLoadResult:
+        """Write all vertices, then all edges, pipelining independent batches."""
+        start_time = time.time()
+        result = BulkLoadResult()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        # Vertices first - edges can only attach to vertices that exist
+        vertices = [dict(entity, id=entity.get("id", str(uuid.uuid4()))) for entity in entities]
+        result.vertices_submitted = len(vertices)
+        await asyncio.gather(*[
+            self._load_vertex_batch(batch, result, semaphore)
+            for batch in self._batches(vertices)
+        ])
+
+        edges = []
+        for relationship in relationships:
+            from_id, to_id = edge_endpoints(relationship)
+            if from_id and to_id:
+                edges.append(relationship)
+            else:
+                result.failures.append(BulkItemFailure(
+                    item_type="edge",
+                    item_id=f"{from_id}->{to_id}",
+                    error="Relationship is missing a source or target id"
+                ))
+        result.edges_submitted = len(edges)
+        await asyncio.gather(*[
+            self._load_edge_batch(batch, result, semaphore)
+            for batch in self._batches(edges)
+        ])
+
+        result.load_time = time.time() - start_time
+        return result
+
+    def _batches(self, items: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Split items into batch_size slices."""
+        return [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+
+    async def _load_vertex_batch(self, batch: List[Dict[str, Any]], result: BulkLoadResult, semaphore: asyncio.Semaphore) -> None:
+        """Write a vertex batch, isolating failing items if the batch fails."""
+        try:
+            await self._submit_with_retry(*build_vertex_batch(batch), "bulk_add_vertices", result, semaphore)
+            result.vertices_stored += len(batch)
+            return
+        except Exception as e:
+            if len(batch) == 1:
+                result.failures.append(BulkItemFailure(item_type="vertex", item_id=str(batch[0]["id"]), error=str(e)))
+                return
+
+        # One bad item fails the whole script - retry singly. Items the failed
+        # script already wrote are matched by the get-or-add branches.
+        await asyncio.gather(*[self._load_vertex_batch([entity], result, semaphore) for entity in batch])
+
+    async def _load_edge_batch(self, batch: List[Dict[str, Any]], result: BulkLoadResult, semaphore: asyncio.Semaphore) -> None:
+        """Write an edge batch and record edges whose endpoints were not found."""
+        try:
+            written = await self._submit_with_retry(*build_edge_batch(batch), "bulk_add_edges", result, semaphore)
+        except Exception as e:
+            if len(batch) == 1:
+                from_id, to_id = edge_endpoints(batch[0])
+                result.failures.append(BulkItemFailure(item_type="edge", item_id=f"{from_id}->{to_id}", error=str(e)))
+                return
+            await asyncio.gather(*[self._load_edge_batch([relationship], result, semaphore) for relationship in batch])
+            return
+
+        written_indices = set(written)
+        result.edges_stored += len(written_indices)
+        for i, relationship in enumerate(batch):
+            if i not in written_indices:
+                from_id, to_id = edge_endpoints(relationship)
+                result.failures.append(BulkItemFailure(
+                    item_type="edge",
+                    item_id=f"{from_id}->{to_id}",
+                    error="Source or target vertex not found"
+                ))
+
+    async def _submit_with_retry(
+        self,
+        query: str,
+        bindings: Dict[str, Any],
+        template_name: str,
+        result: BulkLoadResult,
+        semaphore: asyncio.Semaphore
+    ) -> List[Any]:
+        """Submit a batch, backing off and retrying while Cosmos DB throttles."""
+        attempt = 0
+        while True:
+            async with semaphore:
+                result.batches_sent += 1
+                try:
+                    return await self.connection_pool.submit(query, bindings, template_name)
+                except Exception as e:
+                    if not is_throttled(e) or attempt >= self.max_retries:
+                        raise
+                    delay = retry_after_seconds(e)
+
+            # Back off outside the semaphore so other batches keep flowing
+            if delay is None:
+                delay = self.backoff_base * (2 ** attempt)
+            delay += random.uniform(0, self.backoff_base)
+            attempt += 1
+            result.throttled_retries += 1
+            await asyncio.sleep(delay)
@@ -0,0 +1,222 @@
+"""
+Gremlin Connection Pool
+
+Long-lived, health-checked pool of Gremlin clients for Azure Cosmos DB.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from contextlib import asynccontextmanager
+import asyncio
+import threading
+import time
+import aiohttp
+from gremlin_python.driver.protocol import GremlinServerError
+from models.azure import ConnectionPoolMetrics
+from .gremlin_templates import ScriptMetricsTracker
+
+
+# Failures of the socket itself, as opposed to errors reported by the server
+_TRANSPORT_ERRORS = (aiohttp.ClientError, OSError)
+
+
+class RequestNotSentError(ConnectionError):
+    """A Gremlin request failed while connecting, before the server could see it."""
+
+
+class _PooledConnection:
+    """Gremlin client plus bookkeeping for idle health checks."""
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.last_used = time.monotonic()
+
+
+class GremlinConnectionPool:
+    """Pool of Gremlin clients that are opened lazily and reused across calls.
+
+    Each pooled client keeps its WebSocket open between requests, so only the
+    first request on a connection pays the TLS and WebSocket handshake.
+    Connections idle for longer than ``health_check_interval`` are probed
+    before reuse. A connection that fails with a transport error, or whose
+    request is cancelled mid-flight, is discarded and replaced on next use.
+
+    gremlin_python clients drive their own event loop with
+    ``run_until_complete``, so connecting, submitting and reading results
+    all happen in worker threads rather than on the caller's loop.
+    """
+
+    HEALTH_CHECK_QUERY = "g.inject(0)"
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any],
+        pool_size: int,
+        acquire_timeout: float,
+        health_check_interval: float,
+        service_name: str = "azure_cosmos",
+        script_metrics: Optional[ScriptMetricsTracker] = None
+    ):
+        """Initialize an empty pool; connections are opened on demand."""
+        self.client_factory = client_factory
+        self.pool_size = pool_size
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+        self.service_name = service_name
+        self.script_metrics = script_metrics
+
+        self._idle: List[_PooledConnection] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._open_connections = 0
+
+        # Metrics tracking
+        self.in_use = 0
+        self.total_acquires = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.reconnects = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Check out a healthy Gremlin client for the duration of the block."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.pool_size)
+
+        start_time = time.monotonic()
+        await asyncio.wait_for(self._semaphore.acquire(), timeout=self.acquire_timeout)
+        wait_time = time.monotonic() - start_time
+        self.total_acquires += 1
+        self.total_wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+
+        connection = None
+        try:
+            connection = await self._checkout()
+            self.in_use += 1
+            try:
+                yield connection.client
+            except BaseException as e:
+                # A cancelled request is still in flight on this connection
+                if not isinstance(e, Exception) or self._is_connection_error(e):
+                    self._discard(connection)
+                    connection = None
+                raise
+            finally:
+                self.in_use -= 1
+        finally:
+            if connection is not None:
+                connection.last_used = time.monotonic()
+                self._idle.append(connection)
+            self._semaphore.release()
+
+    async def submit(
+        self,
+        query: str,
+        bindings: Optional[Dict[str, Any]] = None,
+        template_name: Optional[str] = None
+    ) -> List[Any]:
+        """Run a Gremlin script on a pooled connection without blocking the loop.
+
+        A request whose connection could not be opened is retried once on a
+        fresh connection. Requests that may have reached the server are not
+        retried, since replaying addV/addE scripts would duplicate writes.
+        """
+        try:
+            async with self.acquire() as gremlin_client:
+                return await self._run_tracked(gremlin_client, query, bindings, template_name)
+        except RequestNotSentError:
+            pass
+
+        async with self.acquire() as gremlin_client:
+            return await self._run_tracked(gremlin_client, query, bindings, template_name)
+
+    def get_metrics(self) -> ConnectionPoolMetrics:
+        """Current pool utilisation and wait-time metrics."""
+        return ConnectionPoolMetrics(
+            service_name=self.service_name,
+            pool_size=self.pool_size,
+            open_connections=self._open_connections,
+            in_use=self.in_use,
+            total_acquires=self.total_acquires,
+            total_wait_time=self.total_wait_time,
+            max_wait_time=self.max_wait_time,
+            reconnects=self.reconnects
+        )
+
+    async def aclose(self) -> None:
+        """Close every idle connection."""
+        while self._idle:
+            connection = self._idle.pop()
+            self._open_connections -= 1
+            await asyncio.to_thread(self._close_client, connection.client)
+
+    async def _checkout(self) -> _PooledConnection:
+        """Reuse an idle connection, probing it if stale, or open a new one."""
+        while self._idle:
+            connection = self._idle.pop()
+            if time.monotonic() - connection.last_used < self.health_check_interval:
+                return connection
+            if await self._is_healthy(connection):
+                return connection
+            self._discard(connection)
+
+        gremlin_client = await asyncio.to_thread(self.client_factory)
+        self._open_connections += 1
+        return _PooledConnection(gremlin_client)
+
+    async def _is_healthy(self, connection: _PooledConnection) -> bool:
+        """Probe a connection with a trivial traversal."""
+        try:
+            await self._run(connection.client, self.HEALTH_CHECK_QUERY, None)
+            return True
+        except Exception:
+            return False
+
+    async def _run_tracked(
+        self,
+        gremlin_client: Any,
+        query: str,
+        bindings: Optional[Dict[str, Any]],
+        template_name: Optional[str]
+    ) -> List[Any]:
+        """Run a script and record its latency against its template."""
+        start_time = time.monotonic()
+        result = await self._run(gremlin_client, query, bindings)
+        if self.script_metrics is not None:
+            self.script_metrics.record(query, template_name, time.monotonic() - start_time)
+        return result
+
+    @classmethod
+    async def _run(cls, gremlin_client: Any, query: str, bindings: Optional[Dict[str, Any]]) -> List[Any]:
+        """Submit a script and await its full result set."""
+        return await asyncio.to_thread(cls._run_blocking, gremlin_client, query, bindings)
+
+    @staticmethod
+    def _run_blocking(gremlin_client: Any, query: str, bindings: Optional[Dict[str, Any]]) -> List[Any]:
+        """Submit a script from a worker thread; the first submit also connects."""
+        try:
+            future = gremlin_client.submit_async(query, bindings)
+        except _TRANSPORT_ERRORS as e:
+            raise RequestNotSentError(f"Gremlin connection failed: {str(e)}") from e
+        return future.result().all().result()
+
+    @staticmethod
+    def _is_connection_error(error: Exception) -> bool:
+        """Server-side query errors leave the connection usable; others do not."""
+        return not isinstance(error, GremlinServerError)
+
+    def _discard(self, connection: _PooledConnection) -> None:
+        """Drop a broken connection so the next checkout reconnects.
+
+        Closing waits for any in-flight response, so it runs on its own thread.
+        """
+        self._open_connections -= 1
+        self.reconnects += 1
+        threading.Thread(target=self._close_client, args=(connection.client,), daemon=True).start()
+
+    @staticmethod
+    def _close_client(gremlin_client: Any) -> None:
+        """Close a pooled client, ignoring errors from already-dead sockets."""
+        try:
+            gremlin_client.close()
+        except Exception:
+            pass
@@ -0,0 +1,157 @@
+"""
+Gremlin Traversal Templates
+
+Named, pre-parameterized Gremlin scripts and script-level metrics.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+from dataclasses import dataclass
+from models.azure import GremlinScriptMetrics, TraversalMetrics
+
+
+@dataclass(frozen=True)
+class TraversalTemplate:
+    """Gremlin script whose variable parts are all supplied as bindings.
+
+    Because the script text never changes, the server compiles it once and
+    serves every later execution from its script cache.
+    """
+
+    name: str
+    script: str
+    parameters: Tuple[str, ...]
+
+    def bind(self, bindings: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Validate bindings against the template parameters."""
+        bindings = dict(bindings or {})
+        missing = [name for name in self.parameters if name not in bindings]
+        if missing:
+            raise ValueError(f"Traversal template '{self.name}' is missing bindings: {', '.join(missing)}")
+        return bindings
+
+
+TRAVERSAL_TEMPLATES: Dict[str, TraversalTemplate] = {
+    template.name: template
+    for template in (
+        TraversalTemplate(
+            name="add_vertex",
+            script="g.addV(vertex_label).property('id', vertex_id).property('name', vertex_name)",
+            parameters=("vertex_label", "vertex_id", "vertex_name")
+        ),
+        TraversalTemplate(
+            name="add_edge",
+            script="g.V(from_id).addE(edge_label).to(g.V(to_id))",
+            parameters=("from_id", "to_id", "edge_label")
+        ),
+        TraversalTemplate(
+            name="get_vertex",
+            script="g.V(vertex_id)",
+            parameters=("vertex_id",)
+        ),
+        TraversalTemplate(
+            name="find_vertices_by_name",
+            script="g.V().has('name', vertex_name).limit(max_results)",
+            parameters=("vertex_name", "max_results")
+        ),
+        TraversalTemplate(
+            name="find_vertices_by_names",
+            script="g.V().has('name', within(vertex_names)).limit(max_results)",
+            parameters=("vertex_names", "max_results")
+        ),
+        TraversalTemplate(
+            name="vertices_by_label",
+            script="g.V().hasLabel(vertex_label).limit(max_results)",
+            parameters=("vertex_label", "max_results")
+        ),
+        TraversalTemplate(
+            name="neighbors",
+            script="g.V(vertex_id).both().dedup().limit(max_results)",
+            parameters=("vertex_id", "max_results")
+        ),
+        TraversalTemplate(
+            name="outgoing_edges",
+            script="g.V(vertex_id).outE().limit(max_results)",
+            parameters=("vertex_id", "max_results")
+        ),
+        TraversalTemplate(
+            name="incoming_edges",
+            script="g.V(vertex_id).inE().limit(max_results)",
+            parameters=("vertex_id", "max_results")
+        ),
+        TraversalTemplate(
+            name="count_vertices",
+            script="g.V().count()",
+            parameters=()
+        ),
+        TraversalTemplate(
+            name="count_edges",
+            script="g.E().count()",
+            parameters=()
+        ),
+    )
+}
+
+
+def get_traversal_template(name: str) -> TraversalTemplate:
+    """Look up a traversal template by name."""
+    template = TRAVERSAL_TEMPLATES.get(name)
+    if template is None:
+        raise ValueError(
+            f"Unknown traversal template '{name}'. Available: {', '.join(sorted(TRAVERSAL_TEMPLATES))}"
+        )
+    return template
+
+
+def property_steps(prefix: str, item: Dict[str, Any], reserved: Tuple[str, ...], bindings: Dict[str, Any]) -> str:
+    """Append bound .property() steps for every non-reserved key.
+
+    Keys and values both travel as bindings, so the script depends only on the
+    number of properties, never on their names or contents.
+    """
+    steps = ""
+    for j, (key, value) in enumerate(
+        (key, value) for key, value in item.items() if key not in reserved
+    ):
+        steps += f".property({prefix}_k{j}, {prefix}_p{j})"
+        bindings[f"{prefix}_k{j}"] = key
+        bindings[f"{prefix}_p{j}"] = value
+    return steps
+
+
+class ScriptMetricsTracker:
+    """Tracks distinct script texts and per-template latency."""
+
+    ADHOC_TEMPLATE = "adhoc"
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.total_submissions = 0
+        self._script_hashes = set()
+        self._templates: Dict[str, TraversalMetrics] = {}
+
+    def record(self, script: str, template_name: Optional[str], latency: float) -> None:
+        """Record one script execution."""
+        self.total_submissions += 1
+        self._script_hashes.add(hash(script))
+
+        name = template_name or self.ADHOC_TEMPLATE
+        metrics = self._templates.get(name)
+        if metrics is None:
+            metrics = self._templates[name] = TraversalMetrics(template_name=name)
+        metrics.executions += 1
+        metrics.total_latency += latency
+        metrics.avg_latency = metrics.total_latency / metrics.executions
+        metrics.max_latency = max(metrics.max_latency, latency)
+
+    def get_metrics(self) -> GremlinScriptMetrics:
+        """Snapshot of script cache effectiveness and template latencies."""
+        distinct_scripts = len(self._script_hashes)
+        compile_reduction = (
+            1 - distinct_scripts / self.total_submissions if self.total_submissions else 0.0
+        )
+        return GremlinScriptMetrics(
+            total_submissions=self.total_submissions,
+            distinct_scripts=distinct_scripts,
+            compile_reduction=compile_reduction,
+            templates=[metrics.model_copy() for metrics in self._templates.values()]
+        )
@@ -0,0 +1,313 @@
+"""
+Local Index
+
+In-process vector and BM25 indexes backing the local search client.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+import math
+import re
+import numpy as np
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Indices of the top_k highest scores, best first."""
+    if top_k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    candidates = np.argpartition(-scores, top_k)[:top_k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class LocalVectorIndex:
+    """Cosine-similarity index over a float32 matrix of unit vectors.
+
+    ``exact`` mode scores every vector with one matrix-vector product. ``ivf``
+    mode clusters vectors around k-means centroids at build time and, per
+    query, scores only the vectors in the ``nprobe`` closest clusters.
+
+    On disk the index is a set of ``.npy`` arrays that are memory-mapped on
+    load, so opening an index is O(1) and pages are read on demand.
+    """
+
+    VECTORS_FILE = "vectors.npy"
+    CENTROIDS_FILE = "ivf_centroids.npy"
+    LIST_ORDER_FILE = "ivf_order.npy"
+    LIST_OFFSETS_FILE = "ivf_offsets.npy"
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        centroids: Optional[np.ndarray] = None,
+        list_order: Optional[np.ndarray] = None,
+        list_offsets: Optional[np.ndarray] = None
+    ):
+        """Wrap prebuilt arrays; use build() or load() to create an index."""
+        self.vectors = vectors
+        self.centroids = centroids
+        self.list_order = list_order
+        self.list_offsets = list_offsets
+
+    @property
+    def size(self) -> int:
+        """Number of indexed vectors."""
+        return self.vectors.shape[0]
+
+    @property
+    def has_ivf(self) -> bool:
+        """Whether inverted lists were built for approximate search."""
+        return self.centroids is not None
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, nlist: int = 0, kmeans_iterations: int = 10, seed: int = 0) -> "LocalVectorIndex":
+        """Normalize vectors and, if nlist > 0, build IVF inverted lists."""
+        vectors = cls._normalize(np.asarray(vectors, dtype=np.float32))
+        if nlist <= 0 or len(vectors) == 0:
+            return cls(vectors)
+
+        nlist = min(nlist, len(vectors))
+        centroids = cls._kmeans(vectors, nlist, kmeans_iterations, seed)
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        list_order = np.argsort(assignments, kind="stable").astype(np.int64)
+        list_offsets = np.searchsorted(assignments[list_order], np.arange(nlist + 1)).astype(np.int64)
+        return cls(vectors, centroids, list_order, list_offsets)
+
+    def search(self, query: np.ndarray, top_k: int, mode: str = "exact", nprobe: int = 8) -> List[Tuple[int, float]]:
+        """(row, cosine similarity) pairs of the nearest vectors, best first."""
+        if mode not in ("exact", "ivf"):
+            raise ValueError(f"Unknown vector search mode '{mode}'. Available: exact, ivf")
+        if self.size == 0:
+            return []
+        query = self._normalize(np.asarray(query, dtype=np.float32)[None, :])[0]
+
+        if mode == "exact" or not self.has_ivf:
+            scores = self.vectors @ query
+            rows = top_k_indices(scores, top_k)
+            return [(int(row), float(scores[row])) for row in rows]
+
+        # Probe only the clusters whose centroids are closest to the query
+        probed_lists = top_k_indices(self.centroids @ query, nprobe)
+        candidates = np.concatenate([
+            self.list_order[self.list_offsets[i]:self.list_offsets[i + 1]] for i in probed_lists
+        ])
+        if len(candidates) == 0:
+            return []
+        scores = self.vectors[candidates] @ query
+        best = top_k_indices(scores, top_k)
+        return [(int(candidates[i]), float(scores[i])) for i in best]
+
+    def save(self, index_dir: Path) -> None:
+        """Write the index arrays to index_dir."""
+        index_dir = Path(index_dir)
+        index_dir.mkdir(parents=True, exist_ok=True)
+        np.save(index_dir / self.VECTORS_FILE, self.vectors)
+        if self.has_ivf:
+            np.save(index_dir / self.CENTROIDS_FILE, self.centroids)
+            np.save(index_dir / self.LIST_ORDER_FILE, self.list_order)
+            np.save(index_dir / self.LIST_OFFSETS_FILE, self.list_offsets)
+
+    @classmethod
+    def load(cls, index_dir: Path) -> "LocalVectorIndex":
+        """Memory-map a saved index."""
+        index_dir = Path(index_dir)
+        vectors = np.load(index_dir / cls.VECTORS_FILE, mmap_mode="r")
+        if not (index_dir / cls.CENTROIDS_FILE).exists():
+            return cls(vectors)
+        return cls(
+            vectors,
+            np.load(index_dir / cls.CENTROIDS_FILE, mmap_mode="r"),
+            np.load(index_dir / cls.LIST_ORDER_FILE, mmap_mode="r"),
+            np.load(index_dir / cls.LIST_OFFSETS_FILE, mmap_mode="r")
+        )
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """Scale rows to unit length so dot products are cosine similarities."""
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return (vectors / np.where(norms == 0, 1, norms)).astype(np.float32)
+
+    @classmethod
+    def _kmeans(cls, vectors: np.ndarray, nlist: int, iterations: int, seed: int) -> np.ndarray:
+        """Spherical k-means centroids for the coarse quantizer."""
+        rng = np.random.default_rng(seed)
+        centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, vectors)
+            counts = np.bincount(assignments, minlength=nlist)
+            # Empty clusters keep their previous centroid
+            occupied = counts > 0
+            centroids[occupied] = cls._normalize(sums[occupied])
+        return centroids
+
+
+class StringArray:
+    """Read-only sequence of strings stored as UTF-8 bytes plus row offsets.
+
+    Saved as two ``.npy`` arrays that are memory-mapped on load, so opening
+    is O(1) and a lookup decodes only the requested row.
+    """
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        """Wrap prebuilt arrays; use build() or load() to create one."""
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        return bytes(self.data[self.offsets[row]:self.offsets[row + 1]]).decode("utf-8")
+
+    @classmethod
+    def build(cls, strings: Sequence[str]) -> "StringArray":
+        """Pack strings into one byte array."""
+        encoded = [string.encode("utf-8") for string in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+    def save(self, index_dir: Path, name: str) -> None:
+        """Write name.npy and name_offsets.npy to index_dir."""
+        np.save(Path(index_dir) / f"{name}.npy", self.data)
+        np.save(Path(index_dir) / f"{name}_offsets.npy", self.offsets)
+
+    @classmethod
+    def load(cls, index_dir: Path, name: str) -> "StringArray":
+        """Memory-map a saved array."""
+        return cls(
+            np.load(Path(index_dir) / f"{name}.npy", mmap_mode="r"),
+            np.load(Path(index_dir) / f"{name}_offsets.npy", mmap_mode="r")
+        )
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index of per-term posting arrays.
+
+    Postings are stored CSR-style: the sorted vocabulary, and per term a
+    slice of one rows array and one counts array. The index is saved as
+    ``.npy`` arrays and memory-mapped on load, so opening it neither
+    re-tokenizes the corpus nor reads more than the probed postings.
+    """
+
+    TERMS_NAME = "bm25_terms"
+    OFFSETS_FILE = "bm25_offsets.npy"
+    ROWS_FILE = "bm25_rows.npy"
+    COUNTS_FILE = "bm25_counts.npy"
+    LENGTH_NORM_FILE = "bm25_length_norm.npy"
+    PARAMS_FILE = "bm25_params.npy"
+
+    def __init__(self, documents: List[str], k1: float = 1.2, b: float = 0.75):
+        """Tokenize documents and build postings."""
+        postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        lengths = np.zeros(len(documents), dtype=np.float32)
+        for row, text in enumerate(documents):
+            term_counts = Counter(self.tokenize(text))
+            lengths[row] = sum(term_counts.values())
+            for term, count in term_counts.items():
+                rows, counts = postings.setdefault(term, ([], []))
+                rows.append(row)
+                counts.append(count)
+
+        terms = sorted(postings)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum([len(postings[term][0]) for term in terms], out=offsets[1:])
+        avg_length = float(lengths.mean()) if len(documents) else 0.0
+        self._set_arrays(
+            StringArray.build(terms),
+            offsets,
+            np.asarray([row for term in terms for row in postings[term][0]], dtype=np.int64),
+            np.asarray([count for term in terms for count in postings[term][1]], dtype=np.float32),
+            # Per-document length normalization, precomputed once
+            k1 * (1 - b + b * lengths / (avg_length or 1.0)),
+            k1,
+            b
+        )
+
+    def _set_arrays(
+        self,
+        terms: StringArray,
+        offsets: np.ndarray,
+        rows: np.ndarray,
+        counts: np.ndarray,
+        length_norm: np.ndarray,
+        k1: float,
+        b: float
+    ) -> None:
+        self.terms = terms
+        self.offsets = offsets
+        self.rows = rows
+        self.counts = counts
+        self.length_norm = length_norm
+        self.k1 = k1
+        self.b = b
+        self.document_count = len(length_norm)
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Lower-cased word tokens."""
+        return TOKEN_PATTERN.findall(text.lower())
+
+    def postings(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(rows, counts) of the documents containing term, or None."""
+        position = bisect_left(self.terms, term)
+        if position == len(self.terms) or self.terms[position] != term:
+            return None
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return self.rows[start:end], self.counts[start:end]
+
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency (never negative)."""
+        document_frequency = len(self.postings(term)[0])
+        return math.log(1 + (self.document_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every document for a query."""
+        scores = np.zeros(self.document_count, dtype=np.float32)
+        for term in set(self.tokenize(query)):
+            postings = self.postings(term)
+            if postings is None:
+                continue
+            rows, counts = postings
+            scores[rows] += self.idf(term) * counts * (self.k1 + 1) / (counts + self.length_norm[rows])
+        return scores
+
+    def search(self, query: str, top_k: int) -> List[Tuple[int, float]]:
+        """(row, BM25 score) pairs of matching documents, best first."""
+        scores = self.scores(query)
+        rows = top_k_indices(scores, top_k)
+        return [(int(row), float(scores[row])) for row in rows if scores[row] > 0]
+
+    def save(self, index_dir: Path) -> None:
+        """Write the postings and length normalization to index_dir."""
+        index_dir = Path(index_dir)
+        index_dir.mkdir(parents=True, exist_ok=True)
+        self.terms.save(index_dir, self.TERMS_NAME)
+        np.save(index_dir / self.OFFSETS_FILE, self.offsets)
+        np.save(index_dir / self.ROWS_FILE, self.rows)
+        np.save(index_dir / self.COUNTS_FILE, self.counts)
+        np.save(index_dir / self.LENGTH_NORM_FILE, self.length_norm)
+        np.save(index_dir / self.PARAMS_FILE, np.asarray([self.k1, self.b], dtype=np.float64))
+
+    @classmethod
+    def load(cls, index_dir: Path) -> "BM25Index":
+        """Memory-map a saved index."""
+        index_dir = Path(index_dir)
+        k1, b = np.load(index_dir / cls.PARAMS_FILE)
+        index = cls.__new__(cls)
+        index._set_arrays(
+            StringArray.load(index_dir, cls.TERMS_NAME),
+            np.load(index_dir / cls.OFFSETS_FILE, mmap_mode="r"),
+            np.load(index_dir / cls.ROWS_FILE, mmap_mode="r"),
+            np.load(index_dir / cls.COUNTS_FILE, mmap_mode="r"),
+            np.load(index_dir / cls.LENGTH_NORM_FILE, mmap_mode="r"),
+            float(k1),
+            float(b)
+        )
+        return index
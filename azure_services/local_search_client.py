@@ -0,0 +1,173 @@
+"""
+Local Search Client
+
+Offline stand-in for Azure Cognitive Search over a local vector and BM25 index.
+"""
+
+from typing import Dict, Any, List, Optional
+from pathlib import Path
+import math
+import os
+import time
+import numpy as np
+from .local_index import BM25Index, LocalVectorIndex, StringArray
+from .search_fusion import fuse_results
+
+
+class LocalSearchClient:
+    """Drop-in replacement for SearchClient's search methods without network access.
+
+    Serves integration tests, edge deployments and hot domains from an index
+    directory holding memory-mapped vectors, BM25 postings and document ids
+    and contents. Opening an index maps the vectors and documents; the BM25
+    postings are mapped on the first text or hybrid search. Results use the
+    same dictionaries and score scales as SearchClient.
+    """
+
+    IDS_NAME = "document_ids"
+    CONTENTS_NAME = "document_contents"
+
+    def __init__(self, index_dir: Optional[Path] = None):
+        """Open an index previously written by build_index."""
+        # === LOCAL SEARCH CLIENT IMPLEMENTATION ===
+        if index_dir is None:
+            index_dir = Path(os.getenv("LOCAL_SEARCH_INDEX_DIR", str(Path(os.getenv("CACHE_DIR", "cache")) / "local_index")))
+        self.index_dir = Path(index_dir)
+        self.index_name = self.index_dir.name
+        self.vector_mode = os.getenv("LOCAL_SEARCH_MODE", "exact")
+        self.nprobe = int(os.getenv("LOCAL_SEARCH_NPROBE", "8"))
+
+        if not (self.index_dir / f"{self.IDS_NAME}.npy").exists():
+            raise ValueError(f"No local search index found at {self.index_dir}")
+        self.document_ids = StringArray.load(self.index_dir, self.IDS_NAME)
+        self.contents = StringArray.load(self.index_dir, self.CONTENTS_NAME)
+
+        self.vector_index = LocalVectorIndex.load(self.index_dir)
+        self._text_index: Optional[BM25Index] = None
+
+        # Metrics tracking
+        self.search_count = 0
+        self.last_search_time = 0.0
+
+    @classmethod
+    def build_index(
+        cls,
+        index_dir: Path,
+        documents: List[Dict[str, Any]],
+        nlist: Optional[int] = None
+    ) -> "LocalSearchClient":
+        """Write an index for documents with id, content and content_vector fields.
+
+        nlist sets the number of IVF clusters; it defaults to sqrt(N), and 0
+        builds an exact-only index.
+        """
+        index_dir = Path(index_dir)
+        if nlist is None:
+            nlist = int(math.sqrt(len(documents)))
+
+        vectors = np.asarray([document["content_vector"] for document in documents], dtype=np.float32)
+        LocalVectorIndex.build(vectors, nlist=nlist).save(index_dir)
+        contents = [document.get("content", "") for document in documents]
+        BM25Index(contents).save(index_dir)
+        StringArray.build([str(document["id"]) for document in documents]).save(index_dir, cls.IDS_NAME)
+        StringArray.build(contents).save(index_dir, cls.CONTENTS_NAME)
+        return cls(index_dir)
+
+    @property
+    def text_index(self) -> BM25Index:
+        """BM25 postings, memory-mapped on first use."""
+        if self._text_index is None:
+            self._text_index = BM25Index.load(self.index_dir)
+        return self._text_index
+
+    async def vector_search(self, query_vector: List[float], top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Nearest-neighbour search over the local vector index."""
+        start_time = time.time()
+        if top_k is None:
+            top_k = int(os.getenv("VECTOR_SEARCH_TOP_K", "10"))
+
+        matches = self.vector_index.search(query_vector, top_k, self.vector_mode, self.nprobe)
+        search_results = [
+            {
+                "id": self.document_ids[row],
+                "content": self.contents[row],
+                "score": self._cosine_score(similarity),
+                "metadata": {"type": "vector_result", "search_highlights": {}}
+            }
+            for row, similarity in matches
+        ]
+
+        self._track(start_time)
+        return search_results
+
+    async def hybrid_search(self, query: str, query_vector: List[float], top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Text and vector search merged with reciprocal rank fusion, as Azure does.
+
+        Scores are RRF sums scaled into [0,1] by search_fusion.
+        """
+        start_time = time.time()
+        if top_k is None:
+            top_k = int(os.getenv("VECTOR_SEARCH_TOP_K", "10"))
+
+        fused = fuse_results(
+            {
+                "text": [{"id": row} for row, _ in self.text_index.search(query, top_k)],
+                "vector": [
+                    {"id": row}
+                    for row, _ in self.vector_index.search(query_vector, top_k, self.vector_mode, self.nprobe)
+                ]
+            },
+            top_k,
+            method="rrf",
+            rrf_k=int(os.getenv("HYBRID_RRF_K", "60"))
+        )
+        hybrid_results = [
+            {
+                "id": self.document_ids[match.document_id],
+                "content": self.contents[match.document_id],
+                "score": match.score,
+                "search_type": "hybrid",
+                "metadata": {
+                    "query": query,
+                    "vector_match": "vector" in match.source_scores,
+                    "text_match": "text" in match.source_scores,
+                    "search_highlights": {},
+                    "reranker_score": None
+                }
+            }
+            for match in fused
+        ]
+
+        self._track(start_time)
+        return hybrid_results
+
+    async def text_search(self, query: str, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """BM25 full-text search."""
+        start_time = time.time()
+        if top_k is None:
+            top_k = int(os.getenv("VECTOR_SEARCH_TOP_K", "10"))
+
+        search_results = [
+            {
+                "id": self.document_ids[row],
+                "content": self.contents[row],
+                "score": score,
+                "metadata": {"type": "text_result", "search_highlights": {}}
+            }
+            for row, score in self.text_index.search(query, top_k)
+        ]
+
+        self._track(start_time)
+        return search_results
+
+    async def aclose(self) -> None:
+        """Nothing to release; present for interface parity with SearchClient."""
+
+    @staticmethod
+    def _cosine_score(similarity: float) -> float:
+        """Azure's @search.score for cosine similarity: 1 / (1 + cosine distance)."""
+        return 1.0 / (2.0 - similarity)
+
+    def _track(self, start_time: float) -> None:
+        self.search_count += 1
+        self.last_search_time = time.time() - start_time
@@ -0,0 +1,164 @@
+"""
+Rate Limiter
+
+Token-bucket pacing of Azure OpenAI requests against RPM/TPM quotas.
+"""
+
+from typing import Deque, Dict, Optional, Tuple
+from collections import deque
+import asyncio
+import random
+import time
+
+
+PRIORITIES = ("interactive", "bulk")
+
+
+class TokenBucket:
+    """Bucket refilled continuously at a fixed rate up to its capacity."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """Start full, so an idle quota absorbs one burst of capacity."""
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.available = capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        """Credit the quota accrued since the last refill."""
+        self.available = min(self.capacity, self.available + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount is available, as of the last refill."""
+        return max(amount - self.available, 0.0) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        """Take amount from the bucket."""
+        self.available -= amount
+
+
+class RateLimiter:
+    """Paces callers against a requests-per-minute and a tokens-per-minute quota.
+
+    Each caller takes one request and its estimated tokens. Callers queue in
+    a FIFO lane per priority, and a waiting ``interactive`` caller is always
+    served before any ``bulk`` caller. Buckets hold ``burst_seconds`` of
+    quota; a request larger than the token bucket waits for a full bucket.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, burst_seconds: float = 10.0):
+        """Initialize limiter with per-minute quotas."""
+        burst_fraction = burst_seconds / 60
+        self.request_bucket = TokenBucket(max(requests_per_minute * burst_fraction, 1.0), requests_per_minute / 60)
+        self.token_bucket = TokenBucket(max(tokens_per_minute * burst_fraction, 1.0), tokens_per_minute / 60)
+
+        self._lanes: Dict[str, Deque[Tuple[float, asyncio.Future]]] = {priority: deque() for priority in PRIORITIES}
+        self._paused_until = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        # Metrics tracking
+        self.granted_count = 0
+        self.throttled_count = 0
+        self.pause_count = 0
+        self.total_wait_time = 0.0
+
+    async def acquire(self, tokens: int = 0, priority: str = "interactive") -> float:
+        """Wait until one request of tokens fits both quotas; returns seconds waited."""
+        if priority not in self._lanes:
+            raise ValueError(f"Unknown priority '{priority}'. Available: {', '.join(PRIORITIES)}")
+
+        start_time = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self._lanes[priority].append((min(float(tokens), self.token_bucket.capacity), waiter))
+        self._dispatch()
+
+        if not waiter.done():
+            self.throttled_count += 1
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Let the callers queued behind an abandoned head move up
+                self._dispatch()
+                raise
+
+        waited = time.monotonic() - start_time
+        self.total_wait_time += waited
+        return waited
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for seconds after the service reports throttling.
+
+        The service has seen the quota exhausted, so the buckets are emptied
+        rather than letting a full burst through when the pause ends.
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self.request_bucket.available = min(self.request_bucket.available, 0.0)
+        self.token_bucket.available = min(self.token_bucket.available, 0.0)
+        self.pause_count += 1
+        self._dispatch()
+
+    @property
+    def queued(self) -> int:
+        """Number of callers waiting for quota."""
+        return sum(len(lane) for lane in self._lanes.values())
+
+    def _dispatch(self) -> None:
+        """Grant queued callers in priority order while both buckets allow."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        now = time.monotonic()
+        self.request_bucket.refill(now)
+        self.token_bucket.refill(now)
+        for lane in self._lanes.values():
+            while lane:
+                tokens, waiter = lane[0]
+                if waiter.done():
+                    # Cancelled while queued
+                    lane.popleft()
+                    continue
+                delay = max(
+                    self._paused_until - now,
+                    self.request_bucket.wait_time(1),
+                    self.token_bucket.wait_time(tokens)
+                )
+                if delay > 0:
+                    # Lower lanes wait behind the blocked head
+                    self._timer = waiter.get_loop().call_later(delay, self._dispatch)
+                    return
+                lane.popleft()
+                self.request_bucket.consume(1)
+                self.token_bucket.consume(tokens)
+                self.granted_count += 1
+                waiter.set_result(None)
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float, retry_after: Optional[float] = None) -> float:
+    """Seconds to wait before retry number attempt (0-based).
+
+    A server-suggested delay is honored with up to base_delay of jitter on
+    top; otherwise full-jitter exponential backoff capped at max_delay.
+    """
+    if retry_after is not None:
+        return retry_after + random.uniform(0, base_delay)
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+# Quotas belong to a deployment, not to a client instance
+_SHARED_LIMITERS: Dict[Tuple[str, str], RateLimiter] = {}
+
+
+def get_shared_limiter(
+    endpoint: str,
+    deployment: str,
+    requests_per_minute: int,
+    tokens_per_minute: int,
+    burst_seconds: float = 10.0
+) -> RateLimiter:
+    """Process-wide limiter for one deployment; the first caller's quotas apply."""
+    key = (endpoint, deployment)
+    if key not in _SHARED_LIMITERS:
+        _SHARED_LIMITERS[key] = RateLimiter(requests_per_minute, tokens_per_minute, burst_seconds)
+    return _SHARED_LIMITERS[key]
@@ -0,0 +1,291 @@
+"""
+Search Result Cache
+
+TTL/LRU cache of search results with pluggable storage backends.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+import fcntl
+import hashlib
+import json
+import os
+import re
+import time
+import unicodedata
+import numpy as np
+
+
+class SearchCacheBackend(ABC):
+    """Key/value store for cached search results.
+
+    The method set mirrors the subset of the Redis API the cache needs, so a
+    Redis client can back the cache directly.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """Return the stored value, or None if missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        """Store a value that expires after ttl seconds."""
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        """Atomically increment a counter that never expires."""
+
+
+class MemorySearchCacheBackend(SearchCacheBackend):
+    """In-process LRU store with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        """Initialize an empty store holding at most max_entries values."""
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+
+        # Metrics tracking
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        # Counters live outside the LRU so they are never evicted
+        if key in self._counters:
+            return str(self._counters[key])
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+
+class FileSearchCacheBackend(SearchCacheBackend):
+    """Local-file store shared by every process on a host.
+
+    Each value is one JSON file named by a hash of its key and written
+    atomically, with its expiry time stored as the file's mtime. Expired
+    files are deleted when read, and every sweep_interval writes a sweep
+    deletes expired files and then the entries closest to expiry until at
+    most max_entries remain, so the directory never holds more than
+    max_entries + sweep_interval entries. Counters live in a separate directory, are
+    never swept, and are updated under an exclusive flock so increments from
+    different processes are not lost.
+    """
+
+    COUNTERS_DIR = "counters"
+
+    def __init__(self, cache_dir: Path, max_entries: int, sweep_interval: int):
+        """Initialize store rooted at cache_dir."""
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        self.counters_dir = self.cache_dir / self.COUNTERS_DIR
+        self.counters_dir.mkdir(parents=True, exist_ok=True)
+        self._writes_since_sweep = 0
+
+        # Metrics tracking
+        self.expirations = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        counter_path = self._counter_path(key)
+        if counter_path.exists():
+            return str(self._read_counter(counter_path))
+
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if entry.get("expires_at") is not None and time.time() >= entry["expires_at"]:
+            self._unlink(path)
+            self.expirations += 1
+            return None
+        return entry["value"]
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        expires_at = time.time() + ttl
+        path = self._path(key)
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps({"expires_at": expires_at, "value": value}))
+        os.utime(temp_path, (time.time(), expires_at))
+        os.replace(temp_path, path)
+
+        self._writes_since_sweep += 1
+        if self._writes_since_sweep >= self.sweep_interval:
+            self.sweep()
+
+    async def incr(self, key: str) -> int:
+        with open(self._counter_path(key), "a+") as counter_file:
+            fcntl.flock(counter_file, fcntl.LOCK_EX)
+            counter_file.seek(0)
+            value = int(counter_file.read() or 0) + 1
+            counter_file.seek(0)
+            counter_file.truncate()
+            counter_file.write(str(value))
+        return value
+
+    def sweep(self) -> None:
+        """Delete expired entries, then the soonest-expiring ones above max_entries."""
+        now = time.time()
+        live = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                expires_at = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if expires_at <= now:
+                self._unlink(path)
+                self.expirations += 1
+            else:
+                live.append((expires_at, path))
+
+        live.sort()
+        for _, path in live[:max(len(live) - self.max_entries, 0)]:
+            self._unlink(path)
+            self.evictions += 1
+        self._writes_since_sweep = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{self._key_hash(key)}.json"
+
+    def _counter_path(self, key: str) -> Path:
+        return self.counters_dir / self._key_hash(key)
+
+    @staticmethod
+    def _key_hash(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _read_counter(path: Path) -> int:
+        with open(path) as counter_file:
+            fcntl.flock(counter_file, fcntl.LOCK_SH)
+            return int(counter_file.read() or 0)
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        # Another process may have swept the same file
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class RedisSearchCacheBackend(SearchCacheBackend):
+    """Adapter for a redis.asyncio-compatible client supplied by the caller."""
+
+    def __init__(self, redis_client: Any, key_prefix: str = "search-cache:"):
+        """Wrap a client exposing async get/set(ex=)/incr."""
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.redis_client.get(self.key_prefix + key)
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return value
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        await self.redis_client.set(self.key_prefix + key, value, ex=max(int(ttl), 1))
+
+    async def incr(self, key: str) -> int:
+        return int(await self.redis_client.incr(self.key_prefix + key))
+
+
+class SearchResultCache:
+    """Caches search results by index, mode, query text, query vector and top_k.
+
+    Every index has a generation number that is part of each key. Reloading
+    an index bumps its generation, which orphans all of its entries at once
+    without scanning the backend; they are then removed by the backend's TTL
+    expiry and size bound.
+    """
+
+    def __init__(self, backend: SearchCacheBackend, ttl: float, vector_decimals: int):
+        """Initialize cache over a storage backend."""
+        self.backend = backend
+        self.ttl = ttl
+        self.vector_decimals = vector_decimals
+
+        # Metrics tracking
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def normalize_query(text: Optional[str]) -> str:
+        """Case- and whitespace-insensitive form of the query text."""
+        if not text:
+            return ""
+        return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip().lower()
+
+    def vector_hash(self, vector: Optional[List[float]]) -> str:
+        """Hash of the query vector rounded to vector_decimals.
+
+        Rounding lets embeddings that differ only by float noise share an entry.
+        """
+        if vector is None:
+            return ""
+        # Adding zero folds -0.0 into 0.0 so both hash alike
+        quantized = np.round(np.asarray(vector, dtype=np.float32), self.vector_decimals) + np.float32(0)
+        return hashlib.sha256(quantized.tobytes()).hexdigest()
+
+    async def cache_key(
+        self,
+        index_name: str,
+        mode: str,
+        text: Optional[str],
+        vector: Optional[List[float]],
+        top_k: int
+    ) -> str:
+        """Backend key for one search under the index's current generation."""
+        generation = await self.backend.get(self._generation_key(index_name)) or "0"
+        payload = "\0".join([
+            index_name, generation, mode, self.normalize_query(text), self.vector_hash(vector), str(top_k)
+        ])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Cached results for a key, or None on a miss."""
+        value = await self.backend.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    async def put(self, key: str, results: List[Dict[str, Any]]) -> None:
+        """Store results for a key."""
+        await self.backend.set(key, json.dumps(results, default=str), self.ttl)
+
+    async def invalidate(self, index_name: str) -> None:
+        """Drop every cached result for an index."""
+        await self.backend.incr(self._generation_key(index_name))
+        self.invalidations += 1
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @staticmethod
+    def _generation_key(index_name: str) -> str:
+        return f"generation\0{index_name}"
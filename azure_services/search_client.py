@@ -4,17 +4,48 @@ Azure Cognitive Search Client
 Client for Azure Cognitive Search services.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
 import os
 import uuid
 import time
-from azure.search.documents import SearchClient as AzureSearchClient
-from azure.search.documents.indexes import SearchIndexClient
+import asyncio
+from datetime import datetime
+from pathlib import Path
+from azure.search.documents.aio import SearchClient as AzureSearchClient
+from azure.search.documents.indexes.aio import SearchIndexClient
+from azure.search.documents.models import VectorizedQuery
 from azure.core.credentials import AzureKeyCredential
-from azure.identity import DefaultAzureCredential
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.identity.aio import DefaultAzureCredential
 from models.validation import ValidationResult, ConfigValidation
-from models.search import SearchRequest, SearchResponse, SearchResults, SearchMetrics
+from models.search import SearchRequest, SearchResponse, SearchResults, SearchMetrics, SearchQuery, MultiSearchResult
 from models.azure import AzureServiceResponse, EmbeddingResult, SearchResult, ServiceHealth
+from .search_cache import (
+    FileSearchCacheBackend,
+    MemorySearchCacheBackend,
+    RedisSearchCacheBackend,
+    SearchCacheBackend,
+    SearchResultCache
+)
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:
+    # Only needed when SEARCH_CACHE_BACKEND=redis
+    redis_asyncio = None
+
+
+class SearchResultList(list):
+    """Results of one search, with that search's metrics.
+    
+    The metrics live on the results rather than on the client, which is
+    shared across requests, so concurrent searches never report each
+    other's cache outcome.
+    """
+    
+    def __init__(self, results: List[Dict[str, Any]], metrics: SearchMetrics):
+        super().__init__(results)
+        self.metrics = metrics
 
 
 class SearchClient:
@@ -37,27 +68,50 @@ class SearchClient:
         # Authentication - try API key first, then DefaultAzureCredential
         search_key = os.getenv("AZURE_SEARCH_KEY")
         if search_key:
-            credential = AzureKeyCredential(search_key)
+            self.credential = AzureKeyCredential(search_key)
         else:
-            credential = DefaultAzureCredential()
+            self.credential = DefaultAzureCredential()
         
-        # Initialize real Azure Search clients
+        # Initialize real Azure Search clients on the async SDK. Both clients
+        # share one aiohttp transport, so searches reuse pooled connections and
+        # never block the event loop.
+        self.transport = AioHttpTransport(
+            connection_timeout=float(os.getenv("SEARCH_CONNECTION_TIMEOUT", "30")),
+            read_timeout=float(os.getenv("SEARCH_READ_TIMEOUT", "60"))
+        )
         self.search_client = AzureSearchClient(
             endpoint=self.endpoint,
             index_name=self.index_name,
-            credential=credential
+            credential=self.credential,
+            transport=self.transport
         )
         
         self.index_client = SearchIndexClient(
             endpoint=self.endpoint,
-            credential=credential
+            credential=self.credential,
+            transport=self.transport
         )
         
+        # Query-result cache for repeated searches. The backend must be shared
+        # with the ingestion process (redis, or file on one host) so that its
+        # invalidate_cache() reaches the API's cached results; memory is only
+        # safe for a single process.
+        self.result_cache = None
+        if os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true":
+            default_backend = "redis" if os.getenv("SEARCH_CACHE_REDIS_URL") else "file"
+            self.result_cache = SearchResultCache(
+                backend=self._create_cache_backend(os.getenv("SEARCH_CACHE_BACKEND", default_backend)),
+                ttl=float(os.getenv("SEARCH_CACHE_TTL", "300")),
+                vector_decimals=int(os.getenv("SEARCH_CACHE_VECTOR_DECIMALS", "4"))
+            )
+        
         # Metrics tracking
         self.search_count = 0
+        self.indexed_count = 0
+        self.deleted_count = 0
         self.last_search_time = 0.0
     
-    async def vector_search(self, query_vector: List[float], top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+    async def vector_search(self, query_vector: List[float], top_k: Optional[int] = None) -> SearchResultList:
         """Real vector search using Azure Cognitive Search."""
         # TODO: Implement advanced vector similarity search with filters
         # TODO: Add support for multiple vector fields and hybrid scoring
@@ -71,9 +125,12 @@ class SearchClient:
             if top_k is None:
                 top_k = int(os.getenv("VECTOR_SEARCH_TOP_K", "10"))
             
-            # Perform real vector search using Azure Cognitive Search
-            from azure.search.documents.models import VectorizedQuery
+            # Serve repeated queries from the result cache
+            cache_key, cached_results = await self._lookup_cached_results("vector", None, query_vector, top_k)
+            if cached_results is not None:
+                return self._with_search_metrics(start_time, cached_results, cache_hit=True)
             
+            # Perform real vector search using Azure Cognitive Search
             vector_query = VectorizedQuery(
                 vector=query_vector,
                 k_nearest_neighbors=top_k,
@@ -81,7 +138,7 @@ class SearchClient:
             )
             
             # Execute the search
-            results = self.search_client.search(
+            results = await self.search_client.search(
                 search_text=None,  # Pure vector search
                 vector_queries=[vector_query],
                 top=top_k,
@@ -95,7 +152,7 @@ class SearchClient:
             
             # Convert results to our format
             search_results = []
-            for result in results:
+            async for result in results:
                 search_results.append({
                     "id": result.get("id", "unknown"),
                     "content": result.get("content", ""),
@@ -106,14 +163,15 @@ class SearchClient:
                     }
                 })
             
-            return search_results
+            await self._store_cached_results(cache_key, search_results)
+            return self._with_search_metrics(start_time, search_results, cache_hit=False)
             
         except Exception as e:
             # Handle Azure Search service errors
             error_time = time.time() - start_time
             raise RuntimeError(f"Azure Cognitive Search vector search failed: {str(e)}") from e
     
-    async def hybrid_search(self, query: str, query_vector: List[float], top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+    async def hybrid_search(self, query: str, query_vector: List[float], top_k: Optional[int] = None) -> SearchResultList:
         """Real hybrid search combining text and vector search."""
         # TODO: Implement advanced hybrid search with weighted scoring
         # TODO: Add support for faceted search and filters
@@ -127,9 +185,12 @@ class SearchClient:
             if top_k is None:
                 top_k = int(os.getenv("VECTOR_SEARCH_TOP_K", "10"))
             
-            # Perform real hybrid search using Azure Cognitive Search
-            from azure.search.documents.models import VectorizedQuery
+            # Serve repeated queries from the result cache
+            cache_key, cached_results = await self._lookup_cached_results("hybrid", query, query_vector, top_k)
+            if cached_results is not None:
+                return self._with_search_metrics(start_time, cached_results, cache_hit=True)
             
+            # Perform real hybrid search using Azure Cognitive Search
             vector_query = VectorizedQuery(
                 vector=query_vector,
                 k_nearest_neighbors=top_k,
@@ -137,7 +198,7 @@ class SearchClient:
             )
             
             # Execute hybrid search (text + vector)
-            results = self.search_client.search(
+            results = await self.search_client.search(
                 search_text=query,  # Text search component
                 vector_queries=[vector_query],  # Vector search component
                 top=top_k,
@@ -153,7 +214,7 @@ class SearchClient:
             
             # Convert results to our format
             hybrid_results = []
-            for result in results:
+            async for result in results:
                 hybrid_results.append({
                     "id": result.get("id", "unknown"),
                     "content": result.get("content", ""),
@@ -168,14 +229,15 @@ class SearchClient:
                     }
                 })
             
-            return hybrid_results
+            await self._store_cached_results(cache_key, hybrid_results)
+            return self._with_search_metrics(start_time, hybrid_results, cache_hit=False)
             
         except Exception as e:
             # Handle Azure Search service errors
             error_time = time.time() - start_time
             raise RuntimeError(f"Azure Cognitive Search hybrid search failed: {str(e)}") from e
     
-    async def text_search(self, query: str, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+    async def text_search(self, query: str, top_k: Optional[int] = None) -> SearchResultList:
         """Real text search using Azure Cognitive Search."""
         # TODO: Implement advanced text search with filters and facets
         # TODO: Add support for search suggestions and autocomplete
@@ -189,8 +251,13 @@ class SearchClient:
             if top_k is None:
                 top_k = int(os.getenv("VECTOR_SEARCH_TOP_K", "10"))
             
+            # Serve repeated queries from the result cache
+            cache_key, cached_results = await self._lookup_cached_results("text", query, None, top_k)
+            if cached_results is not None:
+                return self._with_search_metrics(start_time, cached_results, cache_hit=True)
+            
             # Execute text search
-            results = self.search_client.search(
+            results = await self.search_client.search(
                 search_text=query,
                 top=top_k,
                 include_total_count=True,
@@ -205,7 +272,7 @@ class SearchClient:
             
             # Convert results to our format
             search_results = []
-            for result in results:
+            async for result in results:
                 search_results.append({
                     "id": result.get("id", "unknown"),
                     "content": result.get("content", ""),
@@ -216,13 +283,94 @@ class SearchClient:
                     }
                 })
             
-            return search_results
+            await self._store_cached_results(cache_key, search_results)
+            return self._with_search_metrics(start_time, search_results, cache_hit=False)
             
         except Exception as e:
             # Handle Azure Search service errors
             error_time = time.time() - start_time
             raise RuntimeError(f"Azure Cognitive Search text search failed: {str(e)}") from e
     
+    async def multi_search(
+        self,
+        requests: Sequence[Union[SearchQuery, Tuple[str, Optional[str], Optional[List[float]], Optional[int]]]],
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> List[MultiSearchResult]:
+        """Run several index lookups concurrently under one deadline.
+        
+        Requests are (mode, text, vector, top_k) tuples or SearchQuery models.
+        Results come back in request order, each tagged with its request index.
+        A failed or timed-out lookup is reported in its own result and never
+        fails the rest of the batch.
+        """
+        # === CONCURRENT AZURE COGNITIVE SEARCH FAN-OUT ===
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("SEARCH_MULTI_MAX_CONCURRENCY", "8"))
+        if timeout is None:
+            timeout = float(os.getenv("SEARCH_MULTI_TIMEOUT", "10"))
+        
+        queries = [
+            request if isinstance(request, SearchQuery)
+            else SearchQuery(mode=request[0], text=request[1], vector=request[2], top_k=request[3])
+            for request in requests
+        ]
+        if not queries:
+            return []
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run_query(request_index: int, query: SearchQuery) -> MultiSearchResult:
+            start_time = time.time()
+            try:
+                async with semaphore:
+                    results = await self._run_search_query(query)
+                return MultiSearchResult(
+                    request_index=request_index,
+                    mode=query.mode,
+                    success=True,
+                    results=results,
+                    metrics=results.metrics,
+                    response_time=time.time() - start_time
+                )
+            except Exception as e:
+                return MultiSearchResult(
+                    request_index=request_index,
+                    mode=query.mode,
+                    success=False,
+                    error=str(e),
+                    response_time=time.time() - start_time
+                )
+        
+        tasks = [asyncio.create_task(run_query(i, query)) for i, query in enumerate(queries)]
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        
+        # Lookups still running at the deadline are abandoned, not awaited
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        
+        return [
+            task.result() if task in done else MultiSearchResult(
+                request_index=i,
+                mode=queries[i].mode,
+                success=False,
+                error=f"Search deadline of {timeout}s exceeded",
+                response_time=timeout
+            )
+            for i, task in enumerate(tasks)
+        ]
+    
+    async def _run_search_query(self, query: SearchQuery) -> SearchResultList:
+        """Dispatch one multi-search request to the matching search mode."""
+        if query.mode == "vector":
+            return await self.vector_search(query.vector, query.top_k)
+        if query.mode == "hybrid":
+            return await self.hybrid_search(query.text, query.vector, query.top_k)
+        if query.mode == "text":
+            return await self.text_search(query.text, query.top_k)
+        raise ValueError(f"Unknown search mode '{query.mode}'. Available: vector, hybrid, text")
+    
     async def health_check(self) -> AzureServiceResponse:
         """Real health check for Azure Cognitive Search service."""
         # TODO: Implement comprehensive health check with index validation
@@ -237,20 +385,21 @@ class SearchClient:
         try:
             # Test actual connectivity by checking if index exists
             try:
-                index_stats = self.index_client.get_search_index_statistics(self.index_name)
+                index_stats = await self.index_client.get_search_index_statistics(self.index_name)
             except:
                 # Index might not exist, try a simple search instead
                 pass
             
             # Test a simple search to verify functionality
-            test_results = self.search_client.search(
+            test_results = await self.search_client.search(
                 search_text="test",
                 top=1,
                 include_total_count=True
             )
             
             # Consume the iterator to actually execute the search
-            list(test_results)
+            async for _ in test_results:
+                pass
             
             # If we get here, the service is healthy
             response_time = time.time() - start_time
@@ -277,6 +426,130 @@ class SearchClient:
                 error_details=f"Azure Cognitive Search health check failed: {str(e)}"
             )
 
+    async def upload_documents(self, documents: List[Dict[str, Any]]) -> int:
+        """Merge or upload documents into the index and return how many were indexed.
+        
+        The result cache is left alone so bulk loads can invalidate it once,
+        after their last batch, rather than per batch.
+        """
+        # === REAL AZURE COGNITIVE SEARCH INDEXING IMPLEMENTATION ===
+        try:
+            results = await self.search_client.merge_or_upload_documents(documents=documents)
+        except Exception as e:
+            raise RuntimeError(f"Azure Cognitive Search document upload failed: {str(e)}") from e
+        
+        failed = [result.key for result in results if not result.succeeded]
+        self.indexed_count += len(results) - len(failed)
+        if failed:
+            raise RuntimeError(f"Azure Cognitive Search rejected documents: {', '.join(failed)}")
+        return len(results)
+    
+    async def delete_documents(self, keys: List[str]) -> int:
+        """Delete documents from the index by key and return how many were deleted.
+        
+        Keys that are not in the index count as deleted. As with uploads,
+        the result cache is left for the caller to invalidate.
+        """
+        # === REAL AZURE COGNITIVE SEARCH DELETE IMPLEMENTATION ===
+        try:
+            results = await self.search_client.delete_documents(documents=[{"id": key} for key in keys])
+        except Exception as e:
+            raise RuntimeError(f"Azure Cognitive Search document delete failed: {str(e)}") from e
+        
+        failed = [result.key for result in results if not result.succeeded]
+        self.deleted_count += len(results) - len(failed)
+        if failed:
+            raise RuntimeError(f"Azure Cognitive Search failed to delete documents: {', '.join(failed)}")
+        return len(results)
+    
+    async def invalidate_cache(self, index_name: Optional[str] = None) -> None:
+        """Discard cached results for an index after its documents are reloaded."""
+        if self.result_cache is not None:
+            await self.result_cache.invalidate(index_name or self.index_name)
+    
+    async def aclose(self) -> None:
+        """Close both search clients, the shared transport and the credential."""
+        await self.search_client.close()
+        await self.index_client.close()
+        if isinstance(self.credential, DefaultAzureCredential):
+            await self.credential.close()
+
+    @staticmethod
+    def _create_cache_backend(backend_name: str) -> SearchCacheBackend:
+        """Build the configured result-cache backend.
+        
+        redis (SEARCH_CACHE_REDIS_URL) is shared by every process and host,
+        file (CACHE_DIR/search) by the processes on one host, and memory by
+        nothing - index reloads from another process never invalidate it.
+        """
+        max_entries = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "10000"))
+        if backend_name == "memory":
+            return MemorySearchCacheBackend(max_entries=max_entries)
+        if backend_name == "file":
+            return FileSearchCacheBackend(
+                Path(os.getenv("CACHE_DIR", "cache")) / "search",
+                max_entries=max_entries,
+                sweep_interval=int(os.getenv("SEARCH_CACHE_SWEEP_INTERVAL", "100"))
+            )
+        if backend_name == "redis":
+            redis_url = os.getenv("SEARCH_CACHE_REDIS_URL")
+            if not redis_url:
+                raise ValueError("SEARCH_CACHE_REDIS_URL must be set for SEARCH_CACHE_BACKEND 'redis'")
+            if redis_asyncio is None:
+                raise ValueError("SEARCH_CACHE_BACKEND 'redis' requires the redis package")
+            return RedisSearchCacheBackend(
+                redis_asyncio.from_url(redis_url),
+                key_prefix=os.getenv("SEARCH_CACHE_REDIS_PREFIX", "search-cache:")
+            )
+        raise ValueError(f"Unknown SEARCH_CACHE_BACKEND '{backend_name}'. Available: memory, file, redis")
+    
+    async def _lookup_cached_results(
+        self,
+        mode: str,
+        query: Optional[str],
+        query_vector: Optional[List[float]],
+        top_k: int
+    ) -> Tuple[Optional[str], Optional[List[Dict[str, Any]]]]:
+        """Cache key and cached results for a search; a cache outage counts as a miss."""
+        if self.result_cache is None:
+            return None, None
+        try:
+            cache_key = await self.result_cache.cache_key(self.index_name, mode, query, query_vector, top_k)
+            return cache_key, await self.result_cache.get(cache_key)
+        except Exception:
+            return None, None
+    
+    async def _store_cached_results(self, cache_key: Optional[str], results: List[Dict[str, Any]]) -> None:
+        """Store fresh results, never failing the search on a cache error."""
+        if self.result_cache is None or cache_key is None:
+            return
+        try:
+            await self.result_cache.put(cache_key, results)
+        except Exception:
+            pass
+    
+    def _with_search_metrics(
+        self,
+        start_time: float,
+        results: List[Dict[str, Any]],
+        cache_hit: bool
+    ) -> SearchResultList:
+        """Attach timing, relevance and cache outcome of this search to its results."""
+        processing_time = time.time() - start_time
+        self.last_search_time = processing_time
+        relevance_scores = [float(result.get("score") or 0.0) for result in results]
+        avg_relevance = sum(relevance_scores) / len(relevance_scores) if relevance_scores else 0.0
+        metrics = SearchMetrics(
+            search_id=str(uuid.uuid4()),
+            timestamp=datetime.now(),
+            response_time=processing_time,
+            relevance_scores=relevance_scores,
+            # Text scores are unbounded BM25 values - clamp to the model range
+            avg_relevance=min(max(avg_relevance, 0.0), 1.0),
+            cache_hit=cache_hit
+        )
+        return SearchResultList(results, metrics)
+
 # =============================================================================
 # TEMPORARILY COMMENTED OUT ADVANCED FEATURES
 # These will be re-enabled once basic functionality is working
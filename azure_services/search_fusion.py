@@ -0,0 +1,138 @@
+"""
+Search Fusion
+
+Merges ranked result lists from several search sources into one ranking.
+"""
+
+from typing import Any, Dict, Hashable, List, Optional
+from dataclasses import dataclass
+from operator import itemgetter
+import numpy as np
+from .local_index import top_k_indices
+
+
+FUSION_METHODS = ("rrf", "combsum")
+NORMALIZATION_METHODS = ("minmax", "zscore")
+
+
+@dataclass(frozen=True)
+class FusedResult:
+    """One document in a fused ranking."""
+    document_id: Hashable
+    score: float
+    result: Dict[str, Any]
+    source_scores: Dict[str, float]  # Each source's share of score
+
+    @property
+    def search_method(self) -> str:
+        """Source that contributed most to the fused score."""
+        return max(self.source_scores, key=self.source_scores.get)
+
+
+def fuse_results(
+    result_sets: Dict[str, List[Dict[str, Any]]],
+    top_k: int,
+    method: str = "rrf",
+    normalization: str = "minmax",
+    weights: Optional[Dict[str, float]] = None,
+    rrf_k: int = 60
+) -> List[FusedResult]:
+    """Fuse per-source result lists into the top_k documents, best first.
+
+    Each list must be ranked best first and each result must carry an
+    ``id``; CombSUM also reads a numeric ``score``. ``rrf`` sums
+    weight / (rrf_k + rank) across sources. ``combsum`` sums weighted
+    per-source scores after ``minmax`` or ``zscore`` normalization, with
+    z-scores squashed through a logistic so they stay in [0,1].
+
+    A document listed more than once by a source counts once, at its best
+    rank. Fused scores are divided by the total weight, so they lie in
+    [0,1] and, for rrf and minmax, a document ranked first by every source
+    scores 1.0.
+    """
+    if method not in FUSION_METHODS:
+        raise ValueError(f"Unknown fusion method '{method}'. Available: {', '.join(FUSION_METHODS)}")
+    if normalization not in NORMALIZATION_METHODS:
+        raise ValueError(
+            f"Unknown score normalization '{normalization}'. Available: {', '.join(NORMALIZATION_METHODS)}"
+        )
+
+    sources = [source for source, results in result_sets.items() if results]
+    if not sources or top_k <= 0:
+        return []
+    weights = weights or {}
+    source_weights = np.array([weights.get(source, 1.0) for source in sources], dtype=np.float64)
+
+    # Flatten every list into parallel per-entry arrays
+    results = [result for source in sources for result in result_sets[source]]
+    lengths = np.array([len(result_sets[source]) for source in sources])
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    source_index = np.repeat(np.arange(len(sources)), lengths)
+
+    # Code each document by the position of its first entry; map() keeps the
+    # per-result work in C. Positions that repeat an earlier id are unused slots.
+    first_positions: Dict[Hashable, int] = {}
+    codes = np.fromiter(
+        map(first_positions.setdefault, map(itemgetter("id"), results), range(len(results))),
+        dtype=np.int64, count=len(results)
+    )
+
+    # Keep only each document's first (best-ranked) entry per source
+    positions = np.arange(len(results))
+    source_codes = source_index * len(results) + codes
+    first_entries = np.full(len(sources) * len(results), len(results))
+    np.minimum.at(first_entries, source_codes, positions)
+    kept = first_entries[source_codes] == positions
+
+    if method == "rrf":
+        ranks = positions - starts[source_index]
+        contributions = (rrf_k + 1) / (rrf_k + ranks + 1.0)
+    else:
+        raw_scores = np.fromiter(map(itemgetter("score"), results), dtype=np.float64, count=len(results))
+        contributions = _normalize_segments(raw_scores, starts, lengths, source_index, normalization)
+
+    weighted = np.where(kept, source_weights[source_index] * contributions, 0.0)
+    total_weight = source_weights.sum()
+    fused = np.bincount(codes, weights=weighted, minlength=len(results)) / total_weight
+    np.clip(fused, 0.0, 1.0, out=fused)
+    # Rank unused slots below every document
+    fused[codes != positions] = -1.0
+    best_codes = top_k_indices(fused, min(top_k, len(first_positions)))
+
+    # Per-source breakdown, gathered only for the documents returned
+    selected = np.zeros(len(results), dtype=bool)
+    selected[best_codes] = True
+    breakdowns: Dict[int, Dict[str, float]] = {int(code): {} for code in best_codes}
+    for entry in np.flatnonzero(kept & selected[codes]):
+        breakdowns[int(codes[entry])][sources[source_index[entry]]] = float(weighted[entry] / total_weight)
+
+    return [
+        FusedResult(
+            document_id=results[code]["id"],
+            score=float(fused[code]),
+            result=results[code],
+            source_scores=breakdowns[int(code)]
+        )
+        for code in best_codes
+    ]
+
+
+def _normalize_segments(
+    scores: np.ndarray,
+    starts: np.ndarray,
+    lengths: np.ndarray,
+    source_index: np.ndarray,
+    normalization: str
+) -> np.ndarray:
+    """Normalize each source's contiguous block of scores into [0,1]."""
+    if normalization == "minmax":
+        minimum = np.minimum.reduceat(scores, starts)[source_index]
+        span = np.maximum.reduceat(scores, starts)[source_index] - minimum
+        # A source whose scores are all equal ranks every result as its best
+        return np.where(span > 0, (scores - minimum) / np.where(span > 0, span, 1.0), 1.0)
+
+    mean = np.add.reduceat(scores, starts) / lengths
+    variance = np.maximum(np.add.reduceat(scores * scores, starts) / lengths - mean * mean, 0.0)
+    std = np.sqrt(variance)[source_index]
+    z_scores = np.where(std > 0, (scores - mean[source_index]) / np.where(std > 0, std, 1.0), 0.0)
+    return 1.0 / (1.0 + np.exp(-z_scores))
@@ -4,11 +4,15 @@ Azure Blob Storage Client
 Client for Azure Blob Storage services.
 """
 
-from typing import Dict, Any, Optional, List, AsyncIterator
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
 import os
 import uuid
 import time
-from azure.storage.blob.aio import BlobServiceClient
+import asyncio
+import logging
+from contextlib import aclosing
+from azure.core.exceptions import ClientAuthenticationError, ResourceNotFoundError
+from azure.storage.blob.aio import BlobServiceClient, ContainerClient
 from azure.storage.blob import BlobClient
 from azure.identity import DefaultAzureCredential
 from models.validation import ValidationResult, ConfigValidation
@@ -17,6 +21,9 @@ from models.azure import AzureServiceResponse, EmbeddingResult, SearchResult, Se
 from models.workflow import WorkflowResult
 
 
+logger = logging.getLogger(__name__)
+
+
 class StorageClient:
     """Real Azure Blob Storage client for document management."""
     
@@ -52,6 +59,8 @@ class StorageClient:
         # Metrics tracking
         self.upload_count = 0
         self.download_count = 0
+        self.delete_count = 0
+        self.download_failures = 0
         self.list_count = 0
     
     async def upload_blob(self, container_name: str, blob_name: str, data: bytes) -> WorkflowResult:
@@ -126,12 +135,8 @@ class StorageClient:
                 blob=blob_name
             )
             
-            # Check if blob exists
-            blob_exists = await blob_client.exists()
-            if not blob_exists:
-                return None
-            
-            # Download the blob content
+            # Download directly - a missing blob surfaces as ResourceNotFoundError,
+            # so a separate exists() round-trip is unnecessary
             download_stream = await blob_client.download_blob()
             content = await download_stream.readall()
             
@@ -140,6 +145,8 @@ class StorageClient:
             
             return content
             
+        except ResourceNotFoundError:
+            return None
         except Exception as e:
             # Handle blob not found or other errors
             if "BlobNotFound" in str(e):
@@ -147,6 +154,40 @@ class StorageClient:
             else:
                 raise RuntimeError(f"Blob download failed: {str(e)}") from e
     
+    async def delete_blobs(
+        self,
+        container_name: str,
+        blob_names: List[str],
+        max_concurrency: Optional[int] = None
+    ) -> int:
+        """Delete blobs concurrently and return how many existed.
+        
+        A blob that is already gone is skipped. Any other failure is raised
+        once the remaining deletes have finished.
+        """
+        # === REAL AZURE BLOB STORAGE DELETE IMPLEMENTATION ===
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("STORAGE_DELETE_CONCURRENCY", "16"))
+        
+        container_client = self.blob_service_client.get_container_client(container_name)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def delete_blob(blob_name: str) -> bool:
+            async with semaphore:
+                try:
+                    await container_client.delete_blob(blob_name)
+                    return True
+                except ResourceNotFoundError:
+                    return False
+        
+        outcomes = await asyncio.gather(*(delete_blob(name) for name in blob_names), return_exceptions=True)
+        deleted = sum(outcome is True for outcome in outcomes)
+        self.delete_count += deleted
+        failures = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+        if failures:
+            raise RuntimeError(f"Blob delete failed for {len(failures)} blob(s): {str(failures[0])}") from failures[0]
+        return deleted
+    
     async def list_documents(self, container_name: str, max_results: Optional[int] = None) -> List[Dict[str, Any]]:
         """List documents using real Azure Blob Storage service."""
         # TODO: Implement advanced listing with filters and pagination
@@ -197,50 +238,19 @@ class StorageClient:
             else:
                 raise RuntimeError(f"Blob listing failed: {str(e)}") from e
     
-    async def scan_domain_documents(self, domain_path: str, container_name: Optional[str] = None) -> List[str]:
+    async def scan_domain_documents(self, domain_path: str, container_name: Optional[str] = None, max_documents: Optional[int] = None) -> List[str]:
         """Scan and download actual documents from Azure Blob Storage for domain analysis."""
-        # TODO: Implement advanced document filtering and processing
         # TODO: Add support for different document formats and parsing
         # TODO: Implement intelligent document sampling for large domains
         
         # === REAL AZURE BLOB STORAGE DOCUMENT SCANNING ===
-        if container_name is None:
-            container_name = self.container_name
-            
         try:
-            # List documents in the domain path
-            documents_info = await self.list_documents(container_name)
-            
-            # Filter documents by domain path if specified
-            if domain_path:
-                domain_documents = [
-                    doc for doc in documents_info 
-                    if doc["name"].startswith(domain_path) or domain_path in doc["name"]
-                ]
-            else:
-                domain_documents = documents_info
-            
-            # Download actual document content
             document_contents = []
-            for doc_info in domain_documents:
-                try:
-                    content_bytes = await self.download_blob(container_name, doc_info["name"])
-                    if content_bytes:
-                        # Decode content assuming UTF-8 text documents
-                        try:
-                            content_text = content_bytes.decode('utf-8')
-                            document_contents.append(content_text)
-                        except UnicodeDecodeError:
-                            # Handle binary files by adding a placeholder
-                            document_contents.append(f"[Binary file: {doc_info['name']} - {doc_info['size_bytes']} bytes]")
-                    
-                    # Limit to reasonable number for basic implementation
-                    if len(document_contents) >= 10:  # Use configurable limit
+            async with aclosing(self.stream_domain_documents(domain_path, container_name)) as documents:
+                async for _, content_text in documents:
+                    document_contents.append(content_text)
+                    if max_documents is not None and len(document_contents) >= max_documents:
                         break
-                        
-                except Exception as e:
-                    # Log error but continue with other documents
-                    continue
             
             # Return actual document content, not fake data
             return document_contents if document_contents else [f"[No documents found in domain path: {domain_path}]"]
@@ -248,6 +258,142 @@ class StorageClient:
         except Exception as e:
             # Return error information instead of fake data
             return [f"[Error scanning domain {domain_path}: {str(e)}]"]
+    
+    async def list_blob_etags(self, domain_path: str, container_name: Optional[str] = None) -> Dict[str, str]:
+        """Map every blob name under a domain prefix to its current ETag.
+        
+        Listing returns properties only, so this is cheap compared to a scan and
+        lets callers detect new, changed and deleted blobs without downloading.
+        """
+        # === REAL AZURE BLOB STORAGE PREFIX LISTING ===
+        if container_name is None:
+            container_name = self.container_name
+        
+        container_client = self.blob_service_client.get_container_client(container_name)
+        try:
+            blob_etags = {}
+            async for blob in container_client.list_blobs(name_starts_with=domain_path or None):
+                blob_etags[blob.name] = blob.etag
+            self.list_count += 1
+            return blob_etags
+        except ResourceNotFoundError:
+            return {}
+        except Exception as e:
+            raise RuntimeError(f"Blob listing failed: {str(e)}") from e
+    
+    async def stream_domain_documents(
+        self,
+        domain_path: str,
+        container_name: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        blob_names: Optional[List[str]] = None,
+        failed_blobs: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[Tuple[str, str]]:
+        """Stream (blob_name, text) pairs for every blob under a domain prefix.
+        
+        Blobs are listed server-side with ``name_starts_with`` and downloaded by
+        a bounded pool of workers. Memory stays bounded by the queue sizes, not
+        by the container size. Documents are yielded in completion order.
+        Passing ``blob_names`` skips the listing and downloads only those blobs.
+        
+        A blob that fails to download is logged, counted in
+        ``download_failures`` and recorded in ``failed_blobs`` (name to error)
+        if given, and the stream continues. Authentication and missing
+        container errors end the stream instead.
+        """
+        # === REAL AZURE BLOB STORAGE STREAMING SCAN ===
+        if container_name is None:
+            container_name = self.container_name
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("STORAGE_DOWNLOAD_CONCURRENCY", "16"))
+        
+        container_client = self.blob_service_client.get_container_client(container_name)
+        blob_queue: asyncio.Queue = asyncio.Queue(maxsize=max_concurrency * 2)
+        document_queue: asyncio.Queue = asyncio.Queue(maxsize=max_concurrency)
+        
+        listing_errors: List[Exception] = []
+        download_errors: List[Exception] = []
+        
+        async def list_blobs() -> None:
+            try:
+                if blob_names is not None:
+                    for blob_name in blob_names:
+                        await blob_queue.put(blob_name)
+                else:
+                    async for blob in container_client.list_blobs(name_starts_with=domain_path or None):
+                        await blob_queue.put(blob.name)
+                    self.list_count += 1
+            except Exception as e:
+                listing_errors.append(e)
+            # One end-of-stream marker per worker, even if listing failed
+            for _ in range(max_concurrency):
+                await blob_queue.put(None)
+        
+        async def download_documents() -> None:
+            try:
+                while True:
+                    blob_name = await blob_queue.get()
+                    if blob_name is None:
+                        break
+                    document = await self._download_document(container_client, blob_name, failed_blobs)
+                    if document is not None:
+                        await document_queue.put(document)
+            except Exception as e:
+                download_errors.append(e)
+            await document_queue.put(None)
+        
+        lister = asyncio.create_task(list_blobs())
+        workers = [asyncio.create_task(download_documents()) for _ in range(max_concurrency)]
+        
+        try:
+            finished_workers = 0
+            while finished_workers < max_concurrency:
+                document = await document_queue.get()
+                if document is None:
+                    # Auth or configuration errors would fail every remaining blob
+                    if download_errors:
+                        raise download_errors[0]
+                    finished_workers += 1
+                    continue
+                yield document
+            
+            # Surface listing errors (e.g. missing container) to the caller
+            if listing_errors:
+                raise listing_errors[0]
+        finally:
+            for task in [lister, *workers]:
+                task.cancel()
+            await asyncio.gather(lister, *workers, return_exceptions=True)
+    
+    async def _download_document(
+        self,
+        container_client: ContainerClient,
+        blob_name: str,
+        failed_blobs: Optional[Dict[str, str]] = None
+    ) -> Optional[Tuple[str, str]]:
+        """Download one blob as text, or None if it vanished or failed."""
+        try:
+            download_stream = await container_client.get_blob_client(blob_name).download_blob()
+            content_bytes = await download_stream.readall()
+            self.download_count += 1
+        except ClientAuthenticationError:
+            raise
+        except Exception as e:
+            if isinstance(e, ResourceNotFoundError) and getattr(e, "error_code", None) == "ContainerNotFound":
+                raise
+            # Blob deleted since listing or transient failure - skip it
+            logger.warning("Skipping blob %s: download failed: %s", blob_name, e)
+            self.download_failures += 1
+            if failed_blobs is not None:
+                failed_blobs[blob_name] = str(e)
+            return None
+        
+        try:
+            # Decode content assuming UTF-8 text documents
+            return blob_name, content_bytes.decode('utf-8')
+        except UnicodeDecodeError:
+            # Handle binary files by adding a placeholder
+            return blob_name, f"[Binary file: {blob_name} - {len(content_bytes)} bytes]"
 
     async def health_check(self) -> AzureServiceResponse:
         """Real health check for Azure Blob Storage service."""
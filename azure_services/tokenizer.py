@@ -0,0 +1,215 @@
+"""
+Tokenizer
+
+Offline BPE token counting compatible with tiktoken encodings.
+
+The vocabulary is a tiktoken ``.tiktoken`` ranks file (one base64 token and
+its rank per line), e.g. ``cl100k_base.tiktoken`` for gpt-4 and
+text-embedding-ada-002, placed at TOKENIZER_VOCAB_PATH so no download is
+needed at runtime. Provision it once per environment with
+
+    python -m azure_services.tokenizer
+
+which downloads cl100k_base and checks its published sha256.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from pathlib import Path
+import base64
+import hashlib
+import logging
+import os
+import re
+import httpx
+
+try:
+    import tiktoken
+except ImportError:
+    # Pure-Python BPE below gives the same tokens, only slower on a cold cache
+    tiktoken = None
+
+
+# cl100k_base pre-tokenizer. The stdlib re module has no \p{L} / \p{N}
+# classes, so letters are [^\W\d_] and numbers \d.
+PRETOKEN_PATTERN = re.compile(
+    r"(?i:'s|'t|'re|'ve|'m|'ll|'d)"
+    r"|(?:[^\r\n\w]|_)?[^\W\d_]+"
+    r"|\d{1,3}"
+    r"| ?(?:[^\s\w]|_)+[\r\n]*"
+    r"|\s*[\r\n]+"
+    r"|\s+(?!\S)"
+    r"|\s+"
+)
+TIKTOKEN_PATTERN = (
+    r"""(?i:'s|'t|'re|'ve|'m|'ll|'d)|[^\r\n\p{L}\p{N}]?\p{L}+|\p{N}{1,3}| ?[^\s\p{L}\p{N}]+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+"""
+)
+
+# Chat format framing per message and for the primed assistant reply
+MESSAGE_OVERHEAD_TOKENS = 3
+REPLY_PRIMING_TOKENS = 3
+
+# Published cl100k_base ranks, as pinned by tiktoken
+CL100K_BASE_URL = "https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken"
+CL100K_BASE_SHA256 = "223921b76ee99bde995b7ff738513eef100fb51d18c93597a113bcffe865b2a7"
+
+logger = logging.getLogger(__name__)
+
+
+def default_vocab_path() -> Path:
+    """TOKENIZER_VOCAB_PATH, or cl100k_base.tiktoken under CACHE_DIR/tokenizer."""
+    return Path(os.getenv(
+        "TOKENIZER_VOCAB_PATH",
+        str(Path(os.getenv("CACHE_DIR", "cache")) / "tokenizer" / "cl100k_base.tiktoken")
+    ))
+
+
+def provision_vocabulary(
+    vocab_path: Optional[Path] = None,
+    url: str = CL100K_BASE_URL,
+    expected_sha256: str = CL100K_BASE_SHA256
+) -> Path:
+    """Download a ranks file to vocab_path unless it is already there, verifying its sha256."""
+    vocab_path = Path(vocab_path or default_vocab_path())
+    if vocab_path.exists():
+        return vocab_path
+    try:
+        response = httpx.get(url, timeout=float(os.getenv("TOKENIZER_DOWNLOAD_TIMEOUT", "60")), follow_redirects=True)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        raise RuntimeError(f"Tokenizer vocabulary download failed: {str(e)}") from e
+    digest = hashlib.sha256(response.content).hexdigest()
+    if digest != expected_sha256:
+        raise RuntimeError(f"Tokenizer vocabulary from {url} has sha256 {digest}, expected {expected_sha256}")
+
+    vocab_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = vocab_path.with_suffix(f".{os.getpid()}.tmp")
+    temp_path.write_bytes(response.content)
+    os.replace(temp_path, vocab_path)
+    return vocab_path
+
+
+def load_bpe_ranks(vocab_path: Path) -> Dict[bytes, int]:
+    """Read a tiktoken ranks file into a token-bytes to rank mapping."""
+    ranks = {}
+    for line in Path(vocab_path).read_bytes().splitlines():
+        if line:
+            token, rank = line.split()
+            ranks[base64.b64decode(token)] = int(rank)
+    return ranks
+
+
+class Tokenizer:
+    """Counts and encodes text with a byte-level BPE vocabulary.
+
+    Counts are memoized per text in an LRU, and BPE merges per pre-token, so
+    repeated strings cost one dictionary lookup. Without a vocabulary file
+    counts fall back to one token per six characters of each pre-token, close
+    to cl100k on English prose, and ``exact`` is False. That fallback is
+    logged as a warning, or raises when TOKENIZER_REQUIRE_VOCAB is true.
+    """
+
+    def __init__(self, vocab_path: Optional[Path] = None, cache_size: Optional[int] = None):
+        """Load the vocabulary, if present, and set up the count caches."""
+        # === TOKENIZER IMPLEMENTATION ===
+        if vocab_path is None:
+            vocab_path = default_vocab_path()
+        if cache_size is None:
+            cache_size = int(os.getenv("TOKENIZER_CACHE_SIZE", "65536"))
+        self.vocab_path = Path(vocab_path)
+        self.encoding_name = self.vocab_path.name.split(".")[0]
+
+        self.ranks: Optional[Dict[bytes, int]] = None
+        self._encoding = None
+        if self.vocab_path.exists():
+            self.ranks = load_bpe_ranks(self.vocab_path)
+            if tiktoken is not None:
+                self._encoding = tiktoken.Encoding(
+                    name=self.encoding_name,
+                    pat_str=TIKTOKEN_PATTERN,
+                    mergeable_ranks=self.ranks,
+                    special_tokens={}
+                )
+        elif os.getenv("TOKENIZER_REQUIRE_VOCAB", "false").lower() == "true":
+            raise FileNotFoundError(
+                f"No tokenizer vocabulary found at {self.vocab_path}; run python -m azure_services.tokenizer"
+            )
+        else:
+            logger.warning(
+                "No tokenizer vocabulary found at %s; token counts are approximate. "
+                "Run python -m azure_services.tokenizer to provision it.",
+                self.vocab_path
+            )
+
+        # Per-instance caches so each vocabulary keeps its own counts
+        self.count = lru_cache(maxsize=cache_size)(self._count)
+        self._encode_piece = lru_cache(maxsize=cache_size)(self._merge_piece)
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from the BPE vocabulary rather than an approximation."""
+        return self.ranks is not None
+
+    def encode(self, text: str) -> List[int]:
+        """Token ids of text, ignoring special tokens."""
+        if self.ranks is None:
+            raise ValueError(f"No tokenizer vocabulary found at {self.vocab_path}")
+        if self._encoding is not None:
+            return self._encoding.encode_ordinary(text)
+        return [token for piece in PRETOKEN_PATTERN.findall(text) for token in self._encode_piece(piece)]
+
+    def count_batch(self, texts: List[str]) -> List[int]:
+        """Token counts of many texts, in input order."""
+        return list(map(self.count, texts))
+
+    def count_messages(self, messages: List[Dict[str, str]]) -> int:
+        """Prompt tokens of a chat request, including the chat format framing."""
+        return sum(
+            MESSAGE_OVERHEAD_TOKENS + sum(self.count(str(value or "")) for value in message.values())
+            for message in messages
+        ) + REPLY_PRIMING_TOKENS
+
+    def cache_stats(self) -> Tuple[int, int]:
+        """(hits, misses) of the per-text count cache."""
+        info = self.count.cache_info()
+        return info.hits, info.misses
+
+    def _count(self, text: str) -> int:
+        """Uncached token count of text."""
+        if self._encoding is not None:
+            return len(self._encoding.encode_ordinary(text))
+        pieces = PRETOKEN_PATTERN.findall(text)
+        if self.ranks is None:
+            return sum((len(piece) + 5) // 6 for piece in pieces)
+        return sum(map(len, map(self._encode_piece, pieces)))
+
+    def _merge_piece(self, piece: str) -> Tuple[int, ...]:
+        """BPE-merge one pre-token, always joining the lowest-ranked adjacent pair."""
+        data = piece.encode("utf-8")
+        rank = self.ranks.get(data)
+        if rank is not None:
+            return (rank,)
+
+        parts = [data[i:i + 1] for i in range(len(data))]
+        while len(parts) > 1:
+            best_rank = None
+            best_index = 0
+            for i in range(len(parts) - 1):
+                rank = self.ranks.get(parts[i] + parts[i + 1])
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best_rank = rank
+                    best_index = i
+            if best_rank is None:
+                break
+            parts[best_index:best_index + 2] = [parts[best_index] + parts[best_index + 1]]
+        return tuple(self.ranks[part] for part in parts)
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer() -> Tokenizer:
+    """Process-wide tokenizer for the configured vocabulary."""
+    return Tokenizer()
+
+
+if __name__ == "__main__":
+    print(provision_vocabulary())
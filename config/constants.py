@@ -24,6 +24,9 @@ class CorpusAnalysisConstants:
     # Basic statistical analysis bounds
     MIN_VOCABULARY_DIVERSITY: float = 0.1    # Minimum expected vocabulary diversity
     MAX_VOCABULARY_DIVERSITY: float = 0.9    # Maximum expected vocabulary diversity
+    
+    # Technical density analysis
+    TECHNICAL_TERM_MIN_LENGTH: int = 7       # Words this long count as technical terms
 
 
 @dataclass(frozen=True)
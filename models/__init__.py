@@ -12,11 +12,12 @@ from .domain import DomainConfig, CorpusAnalysis, DomainStatistics, DomainDiscov
 from .knowledge import KnowledgeExtraction, EntityResult, RelationshipResult, KnowledgeValidation
 
 # Search operation models  
-from .search import SearchRequest, SearchResponse, SearchResults, SearchMetrics
+from .search import SearchRequest, SearchResponse, SearchResults, SearchMetrics, SearchQuery, MultiSearchResult
 
 # Azure service integration models (includes ML models)
 from .azure import (
-    AzureServiceResponse, EmbeddingResult, SearchResult, ServiceHealth,
+    AzureServiceResponse, EmbeddingResult, SearchResult, ServiceHealth, ConnectionPoolMetrics,
+    BulkItemFailure, BulkLoadResult, TraversalMetrics, GremlinScriptMetrics, CompletionStreamMetrics,
     GNNTrainingConfig, TrainingJobStatus, ModelDeploymentInfo
 )
 
@@ -51,12 +52,20 @@ __all__ = [
     "SearchResponse", 
     "SearchResults",
     "SearchMetrics",
+    "SearchQuery",
+    "MultiSearchResult",
     
     # Azure models (Core)
     "AzureServiceResponse",
     "EmbeddingResult",
     "SearchResult",
     "ServiceHealth",
+    "ConnectionPoolMetrics",
+    "BulkItemFailure",
+    "BulkLoadResult",
+    "TraversalMetrics",
+    "GremlinScriptMetrics",
+    "CompletionStreamMetrics",
     
     # Azure models (ML)
     "GNNTrainingConfig",
@@ -68,6 +68,77 @@ class ServiceHealth(BaseModel):
     pass
 
 
+class ConnectionPoolMetrics(BaseModel):
+    """Connection pool utilisation for long-lived Azure service connections."""
+    
+    # === BASIC IMPLEMENTATION BELOW ===
+    service_name: str = Field(..., description="Name of Azure service the pool connects to")
+    pool_size: int = Field(..., ge=0, description="Maximum number of pooled connections")
+    open_connections: int = Field(default=0, ge=0, description="Connections currently open")
+    in_use: int = Field(default=0, ge=0, description="Connections currently checked out")
+    total_acquires: int = Field(default=0, ge=0, description="Number of successful acquisitions")
+    total_wait_time: float = Field(default=0.0, ge=0.0, description="Cumulative time spent waiting for a connection in seconds")
+    max_wait_time: float = Field(default=0.0, ge=0.0, description="Longest single wait for a connection in seconds")
+    reconnects: int = Field(default=0, ge=0, description="Connections replaced after a drop or failed health check")
+
+
+class TraversalMetrics(BaseModel):
+    """Latency statistics for one named Gremlin traversal template."""
+    
+    # === BASIC IMPLEMENTATION BELOW ===
+    template_name: str = Field(..., description="Traversal template name (or 'adhoc' for raw scripts)")
+    executions: int = Field(default=0, ge=0, description="Number of executions")
+    total_latency: float = Field(default=0.0, ge=0.0, description="Cumulative latency in seconds")
+    avg_latency: float = Field(default=0.0, ge=0.0, description="Mean latency in seconds")
+    max_latency: float = Field(default=0.0, ge=0.0, description="Slowest execution in seconds")
+
+
+class GremlinScriptMetrics(BaseModel):
+    """Server-side script cache effectiveness for submitted Gremlin scripts."""
+    
+    # === BASIC IMPLEMENTATION BELOW ===
+    total_submissions: int = Field(default=0, ge=0, description="Scripts submitted to the server")
+    distinct_scripts: int = Field(default=0, ge=0, description="Distinct script texts the server had to compile")
+    compile_reduction: float = Field(default=0.0, ge=0.0, le=1.0, description="Fraction of submissions served by an already compiled script")
+    templates: List[TraversalMetrics] = Field(default_factory=list, description="Per-template latency statistics")
+
+
+class BulkItemFailure(BaseModel):
+    """Single vertex or edge that could not be written during a bulk load."""
+    
+    # === BASIC IMPLEMENTATION BELOW ===
+    item_type: str = Field(..., description="Kind of graph item (vertex, edge)")
+    item_id: str = Field(..., description="Vertex id or 'from->to' pair for edges")
+    error: str = Field(..., description="Reason the item was not written")
+
+
+class BulkLoadResult(BaseModel):
+    """Outcome of a bulk knowledge graph load into Cosmos DB."""
+    
+    # === BASIC IMPLEMENTATION BELOW ===
+    vertices_submitted: int = Field(default=0, ge=0, description="Vertices sent to the graph")
+    vertices_stored: int = Field(default=0, ge=0, description="Vertices written successfully")
+    edges_submitted: int = Field(default=0, ge=0, description="Edges sent to the graph")
+    edges_stored: int = Field(default=0, ge=0, description="Edges written successfully")
+    batches_sent: int = Field(default=0, ge=0, description="Batched traversals submitted, including retries")
+    throttled_retries: int = Field(default=0, ge=0, description="Batches retried after 429/RU throttling")
+    failures: List[BulkItemFailure] = Field(default_factory=list, description="Per-item failures")
+    load_time: float = Field(default=0.0, ge=0.0, description="Total load time in seconds")
+
+
+class CompletionStreamMetrics(BaseModel):
+    """Latency and usage of one streamed chat completion."""
+    
+    # === BASIC IMPLEMENTATION BELOW ===
+    request_id: str = Field(..., description="Unique request identifier")
+    time_to_first_token: Optional[float] = Field(None, ge=0.0, description="Seconds until the first content delta arrived")
+    total_time: float = Field(default=0.0, ge=0.0, description="Seconds until the stream finished")
+    chunk_count: int = Field(default=0, ge=0, description="Content deltas received")
+    prompt_tokens: Optional[int] = Field(None, ge=0, description="Prompt tokens reported by the service")
+    completion_tokens: Optional[int] = Field(None, ge=0, description="Completion tokens reported by the service")
+    finish_reason: Optional[str] = Field(None, description="Why generation stopped (stop, length, content_filter)")
+
+
 # ===== AZURE ML MODELS (Centralized from local definitions) =====
 
 class GNNTrainingConfig(BaseModel):
@@ -95,4 +95,26 @@ class SearchMetrics(BaseModel):
     relevance_scores: List[float] = Field(default_factory=list, description="Relevance scores of all results")
     avg_relevance: float = Field(..., ge=0.0, le=1.0, description="Average relevance score")
     cache_hit: bool = Field(..., description="Whether results came from cache")
-    feedback_score: Optional[float] = Field(None, ge=0.0, le=1.0, description="User feedback score if available")
\ No newline at end of file
+    feedback_score: Optional[float] = Field(None, ge=0.0, le=1.0, description="User feedback score if available")
+
+class SearchQuery(BaseModel):
+    """One index lookup within a multi-search batch."""
+    
+    # === BASIC IMPLEMENTATION BELOW ===
+    mode: str = Field(..., description="Search mode (vector, hybrid, text)")
+    text: Optional[str] = Field(None, description="Query text for hybrid and text searches")
+    vector: Optional[List[float]] = Field(None, description="Query vector for vector and hybrid searches")
+    top_k: Optional[int] = Field(None, ge=1, description="Maximum results (uses VECTOR_SEARCH_TOP_K if not provided)")
+
+
+class MultiSearchResult(BaseModel):
+    """Outcome of one lookup in a multi-search batch."""
+    
+    # === BASIC IMPLEMENTATION BELOW ===
+    request_index: int = Field(..., ge=0, description="Position of the request in the batch")
+    mode: str = Field(..., description="Search mode of the request")
+    success: bool = Field(..., description="Whether this lookup succeeded")
+    results: List[Dict[str, Any]] = Field(default_factory=list, description="Search results for this lookup")
+    metrics: Optional[SearchMetrics] = Field(None, description="Timing, relevance and cache outcome of this lookup")
+    error: Optional[str] = Field(None, description="Error message if this lookup failed or timed out")
+    response_time: float = Field(default=0.0, ge=0.0, description="Time spent on this lookup in seconds")
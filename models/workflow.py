@@ -38,6 +38,8 @@ class NodeExecution(BaseModel):
     # TODO: Define execution_time float field with description "Node execution time in seconds"
     # TODO: Define success bool field with description "Whether node execution succeeded"
     # TODO: Define error_details Optional[str] field with description "Error details if node failed"
+    # TODO: Define started_at Optional[datetime] field with description "When node execution started"
+    # TODO: Define document_id Optional[str] field with description "Document the node ran for in a per-document batch"
     
     # === BASIC IMPLEMENTATION BELOW ===
     node_id: str = Field(..., description="Workflow node identifier")
@@ -47,6 +49,8 @@ class NodeExecution(BaseModel):
     execution_time: float = Field(..., ge=0.0, description="Node execution time in seconds")
     success: bool = Field(..., description="Whether node execution succeeded")
     error_details: Optional[str] = Field(None, description="Error details if node failed")
+    started_at: Optional[datetime] = Field(None, description="When node execution started")
+    document_id: Optional[str] = Field(None, description="Document the node ran for in a per-document batch")
 
 
 class WorkflowResult(BaseModel):
@@ -65,6 +69,7 @@ class WorkflowResult(BaseModel):
     workflow_id: str = Field(..., description="Workflow execution identifier")
     workflow_name: str = Field(..., description="Name of executed workflow")
     success: bool = Field(..., description="Whether workflow completed successfully")
+    node_executions: List[NodeExecution] = Field(default_factory=list, description="Results from each node")
     final_output: Dict[str, Any] = Field(default_factory=dict, description="Final workflow output")
     total_time: float = Field(default=0.0, ge=0.0, description="Total workflow execution time")
     completed_at: datetime = Field(..., description="When workflow completed")
@@ -120,6 +125,10 @@ class FlowNode(BaseModel):
     # TODO: Define llm_config Optional[Dict[str, Any]] field with description "LLM configuration if LLM node"
     # TODO: Define validation_rules Optional[List[str]] field with description "Validation rules if validation node"
     # TODO: Define output_mapping Dict[str, str] field with description "How to map outputs to downstream nodes"
+    # TODO: Define function Optional[str] field with description "Registered function name if python or validation node"
+    # TODO: Define inputs List[str] field with description "Context variables the node reads"
+    # TODO: Define outputs List[str] field with description "Context variables the node produces"
+    # TODO: Define max_execution_time Optional[float] field with description "Node timeout in seconds"
     
     # === BASIC IMPLEMENTATION BELOW ===
     node_id: str = Field(..., description="Unique identifier for the node")
@@ -129,6 +138,10 @@ class FlowNode(BaseModel):
     llm_config: Optional[Dict[str, Any]] = Field(None, description="LLM configuration if LLM node")
     validation_rules: Optional[List[str]] = Field(None, description="Validation rules if validation node")
     output_mapping: Dict[str, str] = Field(default_factory=dict, description="How to map outputs to downstream nodes")
+    function: Optional[str] = Field(None, description="Registered function name if python or validation node")
+    inputs: List[str] = Field(default_factory=list, description="Context variables the node reads")
+    outputs: List[str] = Field(default_factory=list, description="Context variables the node produces")
+    max_execution_time: Optional[float] = Field(None, gt=0.0, description="Node timeout in seconds")
 
 
 class WorkflowExecution(BaseModel):
@@ -5,17 +5,14 @@ YAML-driven workflow orchestration with Jinja2 template management for
 intelligent, context-aware prompt engineering and execution.
 """
 
-# TODO: Import FlowMgr once implemented
-# from .flow_mgr import FlowMgr
-# TODO: Import TemplateMgr once implemented
-# from .template_mgr import TemplateMgr
+from .flow_mgr import FlowMgr
+from .template_mgr import TemplateMgr
 # TODO: Import PromptComposer once implemented
 # from .prompt_composer import PromptComposer
 
-# TODO: Define __all__ exports once modules are implemented
-# __all__ = [
-#     "FlowMgr",
-#     "TemplateMgr", 
-#     "PromptComposer",
-# ]
-pass
\ No newline at end of file
+__all__ = [
+    "FlowMgr",
+    "TemplateMgr",
+    # TODO: Export PromptComposer once implemented
+    # "PromptComposer",
+]
@@ -5,16 +5,29 @@ Main workflow orchestration engine for executing DAG-based prompt flows
 with state management and recovery capabilities.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime
 from enum import Enum
+from pathlib import Path
+import asyncio
+import inspect
+import json
+import os
+import re
+import time
+import uuid
+import jinja2
+import yaml
+from azure_services.openai_client import OpenAIClient
 from models.knowledge import KnowledgeExtraction, EntityResult, RelationshipResult, KnowledgeValidation
 from models.workflow import (
     WorkflowContext, WorkflowResult, NodeExecution,
-    FlowNode, WorkflowExecution
+    FlowNode, WorkflowExecution, TemplateConfig
 )
 from models.domain import DomainConfig, CorpusAnalysis, DomainStatistics, DomainDiscovery
 from models.validation import ValidationResult, ConfigValidation
 from models.search import SearchRequest, SearchResponse, SearchResults, SearchMetrics
+from .template_mgr import TemplateMgr
 
 
 class FlowStatus(str, Enum):
@@ -28,35 +41,431 @@ class FlowStatus(str, Enum):
 
 
 class FlowMgr:
-    """Basic workflow orchestration engine - simplified for core functionality."""
+    """DAG workflow engine for the YAML prompt flows in defs/.
+
+    Stages run as soon as every stage they depend on has finished, so
+    independent branches run concurrently up to max_concurrency. Stage
+    outputs are merged into the shared context that later stages read
+    their inputs from. A failed stage fails the workflow and skips its
+    dependents, while unrelated branches keep running.
+
+    Runs given an execution_id checkpoint every finished stage, and every
+    finished document of a batch, through StatePersistence. Running the
+    same execution_id again after a crash skips whatever was checkpointed.
+    """
     
-    def __init__(self):
-        """Initialize basic flow manager."""
+    def __init__(
+        self,
+        template_mgr: Optional[TemplateMgr] = None,
+        openai_client: Optional[OpenAIClient] = None,
+        functions: Optional[Dict[str, Callable[..., Any]]] = None,
+        max_concurrency: Optional[int] = None,
+        state_persistence: Optional[Any] = None
+    ):
+        """Initialize flow manager with its template, LLM and function providers."""
         # TODO: Basic initialization - set up YAML workflow loader
         # TODO: Configure template manager integration
         # TODO: Set up basic DAG execution engine
-        pass
+        
+        # === BASIC IMPLEMENTATION BELOW ===
+        self.defs_dir = Path(__file__).parent / "defs"
+        self.templates_dir = Path(__file__).parent / "templates"
+        self.template_mgr = template_mgr or TemplateMgr()
+        # Created on first LLM node so non-LLM flows need no Azure credentials
+        self.openai_client = openai_client
+        self.functions: Dict[str, Callable[..., Any]] = dict(functions or {})
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("FLOW_MAX_CONCURRENCY", "4"))
+        self.max_concurrency = max_concurrency
+        # StatePersistence, created on the first checkpointed run
+        self.state_persistence = state_persistence
+        
+        # Metrics tracking
+        self.workflow_count = 0
+        self.node_count = 0
+        self.nodes_resumed = 0
+        self.documents_skipped = 0
+    
+    def register_function(self, name: str, function: Callable[..., Any]) -> None:
+        """Make a sync or async function available to python and validation nodes."""
+        self.functions[name] = function
     
-    async def execute_workflow(self, workflow_name: str, context: Dict[str, Any]) -> WorkflowResult:
-        """Basic workflow execution - simplified version."""
+    async def execute_workflow(
+        self,
+        workflow_name: str,
+        context: Dict[str, Any],
+        execution_id: Optional[str] = None
+    ) -> WorkflowResult:
+        """Run every stage of a workflow in dependency order, independent stages concurrently.
+        
+        With an execution_id, stages are checkpointed as they finish and
+        stages already checkpointed under that id are not run again.
+        """
         # TODO: Load workflow definition from defs/ directory
         # TODO: Execute workflow nodes in dependency order
         # TODO: Return workflow execution results
-        pass
+        
+        # === BASIC IMPLEMENTATION BELOW ===
+        if execution_id is None:
+            return await self._execute(workflow_name, context)
+        
+        execution = await self._open_execution(execution_id, workflow_name, context)
+        completed = {}
+        if execution is not None:
+            completed = {e.node_id: e for e in execution.node_executions if e.document_id is None}
+        result = await self._execute(workflow_name, context, execution_id, completed=completed)
+        await self.state_persistence.finish_workflow(execution_id, result.success, result.final_output)
+        return result
     
-    async def load_workflow(self, workflow_name: str) -> WorkflowResult:
-        """Basic workflow loading - simplified version."""
+    async def execute_documents(
+        self,
+        workflow_name: str,
+        documents: Dict[str, Dict[str, Any]],
+        execution_id: Optional[str] = None
+    ) -> Dict[str, WorkflowResult]:
+        """Run a workflow once per document, keyed by document id.
+        
+        With an execution_id, documents whose run succeeded under that id
+        are skipped, and a document interrupted mid-workflow resumes after
+        its last checkpointed stage. Failed documents run again.
+        """
+        completed_documents: Dict[str, Dict[str, Any]] = {}
+        completed_nodes: Dict[str, Dict[str, NodeExecution]] = {}
+        if execution_id is not None:
+            execution = await self._open_execution(execution_id, workflow_name, {"documents": list(documents)})
+            if execution is not None:
+                completed_documents = execution.execution_context["completed_documents"]
+                for node_execution in execution.node_executions:
+                    completed_nodes.setdefault(node_execution.document_id, {})[node_execution.node_id] = node_execution
+        
+        results: Dict[str, WorkflowResult] = {}
+        for document_id, context in documents.items():
+            if document_id in completed_documents:
+                self.documents_skipped += 1
+                results[document_id] = WorkflowResult(
+                    workflow_id=execution_id,
+                    workflow_name=self._read_definition(workflow_name).get("workflow_id", workflow_name),
+                    success=True,
+                    final_output=completed_documents[document_id],
+                    completed_at=datetime.now()
+                )
+                continue
+            result = await self._execute(
+                workflow_name, context, execution_id, document_id, completed_nodes.get(document_id, {})
+            )
+            if execution_id is not None and result.success:
+                await self.state_persistence.checkpoint_document(execution_id, document_id, result.final_output)
+            results[document_id] = result
+        
+        if execution_id is not None:
+            await self.state_persistence.finish_workflow(
+                execution_id,
+                all(result.success for result in results.values()),
+                {"documents_completed": sum(result.success for result in results.values())}
+            )
+        return results
+    
+    async def _execute(
+        self,
+        workflow_name: str,
+        context: Dict[str, Any],
+        execution_id: Optional[str] = None,
+        document_id: Optional[str] = None,
+        completed: Optional[Dict[str, NodeExecution]] = None
+    ) -> WorkflowResult:
+        """Run one workflow over context, reusing the completed node executions."""
+        start_time = time.time()
+        definition = self._read_definition(workflow_name)
+        nodes = await self.load_workflow(workflow_name, context)
+        
+        concurrency = self.max_concurrency
+        if not definition.get("execution_config", {}).get("parallel_execution", True):
+            concurrency = 1
+        
+        workflow_context = dict(context)
+        executions = await self._run_graph(nodes, workflow_context, concurrency, completed, execution_id, document_id)
+        self.workflow_count += 1
+        
+        failures = [execution for execution in executions if not execution.success]
+        final_output = {
+            key: value
+            for execution in executions if execution.success
+            for key, value in execution.output_data.items()
+        }
+        return WorkflowResult(
+            workflow_id=execution_id or str(uuid.uuid4()),
+            workflow_name=definition.get("workflow_id", workflow_name),
+            success=not failures,
+            node_executions=executions,
+            final_output=final_output,
+            total_time=time.time() - start_time,
+            completed_at=datetime.now(),
+            error_summary="; ".join(f"{e.node_id}: {e.error_details}" for e in failures) or None
+        )
+    
+    async def load_workflow(self, workflow_name: str, context: Optional[Dict[str, Any]] = None) -> List[FlowNode]:
+        """Parse a workflow's stages into FlowNodes in topological order.
+        
+        Templated settings such as max_execution_time are rendered against
+        context, so their ``default(...)`` values apply when it is omitted.
+        Raises ValueError for unknown dependencies or cycles.
+        """
         # TODO: Load YAML workflow definition from file
         # TODO: Parse workflow structure and dependencies
         # TODO: Return parsed workflow definition
-        pass
+        
+        # === BASIC IMPLEMENTATION BELOW ===
+        context = context or {}
+        nodes = []
+        for stage in self._read_definition(workflow_name).get("stages", []):
+            template_config = None
+            if stage.get("template"):
+                template_config = TemplateConfig(
+                    template_name=stage["template"],
+                    template_path=str(self.templates_dir / stage["template"]),
+                    template_type=stage["type"]
+                )
+            timeout = stage.get("performance_targets", {}).get("max_execution_time")
+            nodes.append(FlowNode(
+                node_id=stage["name"],
+                node_type=stage["type"],
+                dependencies=stage.get("depends_on", []),
+                template_config=template_config,
+                llm_config=stage.get("llm_config"),
+                validation_rules=stage.get("validation", {}).get("required_fields"),
+                output_mapping=stage.get("output_mapping", {}),
+                function=stage.get("function"),
+                inputs=stage.get("inputs", []),
+                outputs=stage.get("outputs", []),
+                max_execution_time=float(self._render_setting(timeout, context)) if timeout is not None else None
+            ))
+        return self._topological_order(nodes)
     
-    async def execute_node(self, node_config: Dict[str, Any], context: Dict[str, Any]) -> WorkflowResult:
-        """Basic node execution - simplified version."""
+    async def execute_node(self, node: FlowNode, context: Dict[str, Any]) -> NodeExecution:
+        """Run one node on its inputs from context, within its max_execution_time.
+        
+        Failures, including timeouts and missing required outputs, are
+        reported in the returned NodeExecution rather than raised.
+        """
         # TODO: Execute single workflow node with context
         # TODO: Handle node type (llm, python, template)
         # TODO: Return node execution results
-        pass
+        
+        # === BASIC IMPLEMENTATION BELOW ===
+        started_at = datetime.now()
+        start_time = time.time()
+        inputs = {name: context[name] for name in node.inputs if name in context}
+        outputs: Dict[str, Any] = {}
+        error_details = None
+        
+        try:
+            outputs = await asyncio.wait_for(self._run_node(node, inputs), timeout=node.max_execution_time)
+            missing = [field for field in node.validation_rules or [] if field not in outputs]
+            if missing:
+                error_details = f"Missing required outputs: {', '.join(missing)}"
+        except asyncio.TimeoutError:
+            error_details = f"Exceeded max_execution_time of {node.max_execution_time}s"
+        except Exception as e:
+            error_details = f"{type(e).__name__}: {str(e)}"
+        
+        self.node_count += 1
+        return NodeExecution(
+            node_id=node.node_id,
+            node_type=node.node_type,
+            input_data=inputs,
+            output_data={node.output_mapping.get(key, key): value for key, value in outputs.items()},
+            execution_time=time.time() - start_time,
+            success=error_details is None,
+            error_details=error_details,
+            started_at=started_at
+        )
+    
+    async def _run_graph(
+        self,
+        nodes: List[FlowNode],
+        context: Dict[str, Any],
+        concurrency: int,
+        completed: Optional[Dict[str, NodeExecution]] = None,
+        execution_id: Optional[str] = None,
+        document_id: Optional[str] = None
+    ) -> List[NodeExecution]:
+        """Start each node once its dependencies finish; returns executions in node order.
+        
+        Nodes in completed count as finished up front, and their outputs
+        are restored into context. With an execution_id every newly
+        finished node is checkpointed.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        pending = {node.node_id: node for node in nodes}
+        executions: Dict[str, NodeExecution] = {}
+        running: Dict[asyncio.Task, FlowNode] = {}
+        
+        for node in nodes:
+            if node.node_id in (completed or {}):
+                executions[node.node_id] = completed[node.node_id]
+                context.update(completed[node.node_id].output_data)
+                del pending[node.node_id]
+                self.nodes_resumed += 1
+        
+        async def run_limited(node: FlowNode) -> NodeExecution:
+            async with semaphore:
+                return await self.execute_node(node, context)
+        
+        try:
+            while pending or running:
+                # Skipping a node can unblock (and skip) its dependents, so repeat until stable
+                changed = True
+                while changed:
+                    changed = False
+                    for node in list(pending.values()):
+                        if not all(dependency in executions for dependency in node.dependencies):
+                            continue
+                        del pending[node.node_id]
+                        changed = True
+                        failed = [d for d in node.dependencies if not executions[d].success]
+                        if failed:
+                            executions[node.node_id] = NodeExecution(
+                                node_id=node.node_id,
+                                node_type=node.node_type,
+                                execution_time=0.0,
+                                success=False,
+                                error_details=f"Skipped: dependency {', '.join(failed)} failed"
+                            )
+                        else:
+                            running[asyncio.create_task(run_limited(node))] = node
+                if not running:
+                    break
+                
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    node = running.pop(task)
+                    execution = task.result()
+                    execution.document_id = document_id
+                    if execution_id is not None:
+                        await self.state_persistence.checkpoint_node(execution_id, execution)
+                    executions[node.node_id] = execution
+                    if execution.success:
+                        context.update(execution.output_data)
+        finally:
+            for task in running:
+                task.cancel()
+        
+        return [executions[node.node_id] for node in nodes]
+    
+    async def _run_node(self, node: FlowNode, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch a node by type and return its outputs."""
+        if node.node_type == "llm":
+            if node.template_config is None:
+                raise ValueError(f"LLM node '{node.node_id}' has no template")
+            rendered = await self.template_mgr.render_template(node.template_config.template_name, inputs)
+            if rendered.render_errors:
+                raise ValueError(f"Template rendering failed: {'; '.join(rendered.render_errors)}")
+            # Undefined variables render as empty text, which would still reach the model
+            if rendered.missing_variables:
+                raise ValueError(
+                    f"Template '{rendered.template_name}' is missing required variables: "
+                    f"{', '.join(rendered.missing_variables)}"
+                )
+            if self.openai_client is None:
+                self.openai_client = OpenAIClient()
+            response = await self.openai_client.chat_completion(
+                [{"role": "user", "content": rendered.rendered_content}],
+                **(node.llm_config or {})
+            )
+            return self._parse_llm_outputs(node, response)
+        
+        if node.node_type in ("python", "validation"):
+            function = self.functions.get(node.function)
+            if function is None:
+                raise ValueError(f"No function registered for '{node.function}'. Available: {', '.join(self.functions)}")
+            result = function(**inputs)
+            if inspect.isawaitable(result):
+                result = await result
+            return dict(result or {})
+        
+        raise ValueError(f"Unknown node type '{node.node_type}'. Available: llm, python, validation")
+    
+    async def _open_execution(
+        self,
+        execution_id: str,
+        workflow_name: str,
+        context: Dict[str, Any]
+    ) -> Optional[WorkflowExecution]:
+        """Replay the checkpoint log of execution_id, starting a new log if there is none."""
+        if self.state_persistence is None:
+            # Imported here since the agents package loads every agent on import
+            from agents.graph_flows.state_persist import StatePersistence
+            self.state_persistence = StatePersistence()
+        
+        execution = await self.state_persistence.load_execution(execution_id)
+        if execution is None:
+            definition = self._read_definition(workflow_name)
+            saved = await self.state_persistence.save_workflow_state(execution_id, WorkflowContext(
+                workflow_id=execution_id,
+                workflow_name=workflow_name,
+                domain=str(context.get("domain", "")),
+                input_data=context,
+                config_used={"workflow_version": str(definition.get("version", ""))},
+                started_at=datetime.now()
+            ))
+            if not saved.success:
+                raise RuntimeError(saved.error_summary)
+        elif execution.workflow_name != workflow_name:
+            raise ValueError(
+                f"Execution '{execution_id}' belongs to workflow '{execution.workflow_name}', not '{workflow_name}'"
+            )
+        return execution
+    
+    @staticmethod
+    def _parse_llm_outputs(node: FlowNode, response: str) -> Dict[str, Any]:
+        """Declared outputs from a JSON object response, else the raw text as the first output."""
+        text = response.strip()
+        fenced = re.match(r"^```(?:json)?\s*(.*?)\s*```$", text, re.DOTALL)
+        if fenced:
+            text = fenced.group(1)
+        try:
+            parsed = json.loads(text)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, dict):
+            return {key: parsed[key] for key in node.outputs if key in parsed} if node.outputs else parsed
+        return {node.outputs[0] if node.outputs else node.node_id: response}
+    
+    @staticmethod
+    def _topological_order(nodes: List[FlowNode]) -> List[FlowNode]:
+        """Order nodes so dependencies come first, keeping definition order among peers."""
+        by_id = {node.node_id: node for node in nodes}
+        for node in nodes:
+            unknown = [dependency for dependency in node.dependencies if dependency not in by_id]
+            if unknown:
+                raise ValueError(f"Node '{node.node_id}' depends on unknown nodes: {', '.join(unknown)}")
+        
+        ordered: List[FlowNode] = []
+        placed = set()
+        remaining = list(nodes)
+        while remaining:
+            ready = [node for node in remaining if all(d in placed for d in node.dependencies)]
+            if not ready:
+                raise ValueError(f"Workflow has a dependency cycle among: {', '.join(n.node_id for n in remaining)}")
+            ordered.extend(ready)
+            placed.update(node.node_id for node in ready)
+            remaining = [node for node in remaining if node.node_id not in placed]
+        return ordered
+    
+    def _read_definition(self, workflow_name: str) -> Dict[str, Any]:
+        """Parsed YAML for a workflow name, with or without the .yaml suffix."""
+        path = self.defs_dir / f"{workflow_name.removesuffix('.yaml')}.yaml"
+        if not path.exists():
+            available = ", ".join(sorted(p.stem for p in self.defs_dir.glob("*.yaml")))
+            raise ValueError(f"Unknown workflow '{workflow_name}'. Available: {available}")
+        return yaml.safe_load(path.read_text()) or {}
+    
+    @staticmethod
+    def _render_setting(value: Any, context: Dict[str, Any]) -> Any:
+        """Render a Jinja-templated YAML setting such as "{{ x | default(45.0) }}"."""
+        if isinstance(value, str) and "{{" in value:
+            return jinja2.Environment().from_string(value).render(**context)
+        return value
 
 
 # =============================================================================
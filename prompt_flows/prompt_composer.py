@@ -11,7 +11,8 @@ from models.domain import DomainConfig, CorpusAnalysis, DomainStatistics, Domain
 from models.knowledge import KnowledgeExtraction, EntityResult, RelationshipResult, KnowledgeValidation
 from models.validation import ValidationResult, ConfigValidation
 from models.search import SearchRequest, SearchResponse, SearchResults, SearchMetrics
-from models.workflow import PromptContext, ComposedPrompt
+from models.workflow import PromptContext, ComposedPrompt, WorkflowResult
+from azure_services.tokenizer import get_tokenizer
 
 
 class PromptType(str, Enum):
@@ -48,6 +49,22 @@ class PromptComposer:
         # TODO: Return adapted prompt
         pass
     
+    def build_composed_prompt(
+        self,
+        prompt_content: str,
+        prompt_type: str,
+        composition_time: float,
+        **fields: Any
+    ) -> ComposedPrompt:
+        """Wrap composed text as a ComposedPrompt with its token estimate."""
+        return ComposedPrompt(
+            prompt_content=prompt_content,
+            prompt_type=prompt_type,
+            composition_time=composition_time,
+            estimated_tokens=get_tokenizer().count(prompt_content),
+            **fields
+        )
+    
     async def validate_prompt(self, prompt: str) -> WorkflowResult:
         """Basic prompt validation - simplified version."""
         # TODO: Validate prompt structure and completeness
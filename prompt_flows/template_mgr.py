@@ -5,8 +5,11 @@ Jinja2 template management system for maintainable, context-aware prompt
 engineering with template inheritance and validation.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
+import os
+import time
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, TemplateError, TemplateNotFound, meta, nodes
 from models.domain import DomainConfig, CorpusAnalysis, DomainStatistics, DomainDiscovery
 from models.search import SearchRequest, SearchResponse, SearchResults, SearchMetrics
 from models.validation import ValidationResult, ConfigValidation
@@ -16,28 +19,125 @@ from models.workflow import (
 )
 
 
+TEMPLATE_SUFFIX = ".jinja2"
+
+
+def optional_variables(ast: nodes.Template) -> List[str]:
+    """Variables the template guards itself, via ``| default``, ``is defined`` or a bare ``{% if x %}``."""
+    guarded = set()
+    for node in ast.find_all(nodes.Filter):
+        if node.name == "default" and isinstance(node.node, nodes.Name):
+            guarded.add(node.node.name)
+    for node in ast.find_all(nodes.Test):
+        if node.name == "defined" and isinstance(node.node, nodes.Name):
+            guarded.add(node.node.name)
+    for node in ast.find_all(nodes.If):
+        if isinstance(node.test, nodes.Name):
+            guarded.add(node.test.name)
+    return sorted(guarded)
+
+
+def template_type(template_name: str) -> str:
+    """Classify a template as domain, extraction, search or validation by its name."""
+    for marker, kind in (("extract", "extraction"), ("search", "search"), ("valid", "validation")):
+        if marker in template_name:
+            return kind
+    return "domain"
+
+
 class TemplateMgr:
-    """Basic template manager - simplified for core functionality."""
+    """Jinja2 template manager for the prompt templates in templates/.
+
+    Every template is compiled once, at startup when precompile is on, and
+    kept in memory with its variable metadata, so a render costs the
+    compiled render function plus two small set checks. Compiled bytecode
+    is also cached on disk under CACHE_DIR/templates, so later processes
+    skip code generation for unchanged templates.
+    """
     
-    def __init__(self):
+    def __init__(self, templates_dir: Optional[Path] = None, precompile: Optional[bool] = None):
         """Initialize basic template manager."""
         # TODO: Basic initialization - set up Jinja2 environment
         # TODO: Configure template loading from templates/ directory
-        pass
+        
+        # === BASIC IMPLEMENTATION BELOW ===
+        self.templates_dir = Path(templates_dir or Path(__file__).parent / "templates")
+        # Templates are not re-checked on disk per render unless asked for
+        self.auto_reload = os.getenv("TEMPLATE_AUTO_RELOAD", "false").lower() == "true"
+        bytecode_cache = None
+        if os.getenv("TEMPLATE_BYTECODE_CACHE_ENABLED", "true").lower() == "true":
+            bytecode_dir = Path(os.getenv("CACHE_DIR", "cache")) / "templates"
+            bytecode_dir.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(bytecode_dir))
+        self.env = Environment(
+            loader=FileSystemLoader(str(self.templates_dir)),
+            bytecode_cache=bytecode_cache,
+            auto_reload=self.auto_reload,
+            autoescape=False,
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+        
+        # template name -> compiled template, its metadata and every variable it reads
+        self._templates: Dict[str, Template] = {}
+        self._configs: Dict[str, TemplateConfig] = {}
+        self._variables: Dict[str, Tuple[str, ...]] = {}
+        
+        # Metrics tracking
+        self.compile_count = 0
+        self.render_count = 0
+        self.total_render_time = 0.0
+        
+        if precompile is None:
+            precompile = os.getenv("TEMPLATE_PRECOMPILE", "true").lower() == "true"
+        if precompile:
+            self.precompile()
+    
+    def precompile(self) -> List[str]:
+        """Compile every template in templates_dir and return their names."""
+        names = sorted(path.name for path in self.templates_dir.glob(f"*{TEMPLATE_SUFFIX}"))
+        for name in names:
+            self._compile(name)
+        return names
     
     async def load_template(self, template_name: str) -> TemplateConfig:
         """Basic template loading - simplified version."""
         # TODO: Implement basic template file loading
         # TODO: Read template from templates/ directory
         # TODO: Return basic template configuration
-        pass
+        
+        # === BASIC IMPLEMENTATION BELOW ===
+        return self._configs[self._get(template_name)[0]]
     
     async def render_template(self, template_name: str, context: Dict[str, Any]) -> TemplateRenderResult:
         """Basic template rendering - simplified version."""
         # TODO: Implement basic template rendering with Jinja2
         # TODO: Render template with provided context
         # TODO: Return rendered result
-        pass
+        
+        # === BASIC IMPLEMENTATION BELOW ===
+        start_time = time.perf_counter()
+        name, template = self._get(template_name)
+        render_errors = []
+        try:
+            rendered_content = template.render(context)
+        except (TemplateError, TypeError, ValueError, AttributeError, KeyError) as e:
+            rendered_content = ""
+            render_errors.append(f"{type(e).__name__}: {str(e)}")
+        render_time = time.perf_counter() - start_time
+        
+        self.render_count += 1
+        self.total_render_time += render_time
+        return TemplateRenderResult(
+            rendered_content=rendered_content,
+            template_name=name,
+            render_time=render_time,
+            variables_used=[variable for variable in self._variables[name] if variable in context],
+            missing_variables=[
+                variable for variable in self._configs[name].required_variables if variable not in context
+            ],
+            render_errors=render_errors
+        )
     
     async def validate_template(self, template_name: str) -> WorkflowResult:
         """Basic template validation - simplified version."""
@@ -45,6 +145,40 @@ class TemplateMgr:
         # TODO: Check Jinja2 template validity
         # TODO: Return validation results
         pass
+    
+    def _get(self, template_name: str) -> Tuple[str, Template]:
+        """Compiled template by name, with or without the .jinja2 suffix."""
+        name = template_name if template_name.endswith(TEMPLATE_SUFFIX) else template_name + TEMPLATE_SUFFIX
+        template = self._templates.get(name)
+        if template is None or (self.auto_reload and not template.is_up_to_date):
+            template = self._compile(name)
+        return name, template
+    
+    def _compile(self, name: str) -> Template:
+        """Compile a template and derive its variable metadata from the AST once."""
+        try:
+            source, filename, _ = self.env.loader.get_source(self.env, name)
+        except TemplateNotFound:
+            available = ", ".join(sorted(path.name for path in self.templates_dir.glob(f"*{TEMPLATE_SUFFIX}")))
+            raise ValueError(f"Unknown template '{name}'. Available: {available}")
+        
+        ast = self.env.parse(source, name, filename)
+        variables = sorted(meta.find_undeclared_variables(ast))
+        optional = [variable for variable in optional_variables(ast) if variable in variables]
+        self._configs[name] = TemplateConfig(
+            template_name=name,
+            template_path=filename,
+            template_type=template_type(name),
+            required_variables=[variable for variable in variables if variable not in optional],
+            optional_variables=optional,
+            inheritance_chain=[ref for ref in meta.find_referenced_templates(ast) if ref]
+        )
+        self._variables[name] = tuple(variables)
+        # Served from the bytecode cache when the source is unchanged
+        template = self.env.get_template(name)
+        self._templates[name] = template
+        self.compile_count += 1
+        return template
 # =============================================================================
 # TEMPORARILY COMMENTED OUT ADVANCED FEATURES
 # These will be re-enabled once basic functionality is working
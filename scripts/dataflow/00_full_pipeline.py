@@ -5,11 +5,24 @@ Runs the complete data processing pipeline.
 """
 
 import asyncio
+import importlib.util
+import logging
+import os
 from pathlib import Path
+from typing import List, Optional
 
+# The ingestion script name starts with a digit, so it is loaded by path
+_spec = importlib.util.spec_from_file_location("data_ingestion", Path(__file__).parent / "01_data_ingestion.py")
+data_ingestion = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(data_ingestion)
 
-async def run_full_pipeline():
-    """Basic full pipeline - simplified version."""
+
+async def run_full_pipeline(raw_data_dir: Optional[str] = None) -> List["data_ingestion.IngestionResult"]:
+    """Basic full pipeline - simplified version.
+    
+    Each subdirectory of RAW_DATA_DIR is ingested as one domain through
+    the staged ingestion pipeline.
+    """
     # TODO: Implement basic pipeline orchestration
     # TODO: Set up basic logging and monitoring
     # TODO: Run basic pipeline phases in sequence
@@ -17,7 +30,22 @@ async def run_full_pipeline():
     # TODO: Run basic knowledge extraction phase
     # TODO: Execute basic search optimization phase
     # TODO: Validate basic pipeline results
-    pass
+    
+    # === BASIC IMPLEMENTATION BELOW ===
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+    raw_data_path = Path(raw_data_dir or os.getenv("RAW_DATA_DIR", "data/raw"))
+    
+    orchestrator = data_ingestion.DataIngestionOrchestrator()
+    results = []
+    try:
+        for domain_dir in sorted(path for path in raw_data_path.iterdir() if path.is_dir()):
+            result = await orchestrator.ingest_documents(str(domain_dir))
+            logger.info(await orchestrator.generate_ingestion_report(result))
+            results.append(result)
+    finally:
+        await orchestrator.aclose()
+    return results
 
 # =============================================================================
 # TEMPORARILY COMMENTED OUT ADVANCED FEATURES
@@ -5,10 +5,19 @@ Basic document ingestion with automatic domain detection and preprocessing.
 """
 
 import asyncio
+import hashlib
+import inspect
+import itertools
+import json
 import logging
+import os
+import re
 import sys
+import time
+import uuid
+from contextlib import aclosing
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, Optional, Set, Tuple, Union
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -17,6 +26,8 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from azure_services.storage_client import StorageClient
 from azure_services.openai_client import OpenAIClient
+from azure_services.search_client import SearchClient
+from azure_services.tokenizer import Tokenizer, get_tokenizer
 from agents.supports.config_provider import ConfigProvider
 from config.params import ConfigurationNotAvailableError
 from models.azure import AzureServiceResponse, EmbeddingResult, SearchResult, ServiceHealth
@@ -37,34 +48,548 @@ class IngestionResult:
     errors: List[str]
 
 
+@dataclass
+class StageStats:
+    """Counters for one stage of the ingestion pipeline."""
+    workers: int
+    items: int = 0
+    errors: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    queue_depth_total: int = 0
+    queue_depth_max: int = 0
+    queue_samples: int = 0
+
+
+# Pipeline stages in order, each fed by a bounded queue, with default worker counts
+INGESTION_STAGES = ("chunk", "embed", "upload", "index")
+DEFAULT_STAGE_WORKERS = {"chunk": 4, "embed": 4, "upload": 8, "index": 4}
+
+# Index ids written per source document, kept in blob storage under the domain
+INDEX_MANIFEST_BLOB = "index_manifest.json"
+# Azure Cognitive Search accepts at most 1000 documents per indexing request
+INDEX_BATCH_LIMIT = 1000
+
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+FENCE_PATTERN = re.compile(r"^\s*(`{3,}|~{3,})")
+# A sentence runs to terminal punctuation followed by whitespace, or to the end
+SENTENCE_PATTERN = re.compile(r"\S.*?(?:[.!?]+(?=\s)|\Z)", re.DOTALL)
+WORD_PATTERN = re.compile(r"\S+")
+
+# (whitespace before it, text, tokens, first line, last line)
+ChunkUnit = Tuple[str, str, int, int, int]
+
+
+def markdown_blocks(lines: Iterable[str]) -> Iterator[Tuple[str, str, int]]:
+    """Split Markdown lines into (kind, text, first line) blocks, consuming lines lazily.
+    
+    kind is "heading" for an ATX heading, "code" for a fenced code block
+    including its fences, or "paragraph" for a run of non-blank lines.
+    """
+    paragraph: List[str] = []
+    paragraph_start = 0
+    code: List[str] = []
+    code_start = 0
+    fence = None
+    
+    for line_number, line in enumerate(lines, start=1):
+        line = line.rstrip("\r\n")
+        if fence is not None:
+            code.append(line)
+            if re.fullmatch(re.escape(fence[0]) + "{%d,}" % len(fence), line.strip()):
+                yield "code", "\n".join(code), code_start
+                fence = None
+            continue
+        
+        opening = FENCE_PATTERN.match(line)
+        heading = HEADING_PATTERN.match(line)
+        if (opening or heading or not line.strip()) and paragraph:
+            yield "paragraph", "\n".join(paragraph), paragraph_start
+            paragraph = []
+        if opening:
+            fence = opening.group(1)
+            code = [line]
+            code_start = line_number
+        elif heading:
+            yield "heading", line.strip(), line_number
+        elif line.strip():
+            if not paragraph:
+                paragraph_start = line_number
+            paragraph.append(line)
+    
+    # An unclosed fence runs to the end of the document
+    if fence is not None:
+        yield "code", "\n".join(code), code_start
+    if paragraph:
+        yield "paragraph", "\n".join(paragraph), paragraph_start
+
+
+class MarkdownChunker:
+    """Packs Markdown blocks into chunks of at most chunk_tokens tokens.
+    
+    Chunks break between blocks where possible. A heading starts a new
+    chunk once the current one holds min_chunk_tokens, without overlap, so
+    sections stay apart. A block larger than the budget is split at
+    sentences, or at lines for code, and then at words. Consecutive chunks
+    within a section share up to overlap_tokens of trailing sentences or
+    lines.
+    """
+    
+    def __init__(
+        self,
+        chunk_tokens: int,
+        overlap_tokens: int,
+        min_chunk_tokens: int,
+        tokenizer: Optional[Tokenizer] = None
+    ):
+        """Initialize chunker with its token budget."""
+        if not 0 <= overlap_tokens < chunk_tokens:
+            raise ValueError(f"Chunk overlap {overlap_tokens} must be below the chunk budget {chunk_tokens}")
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.min_chunk_tokens = min_chunk_tokens
+        self.tokenizer = tokenizer or get_tokenizer()
+    
+    def chunks(self, lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Yield chunks with content, token_count, heading_path and line span."""
+        current: List[ChunkUnit] = []
+        current_tokens = 0
+        heading_path: List[str] = []
+        chunk_path: List[str] = []
+        
+        for kind, text, start_line in markdown_blocks(lines):
+            if kind == "heading":
+                if current and current_tokens >= self.min_chunk_tokens:
+                    yield self._emit(current, chunk_path)
+                    current, current_tokens = [], 0
+                hashes, title = HEADING_PATTERN.match(text).groups()
+                heading_path = heading_path[:len(hashes) - 1] + [title]
+            
+            units = self._units(kind, text, start_line)
+            # Separators count as one token each
+            block_tokens = sum(unit[2] for unit in units) + len(units) - 1
+            if current and current_tokens + 1 + block_tokens > self.chunk_tokens >= block_tokens:
+                yield self._emit(current, chunk_path)
+                current = self._overlap(current, min(self.overlap_tokens, self.chunk_tokens - block_tokens - 1))
+                current_tokens = self._total(current)
+            
+            for index, unit in enumerate(units):
+                if index == 0:
+                    unit = ("\n\n",) + unit[1:]
+                cost = unit[2] + (1 if current else 0)
+                if current and current_tokens + cost > self.chunk_tokens:
+                    yield self._emit(current, chunk_path)
+                    current = self._overlap(current, min(self.overlap_tokens, self.chunk_tokens - unit[2] - 1))
+                    current_tokens = self._total(current)
+                    cost = unit[2] + (1 if current else 0)
+                if not current:
+                    chunk_path = list(heading_path)
+                current.append(unit)
+                current_tokens += cost
+        
+        if current:
+            yield self._emit(current, chunk_path)
+    
+    def _units(self, kind: str, text: str, start_line: int) -> List[ChunkUnit]:
+        """Split a block into units that each fit the budget, keeping the whitespace between them."""
+        if kind == "code":
+            pieces = re.finditer(r"[^\n]+", text)
+        elif kind == "paragraph" and self.tokenizer.count(text) > self.chunk_tokens:
+            pieces = SENTENCE_PATTERN.finditer(text)
+        else:
+            pieces = [re.match(r".*", text, re.DOTALL)]
+        
+        units = []
+        previous_end = 0
+        for piece in pieces:
+            for offset, run in self._fit_words(piece.group()):
+                start = piece.start() + offset
+                line = start_line + text.count("\n", 0, start)
+                units.append((text[previous_end:start], run, self.tokenizer.count(run), line, line + run.count("\n")))
+                previous_end = start + len(run)
+        return units
+    
+    def _fit_words(self, piece: str) -> Iterator[Tuple[int, str]]:
+        """Yield (offset, text) runs of whole words within the budget; a single huge word stands alone."""
+        if self.tokenizer.count(piece) <= self.chunk_tokens:
+            yield 0, piece
+            return
+        start = None
+        end = 0
+        for match in WORD_PATTERN.finditer(piece):
+            if start is not None and self.tokenizer.count(piece[start:match.end()]) > self.chunk_tokens:
+                yield start, piece[start:end]
+                start = None
+            if start is None:
+                start = match.start()
+            end = match.end()
+        if start is not None:
+            yield start, piece[start:end]
+    
+    def _overlap(self, units: List[ChunkUnit], limit: int) -> List[ChunkUnit]:
+        """Trailing units of a finished chunk that fit within limit tokens."""
+        kept: List[ChunkUnit] = []
+        total = 0
+        for unit in reversed(units):
+            total += unit[2] + (1 if kept else 0)
+            if total > limit:
+                break
+            kept.append(unit)
+        return kept[::-1]
+    
+    @staticmethod
+    def _total(units: List[ChunkUnit]) -> int:
+        """Running token total of units including their separators."""
+        return sum(unit[2] for unit in units) + max(len(units) - 1, 0)
+    
+    def _emit(self, units: List[ChunkUnit], heading_path: List[str]) -> Dict[str, Any]:
+        """Join units into a chunk and count its exact tokens."""
+        content = units[0][1] + "".join(separator + text for separator, text, _, _, _ in units[1:])
+        return {
+            "content": content,
+            "token_count": self.tokenizer.count(content),
+            "heading_path": heading_path,
+            "start_line": units[0][3],
+            "end_line": units[-1][4],
+        }
+
+
 class DataIngestionOrchestrator:
     """Orchestrates basic document ingestion with domain detection."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        openai_client: Optional[OpenAIClient] = None,
+        storage_client: Optional[StorageClient] = None,
+        search_client: Optional[SearchClient] = None
+    ):
         """Initialize ingestion orchestrator with basic services."""
         # TODO: Initialize configuration provider
         # TODO: Set up basic logging
-        pass
+        
+        # === BASIC IMPLEMENTATION BELOW ===
+        self.logger = logging.getLogger(__name__)
+        self.chunker = MarkdownChunker(
+            chunk_tokens=int(os.getenv("CHUNK_TARGET_TOKENS", "512")),
+            overlap_tokens=int(os.getenv("CHUNK_OVERLAP_TOKENS", "64")),
+            min_chunk_tokens=int(os.getenv("CHUNK_MIN_TOKENS", "128"))
+        )
+        # Azure clients are created on first ingestion so chunking needs no credentials
+        self.openai_client = openai_client
+        self.storage_client = storage_client
+        self.search_client = search_client
     
     async def ingest_documents(
         self, 
         source_path: str, 
         target_domain: Optional[str] = None
     ) -> IngestionResult:
-        """Basic document ingestion workflow."""
+        """Run documents through the chunk, embed, upload and index stages concurrently.
+        
+        Every stage has its own workers (INGEST_<STAGE>_WORKERS) and reads
+        from a bounded queue (INGEST_QUEUE_SIZE), so a slow stage applies
+        backpressure upstream instead of buffering the corpus. Documents
+        are read line by line while they are chunked, and their chunks are
+        passed on as they are produced. Embeddings are requested in batches
+        of up to INGEST_EMBED_BATCH_SIZE chunks at bulk priority. Failures
+        are recorded per batch in errors and the rest of the corpus
+        continues. Once the load finishes, index entries and chunk blobs of
+        chunks that documents no longer produce are deleted.
+        """
         # TODO: Discover documents in source path
         # TODO: Process documents with domain detection
         # TODO: Create intelligent chunks from content
         # TODO: Validate document quality
         # TODO: Return ingestion results with metrics
-        pass
+        
+        # === BASIC IMPLEMENTATION BELOW ===
+        start_time = time.time()
+        domain = target_domain or Path(source_path).name
+        if self.openai_client is None:
+            self.openai_client = OpenAIClient()
+        if self.storage_client is None:
+            self.storage_client = StorageClient()
+        if self.search_client is None:
+            self.search_client = SearchClient()
+        
+        queue_size = int(os.getenv("INGEST_QUEUE_SIZE", "256"))
+        embed_batch_size = int(os.getenv("INGEST_EMBED_BATCH_SIZE", "64"))
+        stats = {
+            stage: StageStats(workers=int(os.getenv(f"INGEST_{stage.upper()}_WORKERS", str(DEFAULT_STAGE_WORKERS[stage]))))
+            for stage in INGESTION_STAGES
+        }
+        queues = {stage: asyncio.Queue(maxsize=queue_size) for stage in INGESTION_STAGES}
+        errors: List[str] = []
+        totals = {"chunks_created": 0, "chunks_indexed": 0, "chunks_deleted": 0, "embedding_tokens": 0}
+        # Chunks per source once its whole file is chunked, and the ids indexed for it
+        chunk_counts: Dict[str, int] = {}
+        indexed_ids: Dict[str, Set[str]] = {}
+        
+        async def chunk(paths: List[Path]) -> AsyncIterator[Dict[str, Any]]:
+            for path in paths:
+                chunks = self.chunk_file(path, domain)
+                count = 0
+                while True:
+                    # Read and chunk the file a few chunks at a time, off the event loop
+                    try:
+                        batch = await asyncio.to_thread(lambda: list(itertools.islice(chunks, embed_batch_size)))
+                    except (OSError, UnicodeDecodeError) as e:
+                        raise RuntimeError(f"Document read failed for {path}: {str(e)}") from e
+                    if not batch:
+                        break
+                    count += len(batch)
+                    totals["chunks_created"] += len(batch)
+                    for item in batch:
+                        yield item
+                chunk_counts[str(path)] = count
+        
+        async def embed(chunks: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+            embeddings = await self.openai_client.generate_embeddings(
+                [chunk["content"] for chunk in chunks], priority="bulk"
+            )
+            totals["embedding_tokens"] += sum(embedding.token_count for embedding in embeddings)
+            return [[{**chunk, "embedding": embedding.embedding} for chunk, embedding in zip(chunks, embeddings)]]
+        
+        async def upload(batches: List[List[Dict[str, Any]]]) -> List[List[Dict[str, Any]]]:
+            for batch in batches:
+                # One blob per chunk, named like its index entry, so a reload overwrites it
+                results = await asyncio.gather(*(
+                    self.storage_client.upload_blob(
+                        self.storage_client.container_name,
+                        self._chunk_blob_name(domain, chunk["chunk_id"]),
+                        json.dumps(chunk, ensure_ascii=False).encode("utf-8")
+                    )
+                    for chunk in batch
+                ))
+                failed = [result for result in results if not result.success]
+                if failed:
+                    raise RuntimeError(failed[0].error_summary)
+            return batches
+        
+        async def index(batches: List[List[Dict[str, Any]]]) -> List[Any]:
+            for batch in batches:
+                indexed = await self.search_client.upload_documents([
+                    {
+                        "id": chunk["chunk_id"],
+                        "content": chunk["content"],
+                        "content_vector": chunk["embedding"],
+                    }
+                    for chunk in batch
+                ])
+                totals["chunks_indexed"] += indexed
+                for chunk in batch:
+                    indexed_ids.setdefault(chunk["source"], set()).add(chunk["chunk_id"])
+            return []
+        
+        handlers = {"chunk": chunk, "embed": embed, "upload": upload, "index": index}
+        tasks = []
+        for position, stage in enumerate(INGESTION_STAGES):
+            downstream = INGESTION_STAGES[position + 1] if position + 1 < len(INGESTION_STAGES) else None
+            tasks.append(asyncio.create_task(self._run_stage(
+                stage,
+                queues[stage],
+                queues[downstream] if downstream else None,
+                stats[downstream].workers if downstream else 0,
+                handlers[stage],
+                embed_batch_size if stage == "embed" else 1,
+                stats[stage],
+                errors
+            )))
+        
+        try:
+            documents = await asyncio.to_thread(self._discover_documents, source_path)
+            for document_path in documents:
+                await queues["chunk"].put(document_path)
+            for _ in range(stats["chunk"].workers):
+                await queues["chunk"].put(None)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        try:
+            totals["chunks_deleted"] = await self._remove_stale_chunks(
+                domain, source_path, documents, chunk_counts, indexed_ids
+            )
+        except Exception as e:
+            errors.append(f"stale chunk cleanup failed: {str(e)}")
+        
+        # Searches cached before this load would miss the new chunks
+        await self.search_client.invalidate_cache()
+        
+        quality_metrics: Dict[str, float] = {"documents_discovered": float(len(documents))}
+        quality_metrics.update({name: float(value) for name, value in totals.items()})
+        for stage, stage_stats in stats.items():
+            active_time = (stage_stats.finished_at or 0) - (stage_stats.started_at or 0)
+            quality_metrics[f"{stage}_workers"] = float(stage_stats.workers)
+            quality_metrics[f"{stage}_items"] = float(stage_stats.items)
+            quality_metrics[f"{stage}_errors"] = float(stage_stats.errors)
+            quality_metrics[f"{stage}_throughput"] = stage_stats.items / active_time if active_time > 0 else 0.0
+            quality_metrics[f"{stage}_queue_max_depth"] = float(stage_stats.queue_depth_max)
+            quality_metrics[f"{stage}_queue_mean_depth"] = (
+                stage_stats.queue_depth_total / stage_stats.queue_samples if stage_stats.queue_samples else 0.0
+            )
+        
+        return IngestionResult(
+            domain=domain,
+            documents_processed=stats["chunk"].items,
+            chunks_created=totals["chunks_created"],
+            processing_time=time.time() - start_time,
+            quality_metrics=quality_metrics,
+            errors=errors
+        )
+    
+    async def _run_stage(
+        self,
+        name: str,
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+        downstream_workers: int,
+        handler: Callable[[List[Any]], Union[Awaitable[List[Any]], AsyncIterator[Any]]],
+        batch_size: int,
+        stats: StageStats,
+        errors: List[str]
+    ) -> None:
+        """Run a stage's workers until each takes an end marker, then pass one to every downstream worker.
+        
+        A handler either returns its outputs or, as an async generator,
+        yields them, in which case each is passed downstream as it comes.
+        """
+        async def worker() -> None:
+            done = False
+            while not done:
+                item = await inbox.get()
+                depth = inbox.qsize() + 1
+                stats.queue_samples += 1
+                stats.queue_depth_total += depth
+                stats.queue_depth_max = max(stats.queue_depth_max, depth)
+                
+                # Take whatever else is already queued, up to batch_size
+                batch = []
+                while item is not None:
+                    batch.append(item)
+                    if len(batch) >= batch_size or inbox.empty():
+                        break
+                    item = inbox.get_nowait()
+                done = item is None
+                if not batch:
+                    continue
+                
+                if stats.started_at is None:
+                    stats.started_at = time.time()
+                try:
+                    await self._forward(handler(batch), outbox)
+                except Exception as e:
+                    stats.errors += len(batch)
+                    errors.append(f"{name} failed for {len(batch)} item(s): {str(e)}")
+                else:
+                    stats.items += len(batch)
+                stats.finished_at = time.time()
+        
+        await asyncio.gather(*(worker() for _ in range(stats.workers)))
+        if outbox is not None:
+            for _ in range(downstream_workers):
+                await outbox.put(None)
+    
+    @staticmethod
+    async def _forward(
+        outputs: Union[Awaitable[List[Any]], AsyncIterator[Any]],
+        outbox: Optional[asyncio.Queue]
+    ) -> None:
+        """Put a handler's outputs on the downstream queue, if there is one."""
+        if inspect.isawaitable(outputs):
+            outputs = await outputs
+        if not hasattr(outputs, "__aiter__"):
+            for output in outputs:
+                if outbox is not None:
+                    await outbox.put(output)
+            return
+        async with aclosing(outputs):
+            async for output in outputs:
+                if outbox is not None:
+                    await outbox.put(output)
+    
+    async def _remove_stale_chunks(
+        self,
+        domain: str,
+        source_path: str,
+        documents: List[Path],
+        chunk_counts: Dict[str, int],
+        indexed_ids: Dict[str, Set[str]]
+    ) -> int:
+        """Delete index entries and chunk blobs that documents no longer produce and return how many.
+        
+        The ids indexed for each source are kept in a manifest blob. A
+        source's previous ids are replaced only once every chunk of its
+        file was indexed, and a document gone from under source_path loses
+        all of its ids. Each stale id is deleted from the index and its
+        chunk blob from storage. If either delete fails, the manifest keeps
+        the stale ids so the next load retries them.
+        """
+        manifest_name = f"{domain}/{INDEX_MANIFEST_BLOB}"
+        data = await self.storage_client.download_blob(self.storage_client.container_name, manifest_name)
+        previous: Dict[str, List[str]] = json.loads(data) if data else {}
+        discovered = {str(path) for path in documents}
+        
+        manifest: Dict[str, List[str]] = {}
+        retained: Dict[str, List[str]] = {}
+        stale: List[str] = []
+        for source in sorted(set(previous) | set(indexed_ids)):
+            old = set(previous.get(source, []))
+            new = indexed_ids.get(source, set())
+            removed = source not in discovered and Path(source).is_relative_to(source_path)
+            if removed or chunk_counts.get(source) == len(new):
+                stale.extend(sorted(old - new))
+                kept = new
+            else:
+                kept = old | new
+            if kept:
+                manifest[source] = sorted(kept)
+            if old | new:
+                retained[source] = sorted(old | new)
+        
+        deleted = 0
+        try:
+            for start in range(0, len(stale), INDEX_BATCH_LIMIT):
+                deleted += await self.search_client.delete_documents(stale[start:start + INDEX_BATCH_LIMIT])
+            await self.storage_client.delete_blobs(
+                self.storage_client.container_name,
+                [self._chunk_blob_name(domain, chunk_id) for chunk_id in stale]
+            )
+        except Exception:
+            await self._write_manifest(manifest_name, retained)
+            raise
+        await self._write_manifest(manifest_name, manifest)
+        return deleted
+    
+    @staticmethod
+    def _chunk_blob_name(domain: str, chunk_id: str) -> str:
+        """Blob holding one embedded chunk."""
+        return f"{domain}/chunks/{chunk_id}.json"
+    
+    async def _write_manifest(self, manifest_name: str, manifest: Dict[str, List[str]]) -> None:
+        """Upload the index manifest, raising if storage rejects it."""
+        result = await self.storage_client.upload_blob(
+            self.storage_client.container_name,
+            manifest_name,
+            json.dumps(manifest, ensure_ascii=False).encode("utf-8")
+        )
+        if not result.success:
+            raise RuntimeError(result.error_summary)
     
     def _discover_documents(self, source_path: str) -> List[Path]:
         """Basic document discovery."""
         # TODO: Scan source path for supported document types
         # TODO: Filter by allowed file extensions
         # TODO: Return list of document paths
-        pass
+        
+        # === BASIC IMPLEMENTATION BELOW ===
+        root = Path(source_path)
+        if not root.exists():
+            raise ValueError(f"Source path '{source_path}' does not exist")
+        extensions = {extension.strip().lower() for extension in os.getenv("INGEST_EXTENSIONS", ".md,.txt").split(",")}
+        return sorted(path for path in root.rglob("*") if path.is_file() and path.suffix.lower() in extensions)
     
     async def preprocess_document(
         self, 
@@ -76,7 +601,36 @@ class DataIngestionOrchestrator:
         # TODO: Apply basic text cleaning and normalization
         # TODO: Extract document metadata
         # TODO: Return preprocessed document
-        pass
+        
+        # === BASIC IMPLEMENTATION BELOW ===
+        start_time = time.time()
+        try:
+            content = await asyncio.to_thread(Path(document_path).read_text, encoding="utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            return WorkflowResult(
+                workflow_id=str(uuid.uuid4()),
+                workflow_name="document_preprocess",
+                success=False,
+                total_time=time.time() - start_time,
+                completed_at=datetime.now(),
+                error_summary=f"Document read failed for {document_path}: {str(e)}"
+            )
+        
+        content = content.lstrip("\ufeff").replace("\r\n", "\n")
+        return WorkflowResult(
+            workflow_id=str(uuid.uuid4()),
+            workflow_name="document_preprocess",
+            success=True,
+            final_output={
+                "content": content,
+                "source": str(document_path),
+                "domain": domain,
+                "size_bytes": len(content.encode("utf-8")),
+                "line_count": content.count("\n") + 1,
+            },
+            total_time=time.time() - start_time,
+            completed_at=datetime.now()
+        )
     
     async def create_intelligent_chunks(
         self, 
@@ -88,14 +642,62 @@ class DataIngestionOrchestrator:
         # TODO: Preserve semantic boundaries
         # TODO: Generate chunk metadata
         # TODO: Return chunked content
-        pass
+        
+        # === BASIC IMPLEMENTATION BELOW ===
+        return list(self.iter_chunks(content.splitlines(), domain))
+    
+    def iter_chunks(self, lines: Iterable[str], domain: str, source: str = "inline") -> Iterator[Dict[str, Any]]:
+        """Stream token-budgeted chunks with metadata from an iterable of lines."""
+        for index, chunk in enumerate(self.chunker.chunks(lines)):
+            yield {
+                # Full source path, so same-named files in different folders never collide
+                "chunk_id": hashlib.sha1(f"{source}#{index}".encode("utf-8")).hexdigest(),
+                "chunk_index": index,
+                "source": source,
+                "domain": domain,
+                **chunk,
+            }
+    
+    def chunk_file(self, document_path: Path, domain: str) -> Iterator[Dict[str, Any]]:
+        """Stream chunks of a Markdown file, reading it line by line."""
+        # utf-8-sig drops a leading byte order mark
+        with open(document_path, encoding="utf-8-sig") as document:
+            yield from self.iter_chunks(document, domain, str(document_path))
     
     async def generate_ingestion_report(self, result: IngestionResult) -> str:
         """Generate basic ingestion report."""
         # TODO: Format ingestion statistics
         # TODO: Include quality metrics and errors
         # TODO: Return formatted report
-        pass
+        
+        # === BASIC IMPLEMENTATION BELOW ===
+        metrics = result.quality_metrics
+        lines = [
+            f"Ingestion report for domain '{result.domain}'",
+            f"  Documents processed: {result.documents_processed}",
+            f"  Chunks created: {result.chunks_created}",
+            f"  Processing time: {result.processing_time:.2f}s",
+            "  Stages:",
+        ]
+        for stage in INGESTION_STAGES:
+            if f"{stage}_items" in metrics:
+                lines.append(
+                    f"    {stage:<7} workers={metrics[f'{stage}_workers']:.0f} "
+                    f"items={metrics[f'{stage}_items']:.0f} errors={metrics[f'{stage}_errors']:.0f} "
+                    f"throughput={metrics[f'{stage}_throughput']:.1f}/s "
+                    f"queue max={metrics[f'{stage}_queue_max_depth']:.0f} mean={metrics[f'{stage}_queue_mean_depth']:.1f}"
+                )
+        if result.errors:
+            lines.append(f"  Errors ({len(result.errors)}):")
+            lines.extend(f"    {error}" for error in result.errors)
+        return "\n".join(lines)
+    
+    async def aclose(self) -> None:
+        """Close the Azure clients created for ingestion."""
+        if self.openai_client is not None:
+            await self.openai_client.aclose()
+        if self.search_client is not None:
+            await self.search_client.aclose()
 
 
 async def main():
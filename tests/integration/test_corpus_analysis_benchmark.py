@@ -0,0 +1,195 @@
+"""
+Corpus Analysis Benchmark
+
+Compares peak RSS and wall time of the streaming CorpusTotals accumulator
+against the previous join-then-tokenize analysis, and measures how
+process-pool tokenization scales with worker count, both for in-memory
+documents and for the incremental storage (manifest) path.
+
+Each implementation runs in a forked child so its peak RSS is measured in
+isolation. Run with:
+    pytest tests/integration/test_corpus_analysis_benchmark.py -s
+"""
+
+import asyncio
+import multiprocessing
+import os
+import random
+import re
+import resource
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+import pytest
+from agents.auto_domain.corpus_analyzer import CorpusAnalyzer
+from agents.auto_domain.corpus_stats import CorpusTotals
+
+
+# Benchmark fixtures - synthetic corpus geometry
+BENCHMARK_DOCUMENT_COUNT = 2000
+BENCHMARK_WORDS_PER_DOCUMENT = 1500
+BENCHMARK_VOCABULARY_SIZE = 20000
+BENCHMARK_WORKERS = 4
+
+
+pytestmark = [
+    pytest.mark.performance,
+    pytest.mark.skipif(sys.platform != "linux", reason="RSS measurement relies on fork and ru_maxrss in KiB"),
+]
+
+
+def generate_documents():
+    """Deterministic synthetic documents, produced one at a time."""
+    rng = random.Random(42)
+    vocabulary = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 12)))
+        for _ in range(BENCHMARK_VOCABULARY_SIZE)
+    ]
+    for _ in range(BENCHMARK_DOCUMENT_COUNT):
+        yield " ".join(rng.choice(vocabulary) for _ in range(BENCHMARK_WORDS_PER_DOCUMENT))
+
+
+def legacy_statistics(documents):
+    """The previous analysis: join the corpus, tokenize it, then re-scan the word list."""
+    all_text = " ".join(documents)
+    words = re.findall(r'\b[a-zA-Z]{2,}\b', all_text.lower())
+    word_counts = Counter(words)
+    total_chars = sum(len(doc) for doc in documents)
+    avg_doc_length = total_chars / len(documents)
+    return {
+        "total_words": len(words),
+        "unique_words": len(word_counts),
+        "hapax": sum(1 for count in word_counts.values() if count == 1),
+        "technical_words": sum(1 for word in words if len(word) > 6),
+        "word_length_total": sum(len(word) for word in words),
+        "variance": sum((len(doc) - avg_doc_length) ** 2 for doc in documents) / len(documents),
+    }
+
+
+def streaming_statistics(documents):
+    """The streaming accumulator consuming one document at a time."""
+    totals = CorpusTotals()
+    for doc in documents:
+        totals.add_text(doc)
+    return {
+        "total_words": totals.word_count,
+        "unique_words": len(totals.term_counts),
+        "hapax": totals.hapax_count,
+        "technical_words": totals.technical_word_count,
+        "word_length_total": totals.word_length_total,
+        "variance": totals.document_length_variance,
+    }
+
+
+def run_legacy():
+    # The old implementation needs the whole corpus as a list
+    return legacy_statistics(list(generate_documents()))
+
+
+def run_streaming():
+    return streaming_statistics(generate_documents())
+
+
+def measure(target, results):
+    """Child process body: report statistics, wall time and RSS growth in MiB."""
+    baseline_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start_time = time.perf_counter()
+    statistics = target()
+    elapsed = time.perf_counter() - start_time
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((statistics, elapsed, (peak_kib - baseline_kib) / 1024))
+
+
+class InMemoryStorage:
+    """Storage client stand-in serving generated documents without network latency."""
+
+    def __init__(self, documents):
+        self.blobs = {f"benchmark/doc_{i}.md": doc for i, doc in enumerate(documents)}
+
+    async def list_blob_etags(self, domain_path, container_name=None):
+        return {name: '"1"' for name in self.blobs}
+
+    async def stream_domain_documents(self, domain_path, container_name=None, blob_names=None, failed_blobs=None):
+        for name in blob_names:
+            yield name, self.blobs[name]
+
+
+def run_isolated(target):
+    """Run target in a forked child and collect its measurements."""
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    process = context.Process(target=measure, args=(target, results))
+    process.start()
+    measurement = results.get()
+    process.join()
+    return measurement
+
+
+class TestCorpusAnalysisBenchmark:
+    """Streaming accumulator vs join-then-tokenize analysis."""
+
+    def test_streaming_accumulator_bounds_memory(self):
+        """Benchmark: same statistics with peak RSS bounded by vocabulary."""
+        legacy, legacy_time, legacy_rss = run_isolated(run_legacy)
+        streaming, streaming_time, streaming_rss = run_isolated(run_streaming)
+
+        print(f"\nlegacy:    {legacy_time:.2f}s, peak RSS +{legacy_rss:.1f} MiB")
+        print(f"streaming: {streaming_time:.2f}s, peak RSS +{streaming_rss:.1f} MiB")
+
+        assert {k: v for k, v in streaming.items() if k != "variance"} == \
+            {k: v for k, v in legacy.items() if k != "variance"}
+        assert streaming["variance"] == pytest.approx(legacy["variance"])
+        assert streaming_rss < legacy_rss / 4
+
+    @pytest.mark.skipif((os.cpu_count() or 1) < BENCHMARK_WORKERS, reason="needs one core per worker")
+    def test_process_pool_scales_with_workers(self):
+        """Benchmark: sharded tokenization approaches linear speed-up."""
+        documents = list(generate_documents())
+        analyzer = CorpusAnalyzer.__new__(CorpusAnalyzer)
+        analyzer.documents_analyzed = 0
+        analyzer.analysis_shard_size = 64
+
+        analyzer.analysis_workers = 1
+        start_time = time.perf_counter()
+        serial = asyncio.run(analyzer._perform_real_analysis(documents, "benchmark"))
+        serial_time = time.perf_counter() - start_time
+
+        analyzer.analysis_workers = BENCHMARK_WORKERS
+        start_time = time.perf_counter()
+        parallel = asyncio.run(analyzer._perform_real_analysis(documents, "benchmark"))
+        parallel_time = time.perf_counter() - start_time
+
+        speedup = serial_time / parallel_time
+        print(f"\nserial: {serial_time:.2f}s, {BENCHMARK_WORKERS} workers: {parallel_time:.2f}s ({speedup:.1f}x)")
+
+        assert parallel.statistics == serial.statistics
+        assert parallel.quality_metrics == serial.quality_metrics
+        assert speedup > BENCHMARK_WORKERS / 2
+
+    @pytest.mark.skipif((os.cpu_count() or 1) < BENCHMARK_WORKERS, reason="needs one core per worker")
+    def test_storage_path_scales_with_workers(self, tmp_path):
+        """Benchmark: the manifest path tokenizes changed blobs across the process pool."""
+        analyzer = CorpusAnalyzer.__new__(CorpusAnalyzer)
+        analyzer.storage_client = InMemoryStorage(generate_documents())
+        analyzer.documents_analyzed = 0
+        analyzer.documents_downloaded = 0
+        analyzer.documents_deleted = 0
+        analyzer.analysis_shard_size = 64
+
+        timings = {}
+        results = {}
+        for workers in (1, BENCHMARK_WORKERS):
+            # A fresh manifest per run, so every blob counts as new
+            analyzer.manifest_dir = Path(tmp_path) / f"workers-{workers}"
+            analyzer.analysis_workers = workers
+            start_time = time.perf_counter()
+            results[workers] = asyncio.run(analyzer.analyze_documents_from_storage("benchmark", "benchmark/"))
+            timings[workers] = time.perf_counter() - start_time
+
+        speedup = timings[1] / timings[BENCHMARK_WORKERS]
+        print(f"\nmanifest path serial: {timings[1]:.2f}s, {BENCHMARK_WORKERS} workers: "
+              f"{timings[BENCHMARK_WORKERS]:.2f}s ({speedup:.1f}x)")
+
+        assert results[BENCHMARK_WORKERS].statistics == results[1].statistics
+        assert speedup > BENCHMARK_WORKERS / 3
@@ -0,0 +1,100 @@
+"""
+Gremlin Bulk Load Benchmark
+
+Compares per-item and bulk knowledge graph loading against a local
+TinkerPop Gremlin Server standing in for Cosmos DB.
+
+Run with a server listening, e.g.:
+    docker run -p 8182:8182 tinkerpop/gremlin-server
+    GREMLIN_BENCHMARK_URL=ws://localhost:8182/gremlin pytest tests/integration/test_gremlin_bulk_benchmark.py -s
+"""
+
+import os
+import time
+import uuid
+import pytest
+from gremlin_python.driver import client, serializer
+from azure_services.gremlin_pool import GremlinConnectionPool
+from azure_services.gremlin_bulk import GremlinBulkLoader
+
+
+GREMLIN_BENCHMARK_URL = os.getenv("GREMLIN_BENCHMARK_URL")
+
+# Benchmark fixtures - graph size and loader geometry
+BENCHMARK_ENTITY_COUNT = 2000
+BENCHMARK_BATCH_SIZE = 50
+BENCHMARK_CONCURRENCY = 4
+BENCHMARK_POOL_SIZE = 4
+
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.performance,
+    pytest.mark.skipif(not GREMLIN_BENCHMARK_URL, reason="GREMLIN_BENCHMARK_URL not set"),
+]
+
+
+def make_graph(prefix: str):
+    """Chain of entities with one relationship between neighbours."""
+    entities = [
+        {"id": f"{prefix}-{i}", "type": "Entity", "name": f"entity {i}", "rank": i}
+        for i in range(BENCHMARK_ENTITY_COUNT)
+    ]
+    relationships = [
+        {"from": f"{prefix}-{i}", "to": f"{prefix}-{i + 1}", "type": "NEXT"}
+        for i in range(BENCHMARK_ENTITY_COUNT - 1)
+    ]
+    return entities, relationships
+
+
+class TestGremlinBulkLoadBenchmark:
+    """Per-item vs bulk load throughput."""
+
+    @pytest.fixture
+    async def connection_pool(self):
+        """Pool of connections to the local Gremlin server."""
+        pool = GremlinConnectionPool(
+            client_factory=lambda: client.Client(
+                GREMLIN_BENCHMARK_URL,
+                "g",
+                message_serializer=serializer.GraphSONSerializersV2d0(),
+                pool_size=1
+            ),
+            pool_size=BENCHMARK_POOL_SIZE,
+            acquire_timeout=30,
+            health_check_interval=60
+        )
+        yield pool
+        await pool.aclose()
+
+    async def test_bulk_load_vs_per_item(self, connection_pool):
+        """Bulk load should be many times faster than one traversal per item."""
+        entities, relationships = make_graph(f"single-{uuid.uuid4().hex[:8]}")
+        per_item_loader = GremlinBulkLoader(
+            connection_pool, batch_size=1, concurrency=1, max_retries=0, backoff_base=0
+        )
+        start_time = time.perf_counter()
+        per_item = await per_item_loader.load(entities, relationships)
+        per_item_time = time.perf_counter() - start_time
+
+        entities, relationships = make_graph(f"bulk-{uuid.uuid4().hex[:8]}")
+        bulk_loader = GremlinBulkLoader(
+            connection_pool,
+            batch_size=BENCHMARK_BATCH_SIZE,
+            concurrency=BENCHMARK_CONCURRENCY,
+            max_retries=0,
+            backoff_base=0
+        )
+        start_time = time.perf_counter()
+        bulk = await bulk_loader.load(entities, relationships)
+        bulk_time = time.perf_counter() - start_time
+
+        print(
+            f"\nper-item: {per_item_time:.2f}s ({per_item.batches_sent} traversals)"
+            f"\nbulk:     {bulk_time:.2f}s ({bulk.batches_sent} traversals)"
+            f"\nspeedup:  {per_item_time / bulk_time:.1f}x"
+        )
+        assert per_item.failures == [] and bulk.failures == []
+        assert bulk.vertices_stored == BENCHMARK_ENTITY_COUNT
+        assert bulk.edges_stored == BENCHMARK_ENTITY_COUNT - 1
+        assert bulk_time < per_item_time
@@ -0,0 +1,71 @@
+"""
+Local Vector Index Benchmark
+
+Reports recall@k of IVF search against exact search, and single-core
+queries per second for both modes, on a synthetic clustered corpus.
+
+Run with:
+    pytest tests/integration/test_local_index_benchmark.py -s
+"""
+
+import math
+import time
+import numpy as np
+import pytest
+from azure_services.local_index import LocalVectorIndex
+
+
+# Benchmark fixtures - corpus geometry and IVF parameters
+BENCHMARK_VECTOR_COUNT = 50000
+BENCHMARK_DIMENSIONS = 128
+BENCHMARK_CLUSTERS = 64
+BENCHMARK_QUERIES = 200
+BENCHMARK_TOP_K = 10
+BENCHMARK_NPROBE = 16
+
+
+pytestmark = pytest.mark.performance
+
+
+def make_corpus():
+    """Clustered vectors plus held-out queries drawn from the same clusters."""
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(BENCHMARK_CLUSTERS, BENCHMARK_DIMENSIONS)).astype(np.float32)
+
+    def sample(count):
+        return centers[rng.integers(0, BENCHMARK_CLUSTERS, count)] + \
+            rng.normal(scale=0.5, size=(count, BENCHMARK_DIMENSIONS)).astype(np.float32)
+
+    return sample(BENCHMARK_VECTOR_COUNT), sample(BENCHMARK_QUERIES)
+
+
+def run_queries(index, queries, mode):
+    """Results and queries/second for one search mode."""
+    start_time = time.perf_counter()
+    results = [
+        [row for row, _ in index.search(query, BENCHMARK_TOP_K, mode, BENCHMARK_NPROBE)]
+        for query in queries
+    ]
+    return results, len(queries) / (time.perf_counter() - start_time)
+
+
+class TestLocalIndexBenchmark:
+    """Exact vs IVF search quality and throughput."""
+
+    def test_ivf_recall_and_throughput(self, tmp_path):
+        """Benchmark: IVF keeps high recall@k while answering more queries per second."""
+        vectors, queries = make_corpus()
+        LocalVectorIndex.build(vectors, nlist=int(math.sqrt(BENCHMARK_VECTOR_COUNT))).save(tmp_path)
+        index = LocalVectorIndex.load(tmp_path)
+
+        exact, exact_qps = run_queries(index, queries, "exact")
+        approximate, ivf_qps = run_queries(index, queries, "ivf")
+        recall = np.mean([
+            len(set(truth) & set(found)) / BENCHMARK_TOP_K for truth, found in zip(exact, approximate)
+        ])
+
+        print(f"\nexact: {exact_qps:.0f} QPS/core")
+        print(f"ivf (nprobe={BENCHMARK_NPROBE}): {ivf_qps:.0f} QPS/core, recall@{BENCHMARK_TOP_K} = {recall:.3f}")
+
+        assert recall >= 0.9
+        assert ivf_qps > exact_qps
@@ -0,0 +1,198 @@
+"""
+Unit tests for CorpusAnalyzer
+Tests incremental, etag-tracked and multi-process corpus analysis.
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from agents.auto_domain.corpus_analyzer import CorpusAnalyzer
+from agents.auto_domain.corpus_manifest import CorpusManifest
+from agents.auto_domain.corpus_stats import CorpusTotals, DocumentStats
+
+
+# Test fixture - small domain corpus
+TEST_DOCUMENTS = {
+    "programming/python.md": "Python functions return values. Decorators wrap functions.",
+    "programming/rust.md": "Ownership and borrowing guarantee memory safety.",
+    "programming/go.md": "Goroutines communicate through channels.",
+}
+
+
+class FakeDownload:
+    """Stand-in for StorageStreamDownloader."""
+
+    def __init__(self, content):
+        self.content = content
+
+    async def readall(self):
+        return self.content
+
+
+class FakeContainerClient:
+    """In-memory container whose etags change whenever a blob is rewritten."""
+
+    def __init__(self, documents):
+        self.blobs = {}
+        self.versions = {}
+        self.downloads = []
+        self.failing = set()
+        for name, text in documents.items():
+            self.write(name, text)
+
+    def write(self, name, text):
+        self.blobs[name] = text.encode()
+        self.versions[name] = self.versions.get(name, 0) + 1
+
+    def delete(self, name):
+        del self.blobs[name]
+
+    async def list_blobs(self, name_starts_with=None, **kwargs):
+        for name, content in list(self.blobs.items()):
+            if name_starts_with is None or name.startswith(name_starts_with):
+                yield SimpleNamespace(name=name, size=len(content), etag=f'"{self.versions[name]}"')
+
+    def get_blob_client(self, name):
+        container = self
+
+        async def download_blob():
+            container.downloads.append(name)
+            if name in container.failing:
+                raise TimeoutError("read timed out")
+            return FakeDownload(container.blobs[name])
+
+        return SimpleNamespace(download_blob=download_blob)
+
+
+class TestCorpusAnalyzer:
+    """Test suite for incremental corpus analysis."""
+
+    @pytest.fixture
+    def corpus_analyzer(self, monkeypatch, tmp_path):
+        """Create CorpusAnalyzer backed by an in-memory container."""
+        monkeypatch.setenv("AZURE_STORAGE_ACCOUNT", "teststorage")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com/")
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("EMBEDDING_CACHE_ENABLED", "false")
+        monkeypatch.setenv("COMPLETION_CACHE_ENABLED", "false")
+        monkeypatch.setenv("CACHE_DIR", str(tmp_path))
+        with patch("azure_services.openai_client.AsyncAzureOpenAI"):
+            analyzer = CorpusAnalyzer()
+        self.container = FakeContainerClient(TEST_DOCUMENTS)
+        analyzer.storage_client.blob_service_client = SimpleNamespace(
+            get_container_client=lambda name: self.container
+        )
+        return analyzer
+
+    async def full_analysis(self, analyzer):
+        """Reference result from a from-scratch analysis of the current blobs."""
+        documents = [content.decode() for content in self.container.blobs.values()]
+        return await analyzer._perform_real_analysis(documents, "programming/")
+
+    @pytest.mark.asyncio
+    async def test_first_run_matches_full_analysis(self, corpus_analyzer):
+        """Test a cold run downloads everything and matches a full analysis."""
+        analysis = await corpus_analyzer.analyze_documents_from_storage("docs", "programming/")
+        expected = await self.full_analysis(corpus_analyzer)
+
+        assert sorted(self.container.downloads) == sorted(TEST_DOCUMENTS)
+        assert analysis.statistics == expected.statistics
+        assert analysis.quality_metrics == expected.quality_metrics
+
+    @pytest.mark.asyncio
+    async def test_unchanged_corpus_downloads_nothing(self, corpus_analyzer):
+        """Test a re-run with identical etags skips every download."""
+        first = await corpus_analyzer.analyze_documents_from_storage("docs", "programming/")
+        self.container.downloads.clear()
+
+        second = await corpus_analyzer.analyze_documents_from_storage("docs", "programming/")
+
+        assert self.container.downloads == []
+        assert second.statistics == first.statistics
+
+    @pytest.mark.asyncio
+    async def test_changed_and_deleted_blobs_are_merged(self, corpus_analyzer):
+        """Test only changed blobs are re-read and deleted ones are subtracted."""
+        await corpus_analyzer.analyze_documents_from_storage("docs", "programming/")
+        self.container.downloads.clear()
+        self.container.write("programming/python.md", "Python generators yield values lazily.")
+        self.container.write("programming/java.md", "Java interfaces declare methods.")
+        self.container.delete("programming/go.md")
+
+        analysis = await corpus_analyzer.analyze_documents_from_storage("docs", "programming/")
+        expected = await self.full_analysis(corpus_analyzer)
+
+        assert sorted(self.container.downloads) == ["programming/java.md", "programming/python.md"]
+        assert analysis.statistics == expected.statistics
+        assert analysis.quality_metrics == expected.quality_metrics
+
+    @pytest.mark.asyncio
+    async def test_failed_downloads_are_reported_and_retried(self, corpus_analyzer):
+        """Test a blob that fails to download is counted and picked up by the next run."""
+        self.container.failing = {"programming/go.md"}
+        first = await corpus_analyzer.analyze_documents_from_storage("docs", "programming/")
+
+        assert first.statistics.document_count == len(TEST_DOCUMENTS) - 1
+        assert first.quality_metrics["documents_failed"] == 1
+        assert "programming/go.md" in first.recommendations[-1]
+
+        self.container.failing.clear()
+        self.container.downloads.clear()
+        second = await corpus_analyzer.analyze_documents_from_storage("docs", "programming/")
+
+        assert self.container.downloads == ["programming/go.md"]
+        assert second.statistics.document_count == len(TEST_DOCUMENTS)
+        assert "documents_failed" not in second.quality_metrics
+
+    @pytest.mark.asyncio
+    async def test_manifest_persists_between_analyzers(self, corpus_analyzer, tmp_path):
+        """Test the manifest written by one run is picked up by the next."""
+        await corpus_analyzer.analyze_documents_from_storage("docs", "programming/")
+
+        manifest = CorpusManifest.for_domain(tmp_path / "corpus", "docs", "programming/")
+
+        assert sorted(manifest.entries) == sorted(TEST_DOCUMENTS)
+        assert manifest.totals.document_count == len(TEST_DOCUMENTS)
+
+    def test_totals_removal_restores_previous_state(self):
+        """Test subtracting a document exactly undoes adding it."""
+        totals = CorpusTotals()
+        totals.add(DocumentStats.from_text("alpha beta beta"))
+        before = CorpusTotals.from_dict(totals.to_dict())
+        extra = DocumentStats.from_text("beta gamma delta")
+
+        totals.add(extra)
+        totals.remove(extra)
+
+        assert totals == before
+
+    @pytest.mark.asyncio
+    async def test_process_pool_is_bit_identical_to_serial(self, corpus_analyzer):
+        """Test sharded multi-process analysis reproduces the serial result exactly."""
+        documents = [f"{text} shard{i % 5} {'x' * i}" for i, text in enumerate(list(TEST_DOCUMENTS.values()) * 20)]
+        documents.append("[Binary file: image.png - 10 bytes]")
+        serial = await corpus_analyzer._perform_real_analysis(documents, "programming/")
+
+        corpus_analyzer.analysis_workers = 2
+        corpus_analyzer.analysis_shard_size = 7
+        parallel = await corpus_analyzer._perform_real_analysis(iter(documents), "programming/")
+
+        assert parallel.statistics == serial.statistics
+        assert parallel.quality_metrics == serial.quality_metrics
+
+    @pytest.mark.asyncio
+    async def test_storage_path_tokenizes_in_process_pool(self, corpus_analyzer):
+        """Test the manifest path shards downloads across workers with identical results."""
+        for i in range(9):
+            self.container.write(f"programming/extra_{i}.md", f"Generics shard{i} {'y' * i}")
+        self.container.write("programming/image.png", "[Binary file: image.png - 10 bytes]")
+        serial = await corpus_analyzer.analyze_documents_from_storage("docs", "programming/")
+
+        corpus_analyzer.manifest_dir = corpus_analyzer.manifest_dir / "parallel"
+        corpus_analyzer.analysis_workers = 2
+        corpus_analyzer.analysis_shard_size = 2
+        parallel = await corpus_analyzer.analyze_documents_from_storage("docs", "programming/")
+
+        assert parallel.statistics == serial.statistics
+        assert parallel.quality_metrics == serial.quality_metrics
+        assert corpus_analyzer.documents_downloaded == 2 * len(self.container.blobs)
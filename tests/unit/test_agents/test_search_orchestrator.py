@@ -0,0 +1,99 @@
+"""
+Unit tests for SearchOrchestrator and UniSearchTools result synthesis
+Tests fused rankings are converted into SearchResults with [0,1] relevance.
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from agents.uni_search.orchestrator import SearchOrchestrator
+from agents.uni_search.search_tools import UniSearchTools
+
+
+# Test fixture - learned domain search configuration
+TEST_SEARCH_CONFIG = {"domain": "programming", "similarity_threshold": 0.8, "max_results": 3}
+
+
+class FakeSearchClient:
+    """Returns fixed vector results on Azure's cosine score scale."""
+
+    async def vector_search(self, query_vector, top_k=None):
+        return [
+            {"id": "doc-a", "content": "alpha", "score": 0.95, "metadata": {"type": "vector_result"}},
+            {"id": "doc-b", "content": "beta", "score": 0.85, "metadata": {"type": "vector_result"}},
+            {"id": "doc-c", "content": "gamma", "score": 0.60, "metadata": {"type": "vector_result"}},
+        ][:top_k]
+
+
+class FakeOpenAIClient:
+    async def generate_embedding(self, text):
+        return SimpleNamespace(embedding=[0.1, 0.2, 0.3])
+
+
+class TestSearchOrchestrator:
+    """Test suite for search orchestration and synthesis."""
+
+    @pytest.fixture
+    def orchestrator(self, monkeypatch):
+        """Create SearchOrchestrator with fake Azure clients."""
+        monkeypatch.setenv("AZURE_SEARCH_ENDPOINT", "https://test.search.windows.net")
+        monkeypatch.setenv("AZURE_SEARCH_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com/")
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        with patch("azure_services.openai_client.AsyncAzureOpenAI"):
+            orchestrator = SearchOrchestrator()
+        orchestrator.search_client = FakeSearchClient()
+        orchestrator.openai_client = FakeOpenAIClient()
+        return orchestrator
+
+    @pytest.mark.asyncio
+    async def test_vector_search_applies_similarity_threshold(self, orchestrator):
+        """Test results below the learned threshold are dropped."""
+        results = await orchestrator.vector_search("query", TEST_SEARCH_CONFIG)
+
+        assert [r["id"] for r in results] == ["doc-a", "doc-b"]
+
+    @pytest.mark.asyncio
+    async def test_execute_vector_search_returns_search_results(self, orchestrator):
+        """Test the vector pipeline produces a validated SearchResults model."""
+        results = await orchestrator.execute_vector_search("query", TEST_SEARCH_CONFIG)
+
+        assert results.domain == "programming"
+        assert [r.document_id for r in results.results] == ["doc-a", "doc-b"]
+        assert results.results[0].relevance_score == pytest.approx(1.0)
+        assert results.results[0].search_method == "vector"
+        assert orchestrator.search_count == 1
+
+    def test_synthesize_results_fuses_sources(self, orchestrator):
+        """Test tri-modal results are deduplicated and ranked on one scale."""
+        result_sets = {
+            "vector": [{"id": "doc-a", "content": "alpha", "score": 0.9}, {"id": "doc-b", "content": "beta", "score": 0.8}],
+            "hybrid": [{"id": "doc-b", "content": "beta", "score": 0.03}, {"id": "doc-c", "content": "gamma", "score": 0.02}],
+            "graph": [{"id": "doc-b", "content": "beta", "score": 4.0}],
+        }
+
+        results = orchestrator.synthesize_results("query", result_sets, TEST_SEARCH_CONFIG, 0.1)
+
+        assert results.results[0].document_id == "doc-b"
+        assert results.total_found == 3
+        assert all(0.0 <= r.relevance_score <= 1.0 for r in results.results)
+        assert set(results.results[0].metadata["source_scores"]) == {"vector", "hybrid", "graph"}
+
+    @pytest.mark.asyncio
+    async def test_tools_synthesize_rescales_and_limits(self):
+        """Test UniSearchTools dedupes, rescales into [0,1] and caps results."""
+        vector_results = [
+            {"id": "doc-a", "content": "alpha", "score": 0.95},
+            {"id": "doc-a", "content": "alpha", "score": 0.95},
+            {"id": "doc-b", "content": "beta", "score": 0.85},
+            {"id": "doc-c", "content": "gamma", "score": 0.75},
+            {"id": "doc-d", "content": "delta", "score": 0.65},
+        ]
+
+        results = await UniSearchTools().synthesize_search_results(
+            vector_results, {**TEST_SEARCH_CONFIG, "query": "query"}
+        )
+
+        assert [r.document_id for r in results.results] == ["doc-a", "doc-b", "doc-c"]
+        assert results.results[0].relevance_score == pytest.approx(1.0)
+        assert results.total_found == 4
@@ -0,0 +1,199 @@
+"""
+Unit tests for StatePersistence
+Tests checkpoint log replay, crash tolerance and the file and blob backends.
+"""
+
+import pytest
+from datetime import datetime
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from agents.graph_flows.state_persist import BlobStateLogBackend, FileStateLogBackend, StatePersistence
+from models.workflow import NodeExecution, WorkflowContext
+
+
+# Test fixtures - a workflow context and node executions
+TEST_WORKFLOW_ID = "extraction-run-1"
+TEST_CONTEXT = WorkflowContext(
+    workflow_id=TEST_WORKFLOW_ID,
+    workflow_name="knowledge_extract",
+    domain="maintenance",
+    input_data={"documents": ["doc-1", "doc-2"]},
+    config_used={"workflow_version": "1.0"},
+    started_at=datetime(2026, 1, 1)
+)
+
+
+def node_execution(node_id, success=True, document_id=None):
+    """Build a finished NodeExecution with one output."""
+    return NodeExecution(
+        node_id=node_id,
+        node_type="llm",
+        input_data={"content": "long document text"},
+        output_data={node_id: f"{node_id}-output"},
+        execution_time=0.5,
+        success=success,
+        document_id=document_id
+    )
+
+
+class FakeBlobClient:
+    """Append blob held in the fake service's dict."""
+
+    def __init__(self, service, name):
+        self.service = service
+        self.name = name
+
+    async def append_block(self, data):
+        if self.name not in self.service.blobs:
+            raise ResourceNotFoundError("BlobNotFound")
+        self.service.blobs[self.name] += data
+
+    async def create_append_blob(self):
+        self.service.blobs[self.name] = b""
+
+    async def download_blob(self):
+        if self.name not in self.service.blobs:
+            raise ResourceNotFoundError("BlobNotFound")
+        return FakeDownload(self.service.blobs[self.name])
+
+    async def delete_blob(self):
+        self.service.blobs.pop(self.name)
+
+
+class FakeDownload:
+    def __init__(self, data):
+        self.data = data
+
+    async def readall(self):
+        return self.data
+
+
+class FakeContainerClient:
+    def __init__(self, service):
+        self.service = service
+
+    async def create_container(self):
+        if self.service.container_created:
+            raise ResourceExistsError("ContainerAlreadyExists")
+        self.service.container_created = True
+
+
+class FakeBlobServiceClient:
+    """In-memory stand-in for the async BlobServiceClient."""
+
+    def __init__(self):
+        self.blobs = {}
+        self.container_created = False
+
+    def get_blob_client(self, container, blob):
+        return FakeBlobClient(self, f"{container}/{blob}")
+
+    def get_container_client(self, container):
+        return FakeContainerClient(self)
+
+
+class TestStatePersistence:
+    """Test suite for StatePersistence."""
+
+    @pytest.fixture
+    def persistence(self, tmp_path):
+        """Create StatePersistence over a temporary state directory."""
+        return StatePersistence(FileStateLogBackend(tmp_path / "state", fsync=False))
+
+    @pytest.mark.asyncio
+    async def test_missing_state_loads_as_failure(self, persistence):
+        """Test that unknown workflows have no execution to resume."""
+        result = await persistence.load_workflow_state("unknown")
+
+        assert await persistence.load_execution("unknown") is None
+        assert not result.success
+        assert result.error_summary == "No saved state for workflow 'unknown'"
+
+    @pytest.mark.asyncio
+    async def test_replay_keeps_latest_successful_nodes(self, persistence):
+        """Test that failed nodes are dropped and a later success replaces them."""
+        assert (await persistence.save_workflow_state(TEST_WORKFLOW_ID, TEST_CONTEXT)).success
+        await persistence.checkpoint_node(TEST_WORKFLOW_ID, node_execution("entities"))
+        await persistence.checkpoint_node(TEST_WORKFLOW_ID, node_execution("relations", success=False))
+
+        execution = await persistence.load_execution(TEST_WORKFLOW_ID)
+        assert execution.workflow_name == "knowledge_extract"
+        assert execution.workflow_version == "1.0"
+        assert execution.execution_status == "running"
+        assert [e.node_id for e in execution.node_executions] == ["entities"]
+        assert execution.node_executions[0].input_data == {}
+        assert execution.execution_context["context"] == {"documents": ["doc-1", "doc-2"]}
+
+        await persistence.checkpoint_node(TEST_WORKFLOW_ID, node_execution("relations"))
+        await persistence.finish_workflow(TEST_WORKFLOW_ID, True, {"relations": "relations-output"})
+
+        result = await persistence.load_workflow_state(TEST_WORKFLOW_ID)
+        assert result.success
+        assert [e.node_id for e in result.node_executions] == ["entities", "relations"]
+        assert result.final_output == {"relations": "relations-output"}
+        assert (await persistence.load_execution(TEST_WORKFLOW_ID)).execution_status == "completed"
+
+    @pytest.mark.asyncio
+    async def test_completed_documents_drop_their_nodes(self, persistence):
+        """Test that only nodes of unfinished documents are replayed."""
+        await persistence.save_workflow_state(TEST_WORKFLOW_ID, TEST_CONTEXT)
+        await persistence.checkpoint_node(TEST_WORKFLOW_ID, node_execution("entities", document_id="doc-1"))
+        await persistence.checkpoint_document(TEST_WORKFLOW_ID, "doc-1", {"entities": ["pump"]})
+        await persistence.checkpoint_node(TEST_WORKFLOW_ID, node_execution("entities", document_id="doc-2"))
+
+        execution = await persistence.load_execution(TEST_WORKFLOW_ID)
+        assert execution.execution_context["completed_documents"] == {"doc-1": {"entities": ["pump"]}}
+        assert [(e.document_id, e.node_id) for e in execution.node_executions] == [("doc-2", "entities")]
+
+    @pytest.mark.asyncio
+    async def test_torn_final_record_is_ignored(self, persistence, tmp_path):
+        """Test that a crash mid-append loses only the record being written."""
+        await persistence.save_workflow_state(TEST_WORKFLOW_ID, TEST_CONTEXT)
+        await persistence.checkpoint_node(TEST_WORKFLOW_ID, node_execution("entities"))
+        log_path = tmp_path / "state" / f"{TEST_WORKFLOW_ID}.jsonl"
+        with open(log_path, "a") as log_file:
+            log_file.write('{"record": "node", "execution": {"node_')
+
+        execution = await persistence.load_execution(TEST_WORKFLOW_ID)
+        assert [e.node_id for e in execution.node_executions] == ["entities"]
+
+        log_path.write_text('{"record"\n' + log_path.read_text())
+        with pytest.raises(RuntimeError, match="Corrupt state log"):
+            await persistence.load_execution(TEST_WORKFLOW_ID)
+
+    @pytest.mark.asyncio
+    async def test_append_after_torn_record_drops_it(self, persistence, tmp_path, monkeypatch):
+        """Test that a restart keeps checkpointing after a crash tore the last line."""
+        monkeypatch.setattr(FileStateLogBackend, "SCAN_CHUNK", 8)
+        await persistence.save_workflow_state(TEST_WORKFLOW_ID, TEST_CONTEXT)
+        await persistence.checkpoint_node(TEST_WORKFLOW_ID, node_execution("entities"))
+        log_path = tmp_path / "state" / f"{TEST_WORKFLOW_ID}.jsonl"
+        with open(log_path, "a") as log_file:
+            log_file.write('{"record": "node", "execution": {"node_')
+
+        await persistence.checkpoint_node(TEST_WORKFLOW_ID, node_execution("relations"))
+        await persistence.checkpoint_node(TEST_WORKFLOW_ID, node_execution("validation"))
+
+        execution = await persistence.load_execution(TEST_WORKFLOW_ID)
+        assert [e.node_id for e in execution.node_executions] == ["entities", "relations", "validation"]
+        assert len(log_path.read_text().splitlines()) == 4
+
+    @pytest.mark.asyncio
+    async def test_blob_backend_creates_append_blob_once(self):
+        """Test that the blob backend creates its container and blob on first append."""
+        service = FakeBlobServiceClient()
+        persistence = StatePersistence(BlobStateLogBackend(service, "workflow-state"))
+
+        await persistence.save_workflow_state(TEST_WORKFLOW_ID, TEST_CONTEXT)
+        await persistence.checkpoint_node(TEST_WORKFLOW_ID, node_execution("entities"))
+
+        assert service.container_created
+        assert (await persistence.load_execution(TEST_WORKFLOW_ID)).node_executions[0].node_id == "entities"
+        await persistence.delete_workflow_state(TEST_WORKFLOW_ID)
+        assert await persistence.load_execution(TEST_WORKFLOW_ID) is None
+
+    def test_unknown_backend_raises(self, monkeypatch):
+        """Test that STATE_BACKEND is validated."""
+        monkeypatch.setenv("STATE_BACKEND", "redis")
+
+        with pytest.raises(ValueError, match="Unknown STATE_BACKEND 'redis'. Available: file, blob"):
+            StatePersistence()
@@ -0,0 +1 @@
+# API Unit Tests Package.
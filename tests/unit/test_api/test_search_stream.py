@@ -0,0 +1,165 @@
+"""
+Unit tests for the streaming search endpoint
+Tests SSE event order, time-to-first-result and per-modality failure isolation.
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+import httpx
+import pytest
+from fastapi import FastAPI
+from api.endpoints.search import (
+    router, stream_search_events, get_cosmos_client_provider, get_openai_client, get_search_client
+)
+from models.search import SearchRequest
+
+
+# Test fixtures - simulated latency of each modality and of answer generation
+TEXT_LATENCY = 0.02
+VECTOR_LATENCY = 0.1
+GRAPH_LATENCY = 0.2
+ANSWER_LATENCY = 0.3
+ANSWER_TOKENS = ["Beta", " is", " the", " answer", " [1]."]
+
+
+class FakeSearchClient:
+    async def text_search(self, query, top_k=None):
+        await asyncio.sleep(TEXT_LATENCY)
+        return [{"id": "doc-a", "content": "alpha", "score": 2.5}, {"id": "doc-b", "content": "beta", "score": 1.0}]
+
+    async def vector_search(self, query_vector, top_k=None):
+        await asyncio.sleep(VECTOR_LATENCY / 2)
+        return [{"id": "doc-b", "content": "beta", "score": 0.9}]
+
+
+class FakeOpenAIClient:
+    def __init__(self):
+        self.messages = None
+
+    async def generate_embedding(self, text):
+        await asyncio.sleep(VECTOR_LATENCY / 2)
+        return SimpleNamespace(embedding=[0.1, 0.2])
+
+    async def chat_completion_stream(self, messages, max_tokens=None, temperature=None):
+        self.messages = messages
+        for token in ANSWER_TOKENS:
+            await asyncio.sleep(ANSWER_LATENCY / len(ANSWER_TOKENS))
+            yield token
+
+
+class FakeCosmosClient:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    async def query_graph(self, query=None, bindings=None, template=None):
+        self.calls.append((template, bindings))
+        await asyncio.sleep(GRAPH_LATENCY)
+        if self.fail:
+            raise RuntimeError("Gremlin query execution failed: timeout")
+        return [{"id": "entity-1", "label": "concept", "properties": {"name": "beta"}, "type": "vertex"}]
+
+
+def parse_events(body):
+    """Decode an SSE body into (event, data) pairs."""
+    events = []
+    for block in body.replace("\r\n", "\n").strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n") if ": " in line)
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestSearchStream:
+    """Test suite for /search/stream."""
+
+    @pytest.fixture
+    def clients(self):
+        clients = SimpleNamespace(search=FakeSearchClient(), openai=FakeOpenAIClient(), cosmos=FakeCosmosClient())
+        clients.cosmos_provider = lambda: clients.cosmos
+        return clients
+
+    @pytest.fixture
+    def app(self, clients):
+        """App with the search router and fake Azure clients."""
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_search_client] = lambda: clients.search
+        app.dependency_overrides[get_openai_client] = lambda: clients.openai
+        app.dependency_overrides[get_cosmos_client_provider] = lambda: lambda: clients.cosmos_provider()
+        return app
+
+    async def stream(self, app):
+        """POST a search through the ASGI app and decode the event stream."""
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/search/stream", json={"query": "what is beta", "domain": "programming"})
+        assert response.status_code == 200
+        return parse_events(response.text)
+
+    @pytest.mark.asyncio
+    async def test_events_arrive_fastest_modality_first(self, app):
+        """Test modalities stream as they finish, then fused, answer and done."""
+        events = await self.stream(app)
+
+        assert [e[0] for e in events] == ["results"] * 3 + ["fused"] + ["token"] * len(ANSWER_TOKENS) + ["done"]
+        assert [e[1]["modality"] for e in events[:3]] == ["text", "vector", "graph"]
+        assert events[3][1]["results"][0]["document_id"] == "doc-b"
+        assert all(0.0 <= r["relevance_score"] <= 1.0 for r in events[3][1]["results"])
+        assert "".join(data["text"] for event, data in events if event == "token") == "Beta is the answer [1]."
+
+    @pytest.mark.asyncio
+    async def test_first_result_arrives_before_slowest_modality(self, clients):
+        """Test time-to-first-result tracks the fastest modality, not the whole pipeline."""
+        request = SearchRequest(query="what is beta", domain="programming")
+
+        start_time = time.perf_counter()
+        arrivals = []
+        async for event in stream_search_events(request, clients.search, clients.openai, clients.cosmos_provider):
+            arrivals.append((event["event"], time.perf_counter() - start_time))
+        done = json.loads(event["data"])
+
+        assert arrivals[0] == ("results", pytest.approx(TEXT_LATENCY, abs=0.05))
+        assert done["time_to_first_result"] < VECTOR_LATENCY
+        # The first answer token follows the slowest modality by one token, not the whole answer
+        assert done["time_to_first_token"] < GRAPH_LATENCY + ANSWER_LATENCY / 2
+        assert done["total_time"] >= GRAPH_LATENCY + ANSWER_LATENCY
+
+    @pytest.mark.asyncio
+    async def test_failed_modality_does_not_end_stream(self, app, clients):
+        """Test a graph failure is reported and the other modalities still fuse."""
+        clients.cosmos.fail = True
+
+        events = await self.stream(app)
+
+        assert ("modality_error", {"modality": "graph", "error": "Gremlin query execution failed: timeout"}) in events
+        fused = next(data for event, data in events if event == "fused")
+        assert fused["config_used"]["modalities"] == ["text", "vector"]
+        assert events[-1][0] == "done"
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_graph_backend_fails_only_its_modality(self, app, clients):
+        """Test missing Cosmos settings become a graph modality_error, not a failed request."""
+        def missing_settings():
+            raise ValueError("AZURE_COSMOS_ENDPOINT and AZURE_COSMOS_KEY must be set")
+        clients.cosmos_provider = missing_settings
+
+        events = await self.stream(app)
+
+        assert ("modality_error", {
+            "modality": "graph", "error": "AZURE_COSMOS_ENDPOINT and AZURE_COSMOS_KEY must be set"
+        }) in events
+        fused = next(data for event, data in events if event == "fused")
+        assert fused["config_used"]["modalities"] == ["text", "vector"]
+        assert events[-1][0] == "done"
+
+    @pytest.mark.asyncio
+    async def test_graph_modality_looks_up_query_terms(self, app, clients):
+        """Test the graph lookup uses the bound name-list template."""
+        await self.stream(app)
+
+        template, bindings = clients.cosmos.calls[0]
+        assert template == "find_vertices_by_names"
+        assert bindings["vertex_names"] == ["what is beta", "what", "beta"]
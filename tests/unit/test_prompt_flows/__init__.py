@@ -0,0 +1 @@
+# Prompt Flows Unit Tests Package.
@@ -0,0 +1,310 @@
+"""
+Unit tests for FlowMgr
+Tests DAG ordering, concurrent stages, timeouts, failure propagation and resuming.
+"""
+
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from agents.graph_flows.state_persist import FileStateLogBackend, StatePersistence
+from azure_services import rate_limiter
+from azure_services.completion_cache import CompletionCache
+from azure_services.openai_client import OpenAIClient
+from models.workflow import TemplateRenderResult
+from prompt_flows.flow_mgr import FlowMgr
+from prompt_flows.template_mgr import TemplateMgr
+
+
+# Test fixtures - simulated stage latency and a diamond-shaped workflow
+STAGE_DELAY = 0.2
+DIAMOND_WORKFLOW = """
+workflow_id: "diamond"
+stages:
+  - name: "analysis"
+    type: "llm"
+    template: "analyze.jinja2"
+    inputs: [domain]
+    outputs: [summary]
+  - name: "pattern_lookup"
+    type: "python"
+    function: "lookup_patterns"
+    depends_on: ["analysis"]
+    inputs: [summary]
+    outputs: [patterns]
+    performance_targets:
+      max_execution_time: "{{ lookup_timeout | default(5.0) }}"
+  - name: "statistics"
+    type: "python"
+    function: "compute_statistics"
+    depends_on: ["analysis"]
+    inputs: [summary]
+    outputs: [statistics]
+  - name: "config_generation"
+    type: "python"
+    function: "generate_config"
+    depends_on: ["pattern_lookup", "statistics"]
+    inputs: [patterns, statistics]
+    outputs: [config]
+    validation:
+      required_fields: ["config"]
+execution_config:
+  parallel_execution: true
+"""
+
+
+class FakeTemplateMgr:
+    """Renders templates as their name plus the sorted context keys."""
+
+    async def render_template(self, template_name, context):
+        return TemplateRenderResult(
+            rendered_content=f"{template_name}: {sorted(context)}",
+            template_name=template_name,
+            render_time=0.0
+        )
+
+
+class FakeOpenAIClient:
+    """Chat client answering every prompt with a JSON object after a delay."""
+
+    def __init__(self):
+        self.prompts = []
+
+    async def chat_completion(self, messages, **kwargs):
+        self.prompts.append(messages[0]["content"])
+        await asyncio.sleep(STAGE_DELAY)
+        return '```json\n{"summary": "pumps", "unused": 1}\n```'
+
+
+class FakeChatCompletions:
+    """Async stand-in for AsyncAzureOpenAI.chat.completions counting upstream calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(
+                content='{"extracted_entities": ["P-101"], "entity_confidence_scores": [0.9]}'
+            ))],
+            usage=SimpleNamespace(total_tokens=11)
+        )
+
+
+async def lookup_patterns(summary):
+    await asyncio.sleep(STAGE_DELAY)
+    return {"patterns": [f"{summary}-pattern"]}
+
+
+async def compute_statistics(summary):
+    await asyncio.sleep(STAGE_DELAY)
+    return {"statistics": {"documents": 3}}
+
+
+def generate_config(patterns, statistics):
+    return {"config": {"patterns": patterns, **statistics}}
+
+
+class TestFlowMgr:
+    """Test suite for FlowMgr DAG execution."""
+
+    @pytest.fixture
+    def flow_mgr(self, tmp_path):
+        """Create FlowMgr over a temporary defs/ directory with fake providers."""
+        (tmp_path / "diamond.yaml").write_text(DIAMOND_WORKFLOW)
+        mgr = FlowMgr(
+            template_mgr=FakeTemplateMgr(),
+            openai_client=FakeOpenAIClient(),
+            functions={
+                "lookup_patterns": lookup_patterns,
+                "compute_statistics": compute_statistics,
+                "generate_config": generate_config,
+            },
+            max_concurrency=4
+        )
+        mgr.defs_dir = tmp_path
+        mgr.state_persistence = StatePersistence(FileStateLogBackend(tmp_path / "state", fsync=False))
+        return mgr
+
+    @pytest.mark.asyncio
+    async def test_load_workflow_resolves_templated_timeouts(self, flow_mgr):
+        """Test that stages become FlowNodes with rendered max_execution_time."""
+        nodes = await flow_mgr.load_workflow("diamond", {"lookup_timeout": 2.5})
+        by_id = {node.node_id: node for node in nodes}
+
+        assert nodes[0].node_id == "analysis"
+        assert by_id["pattern_lookup"].max_execution_time == 2.5
+        assert by_id["config_generation"].dependencies == ["pattern_lookup", "statistics"]
+        assert (await flow_mgr.load_workflow("diamond"))[1].max_execution_time == 5.0
+
+    @pytest.mark.asyncio
+    async def test_bundled_workflows_load(self):
+        """Test that every definition in prompt_flows/defs forms a valid DAG."""
+        flow_mgr = FlowMgr(template_mgr=FakeTemplateMgr())
+
+        for workflow_name in ("domain_config", "knowledge_extract", "search_optimize"):
+            nodes = await flow_mgr.load_workflow(workflow_name)
+            assert nodes and all(node.max_execution_time for node in nodes)
+
+    @pytest.mark.asyncio
+    async def test_bundled_extraction_stage_reruns_from_completion_cache(self, monkeypatch, tmp_path):
+        """Test that rerunning a bundled LLM stage is answered by the completion cache."""
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com/")
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("EMBEDDING_CACHE_ENABLED", "false")
+        monkeypatch.setenv("COMPLETION_CACHE_ENABLED", "false")
+        monkeypatch.setattr(rate_limiter, "_SHARED_LIMITERS", {})
+        with patch("azure_services.openai_client.AsyncAzureOpenAI"):
+            openai_client = OpenAIClient()
+        completions = FakeChatCompletions()
+        openai_client.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        openai_client.completion_cache = CompletionCache(
+            cache_dir=tmp_path, deployment=openai_client.gpt_deployment, max_entries=10, ttl=60, sync_interval=1
+        )
+        flow_mgr = FlowMgr(template_mgr=FakeTemplateMgr(), openai_client=openai_client)
+        node = (await flow_mgr.load_workflow("knowledge_extract"))[0]
+        context = {"domain": "maintenance", "content": "Pump P-101 feeds tank T-4."}
+
+        first = await flow_mgr.execute_node(node, context)
+        rerun = await flow_mgr.execute_node(node, context)
+
+        assert first.success and rerun.success
+        assert rerun.output_data == first.output_data
+        assert len(completions.calls) == 1
+        assert openai_client.completion_cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_workflow_outputs_flow_between_stages(self, flow_mgr):
+        """Test that each stage reads upstream outputs and the final output collects them."""
+        result = await flow_mgr.execute_workflow("diamond", {"domain": "maintenance"})
+
+        assert result.success
+        assert result.final_output["config"] == {"patterns": ["pumps-pattern"], "documents": 3}
+        assert "unused" not in result.final_output
+        assert [e.node_id for e in result.node_executions] == [
+            "analysis", "pattern_lookup", "statistics", "config_generation"
+        ]
+        assert flow_mgr.openai_client.prompts == ["analyze.jinja2: ['domain']"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.performance
+    async def test_independent_stages_run_concurrently(self, flow_mgr):
+        """Benchmark: the two middle stages overlap, so the diamond takes three stage delays."""
+        start_time = time.perf_counter()
+        result = await flow_mgr.execute_workflow("diamond", {"domain": "maintenance"})
+        elapsed = time.perf_counter() - start_time
+
+        by_id = {e.node_id: e for e in result.node_executions}
+        overlap = abs((by_id["pattern_lookup"].started_at - by_id["statistics"].started_at).total_seconds())
+        assert overlap < STAGE_DELAY / 2
+        assert elapsed < 3 * STAGE_DELAY + STAGE_DELAY / 2
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_serializes_stages(self, flow_mgr):
+        """Test that max_concurrency=1 runs independent stages one at a time."""
+        flow_mgr.max_concurrency = 1
+        result = await flow_mgr.execute_workflow("diamond", {"domain": "maintenance"})
+
+        by_id = {e.node_id: e for e in result.node_executions}
+        gap = abs((by_id["pattern_lookup"].started_at - by_id["statistics"].started_at).total_seconds())
+        assert result.success
+        assert gap >= STAGE_DELAY * 0.9
+
+    @pytest.mark.asyncio
+    async def test_timeout_fails_node_and_skips_dependents(self, flow_mgr):
+        """Test that max_execution_time is enforced and downstream stages are skipped."""
+        result = await flow_mgr.execute_workflow("diamond", {"domain": "maintenance", "lookup_timeout": 0.05})
+
+        by_id = {e.node_id: e for e in result.node_executions}
+        assert not result.success
+        assert "max_execution_time" in by_id["pattern_lookup"].error_details
+        assert by_id["statistics"].success
+        assert by_id["config_generation"].error_details == "Skipped: dependency pattern_lookup failed"
+        assert "pattern_lookup" in result.error_summary
+
+    @pytest.mark.asyncio
+    async def test_missing_required_output_fails_node(self, flow_mgr):
+        """Test that validation.required_fields are checked on node outputs."""
+        flow_mgr.register_function("generate_config", lambda patterns, statistics: {})
+
+        result = await flow_mgr.execute_workflow("diamond", {"domain": "maintenance"})
+
+        assert result.node_executions[-1].error_details == "Missing required outputs: config"
+
+    @pytest.mark.asyncio
+    async def test_missing_template_variable_fails_llm_node(self, flow_mgr, monkeypatch, tmp_path):
+        """Test that an LLM node never sends a prompt rendered without its required variables."""
+        monkeypatch.setenv("CACHE_DIR", str(tmp_path / "cache"))
+        templates_dir = tmp_path / "templates"
+        templates_dir.mkdir()
+        (templates_dir / "analyze.jinja2").write_text("Summarize {{ domain }} for {{ audience }}.")
+        flow_mgr.template_mgr = TemplateMgr(templates_dir=templates_dir)
+
+        # audience is in the workflow context but not among the stage's declared inputs
+        result = await flow_mgr.execute_workflow("diamond", {"domain": "maintenance", "audience": "operators"})
+
+        by_id = {e.node_id: e for e in result.node_executions}
+        assert not result.success
+        assert by_id["analysis"].error_details == (
+            "ValueError: Template 'analyze.jinja2' is missing required variables: audience"
+        )
+        assert by_id["config_generation"].error_details.startswith("Skipped")
+        assert flow_mgr.openai_client.prompts == []
+
+    @pytest.mark.asyncio
+    async def test_cycles_and_unknown_workflows_raise(self, flow_mgr, tmp_path):
+        """Test that invalid graphs are rejected before anything runs."""
+        (tmp_path / "cycle.yaml").write_text(
+            "stages:\n"
+            "  - {name: a, type: python, depends_on: [b]}\n"
+            "  - {name: b, type: python, depends_on: [a]}\n"
+        )
+
+        with pytest.raises(ValueError, match="dependency cycle"):
+            await flow_mgr.load_workflow("cycle")
+        with pytest.raises(ValueError, match="Unknown workflow 'missing'"):
+            await flow_mgr.execute_workflow("missing", {})
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_checkpointed_stages(self, flow_mgr):
+        """Test that rerunning an interrupted execution only runs the unfinished stages."""
+        def crash(patterns, statistics):
+            raise RuntimeError("pod restarted")
+
+        flow_mgr.register_function("generate_config", crash)
+        first = await flow_mgr.execute_workflow("diamond", {"domain": "maintenance"}, execution_id="run-1")
+        flow_mgr.register_function("generate_config", generate_config)
+        second = await flow_mgr.execute_workflow("diamond", {"domain": "maintenance"}, execution_id="run-1")
+
+        assert not first.success
+        assert second.success and second.workflow_id == "run-1"
+        assert second.final_output["config"] == {"patterns": ["pumps-pattern"], "documents": 3}
+        assert flow_mgr.nodes_resumed == 3
+        assert len(flow_mgr.openai_client.prompts) == 1
+
+    @pytest.mark.asyncio
+    async def test_execute_documents_skips_completed_documents(self, flow_mgr):
+        """Test that a restarted batch reuses the outputs of finished documents."""
+        first = await flow_mgr.execute_documents("diamond", {"doc-1": {"domain": "pumps"}}, execution_id="batch-1")
+        results = await flow_mgr.execute_documents(
+            "diamond",
+            {"doc-1": {"domain": "pumps"}, "doc-2": {"domain": "valves"}},
+            execution_id="batch-1"
+        )
+
+        assert all(result.success for result in results.values())
+        assert results["doc-1"].final_output == first["doc-1"].final_output
+        assert [e.document_id for e in results["doc-2"].node_executions] == ["doc-2"] * 4
+        assert flow_mgr.documents_skipped == 1
+        assert len(flow_mgr.openai_client.prompts) == 2
+
+    @pytest.mark.asyncio
+    async def test_execution_id_is_bound_to_its_workflow(self, flow_mgr, tmp_path):
+        """Test that an execution log cannot be resumed by a different workflow."""
+        (tmp_path / "other.yaml").write_text(DIAMOND_WORKFLOW)
+        await flow_mgr.execute_workflow("diamond", {"domain": "maintenance"}, execution_id="run-1")
+
+        with pytest.raises(ValueError, match="belongs to workflow 'diamond'"):
+            await flow_mgr.execute_workflow("other", {"domain": "maintenance"}, execution_id="run-1")
@@ -0,0 +1,107 @@
+"""
+Unit tests for TemplateMgr
+Tests precompilation, AST-derived variables, render results and the bytecode cache.
+"""
+
+import time
+import pytest
+from prompt_flows.template_mgr import TemplateMgr
+
+
+# Test fixtures - a template with required, defaulted and guarded variables
+TEST_TEMPLATE = """Analyze the {{ domain }} corpus of {{ document_count }} documents.
+Target: {{ performance_target | default("balanced") }}
+{% if history %}
+{% for item in history %}
+- {{ item.name }}
+{% endfor %}
+{% endif %}
+"""
+TEST_CONTEXT = {"domain": "maintenance", "document_count": 12, "history": [{"name": "pumps"}]}
+
+
+class TestTemplateMgr:
+    """Test suite for TemplateMgr."""
+
+    @pytest.fixture
+    def template_mgr(self, tmp_path, monkeypatch):
+        """Create TemplateMgr over a temporary templates/ directory."""
+        monkeypatch.setenv("CACHE_DIR", str(tmp_path / "cache"))
+        templates_dir = tmp_path / "templates"
+        templates_dir.mkdir()
+        (templates_dir / "corpus_analyze.jinja2").write_text(TEST_TEMPLATE)
+        return TemplateMgr(templates_dir=templates_dir)
+
+    @pytest.mark.asyncio
+    async def test_templates_precompiled_at_startup(self, template_mgr):
+        """Test that templates are compiled once, up front, and not per render."""
+        assert template_mgr.compile_count == 1
+
+        for _ in range(3):
+            await template_mgr.render_template("corpus_analyze.jinja2", TEST_CONTEXT)
+        assert template_mgr.compile_count == 1
+        assert template_mgr.render_count == 3
+
+    @pytest.mark.asyncio
+    async def test_load_template_derives_variables_from_ast(self, template_mgr):
+        """Test that guarded variables are optional and loop variables are not reported."""
+        config = await template_mgr.load_template("corpus_analyze")
+
+        assert config.template_name == "corpus_analyze.jinja2"
+        assert config.template_type == "domain"
+        assert config.required_variables == ["document_count", "domain"]
+        assert config.optional_variables == ["history", "performance_target"]
+
+    @pytest.mark.asyncio
+    async def test_render_reports_used_and_missing_variables(self, template_mgr):
+        """Test the render result content, variables and timing."""
+        result = await template_mgr.render_template("corpus_analyze.jinja2", {"domain": "maintenance"})
+
+        assert result.rendered_content.startswith("Analyze the maintenance corpus")
+        assert "Target: balanced" in result.rendered_content
+        assert result.variables_used == ["domain"]
+        assert result.missing_variables == ["document_count"]
+        assert result.render_errors == []
+        assert result.render_time > 0
+
+    @pytest.mark.asyncio
+    async def test_render_errors_are_reported(self, template_mgr):
+        """Test that failures inside the template become render_errors."""
+        result = await template_mgr.render_template("corpus_analyze.jinja2", {**TEST_CONTEXT, "history": 3})
+
+        assert result.rendered_content == ""
+        assert result.render_errors == ["TypeError: 'int' object is not iterable"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_template_raises(self, template_mgr):
+        """Test that unknown templates list the available ones."""
+        with pytest.raises(ValueError, match="Unknown template 'missing.jinja2'. Available: corpus_analyze.jinja2"):
+            await template_mgr.render_template("missing", {})
+
+    def test_bytecode_cache_written(self, template_mgr, tmp_path):
+        """Test that compiled bytecode is persisted under CACHE_DIR/templates."""
+        assert list((tmp_path / "cache" / "templates").iterdir())
+
+    @pytest.mark.asyncio
+    async def test_bundled_templates_compile(self, tmp_path, monkeypatch):
+        """Test that every template in prompt_flows/templates precompiles."""
+        monkeypatch.setenv("CACHE_DIR", str(tmp_path))
+        template_mgr = TemplateMgr()
+
+        config = await template_mgr.load_template("entity_extract.jinja2")
+        assert template_mgr.compile_count == len(list(template_mgr.templates_dir.glob("*.jinja2")))
+        assert config.template_type == "extraction"
+        assert "content" in config.required_variables
+
+    @pytest.mark.asyncio
+    @pytest.mark.performance
+    async def test_render_takes_microseconds(self, template_mgr):
+        """Benchmark: a warm render costs well under a millisecond."""
+        await template_mgr.render_template("corpus_analyze.jinja2", TEST_CONTEXT)
+
+        start_time = time.perf_counter()
+        for _ in range(1000):
+            await template_mgr.render_template("corpus_analyze.jinja2", TEST_CONTEXT)
+        per_render = (time.perf_counter() - start_time) / 1000
+
+        assert per_render < 2e-4
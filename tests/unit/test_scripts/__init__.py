@@ -0,0 +1 @@
+# Script Unit Tests Package.
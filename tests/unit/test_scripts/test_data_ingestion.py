@@ -0,0 +1,356 @@
+"""
+Unit tests for the data ingestion script
+Tests Markdown block splitting, token-budgeted chunking and the staged ingestion pipeline.
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import itertools
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+import pytest
+from azure_services.tokenizer import Tokenizer
+
+# The script name starts with a digit, so it is loaded by path
+SCRIPT_PATH = Path(__file__).parents[3] / "scripts" / "dataflow" / "01_data_ingestion.py"
+spec = importlib.util.spec_from_file_location("data_ingestion", SCRIPT_PATH)
+data_ingestion = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(data_ingestion)
+
+
+# Test fixtures - a small Markdown document and a tight token budget
+TEST_BUDGET = 40
+TEST_OVERLAP = 12
+TEST_DOCUMENT = """# Syntax
+
+BNF describes the syntax of programming languages.
+
+## Lists
+
+Recursion describes lists. A rule is recursive if its LHS appears in its RHS.
+
+```python
+# not a heading
+def ident_list(tokens):
+    return tokens
+```
+"""
+SAMPLE_CORPUS = Path(__file__).parents[3] / "data" / "raw" / "Programming-Language" / "sebesta_part_15.md"
+SERVICE_DELAY = 0.05
+TEST_DOCUMENT_COUNT = 12
+
+
+class FakeOpenAIClient:
+    """Embeds each text as its length after a simulated network delay."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.batch_sizes = []
+
+    async def generate_embeddings(self, texts, priority="interactive"):
+        self.batch_sizes.append(len(texts))
+        await asyncio.sleep(SERVICE_DELAY)
+        if self.fail_on and any(self.fail_on in text for text in texts):
+            raise RuntimeError("Azure OpenAI embedding generation failed: throttled")
+        return [SimpleNamespace(embedding=[float(len(text))], token_count=1) for text in texts]
+
+
+class FakeStorageClient:
+    """Keeps uploaded blobs in a dict."""
+
+    container_name = "test-container"
+
+    def __init__(self):
+        self.blobs = {}
+
+    async def upload_blob(self, container_name, blob_name, data):
+        await asyncio.sleep(SERVICE_DELAY)
+        self.blobs[f"{container_name}/{blob_name}"] = data
+        return SimpleNamespace(success=True, error_summary=None)
+
+    async def download_blob(self, container_name, blob_name):
+        return self.blobs.get(f"{container_name}/{blob_name}")
+
+    async def delete_blobs(self, container_name, blob_names):
+        return sum(self.blobs.pop(f"{container_name}/{name}", None) is not None for name in blob_names)
+
+
+class FakeSearchClient:
+    """Keeps indexed documents by key."""
+
+    def __init__(self):
+        self.documents = {}
+        self.invalidations = 0
+
+    async def upload_documents(self, documents):
+        await asyncio.sleep(SERVICE_DELAY)
+        self.documents.update({document["id"]: document for document in documents})
+        return len(documents)
+
+    async def delete_documents(self, keys):
+        for key in keys:
+            self.documents.pop(key, None)
+        return len(keys)
+
+    async def invalidate_cache(self, index_name=None):
+        self.invalidations += 1
+
+
+class TestMarkdownChunker:
+    """Test suite for MarkdownChunker."""
+
+    @pytest.fixture
+    def tokenizer(self, tmp_path):
+        """Vocabulary-free tokenizer with deterministic approximate counts."""
+        return Tokenizer(tmp_path / "missing.tiktoken")
+
+    def make_chunker(self, tokenizer, budget=TEST_BUDGET, overlap=TEST_OVERLAP, min_tokens=1):
+        """Create chunker with test budget."""
+        return data_ingestion.MarkdownChunker(budget, overlap, min_tokens, tokenizer=tokenizer)
+
+    def test_blocks_split_on_headings_paragraphs_and_fences(self):
+        """Test that fenced code is one block and lines inside it are not headings."""
+        blocks = list(data_ingestion.markdown_blocks(TEST_DOCUMENT.splitlines()))
+
+        assert [(kind, line) for kind, _, line in blocks] == [
+            ("heading", 1), ("paragraph", 3), ("heading", 5), ("paragraph", 7), ("code", 9)
+        ]
+        assert blocks[-1][1].startswith("```python\n# not a heading") and blocks[-1][1].endswith("```")
+
+    def test_headings_start_chunks_with_their_path(self, tokenizer):
+        """Test that sections are chunked separately and carry their heading path."""
+        chunks = list(self.make_chunker(tokenizer).chunks(TEST_DOCUMENT.splitlines()))
+
+        assert [chunk["heading_path"] for chunk in chunks] == [["Syntax"], ["Syntax", "Lists"], ["Syntax", "Lists"]]
+        assert chunks[0]["content"] == "# Syntax\n\nBNF describes the syntax of programming languages."
+        assert chunks[2]["content"].startswith("```python")
+        assert (chunks[2]["start_line"], chunks[2]["end_line"]) == (9, 13)
+
+    def test_oversized_paragraphs_split_at_sentences_with_overlap(self, tokenizer):
+        """Test that long prose is packed by sentence and consecutive chunks overlap."""
+        sentences = [f"Sentence {i} describes a grammar rule." for i in range(20)]
+        chunks = list(self.make_chunker(tokenizer).chunks(["\n".join(sentences)]))
+
+        assert len(chunks) > 1
+        assert all(chunk["token_count"] <= TEST_BUDGET for chunk in chunks)
+        for previous, chunk in zip(chunks, chunks[1:]):
+            assert previous["content"].splitlines()[-1] == chunk["content"].splitlines()[0]
+        assert chunks[-1]["content"].endswith(sentences[-1])
+
+    def test_long_code_splits_at_lines(self, tokenizer):
+        """Test that code larger than the budget breaks between lines, not inside them."""
+        code = ["```"] + [f"x{i} = compute({i})" for i in range(30)] + ["```"]
+        chunks = list(self.make_chunker(tokenizer, overlap=0).chunks(code))
+
+        assert all(chunk["token_count"] <= TEST_BUDGET for chunk in chunks)
+        assert "\n".join(chunk["content"] for chunk in chunks) == "\n".join(code)
+
+    def test_lines_are_consumed_lazily(self, tokenizer):
+        """Test that the first chunk is produced without reading the whole input."""
+        consumed = []
+
+        def lines():
+            for i in itertools.count():
+                consumed.append(i)
+                yield f"Paragraph {i} about operator precedence."
+                yield ""
+
+        first = next(self.make_chunker(tokenizer).chunks(lines()))
+        assert first["content"].startswith("Paragraph 0")
+        assert len(consumed) < 20
+
+    def test_overlap_must_fit_budget(self, tokenizer):
+        """Test that an overlap as large as the budget is rejected."""
+        with pytest.raises(ValueError, match="must be below the chunk budget"):
+            self.make_chunker(tokenizer, overlap=TEST_BUDGET)
+
+    @pytest.mark.asyncio
+    async def test_orchestrator_chunks_carry_metadata(self, monkeypatch):
+        """Test that create_intelligent_chunks numbers chunks and tags the domain."""
+        monkeypatch.setenv("CHUNK_TARGET_TOKENS", "40")
+        monkeypatch.setenv("CHUNK_OVERLAP_TOKENS", "12")
+        monkeypatch.setenv("CHUNK_MIN_TOKENS", "1")
+        orchestrator = data_ingestion.DataIngestionOrchestrator()
+
+        chunks = await orchestrator.create_intelligent_chunks(TEST_DOCUMENT, "programming")
+        assert [chunk["chunk_id"] for chunk in chunks] == [
+            hashlib.sha1(f"inline#{index}".encode("utf-8")).hexdigest() for index in range(3)
+        ]
+        assert all(chunk["domain"] == "programming" for chunk in chunks)
+
+    def test_sample_corpus_fits_budget(self):
+        """Test that the bundled Markdown corpus chunks within the default budget."""
+        orchestrator = data_ingestion.DataIngestionOrchestrator()
+        chunks = list(orchestrator.chunk_file(SAMPLE_CORPUS, "programming"))
+
+        assert len(chunks) > 1
+        assert all(chunk["token_count"] <= orchestrator.chunker.chunk_tokens for chunk in chunks)
+        assert chunks[0]["chunk_id"] == hashlib.sha1(f"{SAMPLE_CORPUS}#0".encode("utf-8")).hexdigest()
+        assert chunks[-1]["end_line"] == len(SAMPLE_CORPUS.read_text().splitlines())
+
+
+class TestIngestionPipeline:
+    """Test suite for the staged ingestion pipeline."""
+
+    @pytest.fixture
+    def corpus(self, tmp_path):
+        """Write a small Markdown corpus plus a file that is not ingested."""
+        corpus_dir = tmp_path / "maintenance"
+        (corpus_dir / "nested").mkdir(parents=True)
+        for i in range(TEST_DOCUMENT_COUNT):
+            folder = corpus_dir / "nested" if i % 2 else corpus_dir
+            (folder / f"doc_{i}.md").write_text(f"\ufeff# Pump {i}\r\n\r\nPump {i} feeds tank {i}.\r\n")
+        (corpus_dir / "image.png").write_bytes(b"\x89PNG")
+        return corpus_dir
+
+    def make_orchestrator(self, openai_client=None):
+        """Create orchestrator over fake Azure clients."""
+        return data_ingestion.DataIngestionOrchestrator(
+            openai_client=openai_client or FakeOpenAIClient(),
+            storage_client=FakeStorageClient(),
+            search_client=FakeSearchClient()
+        )
+
+    @pytest.mark.asyncio
+    async def test_all_chunks_are_embedded_uploaded_and_indexed(self, corpus):
+        """Test that every discovered document reaches blob storage and the index."""
+        orchestrator = self.make_orchestrator()
+        result = await orchestrator.ingest_documents(str(corpus))
+
+        assert result.domain == "maintenance"
+        assert result.errors == []
+        assert result.documents_processed == TEST_DOCUMENT_COUNT
+        assert result.chunks_created == TEST_DOCUMENT_COUNT
+        indexed = orchestrator.search_client.documents.values()
+        assert sorted(document["content"] for document in indexed)[0] == "# Pump 0\n\nPump 0 feeds tank 0."
+        assert all(document["content_vector"] for document in indexed)
+        assert orchestrator.search_client.invalidations == 1
+
+        blobs = orchestrator.storage_client.blobs
+        uploaded = [json.loads(data) for name, data in blobs.items() if "/chunks/" in name]
+        assert len(uploaded) == TEST_DOCUMENT_COUNT
+        manifest = json.loads(blobs["test-container/maintenance/index_manifest.json"])
+        assert sorted(itertools.chain(*manifest.values())) == sorted(orchestrator.search_client.documents)
+        assert sorted(chunk["chunk_id"] for chunk in uploaded) == sorted(orchestrator.search_client.documents)
+
+    @pytest.mark.asyncio
+    async def test_stage_metrics_are_reported(self, corpus, monkeypatch):
+        """Test per-stage throughput and queue depth, bounded by INGEST_QUEUE_SIZE."""
+        monkeypatch.setenv("INGEST_QUEUE_SIZE", "2")
+        monkeypatch.setenv("INGEST_EMBED_WORKERS", "1")
+        orchestrator = self.make_orchestrator()
+        result = await orchestrator.ingest_documents(str(corpus), target_domain="pumps")
+        metrics = result.quality_metrics
+
+        assert result.domain == "pumps"
+        assert metrics["documents_discovered"] == TEST_DOCUMENT_COUNT
+        assert metrics["chunks_indexed"] == TEST_DOCUMENT_COUNT
+        for stage in data_ingestion.INGESTION_STAGES:
+            assert metrics[f"{stage}_throughput"] > 0
+            assert 1 <= metrics[f"{stage}_queue_max_depth"] <= 2
+            assert 0 < metrics[f"{stage}_queue_mean_depth"] <= 2
+        assert metrics["embed_workers"] == 1
+        assert "embed   workers=1" in await orchestrator.generate_ingestion_report(result)
+
+    @pytest.mark.asyncio
+    async def test_embeddings_are_batched(self, corpus, monkeypatch):
+        """Test that a backed-up embed queue is drained in batches up to INGEST_EMBED_BATCH_SIZE."""
+        monkeypatch.setenv("INGEST_EMBED_WORKERS", "1")
+        monkeypatch.setenv("INGEST_EMBED_BATCH_SIZE", "4")
+        orchestrator = self.make_orchestrator()
+        await orchestrator.ingest_documents(str(corpus))
+
+        batch_sizes = orchestrator.openai_client.batch_sizes
+        assert sum(batch_sizes) == TEST_DOCUMENT_COUNT
+        assert max(batch_sizes) == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_recorded_and_rest_continue(self, corpus, monkeypatch):
+        """Test that an embedding failure drops only its batch."""
+        monkeypatch.setenv("INGEST_EMBED_BATCH_SIZE", "1")
+        orchestrator = self.make_orchestrator(FakeOpenAIClient(fail_on="Pump 3 "))
+        result = await orchestrator.ingest_documents(str(corpus))
+
+        assert result.errors == ["embed failed for 1 item(s): Azure OpenAI embedding generation failed: throttled"]
+        assert result.quality_metrics["embed_errors"] == 1
+        assert len(orchestrator.search_client.documents) == TEST_DOCUMENT_COUNT - 1
+
+    @pytest.mark.asyncio
+    async def test_reingest_removes_chunks_of_shrunk_and_deleted_documents(self, corpus, monkeypatch):
+        """Test that a reload leaves no index entries for chunks documents no longer produce."""
+        monkeypatch.setenv("CHUNK_TARGET_TOKENS", "12")
+        monkeypatch.setenv("CHUNK_OVERLAP_TOKENS", "0")
+        monkeypatch.setenv("CHUNK_MIN_TOKENS", "1")
+        (corpus / "doc_0.md").write_text("# Pump 0\n\nPump 0 feeds tank 0.\n\n# Valve 0\n\nValve 0 drains tank 0.\n")
+        orchestrator = self.make_orchestrator()
+        first = await orchestrator.ingest_documents(str(corpus))
+
+        (corpus / "doc_0.md").write_text("# Pump 0\n\nPump 0 feeds tank 0.\n")
+        (corpus / "nested" / "doc_1.md").unlink()
+        second = await orchestrator.ingest_documents(str(corpus))
+
+        assert second.errors == []
+        assert len(orchestrator.search_client.documents) == second.chunks_created
+        assert second.quality_metrics["chunks_deleted"] == first.chunks_created - second.chunks_created > 1
+        assert not any("Valve" in document["content"] for document in orchestrator.search_client.documents.values())
+        chunk_blobs = [name for name in orchestrator.storage_client.blobs if "/chunks/" in name]
+        assert len(chunk_blobs) == second.chunks_created
+
+    @pytest.mark.asyncio
+    async def test_same_named_files_in_different_folders_keep_their_chunks(self, corpus):
+        """Test that chunk ids and blob names come from the full source path."""
+        (corpus / "nested" / "doc_0.md").write_text("# Valve 0\n\nValve 0 drains tank 0.\n")
+        orchestrator = self.make_orchestrator()
+        result = await orchestrator.ingest_documents(str(corpus))
+
+        chunk_blobs = [name for name in orchestrator.storage_client.blobs if "/chunks/" in name]
+        assert result.errors == []
+        assert len(orchestrator.search_client.documents) == result.chunks_created == TEST_DOCUMENT_COUNT + 1
+        assert len(chunk_blobs) == result.chunks_created
+
+    @pytest.mark.asyncio
+    async def test_partly_indexed_document_keeps_its_old_chunks(self, corpus, monkeypatch):
+        """Test that a document whose reload failed is cleaned up only once a reload succeeds."""
+        monkeypatch.setenv("CHUNK_TARGET_TOKENS", "12")
+        monkeypatch.setenv("CHUNK_OVERLAP_TOKENS", "0")
+        monkeypatch.setenv("CHUNK_MIN_TOKENS", "1")
+        monkeypatch.setenv("INGEST_EMBED_BATCH_SIZE", "1")
+        (corpus / "doc_2.md").write_text("# Pump 2\n\nPump 2 feeds tank 2.\n\n# Valve 2\n\nValve 2 drains tank 2.\n")
+        orchestrator = self.make_orchestrator()
+        await orchestrator.ingest_documents(str(corpus))
+        indexed_before = set(orchestrator.search_client.documents)
+
+        (corpus / "doc_2.md").write_text("# Pump 2\n\nPump 2 was replaced.\n")
+        orchestrator.openai_client = FakeOpenAIClient(fail_on="replaced")
+        failed = await orchestrator.ingest_documents(str(corpus))
+        assert failed.quality_metrics["embed_errors"] == 1
+        assert failed.quality_metrics["chunks_deleted"] == 0
+        assert set(orchestrator.search_client.documents) == indexed_before
+
+        orchestrator.openai_client = FakeOpenAIClient()
+        retried = await orchestrator.ingest_documents(str(corpus))
+        contents = [document["content"] for document in orchestrator.search_client.documents.values()]
+        assert retried.quality_metrics["chunks_deleted"] == len(indexed_before) - len(contents) > 0
+        assert "# Pump 2\n\nPump 2 was replaced." in contents
+        assert not any("Valve 2" in content for content in contents)
+
+    @pytest.mark.asyncio
+    async def test_missing_source_path_raises(self, tmp_path):
+        """Test that discovery rejects paths that do not exist."""
+        with pytest.raises(ValueError, match="does not exist"):
+            await self.make_orchestrator().ingest_documents(str(tmp_path / "missing"))
+
+    @pytest.mark.asyncio
+    @pytest.mark.performance
+    async def test_stages_overlap(self, corpus, monkeypatch):
+        """Benchmark: with concurrent workers the corpus takes a few service delays, not one per call."""
+        monkeypatch.setenv("INGEST_EMBED_BATCH_SIZE", "1")
+        start_time = time.perf_counter()
+        await self.make_orchestrator().ingest_documents(str(corpus))
+        elapsed = time.perf_counter() - start_time
+
+        # Sequential processing would wait 3 service calls per document
+        assert elapsed < TEST_DOCUMENT_COUNT * 3 * SERVICE_DELAY / 3
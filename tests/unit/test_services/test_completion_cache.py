@@ -0,0 +1,118 @@
+"""
+Unit tests for CompletionCache
+Tests request keying, persistence, TTL expiry and LRU eviction.
+"""
+
+import time
+import pytest
+from azure_services.completion_cache import CompletionCache
+
+
+# Test fixtures - small cache geometry and a fixed request
+TEST_MAX_ENTRIES = 2
+TEST_TTL = 60
+TEST_MESSAGES = [{"role": "user", "content": "Extract entities from: pump P-101 feeds tank T-4."}]
+TEST_SAMPLING = {"max_tokens": 500, "temperature": 0, "top_p": 1}
+
+
+class TestCompletionCache:
+    """Test suite for CompletionCache."""
+
+    @pytest.fixture
+    def cache_dir(self, tmp_path):
+        """Provide an isolated cache directory."""
+        return tmp_path / "completions"
+
+    def make_cache(self, cache_dir, deployment="gpt-test", ttl=TEST_TTL, sync_interval=1):
+        """Create cache with test geometry."""
+        return CompletionCache(
+            cache_dir=cache_dir,
+            deployment=deployment,
+            max_entries=TEST_MAX_ENTRIES,
+            ttl=ttl,
+            sync_interval=sync_interval
+        )
+
+    def test_hit_miss_and_tokens_saved(self, cache_dir):
+        """Test lookups update counters and credit the stored request's tokens."""
+        cache = self.make_cache(cache_dir)
+        key = cache.cache_key(TEST_MESSAGES, TEST_SAMPLING)
+
+        assert cache.get(key) is None
+        cache.put(key, "P-101, T-4", total_tokens=120)
+
+        assert cache.get(key) == "P-101, T-4"
+        assert (cache.hits, cache.misses, cache.tokens_saved) == (1, 1, 120)
+        assert cache.hit_rate == 0.5
+
+    def test_key_covers_messages_and_sampling(self, cache_dir):
+        """Test that any change to messages or sampling parameters changes the key."""
+        cache = self.make_cache(cache_dir)
+        key = cache.cache_key(TEST_MESSAGES, TEST_SAMPLING)
+
+        assert key == cache.cache_key([dict(m) for m in TEST_MESSAGES], dict(TEST_SAMPLING))
+        assert key != cache.cache_key(TEST_MESSAGES, {**TEST_SAMPLING, "max_tokens": 501})
+        assert key != cache.cache_key([{"role": "system", "content": TEST_MESSAGES[0]["content"]}], TEST_SAMPLING)
+        assert key != self.make_cache(cache_dir, deployment="gpt-other").cache_key(TEST_MESSAGES, TEST_SAMPLING)
+
+    def test_persists_across_instances(self, cache_dir):
+        """Test completions survive reopening the cache."""
+        cache = self.make_cache(cache_dir)
+        key = cache.cache_key(TEST_MESSAGES, TEST_SAMPLING)
+        cache.put(key, "persisted", total_tokens=5)
+
+        reopened = self.make_cache(cache_dir)
+        assert reopened.get(key) == "persisted"
+        assert reopened.tokens_saved == 5
+
+    def test_unsynced_writes_are_not_persisted(self, cache_dir):
+        """Test that writes reach disk only at the sync interval."""
+        cache = self.make_cache(cache_dir, sync_interval=10)
+        cache.put("a", "first")
+
+        assert self.make_cache(cache_dir).get("a") is None
+        cache.sync()
+        assert self.make_cache(cache_dir).get("a") == "first"
+
+    def test_entries_expire_after_ttl(self, cache_dir):
+        """Test that expired completions are misses and are not reloaded."""
+        cache = self.make_cache(cache_dir, ttl=0.05)
+        cache.put("a", "stale")
+        time.sleep(0.06)
+
+        assert cache.get("a") is None
+        assert cache.expirations == 1
+        assert self.make_cache(cache_dir).size == 0
+
+    def test_lru_eviction(self, cache_dir):
+        """Test least recently used completion is evicted when full."""
+        cache = self.make_cache(cache_dir)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.evictions == 1
+
+    def test_deployment_change_invalidates(self, cache_dir):
+        """Test that a different deployment starts with an empty cache."""
+        cache = self.make_cache(cache_dir)
+        cache.put("a", "1")
+
+        other = self.make_cache(cache_dir, deployment="gpt-other")
+        assert other.size == 0
+        assert not other.cache_path.exists()
+
+    def test_sync_merges_entries_from_other_instances(self, cache_dir):
+        """Test that caches sharing a file keep each other's entries on sync."""
+        first = self.make_cache(cache_dir)
+        second = self.make_cache(cache_dir)
+        first.put("a", "from first")
+        second.put("b", "from second")
+
+        reopened = self.make_cache(cache_dir)
+        assert reopened.get("a") == "from first"
+        assert reopened.get("b") == "from second"
+        assert second.get("a") == "from first"
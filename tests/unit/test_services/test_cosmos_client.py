@@ -0,0 +1,74 @@
+"""
+Unit tests for CosmosClient
+Tests parameterized graph writes and template-based graph queries.
+"""
+
+import pytest
+from azure_services.cosmos_client import CosmosClient
+
+
+class RecordingPool:
+    """Connection pool stand-in that records scripts and bindings."""
+
+    def __init__(self, script_metrics):
+        self.script_metrics = script_metrics
+        self.submissions = []
+
+    async def submit(self, query, bindings=None, template_name=None):
+        self.submissions.append((query, bindings, template_name))
+        self.script_metrics.record(query, template_name, 0)
+        return []
+
+
+class TestCosmosClient:
+    """Test suite for CosmosClient graph operations."""
+
+    @pytest.fixture
+    def cosmos_client(self, monkeypatch):
+        """Create CosmosClient with a recording connection pool."""
+        monkeypatch.setenv("AZURE_COSMOS_ENDPOINT", "https://test.gremlin.cosmos.azure.com:443/")
+        monkeypatch.setenv("AZURE_COSMOS_KEY", "test-key")
+        monkeypatch.setenv("COSMOS_BULK_LOAD_ENABLED", "false")
+        client = CosmosClient()
+        client.connection_pool = RecordingPool(client.script_metrics)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_edges_are_written_through_bindings(self, cosmos_client):
+        """Test relationship ids and values never appear in the script text."""
+        relationships = [
+            {"from": "o'brien", "to": "b", "type": "KNOWS", "note": "it's"},
+            {"from": "c", "to": "d", "type": "KNOWS", "note": "other"},
+        ]
+
+        await cosmos_client.store_knowledge_graph([], relationships)
+
+        scripts = [query for query, _, _ in cosmos_client.connection_pool.submissions]
+        assert "o'brien" not in scripts[0] and "it's" not in scripts[0]
+        # Same shape of edge -> identical script, compiled once by the server
+        assert scripts[0] == scripts[1]
+        assert cosmos_client.get_script_metrics().distinct_scripts == 1
+
+    @pytest.mark.asyncio
+    async def test_query_graph_with_template(self, cosmos_client):
+        """Test named templates are expanded with their bindings."""
+        await cosmos_client.query_graph(template="neighbors", bindings={"vertex_id": "a", "max_results": 5})
+        await cosmos_client.query_graph(template="neighbors", bindings={"vertex_id": "b", "max_results": 5})
+
+        query, bindings, template_name = cosmos_client.connection_pool.submissions[0]
+        assert template_name == "neighbors"
+        assert bindings == {"vertex_id": "a", "max_results": 5}
+
+        metrics = cosmos_client.get_script_metrics()
+        assert metrics.total_submissions == 2
+        assert metrics.compile_reduction == 0.5
+        assert [t.template_name for t in metrics.templates] == ["neighbors"]
+        assert metrics.templates[0].executions == 2
+
+    @pytest.mark.asyncio
+    async def test_query_graph_rejects_missing_bindings(self, cosmos_client):
+        """Test templates validate their required bindings."""
+        with pytest.raises(ValueError):
+            await cosmos_client.query_graph(template="neighbors", bindings={"vertex_id": "a"})
+        with pytest.raises(ValueError):
+            await cosmos_client.query_graph(template="no_such_template")
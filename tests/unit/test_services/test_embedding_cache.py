@@ -0,0 +1,122 @@
+"""
+Unit tests for EmbeddingCache
+Tests persistence, LRU eviction, deployment invalidation and instances sharing a directory.
+"""
+
+import pytest
+from azure_services.embedding_cache import EmbeddingCache, get_shared_embedding_cache
+
+
+# Test fixtures - small cache geometry for eviction scenarios
+TEST_MAX_ENTRIES = 3
+TEST_SYNC_INTERVAL = 1
+
+
+class TestEmbeddingCache:
+    """Test suite for EmbeddingCache."""
+
+    @pytest.fixture
+    def cache_dir(self, tmp_path):
+        """Provide an isolated cache directory."""
+        return tmp_path / "embeddings"
+
+    def make_cache(self, cache_dir, deployment="text-embedding-test"):
+        """Create cache with test geometry."""
+        return EmbeddingCache(
+            cache_dir=cache_dir,
+            deployment=deployment,
+            max_entries=TEST_MAX_ENTRIES,
+            sync_interval=TEST_SYNC_INTERVAL
+        )
+
+    def test_hit_and_miss_counters(self, cache_dir):
+        """Test lookups update hit and miss counters."""
+        cache = self.make_cache(cache_dir)
+
+        assert cache.get("hello") is None
+        cache.put("hello", [1.0, 2.0])
+
+        assert cache.get("hello") == [1.0, 2.0]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_normalized_text_shares_entry(self, cache_dir):
+        """Test whitespace differences map to the same entry."""
+        cache = self.make_cache(cache_dir)
+        cache.put("hello   world", [1.0])
+
+        assert cache.get("  hello world\n") == [1.0]
+
+    def test_persists_across_instances(self, cache_dir):
+        """Test vectors survive reopening the cache."""
+        cache = self.make_cache(cache_dir)
+        cache.put("persisted", [3.0, 4.0])
+        cache.sync()
+
+        reopened = self.make_cache(cache_dir)
+        assert reopened.get("persisted") == [3.0, 4.0]
+
+    def test_lru_eviction(self, cache_dir):
+        """Test least recently used entry is evicted when full."""
+        cache = self.make_cache(cache_dir)
+        for name in ("a", "b", "c"):
+            cache.put(name, [1.0])
+        cache.get("a")
+        cache.put("d", [2.0])
+
+        assert cache.get("b") is None
+        assert cache.get("a") == [1.0]
+        assert cache.evictions == 1
+        assert cache.size == TEST_MAX_ENTRIES
+
+    def test_evicted_slot_not_served_after_reopen(self, cache_dir):
+        """Test that reusing an evicted slot cannot leak its new vector to the old key."""
+        cache = EmbeddingCache(cache_dir, "text-embedding-test", max_entries=2, sync_interval=10)
+        cache.put("a", [1.0, 1.0])
+        cache.put("b", [2.0, 2.0])
+        cache.sync()
+        cache.put("c", [3.0, 3.0])
+
+        reopened = EmbeddingCache(cache_dir, "text-embedding-test", max_entries=2, sync_interval=10)
+        assert reopened.get("a") is None
+        assert reopened.get("b") == [2.0, 2.0]
+
+    def test_deployment_change_invalidates(self, cache_dir):
+        """Test cache is discarded when the deployment name changes."""
+        cache = self.make_cache(cache_dir)
+        cache.put("text", [1.0])
+        cache.sync()
+
+        other = self.make_cache(cache_dir, deployment="text-embedding-other")
+        assert other.size == 0
+        assert other.get("text") is None
+
+    def test_instances_sharing_a_directory_keep_their_own_vectors(self, cache_dir):
+        """Test that a second instance adopts entries it finds instead of overwriting them."""
+        first = EmbeddingCache(cache_dir, "text-embedding-test", max_entries=100, sync_interval=1)
+        second = EmbeddingCache(cache_dir, "text-embedding-test", max_entries=100, sync_interval=1)
+        first.put("alpha", [1.0, 1.0])
+        second.put("beta", [2.0, 2.0])
+
+        assert first.get("alpha") == [1.0, 1.0]
+        assert second.get("alpha") == [1.0, 1.0]
+        reopened = EmbeddingCache(cache_dir, "text-embedding-test", max_entries=100, sync_interval=1)
+        assert reopened.get("alpha") == [1.0, 1.0]
+        assert reopened.get("beta") == [2.0, 2.0]
+
+    def test_slot_reused_by_another_instance_is_a_miss(self, cache_dir):
+        """Test that a slot evicted and rewritten elsewhere is never served under its old key."""
+        first = EmbeddingCache(cache_dir, "text-embedding-test", max_entries=1, sync_interval=1)
+        first.put("alpha", [1.0, 1.0])
+        second = EmbeddingCache(cache_dir, "text-embedding-test", max_entries=1, sync_interval=1)
+        second.put("beta", [2.0, 2.0])
+
+        assert first.get("alpha") is None
+        assert first.conflicts == 1
+        assert first.get("beta") == [2.0, 2.0]
+
+    def test_shared_cache_is_one_instance_per_directory(self, cache_dir):
+        """Test that clients in one process share the cache for a directory."""
+        cache = get_shared_embedding_cache(cache_dir, "text-embedding-test", TEST_MAX_ENTRIES, TEST_SYNC_INTERVAL)
+
+        assert get_shared_embedding_cache(cache_dir, "text-embedding-test", TEST_MAX_ENTRIES, 50) is cache
+        assert get_shared_embedding_cache(cache_dir, "text-embedding-other", TEST_MAX_ENTRIES, 50) is not cache
@@ -0,0 +1,151 @@
+"""
+Unit tests for GremlinBulkLoader
+Tests batching, partial failure reporting and throttling retries.
+"""
+
+import pytest
+from gremlin_python.driver.protocol import GremlinServerError
+from azure_services.gremlin_bulk import GremlinBulkLoader, build_edge_batch, build_vertex_batch
+
+
+# Test fixtures - loader geometry
+TEST_BATCH_SIZE = 3
+TEST_CONCURRENCY = 2
+TEST_MAX_RETRIES = 2
+TEST_BACKOFF_BASE = 0
+
+
+def throttling_error():
+    """Cosmos DB style 429 error."""
+    return GremlinServerError({
+        "code": 500,
+        "message": "RequestRateTooLarge",
+        "attributes": {"x-ms-status-code": 429, "x-ms-retry-after-ms": 0}
+    })
+
+
+class FakeGraphPool:
+    """Connection pool stand-in that evaluates batches against an in-memory graph."""
+
+    def __init__(self):
+        self.vertices = set()
+        self.edges = []
+        self.submissions = []
+        self.throttle_next = 0
+        self.conflict_ids = set()
+        self.fail_after_writes = None
+
+    async def submit(self, query, bindings=None, template_name=None):
+        self.submissions.append(query)
+        if self.throttle_next:
+            self.throttle_next -= 1
+            raise throttling_error()
+
+        if "addV" in query:
+            ids = [v for k, v in bindings.items() if k.endswith("_id")]
+            if self.conflict_ids.intersection(ids):
+                raise GremlinServerError({"code": 409, "message": "Conflict", "attributes": {}})
+            for i, vertex_id in enumerate(ids):
+                self.fail_midway(i)
+                self.vertices.add(vertex_id)
+            return []
+
+        written = []
+        i = 0
+        while f"e{i}_from" in bindings:
+            self.fail_midway(i)
+            edge = (bindings[f"e{i}_from"], bindings[f"e{i}_to"], bindings[f"e{i}_label"])
+            if edge[0] in self.vertices and edge[1] in self.vertices:
+                # Get-or-add: an identical edge is matched, not added again
+                if edge not in self.edges:
+                    self.edges.append(edge)
+                written.append(i)
+            i += 1
+        return written
+
+    def fail_midway(self, position):
+        """Fail a script after some of its items were written, as Cosmos DB may."""
+        if position and position == self.fail_after_writes:
+            self.fail_after_writes = None
+            raise GremlinServerError({"code": 500, "message": "ServerTimeout", "attributes": {}})
+
+
+class TestGremlinBulkLoader:
+    """Test suite for GremlinBulkLoader."""
+
+    @pytest.fixture
+    def loader(self):
+        """Create loader over an in-memory graph."""
+        self.pool = FakeGraphPool()
+        return GremlinBulkLoader(
+            connection_pool=self.pool,
+            batch_size=TEST_BATCH_SIZE,
+            concurrency=TEST_CONCURRENCY,
+            max_retries=TEST_MAX_RETRIES,
+            backoff_base=TEST_BACKOFF_BASE
+        )
+
+    def test_batches_are_parameterized(self):
+        """Test ids and property values travel as bindings, not script text."""
+        query, bindings = build_vertex_batch([{"id": "it's", "name": "x", "type": "T", "score": 1}])
+        assert "it's" not in query
+        assert bindings["v0_id"] == "it's"
+        assert bindings["v0_k0"] == "score"
+
+        query, bindings = build_edge_batch([{"from": "a'", "to": "b", "type": "R"}])
+        assert "a'" not in query
+        assert query.startswith("g.inject(0).union(")
+        assert "coalesce(__.outE(e0_label).where(__.inV().hasId(e0_to))" in query
+
+    @pytest.mark.asyncio
+    async def test_chains_items_into_batches(self, loader):
+        """Test many vertices and edges are written with few traversals."""
+        entities = [{"id": f"n{i}", "name": f"node {i}"} for i in range(7)]
+        relationships = [{"from": f"n{i}", "to": f"n{i + 1}"} for i in range(6)]
+
+        result = await loader.load(entities, relationships)
+
+        assert result.vertices_stored == 7
+        assert result.edges_stored == 6
+        assert result.failures == []
+        # ceil(7/3) vertex batches + ceil(6/3) edge batches
+        assert result.batches_sent == 5
+
+    @pytest.mark.asyncio
+    async def test_reports_partial_failures_per_item(self, loader):
+        """Test one conflicting vertex and one dangling edge are reported alone."""
+        self.pool.conflict_ids = {"n1"}
+        entities = [{"id": f"n{i}"} for i in range(3)]
+        relationships = [{"from": "n0", "to": "n2"}, {"from": "n0", "to": "missing"}]
+
+        result = await loader.load(entities, relationships)
+
+        assert result.vertices_stored == 2
+        assert result.edges_stored == 1
+        assert sorted(f.item_id for f in result.failures) == ["n0->missing", "n1"]
+
+    @pytest.mark.asyncio
+    async def test_retries_throttled_batches(self, loader):
+        """Test 429 responses are retried with backoff instead of failing."""
+        self.pool.throttle_next = 2
+
+        result = await loader.load([{"id": "a"}], [])
+
+        assert result.vertices_stored == 1
+        assert result.throttled_retries == 2
+        assert result.failures == []
+
+    @pytest.mark.asyncio
+    async def test_replaying_partly_written_batches_is_idempotent(self, loader):
+        """Test that items written before a batch failed are neither failures nor duplicates."""
+        entities = [{"id": f"n{i}"} for i in range(3)]
+        relationships = [{"from": "n0", "to": "n1"}, {"from": "n1", "to": "n2"}, {"from": "n0", "to": "n2"}]
+
+        self.pool.fail_after_writes = 2
+        vertex_result = await loader.load(entities, [])
+        self.pool.fail_after_writes = 2
+        edge_result = await loader.load([], relationships)
+
+        assert vertex_result.vertices_stored == 3 and vertex_result.failures == []
+        assert edge_result.edges_stored == 3 and edge_result.failures == []
+        assert len(self.pool.edges) == 3
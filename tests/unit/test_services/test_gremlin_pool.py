@@ -0,0 +1,207 @@
+"""
+Unit tests for GremlinConnectionPool
+Tests lazy connection reuse, reconnection, cancellation and pool metrics.
+"""
+
+import asyncio
+import json
+import pytest
+from concurrent.futures import Future
+from aiohttp import web
+from gremlin_python.driver import client, serializer
+from azure_services.gremlin_pool import GremlinConnectionPool
+
+
+# Test fixtures - pool geometry
+TEST_POOL_SIZE = 2
+TEST_ACQUIRE_TIMEOUT = 5
+TEST_HEALTH_CHECK_INTERVAL = 60
+
+
+def completed(value):
+    """Return an already-resolved concurrent future."""
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+def failed(error):
+    """Return an already-failed concurrent future."""
+    future = Future()
+    future.set_exception(error)
+    return future
+
+
+class FakeResultSet:
+    """Stand-in for gremlin_python ResultSet."""
+
+    def __init__(self, items):
+        self.items = items
+
+    def all(self):
+        return completed(self.items)
+
+
+class FakeGremlinClient:
+    """Stand-in for gremlin_python Client that records submissions."""
+
+    def __init__(self):
+        self.queries = []
+        self.fail_next = None
+        self.fail_after_send = None
+        self.closed = False
+
+    def submit_async(self, message, bindings=None):
+        if self.fail_next is not None:
+            error, self.fail_next = self.fail_next, None
+            raise error
+        self.queries.append((message, bindings))
+        if self.fail_after_send is not None:
+            error, self.fail_after_send = self.fail_after_send, None
+            return failed(error)
+        return completed(FakeResultSet([len(self.queries)]))
+
+    def close(self):
+        self.closed = True
+
+
+def stub_gremlin_handler(received):
+    """WebSocket handler answering every GraphSON v2 request with one Int64."""
+    async def handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for message in ws:
+            mime_length = message.data[0]
+            gremlin_request = json.loads(message.data[mime_length + 1:])
+            received.append(gremlin_request["args"])
+            await ws.send_bytes(json.dumps({
+                "requestId": gremlin_request["requestId"]["@value"],
+                "status": {"code": 200, "message": "", "attributes": {}},
+                "result": {"data": [{"@type": "g:Int64", "@value": 3}], "meta": {}}
+            }).encode("utf-8"))
+        return ws
+    return handler
+
+
+class TestGremlinConnectionPool:
+    """Test suite for GremlinConnectionPool."""
+
+    @pytest.fixture
+    def pool(self):
+        """Create pool with a recording client factory."""
+        self.created = []
+
+        def factory():
+            gremlin_client = FakeGremlinClient()
+            self.created.append(gremlin_client)
+            return gremlin_client
+
+        return GremlinConnectionPool(
+            client_factory=factory,
+            pool_size=TEST_POOL_SIZE,
+            acquire_timeout=TEST_ACQUIRE_TIMEOUT,
+            health_check_interval=TEST_HEALTH_CHECK_INTERVAL
+        )
+
+    @pytest.mark.asyncio
+    async def test_connections_created_lazily_and_reused(self, pool):
+        """Test sequential queries share one long-lived connection."""
+        assert self.created == []
+
+        for _ in range(5):
+            await pool.submit("g.V().count()")
+
+        assert len(self.created) == 1
+        assert len(self.created[0].queries) == 5
+        assert pool.get_metrics().open_connections == 1
+
+    @pytest.mark.asyncio
+    async def test_reconnects_after_dropped_connection(self, pool):
+        """Test a transport failure replaces the connection and retries."""
+        await pool.submit("g.V().count()")
+        self.created[0].fail_next = ConnectionResetError("socket closed")
+
+        result = await pool.submit("g.V().count()")
+
+        assert result == [1]
+        assert self.created[0].closed
+        assert len(self.created) == 2
+        assert pool.get_metrics().reconnects == 1
+
+    @pytest.mark.asyncio
+    async def test_pool_bounds_concurrent_connections(self, pool):
+        """Test checkouts wait once every pooled connection is in use."""
+        async def hold():
+            async with pool.acquire():
+                assert pool.in_use <= TEST_POOL_SIZE
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*[hold() for _ in range(6)])
+
+        metrics = pool.get_metrics()
+        assert len(self.created) == TEST_POOL_SIZE
+        assert metrics.in_use == 0
+        assert metrics.total_acquires == 6
+        assert metrics.max_wait_time > 0
+
+    @pytest.mark.asyncio
+    async def test_connect_failure_is_retried_but_sent_request_is_not(self, pool):
+        """Test that only requests that never reached the server are replayed."""
+        await pool.submit("g.V().count()")
+        self.created[0].fail_after_send = ConnectionResetError("socket closed")
+
+        with pytest.raises(ConnectionResetError):
+            await pool.submit("g.addV('pump')")
+
+        assert [query for query, _ in self.created[0].queries].count("g.addV('pump')") == 1
+        assert len(self.created) == 1
+        assert pool.get_metrics().reconnects == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_request_discards_connection(self, pool):
+        """Test that a connection with a request still in flight is not reused."""
+        async def hold():
+            async with pool.acquire():
+                await asyncio.sleep(10)
+
+        task = asyncio.create_task(hold())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        await pool.submit("g.V().count()")
+        assert len(self.created) == 2
+        assert pool.get_metrics().open_connections == 1
+        assert pool.get_metrics().in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_real_client_runs_from_event_loop(self):
+        """Test the pool against gremlin_python's Client and a stub WebSocket server."""
+        received = []
+        app = web.Application()
+        app.router.add_get("/gremlin", stub_gremlin_handler(received))
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        url = f"ws://127.0.0.1:{runner.addresses[0][1]}/gremlin"
+
+        pool = GremlinConnectionPool(
+            client_factory=lambda: client.Client(
+                url, "g", message_serializer=serializer.GraphSONSerializersV2d0(), pool_size=1
+            ),
+            pool_size=TEST_POOL_SIZE,
+            acquire_timeout=TEST_ACQUIRE_TIMEOUT,
+            health_check_interval=TEST_HEALTH_CHECK_INTERVAL
+        )
+        try:
+            results = await asyncio.gather(*[
+                pool.submit("g.V().has('name', name).count()", {"name": f"pump-{i}"}) for i in range(4)
+            ])
+        finally:
+            await pool.aclose()
+            await runner.cleanup()
+
+        assert results == [[3]] * 4
+        assert sorted(args["bindings"]["name"] for args in received) == [f"pump-{i}" for i in range(4)]
+        assert pool.get_metrics().open_connections == 0
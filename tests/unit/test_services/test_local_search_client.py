@@ -0,0 +1,134 @@
+"""
+Unit tests for LocalSearchClient
+Tests exact and IVF vector search, BM25 text search, hybrid fusion and persistence.
+"""
+
+import numpy as np
+import pytest
+from azure_services.local_index import BM25Index, LocalVectorIndex, StringArray
+from azure_services.local_search_client import LocalSearchClient
+
+
+# Test fixture - small clustered corpus
+TEST_DIMENSIONS = 16
+TEST_DOCUMENT_COUNT = 200
+
+
+def make_documents():
+    """Documents whose vectors cluster by topic and whose text names the topic."""
+    rng = np.random.default_rng(7)
+    topics = ["azure", "python", "gremlin", "search"]
+    centers = rng.normal(size=(len(topics), TEST_DIMENSIONS))
+    documents = []
+    for i in range(TEST_DOCUMENT_COUNT):
+        topic = i % len(topics)
+        documents.append({
+            "id": f"doc-{i}",
+            "content": f"{topics[topic]} document number {i}",
+            "content_vector": (centers[topic] + rng.normal(scale=0.1, size=TEST_DIMENSIONS)).tolist(),
+        })
+    return documents
+
+
+class TestLocalSearchClient:
+    """Test suite for the offline search client."""
+
+    @pytest.fixture
+    def documents(self):
+        return make_documents()
+
+    @pytest.fixture
+    def search_client(self, tmp_path, documents):
+        """Build and open a local index with IVF lists."""
+        return LocalSearchClient.build_index(tmp_path / "programming", documents, nlist=8)
+
+    @pytest.mark.asyncio
+    async def test_vector_search_finds_exact_match_first(self, search_client, documents):
+        """Test a document's own vector ranks it first with Azure's cosine score."""
+        results = await search_client.vector_search(documents[5]["content_vector"], top_k=3)
+
+        assert results[0]["id"] == "doc-5"
+        assert results[0]["score"] == pytest.approx(1.0)
+        assert results[0]["metadata"]["type"] == "vector_result"
+
+    @pytest.mark.asyncio
+    async def test_ivf_with_all_lists_probed_matches_exact(self, search_client, documents):
+        """Test IVF degenerates to exact search when every list is probed."""
+        query = documents[10]["content_vector"]
+        exact = await search_client.vector_search(query, top_k=10)
+
+        search_client.vector_mode = "ivf"
+        search_client.nprobe = 8
+        approximate = await search_client.vector_search(query, top_k=10)
+
+        assert [r["id"] for r in approximate] == [r["id"] for r in exact]
+
+    @pytest.mark.asyncio
+    async def test_text_search_ranks_by_bm25(self, search_client):
+        """Test BM25 only returns documents containing the query terms."""
+        results = await search_client.text_search("gremlin", top_k=5)
+
+        assert len(results) == 5
+        assert all("gremlin" in r["content"] for r in results)
+
+    @pytest.mark.asyncio
+    async def test_hybrid_search_fuses_both_rankings(self, search_client, documents):
+        """Test a document ranked first by both text and vector wins the fusion."""
+        results = await search_client.hybrid_search("document number 6", documents[6]["content_vector"], top_k=5)
+
+        assert results[0]["id"] == "doc-6"
+        assert results[0]["search_type"] == "hybrid"
+
+    @pytest.mark.asyncio
+    async def test_index_reopens_memory_mapped(self, search_client, documents):
+        """Test a saved index reloads with memory-mapped vectors."""
+        reopened = LocalSearchClient(search_client.index_dir)
+
+        assert isinstance(reopened.vector_index.vectors, np.memmap)
+        assert reopened.vector_index.has_ivf
+        assert (await reopened.vector_search(documents[3]["content_vector"], top_k=1))[0]["id"] == "doc-3"
+
+    @pytest.mark.asyncio
+    async def test_reopen_maps_bm25_lazily_without_retokenizing(self, search_client, monkeypatch):
+        """Test opening reads no postings and the first text search maps the saved ones."""
+        def rebuild(*args, **kwargs):
+            raise AssertionError("BM25 postings were rebuilt from the documents")
+        expected = await search_client.text_search("gremlin", top_k=5)
+        monkeypatch.setattr(BM25Index, "__init__", rebuild)
+        reopened = LocalSearchClient(search_client.index_dir)
+
+        assert reopened._text_index is None
+        assert isinstance(reopened.contents.data, np.memmap)
+        results = await reopened.text_search("gremlin", top_k=5)
+
+        assert isinstance(reopened.text_index.rows, np.memmap)
+        assert results == expected
+
+    def test_saved_bm25_scores_match_in_memory(self, tmp_path):
+        """Test postings survive a save and load, including non-ASCII terms."""
+        index = BM25Index(["Pumpe fördert Wasser", "Ventil", "pumpe und ventil"])
+        index.save(tmp_path)
+        loaded = BM25Index.load(tmp_path)
+
+        for query in ("pumpe", "fördert ventil", "missing"):
+            assert loaded.search(query, top_k=3) == index.search(query, top_k=3)
+        assert list(StringArray.build(["ä", "", "b"])[i] for i in range(3)) == ["ä", "", "b"]
+
+    def test_missing_index_raises(self, tmp_path):
+        """Test opening an empty directory is a configuration error."""
+        with pytest.raises(ValueError):
+            LocalSearchClient(tmp_path)
+
+    def test_bm25_prefers_rarer_terms(self):
+        """Test a rare query term outweighs a common one."""
+        index = BM25Index(["common rare", "common", "common", "common"])
+
+        assert index.search("common rare", top_k=4)[0][0] == 0
+        assert index.idf("rare") > index.idf("common")
+
+    def test_unknown_vector_mode_raises(self):
+        """Test an unsupported search mode is rejected."""
+        index = LocalVectorIndex.build(np.eye(3))
+
+        with pytest.raises(ValueError):
+            index.search(np.ones(3), top_k=1, mode="hnsw")
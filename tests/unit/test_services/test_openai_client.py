@@ -0,0 +1,462 @@
+"""
+Unit tests for OpenAIClient
+Tests async transport behaviour, metrics tracking and concurrency.
+"""
+
+import asyncio
+import threading
+import time
+import httpx
+import pytest
+import openai
+from types import SimpleNamespace
+from unittest.mock import patch
+from azure_services.openai_client import OpenAIClient
+from azure_services.completion_cache import CompletionCache
+from azure_services.embedding_cache import EmbeddingCache
+from azure_services import rate_limiter
+
+
+# Test fixtures - simulated network round-trip and streamed answer
+SIMULATED_ROUND_TRIP = 0.2
+STREAMED_TOKENS = ["Hello", ",", " world", "!"]
+
+
+class FakeEmbeddings:
+    """Async stand-in for AsyncAzureOpenAI.embeddings."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = []
+
+    async def create(self, input, model):
+        self.calls.append(input)
+        await asyncio.sleep(self.delay)
+        inputs = input if isinstance(input, list) else [input]
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(index=i, embedding=[float(len(text)), float(i)])
+                for i, text in enumerate(inputs)
+            ],
+            usage=SimpleNamespace(prompt_tokens=len(inputs), total_tokens=len(inputs))
+        )
+
+
+class FakeCompletionStream:
+    """Async stand-in for openai.AsyncStream of chat completion chunks.
+
+    Mirrors Azure: a content-filter chunk without choices comes first, and
+    usage arrives in a final chunk without choices.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.closed = False
+        self.chunks_sent = 0
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        yield SimpleNamespace(choices=[], usage=None)
+        for i, token in enumerate(STREAMED_TOKENS):
+            await asyncio.sleep(self.delay)
+            self.chunks_sent += 1
+            finish_reason = "stop" if i == len(STREAMED_TOKENS) - 1 else None
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=token), finish_reason=finish_reason)],
+                usage=None
+            )
+        yield SimpleNamespace(
+            choices=[],
+            usage=SimpleNamespace(prompt_tokens=5, completion_tokens=len(STREAMED_TOKENS), total_tokens=9)
+        )
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeCompletions:
+    """Async stand-in for AsyncAzureOpenAI.chat.completions."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.streams = []
+
+    async def create(self, stream=False, **kwargs):
+        if stream:
+            self.streams.append(FakeCompletionStream(self.delay / len(STREAMED_TOKENS)))
+            return self.streams[-1]
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="ok"))],
+            usage=SimpleNamespace(total_tokens=7)
+        )
+
+
+def throttling_error(retry_after_ms: str = "50"):
+    """Azure OpenAI style 429 error carrying a Retry-After header."""
+    response = httpx.Response(
+        429,
+        headers={"retry-after-ms": retry_after_ms},
+        request=httpx.Request("POST", "https://test.openai.azure.com/")
+    )
+    return openai.RateLimitError("Rate limit is exceeded", response=response, body=None)
+
+
+def bad_request_error():
+    """Azure OpenAI style 400 error for an input the model cannot embed."""
+    response = httpx.Response(400, request=httpx.Request("POST", "https://test.openai.azure.com/"))
+    return openai.BadRequestError("This model's maximum context length is 8192 tokens", response=response, body=None)
+
+
+class FakeAsyncAzureOpenAI:
+    """Minimal async Azure OpenAI client with simulated latency."""
+
+    def __init__(self, delay: float = SIMULATED_ROUND_TRIP):
+        self.embeddings = FakeEmbeddings(delay)
+        self.chat = SimpleNamespace(completions=FakeCompletions(delay))
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class TestOpenAIClient:
+    """Test suite for OpenAIClient async transport."""
+
+    @pytest.fixture
+    def openai_client(self, monkeypatch):
+        """Create OpenAIClient wired to a fake async transport."""
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com/")
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("EMBEDDING_CACHE_ENABLED", "false")
+        monkeypatch.setenv("COMPLETION_CACHE_ENABLED", "false")
+        monkeypatch.setattr(rate_limiter, "_SHARED_LIMITERS", {})
+        with patch("azure_services.openai_client.AsyncAzureOpenAI"):
+            client = OpenAIClient()
+        client.client = FakeAsyncAzureOpenAI()
+        return client
+
+    @pytest.mark.asyncio
+    async def test_generate_embedding_tracks_metrics(self, openai_client):
+        """Test that embedding calls keep request and token counters."""
+        result = await openai_client.generate_embedding("hello world")
+
+        assert result.embedding
+        assert result.model_used == openai_client.embedding_deployment
+        assert openai_client.request_count == 1
+        assert openai_client.total_tokens > 0
+
+    @pytest.mark.asyncio
+    async def test_chat_completion_tracks_usage(self, openai_client):
+        """Test that completion usage is added to the token counter."""
+        content = await openai_client.chat_completion([{"role": "user", "content": "hi"}])
+
+        assert content == "ok"
+        assert openai_client.request_count == 1
+        assert openai_client.total_tokens == 7
+
+    @pytest.mark.asyncio
+    @pytest.mark.performance
+    async def test_concurrent_embeddings_do_not_block_event_loop(self, openai_client):
+        """Benchmark: N concurrent embeddings finish in about one round-trip."""
+        concurrency = 20
+
+        start_time = time.perf_counter()
+        results = await asyncio.gather(*[
+            openai_client.generate_embedding(f"text {i}") for i in range(concurrency)
+        ])
+        wall_time = time.perf_counter() - start_time
+
+        assert len(results) == concurrency
+        assert [r.text for r in results] == [f"text {i}" for i in range(concurrency)]
+        # Sequential execution would take concurrency * SIMULATED_ROUND_TRIP
+        assert wall_time < SIMULATED_ROUND_TRIP * 3
+
+    @pytest.mark.asyncio
+    async def test_micro_batcher_merges_concurrent_calls(self, openai_client):
+        """Test that concurrent single calls share one embeddings request."""
+        texts = ["a", "bb", "ccc", "dddd"]
+
+        results = await asyncio.gather(*[openai_client.generate_embedding(t) for t in texts])
+
+        assert openai_client.request_count == 1
+        assert openai_client.client.embeddings.calls == [texts]
+        # Each caller receives the vector computed for its own text
+        assert [r.embedding[0] for r in results] == [float(len(t)) for t in texts]
+
+    @pytest.mark.asyncio
+    async def test_generate_embeddings_splits_oversize_batches(self, openai_client):
+        """Test that batches are split at the per-request input limit."""
+        openai_client.embedding_batch_max_inputs = 3
+        texts = [f"text {i}" for i in range(7)]
+
+        results = await openai_client.generate_embeddings(texts)
+
+        assert [r.text for r in results] == texts
+        assert [len(c) for c in openai_client.client.embeddings.calls] == [3, 3, 1]
+        assert openai_client.request_count == 3
+
+    @pytest.mark.asyncio
+    async def test_micro_batcher_propagates_errors_to_callers(self, openai_client):
+        """Test that a failed batch raises for every waiting caller."""
+        async def failing_create(input, model):
+            raise ValueError("service unavailable")
+        openai_client.client.embeddings.create = failing_create
+
+        results = await asyncio.gather(
+            openai_client.generate_embedding("a"),
+            openai_client.generate_embedding("b"),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_over_limit_input_fails_only_its_caller(self, openai_client):
+        """Test that a text over the per-input token limit never joins a merged batch."""
+        openai_client.embedding_batcher.max_input_tokens = 5
+
+        short, oversize = await asyncio.gather(
+            openai_client.generate_embedding("short"),
+            openai_client.generate_embedding("far too many words for one embedding input here"),
+            return_exceptions=True
+        )
+
+        assert short.text == "short"
+        assert isinstance(oversize, ValueError)
+        assert openai_client.client.embeddings.calls == [["short"]]
+
+    @pytest.mark.asyncio
+    async def test_rejected_input_is_isolated_by_splitting_the_batch(self, openai_client):
+        """Test that a 400 for one merged input is retried split so its neighbours succeed."""
+        create = openai_client.client.embeddings.create
+
+        async def rejecting_create(input, model):
+            if "bad" in input:
+                raise bad_request_error()
+            return await create(input, model)
+        openai_client.client.embeddings.create = rejecting_create
+
+        results = await asyncio.gather(
+            *[openai_client.generate_embedding(text) for text in ["a", "bad", "c", "d"]],
+            return_exceptions=True
+        )
+
+        assert isinstance(results[1], RuntimeError)
+        assert [r.text for i, r in enumerate(results) if i != 1] == ["a", "c", "d"]
+        assert openai_client.embedding_batcher.batch_splits == 2
+
+    @pytest.mark.asyncio
+    async def test_embedding_cache_skips_repeat_requests(self, openai_client, tmp_path):
+        """Test that repeated text is served from the embedding cache."""
+        openai_client.embedding_cache = EmbeddingCache(
+            cache_dir=tmp_path,
+            deployment=openai_client.embedding_deployment,
+            max_entries=10,
+            sync_interval=1
+        )
+
+        first = await openai_client.generate_embedding("repeat me")
+        second = await openai_client.generate_embedding("repeat me")
+        batch = await openai_client.generate_embeddings(["repeat me", "new text"])
+
+        assert second.embedding == first.embedding
+        assert batch[0].embedding == first.embedding
+        assert openai_client.client.embeddings.calls == [["repeat me"], ["new text"]]
+        assert openai_client.embedding_cache.hits == 2
+
+    @pytest.mark.asyncio
+    async def test_completion_cache_serves_deterministic_requests(self, openai_client, tmp_path):
+        """Test that temperature-0 completions are answered from the cache on repeat."""
+        openai_client.completion_cache = CompletionCache(
+            cache_dir=tmp_path, deployment=openai_client.gpt_deployment, max_entries=10, ttl=60, sync_interval=1
+        )
+        completions = openai_client.client.chat.completions
+        original_create = completions.create
+        calls = []
+
+        async def counting_create(**kwargs):
+            calls.append(kwargs)
+            return await original_create(**kwargs)
+        completions.create = counting_create
+        messages = [{"role": "user", "content": "extract entities"}]
+
+        first = await openai_client.chat_completion(messages, temperature=0)
+        second = await openai_client.chat_completion(messages, temperature=0)
+        bypassed = await openai_client.chat_completion(messages, temperature=0, use_cache=False)
+
+        assert first == second == bypassed == "ok"
+        assert len(calls) == 2
+        assert openai_client.completion_cache.hits == 1
+        assert openai_client.completion_cache.tokens_saved == 7
+
+    @pytest.mark.asyncio
+    async def test_completion_cache_syncs_off_the_event_loop(self, openai_client, tmp_path):
+        """Test that the periodic and closing cache flushes run in worker threads."""
+        cache = CompletionCache(
+            cache_dir=tmp_path, deployment=openai_client.gpt_deployment, max_entries=10, ttl=60, sync_interval=1
+        )
+        openai_client.completion_cache = cache
+        sync_threads = []
+        original_sync = cache.sync
+
+        def recording_sync():
+            sync_threads.append(threading.get_ident())
+            original_sync()
+        cache.sync = recording_sync
+
+        await openai_client.chat_completion([{"role": "user", "content": "extract entities"}], temperature=0)
+        await openai_client.aclose()
+
+        assert len(sync_threads) == 2
+        assert threading.get_ident() not in sync_threads
+        assert CompletionCache(
+            cache_dir=tmp_path, deployment=openai_client.gpt_deployment, max_entries=10, ttl=60, sync_interval=1
+        ).size == 1
+
+    @pytest.mark.asyncio
+    async def test_completion_cache_requires_opt_in_when_sampling(self, openai_client, tmp_path):
+        """Test that non-zero temperature completions are cached only when asked."""
+        openai_client.completion_cache = CompletionCache(
+            cache_dir=tmp_path, deployment=openai_client.gpt_deployment, max_entries=10, ttl=60, sync_interval=1
+        )
+        messages = [{"role": "user", "content": "describe the domain"}]
+
+        await openai_client.chat_completion(messages, temperature=0.7)
+        await openai_client.chat_completion(messages, temperature=0.7, use_cache=True)
+        await openai_client.chat_completion(messages, temperature=0.7, use_cache=True)
+
+        assert openai_client.request_count == 2
+        assert openai_client.completion_cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_transport(self, openai_client):
+        """Test that aclose releases the async transport."""
+        await openai_client.aclose()
+        assert openai_client.client.closed
+
+    @pytest.mark.asyncio
+    async def test_chat_completion_stream_yields_deltas(self, openai_client):
+        """Test streamed deltas arrive in order and usage is tracked."""
+        stream = openai_client.chat_completion_stream([{"role": "user", "content": "hi"}])
+        tokens = [token async for token in stream]
+
+        metrics = stream.metrics
+        assert tokens == STREAMED_TOKENS
+        assert openai_client.total_tokens == 9
+        assert metrics.completion_tokens == len(STREAMED_TOKENS)
+        assert metrics.chunk_count == len(STREAMED_TOKENS)
+        assert metrics.finish_reason == "stop"
+        assert openai_client.client.chat.completions.streams[0].closed
+
+    @pytest.mark.asyncio
+    @pytest.mark.performance
+    async def test_time_to_first_token_precedes_full_generation(self, openai_client):
+        """Benchmark: the first token arrives after one chunk, not the whole completion."""
+        start_time = time.perf_counter()
+        stream = openai_client.chat_completion_stream([{"role": "user", "content": "hi"}])
+        async for _ in stream:
+            first_token_time = time.perf_counter() - start_time
+            break
+
+        metrics = stream.metrics
+        assert first_token_time < SIMULATED_ROUND_TRIP / 2
+        assert metrics.time_to_first_token == pytest.approx(first_token_time, abs=0.02)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_streams_keep_their_own_metrics(self, openai_client):
+        """Test that streams sharing one client do not overwrite each other's metrics."""
+        finished = openai_client.chat_completion_stream([{"role": "user", "content": "hi"}])
+        abandoned = openai_client.chat_completion_stream([{"role": "user", "content": "hi"}])
+
+        await abandoned.__anext__()
+        tokens = [token async for token in finished]
+        await abandoned.aclose()
+
+        assert tokens == STREAMED_TOKENS
+        assert finished.metrics.request_id != abandoned.metrics.request_id
+        assert finished.metrics.chunk_count == len(STREAMED_TOKENS)
+        assert finished.metrics.finish_reason == "stop"
+        assert abandoned.metrics.chunk_count == 1
+        assert abandoned.metrics.finish_reason is None
+
+    @pytest.mark.asyncio
+    async def test_abandoned_stream_is_closed(self, openai_client):
+        """Test closing the iterator early closes the upstream HTTP stream."""
+        tokens = openai_client.chat_completion_stream([{"role": "user", "content": "hi"}])
+        await tokens.__anext__()
+        await tokens.aclose()
+
+        stream = openai_client.client.chat.completions.streams[0]
+        assert stream.closed
+        assert stream.chunks_sent == 1
+
+    @pytest.mark.asyncio
+    async def test_chat_completion_stream_errors_are_wrapped(self, openai_client):
+        """Test request failures surface as RuntimeError."""
+        async def failing_create(**kwargs):
+            raise ValueError("deployment not found")
+        openai_client.client.chat.completions.create = failing_create
+
+        with pytest.raises(RuntimeError, match="streaming completion failed"):
+            async for _ in openai_client.chat_completion_stream([{"role": "user", "content": "hi"}]):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_throttled_completion_is_retried_after_retry_after(self, openai_client):
+        """Test that 429s are retried once the server-suggested delay has passed."""
+        completions = openai_client.client.chat.completions
+        original_create = completions.create
+        attempts = []
+
+        async def throttled_create(**kwargs):
+            attempts.append(time.monotonic())
+            if len(attempts) <= 2:
+                raise throttling_error("50")
+            return await original_create(**kwargs)
+        completions.create = throttled_create
+        openai_client.retry_base_delay = 0.01
+
+        content = await openai_client.chat_completion([{"role": "user", "content": "hi"}])
+
+        assert content == "ok"
+        assert len(attempts) == 3
+        assert all(later - earlier >= 0.05 for earlier, later in zip(attempts, attempts[1:]))
+        assert openai_client.retry_count == 2
+        assert openai_client.throttled_count == 2
+        assert openai_client.chat_limiter.pause_count == 2
+
+    @pytest.mark.asyncio
+    async def test_retries_give_up_after_max_retries(self, openai_client):
+        """Test that persistent throttling fails as RuntimeError after max_retries."""
+        attempts = []
+
+        async def throttled_create(input, model):
+            attempts.append(input)
+            raise throttling_error("0")
+        openai_client.client.embeddings.create = throttled_create
+        openai_client.max_retries = 2
+        openai_client.retry_base_delay = 0.01
+
+        with pytest.raises(RuntimeError, match="embedding failed"):
+            await openai_client.generate_embeddings(["a", "b"])
+
+        assert len(attempts) == 3
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_errors_fail_immediately(self, openai_client):
+        """Test that client errors are not retried."""
+        attempts = []
+
+        async def failing_create(**kwargs):
+            attempts.append(kwargs)
+            raise ValueError("deployment not found")
+        openai_client.client.chat.completions.create = failing_create
+
+        with pytest.raises(RuntimeError, match="completion failed"):
+            await openai_client.chat_completion([{"role": "user", "content": "hi"}])
+
+        assert len(attempts) == 1
+        assert openai_client.retry_count == 0
@@ -0,0 +1,158 @@
+"""
+Unit tests for RateLimiter
+Tests quota pacing, priority lanes, throttling pauses and retry backoff.
+"""
+
+import asyncio
+import time
+import pytest
+from azure_services.rate_limiter import RateLimiter, TokenBucket, backoff_delay, get_shared_limiter
+
+
+# Test fixtures - 10 requests/s with a 5 request burst, 100 tokens/s with a 100 token burst
+TEST_RPM = 600
+TEST_TPM = 6000
+TEST_BURST_SECONDS = 0.5
+TIMING_SLACK = 0.03
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket refill arithmetic."""
+
+    def test_refill_is_capped_at_capacity(self):
+        """Test that idle time never banks more than capacity."""
+        bucket = TokenBucket(capacity=10, refill_per_second=5)
+        bucket.consume(10)
+        bucket.refill(bucket.updated_at + 100)
+
+        assert bucket.available == 10
+
+    def test_wait_time_covers_deficit(self):
+        """Test that wait time is the deficit over the refill rate."""
+        bucket = TokenBucket(capacity=10, refill_per_second=5)
+        bucket.consume(8)
+
+        assert bucket.wait_time(2) == 0
+        assert bucket.wait_time(7) == pytest.approx(1.0)
+
+
+class TestRateLimiter:
+    """Test suite for RateLimiter pacing and priorities."""
+
+    @pytest.fixture
+    def limiter(self):
+        """Create a limiter with small, fast-refilling quotas."""
+        return RateLimiter(TEST_RPM, TEST_TPM, burst_seconds=TEST_BURST_SECONDS)
+
+    @pytest.mark.asyncio
+    async def test_burst_is_granted_immediately(self, limiter):
+        """Test that a burst within capacity does not wait."""
+        start_time = time.monotonic()
+        await asyncio.gather(*[limiter.acquire() for _ in range(5)])
+
+        assert time.monotonic() - start_time < TIMING_SLACK
+        assert limiter.granted_count == 5
+        assert limiter.throttled_count == 0
+
+    @pytest.mark.asyncio
+    async def test_requests_beyond_burst_are_paced(self, limiter):
+        """Test that requests past the burst wait for the request bucket to refill."""
+        start_time = time.monotonic()
+        await asyncio.gather(*[limiter.acquire() for _ in range(8)])
+
+        # Three requests past the burst at 10 requests/s
+        assert time.monotonic() - start_time >= 0.3 - TIMING_SLACK
+        assert limiter.throttled_count == 3
+        assert limiter.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_token_quota_paces_large_requests(self):
+        """Test that the token bucket holds back a request whose tokens are not yet available."""
+        limiter = RateLimiter(TEST_RPM, TEST_TPM, burst_seconds=1.0)
+        await limiter.acquire(tokens=100)
+
+        waited = await limiter.acquire(tokens=20)
+
+        assert waited >= 0.2 - TIMING_SLACK
+
+    @pytest.mark.asyncio
+    async def test_oversize_request_waits_for_full_bucket(self, limiter):
+        """Test that a request larger than the bucket is admitted rather than queued forever."""
+        waited = await asyncio.wait_for(limiter.acquire(tokens=10 ** 6), timeout=1.0)
+
+        assert waited < TIMING_SLACK
+        assert limiter.granted_count == 1
+
+    @pytest.mark.asyncio
+    async def test_interactive_callers_overtake_bulk(self):
+        """Test that a queued interactive caller is served before earlier bulk callers."""
+        limiter = RateLimiter(TEST_RPM, TEST_TPM, burst_seconds=0)
+        await limiter.acquire()
+        order = []
+
+        async def caller(name, priority):
+            await limiter.acquire(priority=priority)
+            order.append(name)
+
+        bulk = [asyncio.create_task(caller(f"bulk-{i}", "bulk")) for i in range(2)]
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(caller("interactive", "interactive"))
+        await asyncio.gather(*bulk, interactive)
+
+        assert order == ["interactive", "bulk-0", "bulk-1"]
+
+    @pytest.mark.asyncio
+    async def test_pause_holds_every_caller(self, limiter):
+        """Test that a throttling pause delays callers even with quota left."""
+        limiter.pause(0.2)
+
+        waited = await limiter.acquire()
+
+        assert waited >= 0.2 - TIMING_SLACK
+        assert limiter.pause_count == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_block_queue(self):
+        """Test that abandoning the head of the queue lets the next caller through."""
+        limiter = RateLimiter(TEST_RPM, TEST_TPM, burst_seconds=1.0)
+        await limiter.acquire(tokens=100)
+        # The head needs a full second of token refill; the caller behind it needs none
+        abandoned = asyncio.create_task(limiter.acquire(tokens=100))
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        abandoned.cancel()
+        await asyncio.wait_for(waiting, timeout=0.2)
+
+        assert limiter.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_unknown_priority_raises(self, limiter):
+        """Test that priorities are validated."""
+        with pytest.raises(ValueError, match="Unknown priority"):
+            await limiter.acquire(priority="urgent")
+
+    def test_shared_limiter_is_reused_per_deployment(self):
+        """Test that clients of the same deployment share one limiter."""
+        first = get_shared_limiter("https://shared.test/", "gpt", TEST_RPM, TEST_TPM)
+        second = get_shared_limiter("https://shared.test/", "gpt", TEST_RPM, TEST_TPM)
+        other = get_shared_limiter("https://shared.test/", "embeddings", TEST_RPM, TEST_TPM)
+
+        assert first is second
+        assert first is not other
+
+
+class TestBackoffDelay:
+    """Test suite for retry delays."""
+
+    def test_retry_after_is_honored_with_jitter(self):
+        """Test that a server-suggested delay is a floor."""
+        delays = [backoff_delay(0, 0.5, 60, retry_after=3.0) for _ in range(50)]
+
+        assert all(3.0 <= delay <= 3.5 for delay in delays)
+
+    def test_exponential_backoff_is_capped(self):
+        """Test that full-jitter delays grow with attempts but stay under the cap."""
+        assert all(0 <= backoff_delay(1, 1.0, 60) <= 2.0 for _ in range(50))
+        assert all(0 <= backoff_delay(10, 1.0, 5.0) <= 5.0 for _ in range(50))
@@ -0,0 +1,144 @@
+"""
+Unit tests for SearchResultCache
+Tests TTL/LRU behaviour and the pluggable storage backends.
+"""
+
+import asyncio
+import multiprocessing
+import pytest
+from azure_services.search_cache import (
+    FileSearchCacheBackend,
+    MemorySearchCacheBackend,
+    RedisSearchCacheBackend,
+    SearchResultCache
+)
+
+
+# Test fixture - cached result payload and file backend geometry
+TEST_RESULTS = [{"id": "doc-1", "content": "azure", "score": 0.9}]
+TEST_MAX_ENTRIES = 3
+TEST_SWEEP_INTERVAL = 2
+TEST_INCREMENTS = 50
+
+
+def increment_counter(cache_dir):
+    """Child process body: bump a shared file counter repeatedly."""
+    backend = FileSearchCacheBackend(cache_dir, max_entries=TEST_MAX_ENTRIES, sweep_interval=TEST_SWEEP_INTERVAL)
+    for _ in range(TEST_INCREMENTS):
+        asyncio.run(backend.incr("generation"))
+
+
+class FakeRedis:
+    """Minimal redis.asyncio stand-in storing bytes like the real client."""
+
+    def __init__(self):
+        self.values = {}
+        self.expiries = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value.encode()
+        self.expiries[key] = ex
+
+    async def incr(self, key):
+        value = int(self.values.get(key, b"0")) + 1
+        self.values[key] = str(value).encode()
+        return value
+
+
+class TestSearchResultCache:
+    """Test suite for SearchResultCache and its backends."""
+
+    @pytest.fixture(params=["memory", "file", "redis"])
+    def result_cache(self, request, tmp_path):
+        """Create a cache over each backend."""
+        backends = {
+            "memory": lambda: MemorySearchCacheBackend(max_entries=100),
+            "file": lambda: FileSearchCacheBackend(tmp_path, max_entries=TEST_MAX_ENTRIES, sweep_interval=TEST_SWEEP_INTERVAL),
+            "redis": lambda: RedisSearchCacheBackend(FakeRedis()),
+        }
+        return SearchResultCache(backend=backends[request.param](), ttl=60, vector_decimals=4)
+
+    @pytest.mark.asyncio
+    async def test_round_trip_and_invalidation(self, result_cache):
+        """Test stored results are returned until their index is invalidated."""
+        key = await result_cache.cache_key("index", "text", "Azure", None, 10)
+        await result_cache.put(key, TEST_RESULTS)
+
+        assert await result_cache.get(await result_cache.cache_key("index", "text", " azure ", None, 10)) == TEST_RESULTS
+
+        await result_cache.invalidate("index")
+        assert await result_cache.get(await result_cache.cache_key("index", "text", "azure", None, 10)) is None
+        assert result_cache.hits == 1
+        assert result_cache.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidation_is_per_index(self, result_cache):
+        """Test reloading one index leaves other indexes cached."""
+        key = await result_cache.cache_key("other-index", "text", "azure", None, 10)
+        await result_cache.put(key, TEST_RESULTS)
+
+        await result_cache.invalidate("index")
+
+        assert await result_cache.get(await result_cache.cache_key("other-index", "text", "azure", None, 10)) == TEST_RESULTS
+
+    @pytest.mark.asyncio
+    async def test_memory_backend_expires_and_evicts(self):
+        """Test the in-process backend honours TTL and its LRU bound."""
+        backend = MemorySearchCacheBackend(max_entries=2)
+        await backend.set("expired", "x", ttl=0.01)
+        await asyncio.sleep(0.02)
+
+        assert await backend.get("expired") is None
+
+        await backend.set("a", "1", ttl=60)
+        await backend.set("b", "2", ttl=60)
+        await backend.get("a")
+        await backend.set("c", "3", ttl=60)
+
+        assert await backend.get("b") is None
+        assert await backend.get("a") == "1"
+        assert backend.evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_file_backend_expires_entries(self, tmp_path):
+        """Test file entries past their TTL read as missing."""
+        backend = FileSearchCacheBackend(tmp_path, max_entries=TEST_MAX_ENTRIES, sweep_interval=TEST_SWEEP_INTERVAL)
+        await backend.set("key", "value", ttl=-1)
+
+        assert await backend.get("key") is None
+        assert list(tmp_path.glob("*.json")) == []
+        assert backend.expirations == 1
+
+    @pytest.mark.asyncio
+    async def test_file_backend_sweep_bounds_entries(self, tmp_path):
+        """Test sweeps drop expired and orphaned entries and cap the file count."""
+        backend = FileSearchCacheBackend(tmp_path, max_entries=TEST_MAX_ENTRIES, sweep_interval=TEST_SWEEP_INTERVAL)
+        cache = SearchResultCache(backend, ttl=60, vector_decimals=4)
+        await backend.set("stale", "value", ttl=-1)
+        for i in range(6):
+            await cache.put(await cache.cache_key("idx", "vector", f"query {i}", None, 5), TEST_RESULTS)
+        await cache.invalidate("idx")
+
+        # Writes since the last sweep may overshoot the bound by sweep_interval
+        assert len(list(tmp_path.glob("*.json"))) <= TEST_MAX_ENTRIES + TEST_SWEEP_INTERVAL
+        backend.sweep()
+        assert len(list(tmp_path.glob("*.json"))) == TEST_MAX_ENTRIES
+        assert backend.expirations == 1
+        assert backend.evictions == 3
+        # The generation counter is never swept
+        assert await backend.get("generation\0idx") == "1"
+
+    def test_file_backend_incr_is_atomic_across_processes(self, tmp_path):
+        """Test concurrent increments from several processes are all counted."""
+        context = multiprocessing.get_context("fork")
+        processes = [context.Process(target=increment_counter, args=(tmp_path,)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        backend = FileSearchCacheBackend(tmp_path, max_entries=TEST_MAX_ENTRIES, sweep_interval=TEST_SWEEP_INTERVAL)
+        assert asyncio.run(backend.get("generation")) == str(4 * TEST_INCREMENTS)
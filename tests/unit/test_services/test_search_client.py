@@ -0,0 +1,273 @@
+"""
+Unit tests for SearchClient
+Tests async search execution, result paging, concurrency, result caching
+and multi-query fan-out.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+import pytest
+from azure_services import search_client as search_client_module
+from azure_services.search_cache import FileSearchCacheBackend, RedisSearchCacheBackend
+from azure_services.search_client import SearchClient
+
+
+# Test fixtures - simulated search round-trip and concurrent caller count
+SIMULATED_ROUND_TRIP = 0.1
+CONCURRENT_SEARCHES = 50
+
+
+class FakeSearchResults:
+    """Async-paged result set like AsyncSearchItemPaged."""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self.documents:
+            yield document
+
+
+class FakeAsyncSearchClient:
+    """Async stand-in for azure.search.documents.aio.SearchClient."""
+
+    def __init__(self, delay: float = SIMULATED_ROUND_TRIP):
+        self.delay = delay
+        self.calls = []
+        self.closed = False
+
+    async def search(self, search_text=None, vector_queries=None, top=10, **kwargs):
+        self.calls.append({"search_text": search_text, "vector_queries": vector_queries, "top": top, **kwargs})
+        await asyncio.sleep(self.delay)
+        return FakeSearchResults([
+            {"id": f"doc-{i}", "content": f"content {i}", "@search.score": 1.0 / (i + 1)}
+            for i in range(top)
+        ])
+
+    async def merge_or_upload_documents(self, documents):
+        self.calls.append({"documents": documents})
+        return [SimpleNamespace(key=d["id"], succeeded=bool(d.get("content"))) for d in documents]
+
+    async def delete_documents(self, documents):
+        self.calls.append({"deleted": documents})
+        return [SimpleNamespace(key=d["id"], succeeded=d["id"] != "locked") for d in documents]
+
+    async def close(self):
+        self.closed = True
+
+
+class TestSearchClient:
+    """Test suite for SearchClient async transport."""
+
+    @pytest.fixture
+    def search_client(self, monkeypatch, tmp_path):
+        """Create SearchClient wired to a fake async SDK client."""
+        monkeypatch.setenv("AZURE_SEARCH_ENDPOINT", "https://test.search.windows.net")
+        monkeypatch.setenv("AZURE_SEARCH_KEY", "test-key")
+        monkeypatch.setenv("CACHE_DIR", str(tmp_path))
+        monkeypatch.delenv("SEARCH_CACHE_BACKEND", raising=False)
+        monkeypatch.delenv("SEARCH_CACHE_REDIS_URL", raising=False)
+        client = SearchClient()
+        client.search_client = FakeAsyncSearchClient()
+        client.index_client = FakeAsyncSearchClient()
+        return client
+
+    @pytest.mark.asyncio
+    async def test_vector_search_pages_results_asynchronously(self, search_client):
+        """Test vector search awaits the SDK and converts async-paged results."""
+        results = await search_client.vector_search([0.1, 0.2, 0.3], top_k=3)
+
+        assert [r["id"] for r in results] == ["doc-0", "doc-1", "doc-2"]
+        assert results[0]["metadata"]["type"] == "vector_result"
+        assert search_client.search_count == 1
+
+    @pytest.mark.asyncio
+    async def test_hybrid_and_text_search(self, search_client):
+        """Test hybrid and text searches pass the query text through."""
+        hybrid = await search_client.hybrid_search("azure", [0.1, 0.2], top_k=2)
+        text = await search_client.text_search("azure", top_k=2)
+
+        assert hybrid[0]["search_type"] == "hybrid"
+        assert text[0]["metadata"]["type"] == "text_result"
+        assert [c["search_text"] for c in search_client.search_client.calls] == ["azure", "azure"]
+
+    @pytest.mark.asyncio
+    async def test_search_errors_are_wrapped(self, search_client):
+        """Test SDK failures surface as RuntimeError."""
+        async def failing_search(**kwargs):
+            raise ValueError("service unavailable")
+        search_client.search_client.search = failing_search
+
+        with pytest.raises(RuntimeError, match="text search failed"):
+            await search_client.text_search("azure")
+
+    @pytest.mark.asyncio
+    @pytest.mark.performance
+    async def test_concurrent_searches_do_not_block_event_loop(self, search_client):
+        """Benchmark: p99 of concurrent searches stays near one round-trip."""
+        async def timed_search(i):
+            start_time = time.perf_counter()
+            await search_client.text_search(f"query {i}", top_k=5)
+            return time.perf_counter() - start_time
+
+        latencies = sorted(await asyncio.gather(*[timed_search(i) for i in range(CONCURRENT_SEARCHES)]))
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+
+        # Blocking calls would grow p99 to CONCURRENT_SEARCHES * SIMULATED_ROUND_TRIP
+        assert p99 < SIMULATED_ROUND_TRIP * 3
+
+    @pytest.mark.asyncio
+    async def test_upload_documents_reports_rejections(self, search_client):
+        """Test document uploads count indexed documents and raise on rejected keys."""
+        indexed = await search_client.upload_documents([{"id": "a", "content": "x"}, {"id": "b", "content": "y"}])
+
+        assert indexed == 2
+        with pytest.raises(RuntimeError, match="rejected documents: c"):
+            await search_client.upload_documents([{"id": "c", "content": ""}])
+        assert search_client.indexed_count == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_documents_reports_failures(self, search_client):
+        """Test document deletes count removed documents and raise on failed keys."""
+        deleted = await search_client.delete_documents(["a", "b"])
+
+        assert deleted == 2
+        assert search_client.search_client.calls[-1] == {"deleted": [{"id": "a"}, {"id": "b"}]}
+        with pytest.raises(RuntimeError, match="failed to delete documents: locked"):
+            await search_client.delete_documents(["locked"])
+        assert search_client.deleted_count == 2
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_clients(self, search_client):
+        """Test aclose releases both SDK clients."""
+        await search_client.aclose()
+
+        assert search_client.search_client.closed
+        assert search_client.index_client.closed
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_is_served_from_cache(self, search_client):
+        """Test normalized repeat queries skip the service and set cache_hit."""
+        first = await search_client.text_search("Azure  Search", top_k=3)
+        second = await search_client.text_search("azure search", top_k=3)
+
+        assert second == first
+        assert len(search_client.search_client.calls) == 1
+        assert first.metrics.cache_hit is False
+        assert second.metrics.cache_hit is True
+
+    @pytest.mark.asyncio
+    async def test_concurrent_searches_keep_their_own_metrics(self, search_client):
+        """Test each lookup in a batch reports its own cache outcome."""
+        await search_client.text_search("azure", top_k=2)
+
+        results = await search_client.multi_search(
+            [("text", "azure", None, 2), ("text", "cosmos", None, 2)], timeout=5
+        )
+
+        assert [r.metrics.cache_hit for r in results] == [True, False]
+        assert not hasattr(search_client, "last_search_metrics")
+
+    def test_default_cache_backend_is_shared_across_processes(self, search_client, monkeypatch, tmp_path):
+        """Test the default backend is the on-host file store, or redis when a URL is configured."""
+        assert isinstance(search_client.result_cache.backend, FileSearchCacheBackend)
+        assert search_client.result_cache.backend.cache_dir == tmp_path / "search"
+
+        monkeypatch.setattr(search_client_module, "redis_asyncio", SimpleNamespace(from_url=lambda url: url))
+        monkeypatch.setenv("SEARCH_CACHE_REDIS_URL", "redis://cache:6379/0")
+        backend = SearchClient().result_cache.backend
+
+        assert isinstance(backend, RedisSearchCacheBackend)
+        assert backend.redis_client == "redis://cache:6379/0"
+
+    def test_redis_cache_backend_requires_a_url(self, search_client):
+        """Test selecting redis without SEARCH_CACHE_REDIS_URL is rejected."""
+        with pytest.raises(ValueError, match="SEARCH_CACHE_REDIS_URL"):
+            search_client._create_cache_backend("redis")
+
+    @pytest.mark.asyncio
+    async def test_cache_key_separates_mode_and_top_k(self, search_client):
+        """Test different modes or result counts never share an entry."""
+        await search_client.text_search("azure", top_k=3)
+        await search_client.text_search("azure", top_k=5)
+        await search_client.hybrid_search("azure", [0.1, 0.2], top_k=3)
+
+        assert len(search_client.search_client.calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_vector_noise_below_precision_hits_cache(self, search_client):
+        """Test query vectors are quantized before hashing."""
+        await search_client.vector_search([0.12341, 0.5], top_k=3)
+        await search_client.vector_search([0.123412, 0.5], top_k=3)
+        await search_client.vector_search([0.2, 0.5], top_k=3)
+
+        assert len(search_client.search_client.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_index_reload_invalidates_cache(self, search_client):
+        """Test invalidating an index forces the next search to the service."""
+        await search_client.text_search("azure", top_k=3)
+        await search_client.invalidate_cache()
+        await search_client.text_search("azure", top_k=3)
+
+        assert len(search_client.search_client.calls) == 2
+        assert search_client.result_cache.invalidations == 1
+
+    @pytest.mark.asyncio
+    async def test_multi_search_runs_requests_concurrently(self, search_client):
+        """Test a batch finishes in about one round-trip with tagged results."""
+        requests = [
+            ("text", "azure", None, 2),
+            ("vector", None, [0.1, 0.2], 3),
+            ("hybrid", "azure", [0.1, 0.2], 4),
+        ]
+
+        start_time = time.perf_counter()
+        results = await search_client.multi_search(requests, max_concurrency=3, timeout=5)
+        wall_time = time.perf_counter() - start_time
+
+        assert [r.request_index for r in results] == [0, 1, 2]
+        assert [len(r.results) for r in results] == [2, 3, 4]
+        assert all(r.success for r in results)
+        assert wall_time < SIMULATED_ROUND_TRIP * 2
+
+    @pytest.mark.asyncio
+    async def test_multi_search_respects_concurrency_limit(self, search_client):
+        """Test at most max_concurrency lookups are in flight."""
+        requests = [("text", f"query {i}", None, 1) for i in range(4)]
+
+        start_time = time.perf_counter()
+        results = await search_client.multi_search(requests, max_concurrency=2, timeout=5)
+        wall_time = time.perf_counter() - start_time
+
+        assert all(r.success for r in results)
+        # Two waves of two lookups each
+        assert wall_time >= SIMULATED_ROUND_TRIP * 2
+
+    @pytest.mark.asyncio
+    async def test_multi_search_isolates_failures(self, search_client):
+        """Test one bad request does not fail the batch."""
+        requests = [("text", "azure", None, 2), ("semantic", "azure", None, 2)]
+
+        results = await search_client.multi_search(requests, timeout=5)
+
+        assert results[0].success
+        assert not results[1].success
+        assert "Unknown search mode" in results[1].error
+
+    @pytest.mark.asyncio
+    async def test_multi_search_deadline_reports_slow_lookups(self, search_client):
+        """Test lookups still running at the deadline are reported as timed out."""
+        search_client.search_client.delay = 1.0
+
+        start_time = time.perf_counter()
+        results = await search_client.multi_search([("text", "slow", None, 1)], timeout=SIMULATED_ROUND_TRIP)
+        wall_time = time.perf_counter() - start_time
+
+        assert not results[0].success
+        assert "deadline" in results[0].error
+        assert wall_time < 1.0
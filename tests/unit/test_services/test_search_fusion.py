@@ -0,0 +1,85 @@
+"""
+Unit tests for search result fusion
+Tests RRF, min-max and z-score CombSUM, deduplication and weighting.
+"""
+
+import pytest
+from azure_services.search_fusion import fuse_results
+
+
+def ranked(source, ids, scores):
+    """Result dictionaries as the search clients return them."""
+    return [{"id": i, "content": f"{source} {i}", "score": s} for i, s in zip(ids, scores)]
+
+
+class TestSearchFusion:
+    """Test suite for fuse_results."""
+
+    @pytest.fixture
+    def result_sets(self):
+        """Three sources on unrelated score scales."""
+        return {
+            "vector": ranked("vector", ["a", "b", "c"], [0.91, 0.88, 0.80]),
+            "hybrid": ranked("hybrid", ["b", "a", "d"], [0.033, 0.032, 0.016]),
+            "graph": ranked("graph", ["b", "e"], [12.0, 3.0]),
+        }
+
+    def test_rrf_rewards_agreement(self, result_sets):
+        """Test the document every source ranks highly wins under RRF."""
+        fused = fuse_results(result_sets, top_k=5, method="rrf")
+
+        assert [r.document_id for r in fused][:2] == ["b", "a"]
+        assert set(fused[0].source_scores) == {"vector", "hybrid", "graph"}
+
+    def test_document_first_everywhere_scores_one(self):
+        """Test scores are scaled so a unanimous first place is 1.0."""
+        result_sets = {"vector": ranked("vector", ["a", "b"], [0.9, 0.1]),
+                       "text": ranked("text", ["a", "c"], [7.0, 2.0])}
+
+        for method in ("rrf", "combsum"):
+            fused = fuse_results(result_sets, top_k=3, method=method)
+            assert fused[0].document_id == "a"
+            assert fused[0].score == pytest.approx(1.0)
+
+    @pytest.mark.parametrize("method,normalization", [
+        ("rrf", "minmax"), ("combsum", "minmax"), ("combsum", "zscore")
+    ])
+    def test_scores_lie_in_unit_interval(self, result_sets, method, normalization):
+        """Test every fused score is a valid relevance_score."""
+        fused = fuse_results(result_sets, top_k=10, method=method, normalization=normalization)
+
+        assert len(fused) == 5
+        assert all(0.0 <= r.score <= 1.0 for r in fused)
+        assert [r.score for r in fused] == sorted((r.score for r in fused), reverse=True)
+
+    def test_duplicates_within_a_source_count_once(self):
+        """Test a repeated id contributes only its best-ranked entry."""
+        fused = fuse_results({"vector": ranked("vector", ["a", "a", "b"], [0.9, 0.8, 0.7])}, top_k=5)
+
+        assert [r.document_id for r in fused] == ["a", "b"]
+        assert fused[0].result["score"] == 0.9
+
+    def test_weights_shift_the_ranking(self):
+        """Test a heavier source decides between conflicting rankings."""
+        result_sets = {"vector": ranked("vector", ["a", "b"], [0.9, 0.1]),
+                       "graph": ranked("graph", ["b", "a"], [0.9, 0.1])}
+
+        fused = fuse_results(result_sets, top_k=2, method="combsum", weights={"vector": 1.0, "graph": 3.0})
+
+        assert fused[0].document_id == "b"
+        assert fused[0].search_method == "graph"
+
+    def test_equal_scores_and_empty_sources(self):
+        """Test constant-score sources and empty lists are handled."""
+        fused = fuse_results({"graph": ranked("graph", ["a", "b"], [0.0, 0.0]), "vector": []},
+                             top_k=5, method="combsum")
+
+        assert [r.score for r in fused] == [1.0, 1.0]
+        assert fuse_results({"vector": []}, top_k=5) == []
+
+    def test_unknown_method_raises(self, result_sets):
+        """Test unsupported fusion settings are rejected."""
+        with pytest.raises(ValueError, match="Unknown fusion method"):
+            fuse_results(result_sets, top_k=5, method="borda")
+        with pytest.raises(ValueError, match="Unknown score normalization"):
+            fuse_results(result_sets, top_k=5, method="combsum", normalization="rank")
@@ -0,0 +1,191 @@
+"""
+Unit tests for StorageClient
+Tests streaming, prefix-filtered, concurrent domain document scans.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from azure.core.exceptions import ClientAuthenticationError, ResourceNotFoundError
+from azure_services.storage_client import StorageClient
+
+
+# Test fixtures - simulated blob download latency and corpus size
+SIMULATED_DOWNLOAD_TIME = 0.05
+TEST_BLOB_COUNT = 40
+TEST_CONCURRENCY = 8
+
+
+class FakeDownload:
+    """Stand-in for StorageStreamDownloader."""
+
+    def __init__(self, content):
+        self.content = content
+
+    async def readall(self):
+        return self.content
+
+
+class FakeBlobClient:
+    """Stand-in for an async BlobClient."""
+
+    def __init__(self, container, name):
+        self.container = container
+        self.name = name
+
+    async def download_blob(self):
+        self.container.active += 1
+        self.container.peak_active = max(self.container.peak_active, self.container.active)
+        await asyncio.sleep(SIMULATED_DOWNLOAD_TIME)
+        self.container.active -= 1
+        if self.container.auth_error:
+            raise ClientAuthenticationError("AuthorizationPermissionMismatch")
+        if self.name not in self.container.blobs:
+            raise ResourceNotFoundError("BlobNotFound")
+        return FakeDownload(self.container.blobs[self.name])
+
+    async def exists(self):
+        self.container.exists_calls += 1
+        return self.name in self.container.blobs
+
+
+class FakeContainerClient:
+    """Stand-in for an async ContainerClient."""
+
+    def __init__(self, blobs):
+        self.blobs = blobs
+        self.prefixes = []
+        self.active = 0
+        self.peak_active = 0
+        self.exists_calls = 0
+        self.auth_error = False
+
+    async def list_blobs(self, name_starts_with=None, **kwargs):
+        self.prefixes.append(name_starts_with)
+        for name, content in list(self.blobs.items()):
+            if name_starts_with is None or name.startswith(name_starts_with):
+                yield SimpleNamespace(name=name, size=len(content), etag=f'"{hash(content)}"')
+
+    def get_blob_client(self, name):
+        return FakeBlobClient(self, name)
+
+    async def delete_blob(self, name):
+        if name == "programming/locked.md":
+            raise RuntimeError("LeaseIdMissing")
+        if self.blobs.pop(name, None) is None:
+            raise ResourceNotFoundError("BlobNotFound")
+
+
+class TestStorageClient:
+    """Test suite for StorageClient document scanning."""
+
+    @pytest.fixture
+    def storage_client(self, monkeypatch):
+        """Create StorageClient backed by an in-memory container."""
+        monkeypatch.setenv("AZURE_STORAGE_ACCOUNT", "teststorage")
+        client = StorageClient()
+        blobs = {f"programming/doc_{i}.md": f"document {i}".encode() for i in range(TEST_BLOB_COUNT)}
+        blobs["other/ignored.md"] = b"not in domain"
+        self.container = FakeContainerClient(blobs)
+        client.blob_service_client = SimpleNamespace(get_container_client=lambda name: self.container)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_stream_uses_prefix_and_skips_exists_probe(self, storage_client):
+        """Test server-side prefix filtering and single round-trip downloads."""
+        documents = [doc async for doc in storage_client.stream_domain_documents(
+            "programming/", max_concurrency=TEST_CONCURRENCY
+        )]
+
+        assert len(documents) == TEST_BLOB_COUNT
+        assert all(name.startswith("programming/") for name, _ in documents)
+        assert self.container.prefixes == ["programming/"]
+        assert self.container.exists_calls == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.performance
+    async def test_stream_downloads_concurrently_within_bound(self, storage_client):
+        """Test downloads overlap but never exceed the concurrency bound."""
+        start_time = asyncio.get_running_loop().time()
+        count = 0
+        async for _ in storage_client.stream_domain_documents("programming/", max_concurrency=TEST_CONCURRENCY):
+            count += 1
+        elapsed = asyncio.get_running_loop().time() - start_time
+
+        assert count == TEST_BLOB_COUNT
+        assert self.container.peak_active <= TEST_CONCURRENCY
+        # Serial downloads would take TEST_BLOB_COUNT * SIMULATED_DOWNLOAD_TIME
+        assert elapsed < TEST_BLOB_COUNT * SIMULATED_DOWNLOAD_TIME / 2
+
+    @pytest.mark.asyncio
+    async def test_scan_has_no_fixed_document_cap(self, storage_client):
+        """Test scan returns every document rather than the first ten."""
+        documents = await storage_client.scan_domain_documents("programming/")
+
+        assert len(documents) == TEST_BLOB_COUNT
+
+    @pytest.mark.asyncio
+    async def test_scan_stops_early_with_max_documents(self, storage_client):
+        """Test an explicit sample size stops the stream early."""
+        documents = await storage_client.scan_domain_documents("programming/", max_documents=5)
+
+        assert len(documents) == 5
+
+    @pytest.mark.asyncio
+    async def test_list_blob_etags_covers_whole_prefix(self, storage_client):
+        """Test the etag listing is prefix-filtered and not capped."""
+        blob_etags = await storage_client.list_blob_etags("programming/")
+
+        assert len(blob_etags) == TEST_BLOB_COUNT
+        assert self.container.prefixes == ["programming/"]
+
+    @pytest.mark.asyncio
+    async def test_stream_downloads_only_named_blobs(self, storage_client):
+        """Test explicit blob names skip the listing."""
+        names = ["programming/doc_1.md", "programming/doc_2.md"]
+
+        documents = [doc async for doc in storage_client.stream_domain_documents("programming/", blob_names=names)]
+
+        assert sorted(name for name, _ in documents) == names
+        assert self.container.prefixes == []
+
+    @pytest.mark.asyncio
+    async def test_failed_downloads_are_counted_and_reported(self, storage_client):
+        """Test that a blob that cannot be downloaded is recorded, not silently dropped."""
+        names = ["programming/doc_1.md", "programming/deleted.md"]
+        failed_blobs = {}
+
+        documents = [doc async for doc in storage_client.stream_domain_documents(
+            "programming/", blob_names=names, failed_blobs=failed_blobs
+        )]
+
+        assert [name for name, _ in documents] == ["programming/doc_1.md"]
+        assert list(failed_blobs) == ["programming/deleted.md"]
+        assert "BlobNotFound" in failed_blobs["programming/deleted.md"]
+        assert storage_client.download_failures == 1
+
+    @pytest.mark.asyncio
+    async def test_auth_errors_end_the_stream(self, storage_client):
+        """Test that credential failures are raised instead of skipping every blob."""
+        self.container.auth_error = True
+
+        with pytest.raises(ClientAuthenticationError):
+            async for _ in storage_client.stream_domain_documents("programming/", max_concurrency=TEST_CONCURRENCY):
+                pass
+        assert storage_client.download_failures == 0
+
+    @pytest.mark.asyncio
+    async def test_delete_blobs_skips_missing_and_reports_failures(self, storage_client):
+        """Test deletes count existing blobs and raise after the rest finish."""
+        deleted = await storage_client.delete_blobs(
+            storage_client.container_name, ["programming/doc_1.md", "programming/gone.md"]
+        )
+
+        assert deleted == 1
+        assert "programming/doc_1.md" not in self.container.blobs
+        with pytest.raises(RuntimeError, match="Blob delete failed for 1 blob"):
+            await storage_client.delete_blobs(
+                storage_client.container_name, ["programming/locked.md", "programming/doc_2.md"]
+            )
+        assert "programming/doc_2.md" not in self.container.blobs
+        assert storage_client.delete_count == 2
@@ -0,0 +1,141 @@
+"""
+Unit tests for Tokenizer
+Tests cl100k pre-tokenization, BPE merges, caching and the approximate fallback.
+"""
+
+import base64
+import hashlib
+import logging
+import time
+import httpx
+import pytest
+from azure_services import tokenizer as tokenizer_module
+from azure_services.tokenizer import PRETOKEN_PATTERN, Tokenizer, get_tokenizer, provision_vocabulary
+from prompt_flows.prompt_composer import PromptComposer
+
+
+# Test fixtures - byte vocabulary plus merges that build "hello" and " world"
+TEST_MERGES = [b"he", b"ll", b"hell", b" w", b"or", b" wor", b"ld", b" world"]
+SHORT_STRINGS = [f"query number {i} about pump maintenance" for i in range(1000)]
+
+# Test fixtures - reference cl100k_base encodings from tiktoken
+CL100K_ENCODINGS = {
+    "hello world": [15339, 1917],
+    "tiktoken is great!": [83, 1609, 5963, 374, 2294, 0],
+}
+
+
+@pytest.fixture
+def vocab_path(tmp_path):
+    """Write a tiktoken-format ranks file with all bytes and TEST_MERGES."""
+    tokens = [bytes([i]) for i in range(256)] + TEST_MERGES
+    path = tmp_path / "test_base.tiktoken"
+    path.write_bytes(b"".join(
+        base64.b64encode(token) + b" " + str(rank).encode() + b"\n" for rank, token in enumerate(tokens)
+    ))
+    return path
+
+
+class TestTokenizer:
+    """Test suite for Tokenizer."""
+
+    def test_pretokenizer_matches_cl100k_splits(self):
+        """Test that words, numbers, contractions and whitespace split like cl100k."""
+        assert PRETOKEN_PATTERN.findall("Hello world! It's 12345 tokens.") == [
+            "Hello", " world", "!", " It", "'s", " ", "123", "45", " tokens", "."
+        ]
+        assert PRETOKEN_PATTERN.findall("foo_bar  baz\n\n  x") == ["foo", "_bar", " ", " baz", "\n\n", " ", " x"]
+
+    def test_bpe_merges_lowest_rank_first(self, vocab_path):
+        """Test that pre-tokens are merged into the expected vocabulary ids."""
+        tokenizer = Tokenizer(vocab_path)
+        hell, world = 256 + TEST_MERGES.index(b"hell"), 256 + TEST_MERGES.index(b" world")
+
+        assert tokenizer.exact
+        assert tokenizer.encode("hello world") == [hell, ord("o"), world]
+        assert tokenizer.count("hello world") == 3
+        assert tokenizer.count("hello world!") == 4
+
+    def test_unicode_falls_back_to_bytes(self, vocab_path):
+        """Test that text outside the merges is encoded byte by byte."""
+        tokenizer = Tokenizer(vocab_path)
+
+        assert tokenizer.count("é") == len("é".encode("utf-8"))
+
+    def test_counts_are_cached_per_text(self, vocab_path):
+        """Test that repeated texts are served from the LRU."""
+        tokenizer = Tokenizer(vocab_path)
+        tokenizer.count_batch(["hello", "world", "hello"])
+
+        assert tokenizer.cache_stats() == (1, 2)
+
+    def test_count_messages_includes_chat_framing(self, vocab_path):
+        """Test that chat requests are charged per-message framing on top of content."""
+        tokenizer = Tokenizer(vocab_path)
+        messages = [{"role": "user", "content": "hello world"}]
+
+        assert tokenizer.count_messages(messages) == 3 + tokenizer.count("user") + 3 + 3
+
+    def test_missing_vocabulary_approximates(self, tmp_path, caplog):
+        """Test that counting still works without a vocabulary file, with a warning."""
+        with caplog.at_level(logging.WARNING, logger="azure_services.tokenizer"):
+            tokenizer = Tokenizer(tmp_path / "missing.tiktoken")
+
+        assert "token counts are approximate" in caplog.text
+        assert not tokenizer.exact
+        assert tokenizer.count("Hello world, how are you?") == 7
+        with pytest.raises(ValueError, match="No tokenizer vocabulary"):
+            tokenizer.encode("hello")
+
+    def test_missing_vocabulary_fails_when_required(self, tmp_path, monkeypatch):
+        """Test that TOKENIZER_REQUIRE_VOCAB turns the fallback into an error."""
+        monkeypatch.setenv("TOKENIZER_REQUIRE_VOCAB", "true")
+
+        with pytest.raises(FileNotFoundError, match="python -m azure_services.tokenizer"):
+            Tokenizer(tmp_path / "missing.tiktoken")
+
+    def test_provision_vocabulary_verifies_sha256(self, tmp_path, monkeypatch):
+        """Test that a download is written only when its sha256 matches."""
+        content = b"aGVsbG8= 0\n"
+        monkeypatch.setattr(
+            tokenizer_module.httpx, "get",
+            lambda url, **kwargs: httpx.Response(200, content=content, request=httpx.Request("GET", url))
+        )
+        vocab_path = tmp_path / "tokenizer" / "test_base.tiktoken"
+
+        with pytest.raises(RuntimeError, match="sha256"):
+            provision_vocabulary(vocab_path, expected_sha256="0" * 64)
+        assert not vocab_path.exists()
+
+        assert provision_vocabulary(vocab_path, expected_sha256=hashlib.sha256(content).hexdigest()) == vocab_path
+        assert vocab_path.read_bytes() == content
+
+    def test_provisioned_cl100k_matches_reference_encodings(self):
+        """Test that the provisioned cl100k_base vocabulary reproduces tiktoken's ids."""
+        tokenizer = get_tokenizer()
+        if not tokenizer.exact:
+            pytest.skip("cl100k_base vocabulary not provisioned")
+
+        for text, expected in CL100K_ENCODINGS.items():
+            assert tokenizer.encode(text) == expected
+            assert tokenizer.count(text) == len(expected)
+
+    def test_composer_estimates_prompt_tokens(self):
+        """Test that PromptComposer fills estimated_tokens from the tokenizer."""
+        prompt = PromptComposer().build_composed_prompt("Summarize the pump manual.", "user", 0)
+
+        assert prompt.estimated_tokens == get_tokenizer().count("Summarize the pump manual.")
+        assert prompt.estimated_tokens > 0
+
+    @pytest.mark.performance
+    def test_short_string_counts_take_microseconds(self, vocab_path):
+        """Benchmark: warm counts of short strings cost at most a few microseconds each."""
+        tokenizer = Tokenizer(vocab_path)
+        tokenizer.count_batch(SHORT_STRINGS)
+
+        start_time = time.perf_counter()
+        for _ in range(10):
+            tokenizer.count_batch(SHORT_STRINGS)
+        per_string = (time.perf_counter() - start_time) / (10 * len(SHORT_STRINGS))
+
+        assert per_string < 3e-6